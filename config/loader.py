@@ -78,15 +78,27 @@ def normalize_config(data: dict[str, Any]) -> dict[str, Any]:
     # File scan defaults: all compatible extensions when not specified (see connectors.filesystem_connector.SUPPORTED_EXTENSIONS)
     _default_extensions = [
         ".txt", ".csv", ".pdf", ".doc", ".docx", ".odt", ".ods", ".odp", ".xls", ".xlsx", ".xlsm", ".ppt", ".pptx",
-        ".sqlite", ".sqlite3", ".db", ".json", ".jsonl", ".xml", ".html", ".htm", ".md", ".yml", ".yaml",
-        ".log", ".ini", ".cfg", ".conf", ".env", ".sql", ".rtf", ".eml", ".msg", ".tex", ".bib",
+        ".sqlite", ".sqlite3", ".db", ".parquet", ".json", ".jsonl", ".xml", ".html", ".htm", ".md", ".yml", ".yaml",
+        ".zip", ".tar", ".tgz", ".tar.gz", ".gz", ".bz2", ".xz",
+        ".log", ".ini", ".cfg", ".conf", ".env", ".sql", ".rtf", ".eml", ".mbox", ".msg", ".tex", ".bib",
     ]
     out["file_scan"] = {
         "extensions": data.get("file_scan", {}).get("extensions", _default_extensions),
         "recursive": data.get("file_scan", {}).get("recursive", True),
         "scan_sqlite_as_db": data.get("file_scan", {}).get("scan_sqlite_as_db", True),
         "sample_limit": data.get("file_scan", {}).get("sample_limit", 5),
+        "scan_tabular_as_table": data.get("file_scan", {}).get("scan_tabular_as_table", True),
+        "scan_archives": data.get("file_scan", {}).get("scan_archives", True),
+        "scan_mailboxes": data.get("file_scan", {}).get("scan_mailboxes", True),
+        "page_cache_hints": data.get("file_scan", {}).get("page_cache_hints", False),
     }
+    # Archive and mail limits (file_scan.archive.archive_limits / file_scan.mail.mail_limits apply defaults for missing keys)
+    for key in (
+        "archive_max_depth", "archive_max_members", "archive_max_member_bytes", "archive_max_total_bytes",
+        "mail_max_messages", "mail_max_message_bytes",
+    ):
+        if key in data.get("file_scan", {}):
+            out["file_scan"][key] = data["file_scan"][key]
     # Normalize extensions to list of suffixes (e.g. "*.pdf" -> ".pdf")
     exts = out["file_scan"]["extensions"]
     out["file_scan"]["extensions"] = [
@@ -233,6 +245,10 @@ def normalize_config(data: dict[str, Any]) -> dict[str, Any]:
         mw = 32
     out["scan"]["max_workers"] = mw
 
+    # Optional global I/O throttle for file-based targets (core.throttle; targets may add their own io_throttle)
+    io_throttle = data.get("io_throttle")
+    out["io_throttle"] = dict(io_throttle) if isinstance(io_throttle, dict) else {}
+
     # SQLite path for audit results
     out["sqlite_path"] = data.get("sqlite_path", "audit_results.db")
 
@@ -1,13 +1,23 @@
 """
 Dataverse (Power Apps) connector: discover entities and attributes via Dataverse Web API,
-sample rows, run sensitivity detection. Uses Azure AD OAuth2 (client credentials).
+sample rows, run sensitivity detection. Uses Azure AD OAuth2 (client credentials; token cached
+across targets, core.token_cache; renewed once when the API rejects it with 401).
+Entity and attribute metadata come from one EntityDefinitions?$expand=Attributes call, kept in
+connector_state between sessions and reused while the org's metadata version (ServerVersionStamp)
+is unchanged. Rows are sampled with OData $batch requests (batch_size entities each, $select of the
+scannable attributes only), run concurrently (concurrency) with retries on 429/5xx (Retry-After).
 Target type: dataverse or powerapps. Required: name, org_url (or environment_url),
 tenant_id, client_id, client_secret (or auth block).
 """
+import json
 import os
+import threading
+import uuid
 from typing import Any
 
 from core.connector_registry import register
+from core.fetch_pool import FetchPool, parse_retry_after, pool_from_config
+from core.token_cache import client_credentials_token, invalidate_token
 
 try:
     import httpx
@@ -19,8 +29,8 @@ except ImportError:
 _HTTPS_PREFIX = "https://"
 
 
-def _dataverse_token(target: dict[str, Any]) -> str | None:
-    """Obtain Dataverse access token via Azure AD client credentials. Scope = org .default."""
+def _token_grant(target: dict[str, Any]) -> tuple[str, str, str, str] | None:
+    """(token_url, client_id, client_secret, scope) from the target or its auth block; None when incomplete."""
     auth = target.get("auth") or {}
     tenant_id = auth.get("tenant_id") or target.get("tenant_id", "")
     client_id = auth.get("client_id") or target.get("client_id", "")
@@ -38,20 +48,17 @@ def _dataverse_token(target: dict[str, Any]) -> str | None:
     if not tenant_id or not client_id or not client_secret:
         return None
     token_url = auth.get("token_url") or f"https://login.microsoftonline.com/{tenant_id}/oauth2/v2.0/token"
-    resp = httpx.post(
-        token_url,
-        data={
-            "grant_type": "client_credentials",
-            "client_id": client_id,
-            "client_secret": client_secret,
-            "scope": scope,
-        },
-        headers={"Accept": "application/json"},
-        timeout=30.0,
-    )
-    resp.raise_for_status()
-    data = resp.json()
-    return data.get("access_token")
+    return token_url, client_id, client_secret, scope
+
+
+def _dataverse_token(target: dict[str, Any], refresh: bool = False) -> str | None:
+    """Dataverse access token via Azure AD client credentials, scope org .default (cached; refresh drops it first)."""
+    grant = _token_grant(target)
+    if grant is None:
+        return None
+    if refresh:
+        invalidate_token(*grant)
+    return client_credentials_token(httpx.post, *grant)
 
 
 def _api_base(org_url: str) -> str:
@@ -66,6 +73,81 @@ def _api_base(org_url: str) -> str:
     return f"{_HTTPS_PREFIX}{org}.api.crm.dynamics.com/api/data/v9.2"
 
 
+# Attribute types scanned (by name); values are sampled for those with a plain column in the entity set
+_SCANNED_TYPES = ("String", "Memo", "Integer", "DateTime", "Double", "Decimal", "Lookup", "Uniqueidentifier")
+_SAMPLED_TYPES = ("String", "Memo", "Integer", "DateTime", "Double", "Decimal")
+DEFAULT_BATCH_SIZE = 20
+# RetrieveMetadataChanges for an entity that does not exist: only the org's ServerVersionStamp comes back
+_VERSION_QUERY = json.dumps({
+    "Criteria": {"FilterOperator": "And", "Conditions": [{
+        "PropertyName": "LogicalName", "ConditionOperator": "Equals",
+        "Value": {"Type": "System.String", "Value": "-"},
+    }]},
+    "Properties": {"AllProperties": False, "PropertyNames": ["LogicalName"]},
+}, separators=(",", ":"))
+
+
+def _entities_from_metadata(definitions: list[dict]) -> list[dict[str, Any]]:
+    """
+    Compact entity list from expanded EntityDefinitions: logical name, entity set and the scanned
+    attributes as [logical name, type, sampled] (secondary attributes, AttributeOf set, are left out).
+    """
+    entities = []
+    for ent in definitions:
+        logical = ent.get("LogicalName", "")
+        entity_set = ent.get("EntitySetName", "")
+        if not logical or not entity_set:
+            continue
+        attributes = [
+            [a.get("LogicalName") or a.get("SchemaName", ""), str(a.get("AttributeType", "")),
+             a.get("AttributeType") in _SAMPLED_TYPES]
+            for a in ent.get("Attributes") or []
+            if a.get("AttributeType") in _SCANNED_TYPES and not a.get("AttributeOf")
+        ]
+        entities.append({"logical": logical, "entity_set": entity_set, "attributes": attributes})
+    return entities
+
+
+def _batch_body(boundary: str, base_url: str, requests: list[str]) -> bytes:
+    """multipart/mixed $batch body with one GET per relative URL."""
+    lines = []
+    for url in requests:
+        lines += [
+            f"--{boundary}",
+            "Content-Type: application/http",
+            "Content-Transfer-Encoding: binary",
+            "",
+            f"GET {base_url}/{url} HTTP/1.1",
+            "Accept: application/json",
+            'Prefer: odata.include-annotations="-*"',
+            "",
+            "",
+        ]
+    lines.append(f"--{boundary}--")
+    return "\r\n".join(lines).encode("utf-8")
+
+
+def _parse_batch_response(content_type: str, body: bytes) -> list[tuple[int, Any]]:
+    """(status, JSON body or None) of each part of a multipart/mixed $batch response, in request order."""
+    boundary = content_type.split("boundary=", 1)[1].split(";", 1)[0].strip().strip('"')
+    results = []
+    for part in body.replace(b"\r\n", b"\n").split(b"--" + boundary.encode())[1:]:
+        if part.startswith(b"--"):
+            break
+        # Part headers, then the HTTP response: status line, headers, body
+        _, _, http = part.partition(b"\n\n")
+        head, _, payload = http.partition(b"\n\n")
+        try:
+            status = int(head.split(b"\n", 1)[0].split()[1])
+        except (IndexError, ValueError):
+            continue
+        try:
+            results.append((status, json.loads(payload) if payload.strip() else None))
+        except ValueError:
+            results.append((status, None))
+    return results
+
+
 class DataverseConnector:
     """
     Connect to Microsoft Dataverse (Power Apps) Web API, list entities, sample rows,
@@ -86,6 +168,16 @@ class DataverseConnector:
         self.sample_limit = min(max(int(sample_limit), 1), 100)
         self._client: "httpx.Client | None" = None
         self._token: str | None = None
+        self._base = ""
+        settings = pool_from_config(self.config)
+        self._workers = settings.workers
+        self._retries = settings.retries
+        self._backoff = settings.backoff
+        try:
+            self._batch_size = max(1, int(self.config.get("batch_size", DEFAULT_BATCH_SIZE)))
+        except (TypeError, ValueError):
+            self._batch_size = DEFAULT_BATCH_SIZE
+        self._token_lock = threading.Lock()
 
     def connect(self) -> None:
         if not _HTTPX_AVAILABLE:
@@ -96,7 +188,7 @@ class DataverseConnector:
         self._token = _dataverse_token(self.config)
         if not self._token:
             raise ValueError("Dataverse auth failed: provide tenant_id, client_id, client_secret (or auth block)")
-        base = _api_base(org_url)
+        base = self._base = _api_base(org_url)
         self._client = httpx.Client(
             base_url=base,
             headers={
@@ -117,35 +209,101 @@ class DataverseConnector:
             self._client = None
         self._token = None
 
+    def _refresh_token(self, rejected: str | None) -> None:
+        """New token after a 401 (once per rejected token, whichever worker sees it first)."""
+        with self._token_lock:
+            if self._token != rejected:
+                return
+            self._token = _dataverse_token(self.config, refresh=True)
+            self._client.headers["Authorization"] = f"Bearer {self._token}"
+
+    def _request(self, method: str, url: str, **kwargs: Any) -> "httpx.Response":
+        """
+        API call retried on 429/5xx (retries) after the shared backoff or the server's Retry-After, and a
+        rejected token (401) renewed once.
+        """
+        attempt, renewed = 0, False
+        while True:
+            self._backoff.wait()
+            token = self._token
+            r = self._client.request(method, url, **kwargs)
+            if r.status_code == 401 and not renewed:
+                renewed = True
+                self._refresh_token(token)
+                continue
+            if (r.status_code == 429 or r.status_code >= 500) and attempt < self._retries:
+                attempt += 1
+                self._backoff.failure(parse_retry_after(r.headers.get("Retry-After")))
+                continue
+            if r.status_code < 400:
+                self._backoff.success()
+            return r
+
+    def _metadata_version(self) -> str | None:
+        """The org's metadata version (ServerVersionStamp); None when it cannot be read (no caching)."""
+        try:
+            r = self._request("GET", "/RetrieveMetadataChanges(Query=@q)", params={"@q": _VERSION_QUERY})
+            if r.status_code != 200:
+                return None
+            return r.json().get("ServerVersionStamp") or None
+        except Exception:
+            return None
+
     def _get_entity_definitions(self) -> list[dict]:
-        """Return list of entity definitions (LogicalName, EntitySetName)."""
-        r = self._client.get(
+        """Entity definitions (LogicalName, EntitySetName) with their Attributes expanded, in one call."""
+        r = self._request(
+            "GET",
             "/EntityDefinitions",
-            params={"$select": "LogicalName,EntitySetName", "$filter": "IsValidForAdvancedFind eq true"},
+            params={
+                "$select": "LogicalName,EntitySetName",
+                "$filter": "IsValidForAdvancedFind eq true",
+                "$expand": "Attributes($select=LogicalName,SchemaName,AttributeType,AttributeOf)",
+            },
         )
         if r.status_code != 200:
             return []
         data = r.json()
         return data.get("value", [])
 
-    def _get_attributes(self, logical_name: str) -> list[dict]:
-        """Return attributes for an entity (SchemaName, AttributeType)."""
-        r = self._client.get(
-            f"/EntityDefinitions(LogicalName='{logical_name}')/Attributes",
-            params={"$select": "LogicalName,SchemaName,AttributeType"},
-        )
-        if r.status_code != 200:
-            return []
-        data = r.json()
-        return data.get("value", [])
+    def _get_entities(self, target_name: str) -> list[dict[str, Any]]:
+        """Entities and scanned attributes: from connector_state while the metadata version matches, else fetched."""
+        version = self._metadata_version()
+        key = f"entity_metadata:{self._base}"
+        if version:
+            raw = self.db_manager.get_connector_state(target_name, key)
+            try:
+                cached = json.loads(raw) if isinstance(raw, str) else None
+            except ValueError:
+                cached = None
+            if isinstance(cached, dict) and cached.get("version") == version:
+                return cached.get("entities") or []
+        entities = _entities_from_metadata(self._get_entity_definitions())
+        if version and entities:
+            payload = json.dumps({"version": version, "entities": entities}, separators=(",", ":"))
+            self.db_manager.set_connector_state(target_name, key, payload)
+        return entities
 
-    def _sample_entity(self, entity_set: str) -> list[dict]:
-        """Fetch top N rows from an entity set."""
-        r = self._client.get(f"/{entity_set}", params={"$top": self.sample_limit})
-        if r.status_code != 200:
-            return []
-        data = r.json()
-        return data.get("value", [])
+    def _sample_url(self, entity: dict[str, Any]) -> str:
+        """Entity set query with $select of the sampled attributes only (no memo-heavy whole rows)."""
+        columns = [name for name, _type, sampled in entity["attributes"] if sampled]
+        query = f"$top={self.sample_limit}"
+        if columns:
+            query = f"$select={','.join(columns)}&" + query
+        return f"{entity['entity_set']}?{query}"
+
+    def _sample_batch(self, entities: list[dict[str, Any]]) -> list[list[dict]]:
+        """Sample rows of several entities in one $batch request; an entity whose part failed gets []."""
+        boundary = f"batch_{uuid.uuid4().hex}"
+        r = self._request(
+            "POST",
+            "/$batch",
+            content=_batch_body(boundary, self._base, [self._sample_url(e) for e in entities]),
+            headers={"Content-Type": f"multipart/mixed; boundary={boundary}"},
+        )
+        r.raise_for_status()
+        parts = _parse_batch_response(r.headers.get("Content-Type", ""), r.content)
+        rows = [(body or {}).get("value", []) if status == 200 else [] for status, body in parts]
+        return (rows + [[] for _ in entities])[: len(entities)]
 
     def run(self) -> None:
         target_name = self.config.get("name", "Dataverse")
@@ -157,58 +315,55 @@ class DataverseConnector:
         except Exception as e:
             self.db_manager.save_failure(target_name, "unreachable", str(e))
             return
+        server_ip = self.config.get("org_url", "").split("/")[0] if self.config.get("org_url") else "dataverse"
         try:
-            entities = self._get_entity_definitions()
-            for ent in entities:
-                logical = ent.get("LogicalName", "")
-                entity_set = ent.get("EntitySetName", "")
-                if not logical or not entity_set:
-                    continue
-                attrs = self._get_attributes(logical)
-                rows = self._sample_entity(entity_set)
-                if not attrs and not rows:
-                    continue
-                columns_to_scan = []
-                if attrs:
-                    for a in attrs:
-                        if a.get("AttributeType") in ("String", "Memo", "Integer", "DateTime", "Double", "Decimal", "Lookup", "Uniqueidentifier"):
-                            columns_to_scan.append((a.get("LogicalName", a.get("SchemaName", "")), str(a.get("AttributeType", ""))))
-                if not columns_to_scan and rows:
-                    for key in rows[0].keys():
-                        if key.startswith("@"):
-                            continue
-                        columns_to_scan.append((key, ""))
-                for col_name, col_type in columns_to_scan:
-                    if not col_name:
-                        continue
-                    sample = ""
-                    if rows:
-                        for row in rows[: self.sample_limit]:
-                            val = row.get(col_name)
-                            if val is not None:
-                                sample += str(val)[:200] + " "
-                    res = self.scanner.scan_column(col_name, sample)
-                    if res.get("sensitivity_level") == "LOW":
-                        continue
-                    self.db_manager.save_finding(
-                        source_type="database",
-                        target_name=target_name,
-                        server_ip=self.config.get("org_url", "").split("/")[0] if self.config.get("org_url") else "dataverse",
-                        engine_details="Dataverse",
-                        schema_name=logical,
-                        table_name=entity_set,
-                        column_name=col_name,
-                        data_type=col_type,
-                        sensitivity_level=res.get("sensitivity_level", "MEDIUM"),
-                        pattern_detected=res.get("pattern_detected", ""),
-                        norm_tag=res.get("norm_tag", ""),
-                        ml_confidence=res.get("ml_confidence", 0),
+            entities = self._get_entities(target_name)
+            batches = [entities[i:i + self._batch_size] for i in range(0, len(entities), self._batch_size)]
+            # $batch requests in flight at once on the shared client; detection and DB writes stay on this thread
+            pool = FetchPool(self._workers, retries=0, backoff=self._backoff)
+            for batch, samples, error in pool.map(batches, lambda _c, b: self._sample_batch(b)):
+                if error is not None:
+                    self.db_manager.save_failure(
+                        target_name, "error", f"{', '.join(e['entity_set'] for e in batch)}: {error}",
                     )
+                    samples = [[] for _ in batch]
+                for entity, rows in zip(batch, samples):
+                    self._scan_entity(target_name, server_ip, entity, rows)
         except Exception as e:
             self.db_manager.save_failure(target_name, "error", str(e))
         finally:
             self.close()
 
+    def _scan_entity(self, target_name: str, server_ip: str, entity: dict[str, Any], rows: list[dict]) -> None:
+        columns_to_scan = [(name, col_type) for name, col_type, _sampled in entity["attributes"]]
+        if not columns_to_scan and rows:
+            columns_to_scan = [(key, "") for key in rows[0] if not key.startswith("@")]
+        for col_name, col_type in columns_to_scan:
+            if not col_name:
+                continue
+            sample = ""
+            for row in rows[: self.sample_limit]:
+                val = row.get(col_name)
+                if val is not None:
+                    sample += str(val)[:200] + " "
+            res = self.scanner.scan_column(col_name, sample)
+            if res.get("sensitivity_level") == "LOW":
+                continue
+            self.db_manager.save_finding(
+                source_type="database",
+                target_name=target_name,
+                server_ip=server_ip,
+                engine_details="Dataverse",
+                schema_name=entity["logical"],
+                table_name=entity["entity_set"],
+                column_name=col_name,
+                data_type=col_type,
+                sensitivity_level=res.get("sensitivity_level", "MEDIUM"),
+                pattern_detected=res.get("pattern_detected", ""),
+                norm_tag=res.get("norm_tag", ""),
+                ml_confidence=res.get("ml_confidence", 0),
+            )
+
 
 if _HTTPX_AVAILABLE:
     register("dataverse", DataverseConnector, ["name", "org_url", "tenant_id", "client_id", "client_secret"])
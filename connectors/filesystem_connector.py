@@ -1,15 +1,62 @@
 """
 Filesystem connector: recursive walk, permission check before read, extensions filter,
-extract text (pypdf, docx, openpyxl, etc.), run detector, save filesystem_findings only.
+extract text (pypdf, streaming OOXML/ODF and spreadsheet readers, extract-msg, etc.), run detector, save filesystem_findings only.
 On permission error: save_failure with reason permission_denied.
 Scans all compatible/supported file types by extension; unknown types get path/name-only analysis.
+Tabular files (CSV/TSV, workbooks, SQL dumps, JSON/JSON Lines by key path) are scanned per column like DB tables when scan_tabular_as_table is set.
+Archives (zip/tar) are streamed member by member in memory (no temp files) when scan_archives is set.
+Single-file compressed files (.gz/.bz2/.xz/.zst) are decompressed lazily and sampled by their inner extension.
+Mail (.eml/.mht, mbox, Maildir directories) is parsed message by message when scan_mailboxes is set; attachments
+go through the same extractors in memory.
+With page_cache_hints (Linux), each file is opened once with O_NOATIME and read through that handle; pages the
+scan brought into the page cache are dropped after sampling (file_scan.page_cache).
+With a throttle (core.throttle.IOThrottle), each file takes a files/sec token and every read is charged to the
+bytes/sec budget (SQLite files opened as databases and Maildir directories count as files only).
+The walk classifies each inode once (file_scan.walk): hardlinks and symlinks to a file already scanned are
+recorded as references (its findings saved under the alias path, no extraction or detection), and symlinked
+directories are walked once (follow_symlinks target key, default true).
 """
+import contextlib
+import io
 import os
+import tarfile
+import tempfile
 import zipfile
+from collections.abc import Callable, Iterator
+from contextlib import AbstractContextManager
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO
 
 from core.connector_registry import register
+from core.throttle import IOThrottle
+from file_scan.archive import (
+    ARCHIVE_EXTENSIONS,
+    DEFAULT_ARCHIVE_LIMITS,
+    MEMBER_SEPARATOR,
+    archive_extension,
+    iter_archive_members,
+)
+from file_scan.columnar import COLUMNAR_EXTENSIONS, read_columnar_sample
+from file_scan.compressed import (
+    COMPRESSED_EXTENSIONS,
+    DECOMPRESSION_ERRORS,
+    inner_extension,
+    open_decompressed,
+    read_decompressed,
+)
+from file_scan.mail import (
+    DEFAULT_MAIL_LIMITS,
+    MAIL_EXTENSIONS,
+    MBOX_EXTENSIONS,
+    iter_mail_messages,
+    iter_maildir_messages,
+    maildir_root,
+)
+from file_scan.office import OFFICE_ZIP_EXTENSIONS, read_office_sample
+from file_scan.page_cache import PageCacheHints
+from file_scan.spreadsheet import SPREADSHEET_EXTENSIONS, read_spreadsheet_sample
+from file_scan.tabular import TABULAR_EXTENSIONS, Source, sample_table_columns
+from file_scan.walk import InodeSet, iter_files
 
 # Plain text and markup (read as text with errors=replace)
 _TEXT_EXTENSIONS = {
@@ -24,16 +71,30 @@ _TEXT_EXTENSIONS = {
 
 # Binary/document formats with dedicated extractors
 _DOCUMENT_EXTENSIONS = {
-    ".pdf", ".doc", ".docx", ".odt", ".ods", ".odp", ".odm", ".odg", ".odf", ".odb",
-    ".xls", ".xlsx", ".xlsm", ".xlsb", ".ppt", ".pptx", ".pps", ".ppsx",
+    ".pdf", ".doc", ".docx", ".docm", ".odt", ".ods", ".odp", ".odm", ".odg", ".odf", ".odb",
+    ".xls", ".xlsx", ".xlsm", ".xlsb", ".ppt", ".pptx", ".pptm", ".pps", ".ppsx",
     ".msg", ".eml", ".mht", ".mhtml",
-}
+} | MBOX_EXTENSIONS
 
-# Database / structured (sample or path-only)
-_DATA_EXTENSIONS = {".sqlite", ".sqlite3", ".db", ".accdb", ".mdb"}
+# Database / structured (sample or path-only); columnar files need optional pyarrow
+_DATA_EXTENSIONS = {".sqlite", ".sqlite3", ".db", ".accdb", ".mdb"} | COLUMNAR_EXTENSIONS
 
 # Supported extensions = all of the above (recursive scan uses this when config does not override)
-SUPPORTED_EXTENSIONS = _TEXT_EXTENSIONS | _DOCUMENT_EXTENSIONS | _DATA_EXTENSIONS
+SUPPORTED_EXTENSIONS = (
+    _TEXT_EXTENSIONS | _DOCUMENT_EXTENSIONS | _DATA_EXTENSIONS | ARCHIVE_EXTENSIONS | COMPRESSED_EXTENSIONS
+)
+
+# Formats sampled from the start of a forward-only stream (everything else needs random access)
+_STREAMABLE_EXTENSIONS = _TEXT_EXTENSIONS | MAIL_EXTENSIONS
+
+# Bytes read from remote shares (bounded SMB reads, HTTP Range) for formats sampled from the start of the file:
+# plain text as much as _read_plain_text reads from a file object (4 bytes per character), text tables (CSV,
+# JSON, SQL dumps) a window large enough for the header and sample rows
+_REMOTE_TEXT_BYTES = 10000 * 4
+_REMOTE_TABLE_BYTES = 1024 * 1024
+
+# data_type / ext passed to _scan_mail_file for a Maildir directory (messages in cur/ and new/)
+MAILDIR_TYPE = "maildir"
 
 # Optional: extension -> MIME (for reference; scanning is extension-based)
 EXTENSION_MIME = {
@@ -48,79 +109,75 @@ EXTENSION_MIME = {
 }
 
 
-def _read_text_sample(path: Path, ext: str, max_chars: int = 10000) -> str:
-    """Extract text from file for sensitivity scan; return empty on error. No content stored after return."""
+def _read_plain_text(source: Source, max_chars: int) -> str:
+    if isinstance(source, (str, Path)):
+        with open(source, "r", encoding="utf-8", errors="replace") as f:
+            return f.read(max_chars)
+    # UTF-8 needs at most 4 bytes per character
+    return source.read(max_chars * 4).decode("utf-8", errors="replace")[:max_chars]
+
+
+def _remote_read_limit(ext: str, scan_tabular_as_table: bool = True) -> int | None:
+    """
+    Bytes of a remote file needed to sample it (read from the start), or None when its extractor needs the
+    whole file (zip-based documents, PDF, spreadsheets, columnar, SQLite, archives, compressed files).
+    """
+    if ext not in _STREAMABLE_EXTENSIONS:
+        return None
+    if scan_tabular_as_table and ext in TABULAR_EXTENSIONS:
+        return _REMOTE_TABLE_BYTES
+    return _REMOTE_TEXT_BYTES
+
+
+def _read_http_body(response: Any, limit: int | None = None, throttle: IOThrottle | None = None) -> bytes:
+    """
+    Body of a streamed HTTP response (requests), at most limit bytes: servers that ignore Range send the
+    whole file, the rest is not read. Chunks are charged to throttle; the response is closed.
+    """
+    body = bytearray()
+    try:
+        for chunk in response.iter_content(64 * 1024):
+            if throttle is not None:
+                throttle.consume(len(chunk))
+            body += chunk
+            if limit is not None and len(body) >= limit:
+                del body[limit:]
+                break
+    finally:
+        response.close()
+    return bytes(body)
+
+
+def _read_text_sample(path: Source, ext: str, max_chars: int = 10000) -> str:
+    """
+    Extract text from a file path or binary file-like object (e.g. an archive member in memory) for
+    sensitivity scan; return empty on error. No content stored after return.
+    """
     try:
         # Plain text and markup: read as text
         if ext in _TEXT_EXTENSIONS:
-            with open(path, "r", encoding="utf-8", errors="replace") as f:
-                return f.read(max_chars)
+            return _read_plain_text(path, max_chars)
 
         if ext == ".pdf":
             from pypdf import PdfReader
             reader = PdfReader(path)
             return " ".join(p.extract_text() or "" for p in reader.pages[:5])[:max_chars]
-        if ext == ".docx":
-            from docx import Document
-            doc = Document(path)
-            return " ".join(p.text for p in doc.paragraphs[:50])[:max_chars]
+        if ext in OFFICE_ZIP_EXTENSIONS:
+            # docx/pptx/xlsx/odt/ods/odp: one streaming zip + iterparse path, stops at max_chars
+            return read_office_sample(path, ext, max_chars)
         if ext == ".doc":
             # Legacy .doc: binary format; path/name still analyzed
             return ""
-        if ext == ".odt":
-            try:
-                from odf.opendocument import load
-                from odf import text as odf_text, teletype
-                doc = load(path)
-                parts = [teletype.extractText(el) for el in doc.getElementsByType(odf_text.P)]
-                return " ".join(parts)[:max_chars]
-            except Exception:
-                return ""
-        if ext == ".ods":
-            try:
-                from odf.opendocument import load
-                from odf import text as odf_text, teletype
-                doc = load(path)
-                parts = [teletype.extractText(el) for el in doc.getElementsByType(odf_text.P)]
-                return " ".join(parts)[:max_chars]
-            except Exception:
-                return ""
-        if ext == ".odp":
-            try:
-                from odf.opendocument import load
-                from odf import text as odf_text, teletype
-                doc = load(path)
-                parts = [teletype.extractText(el) for el in doc.getElementsByType(odf_text.P)]
-                return " ".join(parts)[:max_chars]
-            except Exception:
-                return ""
-        if ext in (".xlsx", ".xls", ".xlsm"):
-            import pandas as pd
-            df = pd.read_excel(path, nrows=20, header=None)
-            return " ".join(df.astype(str).stack().tolist())[:max_chars]
-        if ext == ".xlsb":
-            try:
-                import pandas as pd
-                df = pd.read_excel(path, engine="pyxlsb", nrows=20, header=None)
-                return " ".join(df.astype(str).stack().tolist())[:max_chars]
-            except Exception:
-                return ""
-        if ext == ".pptx":
-            try:
-                with zipfile.ZipFile(path, "r") as z:
-                    parts = []
-                    for name in z.namelist():
-                        if name.startswith("ppt/slides/slide") and name.endswith(".xml"):
-                            data = z.read(name).decode("utf-8", errors="replace")
-                            import re
-                            parts.append(re.sub(r"<[^>]+>", " ", data))
-                    return " ".join(parts)[:max_chars]
-            except Exception:
-                return ""
+        if ext in SPREADSHEET_EXTENSIONS:
+            # .xls/.xlsb: streaming row readers across all sheets, stops at max_chars (no pandas)
+            return read_spreadsheet_sample(path, ext, max_chars)
+        if ext in COLUMNAR_EXTENSIONS:
+            # Parquet/Arrow/ORC: column names + values from the first row group only (never the whole file)
+            return read_columnar_sample(path, ext, max_chars)
         if ext == ".msg":
             try:
                 import extract_msg
-                msg = extract_msg.Message(path)
+                msg = extract_msg.Message(path if isinstance(path, (str, Path)) else path.read())
                 body = (msg.body or "") + " " + (msg.subject or "")
                 for att in (msg.attachments or [])[:3]:
                     body += " " + (getattr(att, "longFilename", "") or "")
@@ -128,9 +185,9 @@ def _read_text_sample(path: Path, ext: str, max_chars: int = 10000) -> str:
                 return body[:max_chars]
             except Exception:
                 return ""
-        if ext in (".eml", ".mht", ".mhtml"):
-            with open(path, "r", encoding="utf-8", errors="replace") as f:
-                return f.read(max_chars)
+        if ext in MAIL_EXTENSIONS:
+            # Raw message/mailbox text; parsed per message by _scan_mail_file when scan_mailboxes is set
+            return _read_plain_text(path, max_chars)
         # .sqlite, .db, .accdb, .mdb: path/name only for text; SQLite files scanned as DB in run() when scan_sqlite_as_db
         return ""
     except Exception:
@@ -194,6 +251,285 @@ def _scan_sqlite_file_as_db(
     return findings
 
 
+def _scan_tabular_file_as_table(
+    source: Source,
+    ext: str,
+    scanner: Any,
+    sample_limit: int = 5,
+    file_name: str | None = None,
+) -> list[dict[str, Any]] | None:
+    """
+    Scan a CSV/TSV/workbook like a DB table: header names plus up to sample_limit values per column go
+    through the detector in one scanner.scan_columns batch per table (scan_column per column when the
+    scanner has no scan_columns). Returns findings (dicts for save_finding source_type=filesystem) with
+    file_name "file | column" (workbooks: "file | sheet.column"; SQL dumps: "file | table.column"; JSON:
+    "file | key.path"; Parquet/Arrow/ORC via file_scan.columnar), or None when no header could be parsed
+    so the caller can fall back to the text sample scan. No raw content stored.
+    """
+    if file_name is None:
+        file_name = Path(source).name if isinstance(source, (str, Path)) else ""
+    parent = str(Path(source).parent) if isinstance(source, (str, Path)) else ""
+    tables = sample_table_columns(source, ext, sample_limit)
+    if not tables:
+        return None
+    findings = []
+    scan_columns = getattr(scanner, "scan_columns", None)
+    for table, columns, samples in tables:
+        pairs = [(cname, " ".join(values)) for cname, values in zip(columns, samples)]
+        results = scan_columns(pairs) if scan_columns is not None else [scanner.scan_column(*pair) for pair in pairs]
+        for (cname, _sample), res in zip(pairs, results):
+            if res["sensitivity_level"] == "LOW":
+                continue
+            label = f"{table}.{cname}" if table else cname
+            findings.append({
+                "path": parent,
+                "file_name": f"{file_name} | {label}",
+                "data_type": ext.replace(".", "").upper(),
+                "sensitivity_level": res["sensitivity_level"],
+                "pattern_detected": res["pattern_detected"],
+                "norm_tag": res.get("norm_tag", ""),
+                "ml_confidence": res.get("ml_confidence", 0),
+            })
+    return findings
+
+
+def _scan_compressed_file(
+    source: Source,
+    ext: str,
+    scanner: Any,
+    sample_limit: int = 5,
+    file_name: str | None = None,
+    scan_tabular_as_table: bool = True,
+    max_bytes: int = DEFAULT_ARCHIVE_LIMITS["max_member_bytes"],
+) -> list[dict[str, Any]]:
+    """
+    Scan a .gz/.bz2/.xz/.zst file through the extractor of its inner extension (app.log.3.gz -> .log).
+    Text and CSV are decompressed lazily, only as far as the sampling budget needs; formats that need
+    random access (PDF, office, workbooks) are decompressed in memory up to max_bytes, else name-only.
+    Findings keep the compressed file name (tabular: "export.csv.xz | column").
+    """
+    if file_name is None:
+        file_name = Path(source).name if isinstance(source, (str, Path)) else ""
+    parent = str(Path(source).parent) if isinstance(source, (str, Path)) else ""
+    inner_ext = inner_extension(file_name)
+
+    def _inner() -> BinaryIO:
+        if not isinstance(source, (str, Path)):
+            source.seek(0)
+        if inner_ext in _STREAMABLE_EXTENSIONS:
+            return open_decompressed(source, ext)
+        data = read_decompressed(source, ext, max_bytes)
+        return io.BytesIO(data or b"")
+
+    content = ""
+    try:
+        if scan_tabular_as_table and inner_ext in TABULAR_EXTENSIONS:
+            with _inner() as stream:
+                tabular = _scan_tabular_file_as_table(stream, inner_ext, scanner, sample_limit, file_name=file_name)
+            if tabular is not None:
+                for finding in tabular:
+                    finding["path"] = parent
+                return tabular
+        with _inner() as stream:
+            content = _read_text_sample(stream, inner_ext)
+    except (ValueError, *DECOMPRESSION_ERRORS):
+        content = ""
+    res = scanner.scan_file_content(content, file_name)
+    if res is None:
+        return []
+    return [{
+        "path": parent,
+        "file_name": file_name,
+        "data_type": inner_ext.replace(".", "").upper(),
+        "sensitivity_level": res["sensitivity_level"],
+        "pattern_detected": res["pattern_detected"],
+        "norm_tag": res.get("norm_tag", ""),
+        "ml_confidence": res.get("ml_confidence", 0),
+    }]
+
+
+def _scan_sqlite_bytes(data: bytes, ext: str, display: str, scanner: Any, sample_limit: int = 5) -> list[dict[str, Any]]:
+    """Open an in-memory SQLite file as a DB; SQLite needs a path, so this is the one case using a temp file."""
+    fd, temp_path = tempfile.mkstemp(suffix=ext)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        findings = _scan_sqlite_file_as_db(Path(temp_path), scanner, sample_limit)
+    finally:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+    temp_name = Path(temp_path).name
+    for finding in findings:
+        finding["file_name"] = display + finding["file_name"][len(temp_name):]
+    return findings
+
+
+def _scan_file_bytes(
+    data: bytes | BinaryIO,
+    ext: str,
+    display: str,
+    scanner: Any,
+    sample_limit: int = 5,
+    scan_tabular_as_table: bool = True,
+    parent: str = "",
+    content_name: str = "",
+    archive_limits: dict[str, int] | None = None,
+    mail_limits: dict[str, int] | None = None,
+    skipped: list[str] | None = None,
+    scan_sqlite_as_db: bool = False,
+) -> list[dict[str, Any]]:
+    """
+    Scan a file held in memory (archive member, mail attachment, remote share file) through the same
+    extractors as plain files; data is bytes or a seekable binary file object. Findings are named display
+    (tabular: "display | column"). Archives are opened only when archive_limits is given, mail files parsed
+    only when mail_limits is given (else scanned as text). SQLite files are opened as DBs only with
+    scan_sqlite_as_db (through a temp file); otherwise name-only analysis.
+    """
+
+    def _buffer() -> BinaryIO:
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            return io.BytesIO(data)
+        data.seek(0)
+        return data
+
+    findings: list[dict[str, Any]] = []
+    if scan_sqlite_as_db and ext in FilesystemConnector.SQLITE_EXTENSIONS:
+        findings = _scan_sqlite_bytes(_buffer().read(), ext, display, scanner, sample_limit)
+    elif ext in COMPRESSED_EXTENSIONS:
+        findings = _scan_compressed_file(
+            _buffer(), ext, scanner, sample_limit, file_name=display, scan_tabular_as_table=scan_tabular_as_table,
+        )
+    elif archive_limits is not None and ext in ARCHIVE_EXTENSIONS:
+        findings = _scan_archive_file(
+            _buffer(), ext, scanner, sample_limit, file_name=display,
+            scan_tabular_as_table=scan_tabular_as_table, limits=archive_limits, skipped=skipped,
+        )
+    elif mail_limits is not None and ext in MAIL_EXTENSIONS:
+        findings = _scan_mail_file(
+            _buffer(), ext, scanner, sample_limit, file_name=display,
+            scan_tabular_as_table=scan_tabular_as_table, limits=mail_limits, skipped=skipped,
+        )
+    else:
+        tabular = None
+        if scan_tabular_as_table and ext in TABULAR_EXTENSIONS:
+            tabular = _scan_tabular_file_as_table(_buffer(), ext, scanner, sample_limit, file_name=display)
+        if tabular is not None:
+            findings = tabular
+        else:
+            res = scanner.scan_file_content(_read_text_sample(_buffer(), ext), content_name or display)
+            if res is None:
+                return []
+            findings = [{
+                "path": parent,
+                "file_name": display,
+                "data_type": ext.replace(".", "").upper(),
+                "sensitivity_level": res["sensitivity_level"],
+                "pattern_detected": res["pattern_detected"],
+                "norm_tag": res.get("norm_tag", ""),
+                "ml_confidence": res.get("ml_confidence", 0),
+            }]
+    for finding in findings:
+        finding["path"] = parent
+    return findings
+
+
+def _scan_archive_file(
+    source: Source,
+    ext: str,
+    scanner: Any,
+    sample_limit: int = 5,
+    file_name: str | None = None,
+    scan_tabular_as_table: bool = True,
+    limits: dict[str, int] | None = None,
+    skipped: list[str] | None = None,
+    mail_limits: dict[str, int] | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Scan the members of a zip/tar archive (recursively, within limits) in memory through the same
+    extractors as plain files. Findings (dicts for save_finding source_type=filesystem) are named
+    "archive.zip!/inner/path.csv" (tabular members: "archive.zip!/inner/path.csv | column"; mail members,
+    with mail_limits: "archive.zip!/inbox.mbox | <message-id>").
+    Limit hits and unreadable archives are appended to skipped. No member is written to disk.
+    """
+    if file_name is None:
+        file_name = Path(source).name if isinstance(source, (str, Path)) else ""
+    parent = str(Path(source).parent) if isinstance(source, (str, Path)) else ""
+    findings: list[dict[str, Any]] = []
+    skipped = skipped if skipped is not None else []
+    try:
+        for member_name, data in iter_archive_members(source, ext, limits, skipped):
+            member_ext = Path(member_name).suffix.lower()
+            if member_ext not in SUPPORTED_EXTENSIONS:
+                continue
+            # Nested archives were already expanded by iter_archive_members
+            findings.extend(_scan_file_bytes(
+                data, member_ext, f"{file_name}{MEMBER_SEPARATOR}{member_name}", scanner, sample_limit,
+                scan_tabular_as_table=scan_tabular_as_table, parent=parent, content_name=member_name,
+                mail_limits=mail_limits, skipped=skipped,
+            ))
+    except (zipfile.BadZipFile, tarfile.TarError, EOFError, OSError) as e:
+        skipped.append(f"unreadable archive: {e}")
+    return findings
+
+
+def _scan_mail_file(
+    source: Source,
+    ext: str,
+    scanner: Any,
+    sample_limit: int = 5,
+    file_name: str | None = None,
+    scan_tabular_as_table: bool = True,
+    limits: dict[str, int] | None = None,
+    skipped: list[str] | None = None,
+    archive_limits: dict[str, int] | None = None,
+    open_message: Callable[[Path], AbstractContextManager[BinaryIO] | None] | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Scan a .eml/.mht/.mhtml message, an mbox file, or a Maildir directory (source = its path, ext =
+    MAILDIR_TYPE, message files opened with open_message when given) message by message, within limits (file_scan.mail). Headers and bodies go through
+    scanner.scan_file_content per message; attachments go through the regular extractors in memory
+    (archives only when archive_limits is given, within them). Findings are named "inbox.mbox | <message-id>" and
+    "inbox.mbox | <message-id>!/attachment.csv" (tabular: "... | column"). Limit hits go to skipped.
+    """
+    if file_name is None:
+        file_name = Path(source).name if isinstance(source, (str, Path)) else ""
+    parent = str(Path(source).parent) if isinstance(source, (str, Path)) else ""
+    findings: list[dict[str, Any]] = []
+    skipped = skipped if skipped is not None else []
+    if ext == MAILDIR_TYPE:
+        messages = iter_maildir_messages(Path(source), limits, skipped, open_message=open_message)
+    else:
+        messages = iter_mail_messages(source, ext, limits, skipped)
+    try:
+        for message_id, text, attachments in messages:
+            label = f"{file_name} | {message_id}"
+            res = scanner.scan_file_content(text, label)
+            if res is not None:
+                findings.append({
+                    "path": parent,
+                    "file_name": label,
+                    "data_type": ext.replace(".", "").upper(),
+                    "sensitivity_level": res["sensitivity_level"],
+                    "pattern_detected": res["pattern_detected"],
+                    "norm_tag": res.get("norm_tag", ""),
+                    "ml_confidence": res.get("ml_confidence", 0),
+                })
+            for name, data in attachments:
+                att_ext = archive_extension(name)
+                if att_ext not in SUPPORTED_EXTENSIONS:
+                    continue
+                findings.extend(_scan_file_bytes(
+                    data, att_ext, f"{label}{MEMBER_SEPARATOR}{name}", scanner, sample_limit,
+                    scan_tabular_as_table=scan_tabular_as_table, parent=parent, content_name=name,
+                    archive_limits=archive_limits, skipped=skipped,
+                ))
+    except (OSError, ValueError) as e:
+        skipped.append(f"unreadable mailbox: {e}")
+    return findings
+
+
 class FilesystemConnector:
     """
     Scan a directory recursively (or not), filter by extensions, check os.access(R_OK) before read,
@@ -210,12 +546,34 @@ class FilesystemConnector:
         extensions: set[str] | list[str] | None = None,
         scan_sqlite_as_db: bool = True,
         sample_limit: int = 5,
+        scan_tabular_as_table: bool = True,
+        scan_archives: bool = True,
+        archive_limits: dict[str, int] | None = None,
+        scan_mailboxes: bool = True,
+        mail_limits: dict[str, int] | None = None,
+        page_cache_hints: bool = False,
+        throttle: IOThrottle | None = None,
     ):
         self.config = target_config
+        self.throttle = throttle
         self.scanner = scanner
         self.db_manager = db_manager
         self.scan_sqlite_as_db = scan_sqlite_as_db
+        self.page_cache_hints = page_cache_hints
+        # PageCacheHints for the current run() when page_cache_hints is set
+        self._hints: PageCacheHints | None = None
+        self.scan_tabular_as_table = scan_tabular_as_table
+        self.scan_archives = scan_archives
+        self.archive_limits = archive_limits or dict(DEFAULT_ARCHIVE_LIMITS)
+        self.scan_mailboxes = scan_mailboxes
+        self.mail_limits = mail_limits or dict(DEFAULT_MAIL_LIMITS)
         self.sample_limit = sample_limit
+        # Inode dedupe for the current run(): (st_dev, st_ino) already classified, and the findings of those that
+        # had any (first file name, save_finding kwargs; memory follows findings, not files) so aliases are
+        # recorded without being read again
+        self._inodes = InodeSet()
+        self._inode_findings: dict[tuple[int, int], tuple[str, list[dict[str, Any]]]] = {}
+        self._captured: list[dict[str, Any]] | None = None
         # "*" or "all" in list => use full SUPPORTED_EXTENSIONS; else use provided list or default
         use_all = False
         if extensions:
@@ -224,6 +582,141 @@ class FilesystemConnector:
         self.extensions = SUPPORTED_EXTENSIONS if use_all else set(extensions or SUPPORTED_EXTENSIONS)
         # Normalize to lowercase with dot
         self.extensions = {e if e.startswith(".") else f".{e.lstrip('*')}" for e in self.extensions}
+        # Maildir messages have no extension: Maildirs are scanned along with .eml (or with "maildir" listed)
+        self.scan_maildirs = scan_mailboxes and bool(self.extensions & {".eml", f".{MAILDIR_TYPE}"})
+
+    def _save_findings(self, target_name: str, findings: list[dict[str, Any]], parent: str | None = None) -> None:
+        """Save finding dicts from _scan_sqlite_file_as_db / _scan_tabular_file_as_table / _scan_archive_file /
+        _scan_mail_file; parent overrides their path (set when they read an open file instead of a path)."""
+        for finding in findings:
+            self._save_finding(
+                target_name,
+                path=finding["path"] if parent is None else parent,
+                file_name=finding["file_name"],
+                data_type=finding["data_type"],
+                sensitivity_level=finding["sensitivity_level"],
+                pattern_detected=finding["pattern_detected"],
+                norm_tag=finding["norm_tag"],
+                ml_confidence=finding["ml_confidence"],
+            )
+
+    def _save_finding(self, target_name: str, **fields: Any) -> None:
+        """Save one filesystem finding (kept for aliases of the file being scanned) and log it."""
+        self.db_manager.save_finding(source_type="filesystem", target_name=target_name, **fields)
+        if self._captured is not None:
+            self._captured.append(fields)
+        try:
+            from utils.logger import log_finding
+            log_path = os.path.join(fields["path"], fields["file_name"]) if fields.get("path") else fields["file_name"]
+            log_finding("filesystem", target_name, log_path, fields["sensitivity_level"], fields["pattern_detected"])
+        except Exception:
+            pass
+
+    def _save_alias(self, target_name: str, file_path: Path, key: tuple[int, int]) -> None:
+        """Record file_path as a reference to an inode already classified: its findings under this path."""
+        first_name, findings = self._inode_findings.get(key, ("", []))
+        for fields in findings:
+            file_name = fields["file_name"]
+            if file_name.startswith(first_name):
+                file_name = file_path.name + file_name[len(first_name):]
+            self._save_finding(target_name, **{**fields, "path": str(file_path.parent), "file_name": file_name})
+
+    def _scan_mailbox(self, target_name: str, file_path: Path, ext: str, source: Source | None = None) -> None:
+        """Scan a mail file or Maildir per message; limit hits are saved as mail_limit failures."""
+        skipped: list[str] = []
+        self._save_findings(target_name, _scan_mail_file(
+            file_path if source is None else source, ext, self.scanner, self.sample_limit, file_name=file_path.name,
+            scan_tabular_as_table=self.scan_tabular_as_table, limits=self.mail_limits, skipped=skipped,
+            archive_limits=self.archive_limits if self.scan_archives else None,
+            open_message=self._open_maildir_message if ext == MAILDIR_TYPE else None,
+        ), parent=str(file_path.parent))
+        if skipped:
+            self.db_manager.save_failure(target_name, "mail_limit", f"{file_path}: {'; '.join(skipped)}")
+
+    def _open_maildir_message(self, path: Path) -> AbstractContextManager[BinaryIO] | None:
+        """Open a Maildir message like any scanned file (inode set, throttle); None when its inode was already seen."""
+        st = path.stat()
+        if not self._inodes.add(st.st_dev, st.st_ino):
+            return None
+        return self._throttled_open(path)
+
+    @contextlib.contextmanager
+    def _throttled_open(self, path: Path) -> Iterator[BinaryIO]:
+        with contextlib.ExitStack() as stack:
+            if self.throttle is not None:
+                self.throttle.file()
+            source: BinaryIO = stack.enter_context(open(path, "rb"))
+            if self.throttle is not None:
+                source = stack.enter_context(self.throttle.wrap(source))
+            yield source
+
+    def _scan_file(self, target_name: str, file_path: Path, ext: str) -> None:
+        """
+        Scan one readable file; with page_cache_hints, every extractor reads the same O_NOATIME handle, and
+        with a throttle, reads go through it.
+        """
+        with contextlib.ExitStack() as stack:
+            source: Source = file_path
+            try:
+                if self._hints is not None:
+                    source = stack.enter_context(self._hints.open(file_path))
+                if self.throttle is not None:
+                    self.throttle.file()
+                    if isinstance(source, Path):
+                        source = stack.enter_context(open(file_path, "rb"))
+                    source = stack.enter_context(self.throttle.wrap(source))
+            except PermissionError:
+                self.db_manager.save_failure(target_name, "permission_denied", str(file_path))
+                return
+            except OSError:
+                # Removed or replaced while walking
+                return
+            parent = str(file_path.parent)
+            if self.scan_archives and ext in ARCHIVE_EXTENSIONS:
+                skipped: list[str] = []
+                self._save_findings(target_name, _scan_archive_file(
+                    source, ext, self.scanner, self.sample_limit, file_name=file_path.name,
+                    scan_tabular_as_table=self.scan_tabular_as_table, limits=self.archive_limits, skipped=skipped,
+                    mail_limits=self.mail_limits if self.scan_mailboxes else None,
+                ), parent=parent)
+                if skipped:
+                    self.db_manager.save_failure(target_name, "archive_limit", f"{file_path}: {'; '.join(skipped)}")
+                return
+            if self.scan_mailboxes and ext in MAIL_EXTENSIONS:
+                self._scan_mailbox(target_name, file_path, ext, source)
+                return
+            if ext in COMPRESSED_EXTENSIONS:
+                self._save_findings(target_name, _scan_compressed_file(
+                    source, ext, self.scanner, self.sample_limit, file_name=file_path.name,
+                    scan_tabular_as_table=self.scan_tabular_as_table,
+                ), parent=parent)
+                return
+            # 2.6: treat .sqlite/.sqlite3/.db as DBs when scan_sqlite_as_db is True (SQLite opens the path itself)
+            if self.scan_sqlite_as_db and ext in self.SQLITE_EXTENSIONS:
+                self._save_findings(target_name, _scan_sqlite_file_as_db(file_path, self.scanner, self.sample_limit))
+                return
+            # Tabular files: per-column findings like a DB table; fall back to the text scan when unparsable
+            if self.scan_tabular_as_table and ext in TABULAR_EXTENSIONS:
+                tabular = _scan_tabular_file_as_table(source, ext, self.scanner, self.sample_limit, file_name=file_path.name)
+                if tabular is not None:
+                    self._save_findings(target_name, tabular, parent=parent)
+                    return
+                if not isinstance(source, Path):
+                    source.seek(0)
+            content = _read_text_sample(source, ext)
+        res = self.scanner.scan_file_content(content, file_path)
+        if res is None:
+            return
+        self._save_finding(
+            target_name,
+            path=str(file_path.parent),
+            file_name=file_path.name,
+            data_type=file_path.suffix.replace(".", "").upper(),
+            sensitivity_level=res["sensitivity_level"],
+            pattern_detected=res["pattern_detected"],
+            norm_tag=res.get("norm_tag", ""),
+            ml_confidence=res.get("ml_confidence", 0),
+        )
 
     def run(self) -> None:
         """Walk target path, check permission, read sample, detect, save_finding or save_failure."""
@@ -242,56 +735,50 @@ class FilesystemConnector:
             log_connection(target_name, "filesystem", str(path))
         except Exception:
             pass
-        pattern = "**/*" if recursive else "*"
-        for file_path in path.glob(pattern):
-            if not file_path.is_file():
+        follow_symlinks = bool(self.config.get("follow_symlinks", True))
+        self._hints = PageCacheHints() if self.page_cache_hints else None
+        self._inodes = InodeSet()
+        self._inode_findings = {}
+        try:
+            self._walk(target_name, path, recursive, follow_symlinks)
+        finally:
+            self._inode_findings = {}
+            if self._hints is not None:
+                self._hints.close()
+                self._hints = None
+
+    def _walk(self, target_name: str, path: Path, recursive: bool, follow_symlinks: bool = True) -> None:
+        """
+        Scan each file under path that matches the extensions (each Maildir once, as one mailbox; each inode
+        once, later hardlinks/symlinks recorded as aliases).
+        """
+        maildirs: set[Path] = set()
+        for file_path, st in iter_files(path, recursive=recursive, follow_symlinks=follow_symlinks):
+            # Maildir messages have no extension: scan each Maildir once, as one mailbox
+            maildir = maildir_root(file_path) if self.scan_maildirs and recursive else None
+            if maildir is not None:
+                if maildir not in maildirs:
+                    maildirs.add(maildir)
+                    self._scan_mailbox(target_name, maildir, MAILDIR_TYPE)
                 continue
-            if file_path.suffix.lower() not in self.extensions:
+            # Compound tar suffixes (.tar.gz) match as a whole or by their last suffix
+            ext = archive_extension(file_path.name)
+            if ext not in self.extensions and file_path.suffix.lower() not in self.extensions:
+                continue
+            key = (st.st_dev, st.st_ino)
+            if not self._inodes.add(*key):
+                self._save_alias(target_name, file_path, key)
                 continue
             if not os.access(file_path, os.R_OK):
                 self.db_manager.save_failure(target_name, "permission_denied", str(file_path))
                 continue
-            ext = file_path.suffix.lower()
-            # 2.6: treat .sqlite/.sqlite3/.db as DBs when scan_sqlite_as_db is True
-            if self.scan_sqlite_as_db and ext in self.SQLITE_EXTENSIONS:
-                for finding in _scan_sqlite_file_as_db(file_path, self.scanner, self.sample_limit):
-                    self.db_manager.save_finding(
-                        source_type="filesystem",
-                        target_name=target_name,
-                        path=finding["path"],
-                        file_name=finding["file_name"],
-                        data_type=finding["data_type"],
-                        sensitivity_level=finding["sensitivity_level"],
-                        pattern_detected=finding["pattern_detected"],
-                        norm_tag=finding["norm_tag"],
-                        ml_confidence=finding["ml_confidence"],
-                    )
-                    try:
-                        from utils.logger import log_finding
-                        log_finding("filesystem", target_name, finding["file_name"], finding["sensitivity_level"], finding["pattern_detected"])
-                    except Exception:
-                        pass
-                continue
-            content = _read_text_sample(file_path, ext)
-            res = self.scanner.scan_file_content(content, file_path)
-            if res is None:
-                continue
-            self.db_manager.save_finding(
-                source_type="filesystem",
-                target_name=target_name,
-                path=str(file_path.parent),
-                file_name=file_path.name,
-                data_type=file_path.suffix.replace(".", "").upper(),
-                sensitivity_level=res["sensitivity_level"],
-                pattern_detected=res["pattern_detected"],
-                norm_tag=res.get("norm_tag", ""),
-                ml_confidence=res.get("ml_confidence", 0),
-            )
+            self._captured = []
             try:
-                from utils.logger import log_finding
-                log_finding("filesystem", target_name, str(file_path), res["sensitivity_level"], res["pattern_detected"])
-            except Exception:
-                pass
+                self._scan_file(target_name, file_path, ext)
+            finally:
+                if self._captured:
+                    self._inode_findings[key] = (file_path.name, self._captured)
+                self._captured = None
 
 
 register("filesystem", FilesystemConnector, ["name", "type", "path"])
@@ -0,0 +1,261 @@
+"""
+Git connector: scan every blob ever committed in a local repository (bare or with a working tree)
+straight from the object database, so secrets and personal data removed from the working tree but
+still in history are found. Requires the git command line (no checkout, no extra Python dependency).
+
+History is walked once with "git log --all --raw" (all refs, merges diffed against their first parent)
+and each blob SHA is scanned exactly once, the first time it shows up (newest commit first); its findings
+are kept by SHA and saved again under every later path@commit holding the same content (no read or
+detection). Blob content is streamed from "git cat-file --batch"; sizes are checked first with --batch-check so blobs
+over max_blob_bytes are never read (they are listed in a blob_limit scan failure). Blobs go through the
+filesystem extractors in memory (connectors.filesystem_connector._scan_file_bytes) and findings are named
+"path@commit" (tabular: "path@commit | column").
+
+Config: path (repository), optional refs (list; default all refs), max_blob_bytes (default 32 MiB),
+git_binary (default "git").
+"""
+import subprocess
+import tempfile
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+from core.connector_registry import register
+
+from connectors.filesystem_connector import SUPPORTED_EXTENSIONS, _scan_file_bytes
+from file_scan.archive import DEFAULT_ARCHIVE_LIMITS, archive_extension
+
+DEFAULT_MAX_BLOB_BYTES = 32 * 1024 * 1024
+
+# Short commit id in finding names (path@commit)
+_COMMIT_CHARS = 12
+_READ_CHUNK = 64 * 1024
+# Regular files only: symlinks (120000) and submodules (160000) have no scannable content
+_FILE_MODES = {b"100644", b"100755", b"100664"}
+
+
+def _normalize_extensions(extensions: Any) -> set[str]:
+    if not extensions:
+        return set(SUPPORTED_EXTENSIONS)
+    exts = list(extensions) if isinstance(extensions, (list, set)) else [extensions]
+    use_all = any(str(x).strip().lower() in ("*", "all", ".*") for x in exts)
+    if use_all:
+        return set(SUPPORTED_EXTENSIONS)
+    return {e if e.startswith(".") else f".{e.lstrip('*')}" for e in exts}
+
+
+def iter_history_blobs(
+    repo: str | Path,
+    refs: list[str] | None = None,
+    git_binary: str = "git",
+) -> Iterator[tuple[str, str, str]]:
+    """
+    Yield (blob_sha, path, commit_sha) for each blob added or modified in the history of refs (default
+    --all), newest commit first. The same blob may be yielded again for other paths/commits; callers
+    dedupe by blob SHA. Output of git log is parsed as it streams (NUL-separated, no quoting issues).
+    """
+    cmd = [
+        git_binary, "-C", str(repo), "log", *(refs or ["--all"]), "-z", "--raw", "--no-abbrev", "--no-renames",
+        "--diff-merges=first-parent", "--format=%H", "--",
+    ]
+    # stderr to a temp file: a pipe read only after stdout is drained can fill up and block git
+    errors = tempfile.TemporaryFile()
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=errors)
+    try:
+        commit = ""
+        meta: bytes | None = None
+        pending = b""
+        while True:
+            chunk = proc.stdout.read(_READ_CHUNK)
+            tokens = (pending + chunk).split(b"\0")
+            pending = tokens.pop() if chunk else b""
+            for token in tokens:
+                if meta is not None:
+                    # ":old_mode new_mode old_sha new_sha status" followed by the path token
+                    fields = meta[1:].split(b" ")
+                    meta = None
+                    if len(fields) == 5 and fields[1] in _FILE_MODES and fields[4][:1] in (b"A", b"M", b"T"):
+                        yield fields[3].decode(), token.decode("utf-8", errors="replace"), commit
+                    continue
+                token = token.lstrip(b"\n")
+                if token.startswith(b":"):
+                    meta = token
+                elif token:
+                    commit = token.decode()
+            if not chunk:
+                break
+    finally:
+        proc.stdout.close()
+        returncode = proc.wait()
+        errors.seek(0)
+        stderr = errors.read().decode("utf-8", errors="replace").strip()
+        errors.close()
+    if returncode != 0:
+        raise RuntimeError(stderr or f"git log exited with {returncode}")
+
+
+class _BlobReader:
+    """Long-running git cat-file --batch-check / --batch pair: size first, content only when small enough."""
+
+    def __init__(self, repo: str | Path, git_binary: str = "git"):
+        base = [git_binary, "-C", str(repo), "cat-file"]
+        self._check = subprocess.Popen([*base, "--batch-check"], stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        self._batch = subprocess.Popen([*base, "--batch"], stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+
+    def size(self, sha: str) -> int | None:
+        self._check.stdin.write(f"{sha}\n".encode())
+        self._check.stdin.flush()
+        fields = self._check.stdout.readline().split()
+        if len(fields) != 3 or fields[1] != b"blob":
+            return None
+        return int(fields[2])
+
+    def read(self, sha: str) -> bytes | None:
+        self._batch.stdin.write(f"{sha}\n".encode())
+        self._batch.stdin.flush()
+        fields = self._batch.stdout.readline().split()
+        if len(fields) != 3:
+            return None
+        size = int(fields[2])
+        data = self._batch.stdout.read(size)
+        # Trailing newline after the content
+        self._batch.stdout.read(1)
+        return data
+
+    def close(self) -> None:
+        for proc in (self._check, self._batch):
+            try:
+                proc.stdin.close()
+                proc.stdout.close()
+                proc.wait(timeout=10)
+            except Exception:
+                proc.kill()
+
+
+class GitConnector:
+    """
+    Scan the unique blobs of a local git repository across all refs (or configured refs). Each blob is
+    read once from the object database and scanned like a file of the same extension; findings are saved
+    as filesystem findings named "path@commit" with path = repository, for every path@commit of the blob.
+    """
+
+    def __init__(
+        self,
+        target_config: dict[str, Any],
+        scanner: Any,
+        db_manager: Any,
+        extensions: set[str] | list[str] | None = None,
+        sample_limit: int = 5,
+        scan_tabular_as_table: bool = True,
+        scan_archives: bool = True,
+        archive_limits: dict[str, int] | None = None,
+        scan_mailboxes: bool = True,
+        mail_limits: dict[str, int] | None = None,
+    ):
+        self.config = target_config
+        self.scanner = scanner
+        self.db_manager = db_manager
+        self.extensions = _normalize_extensions(extensions)
+        self.sample_limit = sample_limit
+        self.scan_tabular_as_table = scan_tabular_as_table
+        self.archive_limits = (archive_limits or dict(DEFAULT_ARCHIVE_LIMITS)) if scan_archives else None
+        self.mail_limits = mail_limits if scan_mailboxes else None
+        self.git_binary = self.config.get("git_binary", "git")
+        try:
+            self.max_blob_bytes = int(self.config.get("max_blob_bytes", DEFAULT_MAX_BLOB_BYTES))
+        except (TypeError, ValueError):
+            self.max_blob_bytes = DEFAULT_MAX_BLOB_BYTES
+        # Blob SHAs already scanned in this run (the dedup key), and the findings of those that had any
+        # (first path@commit, finding dicts) so later paths/commits of the same blob are saved without a rescan
+        self.scanned_blobs: set[str] = set()
+        self._blob_findings: dict[str, tuple[str, list[dict[str, Any]]]] = {}
+
+    def run(self) -> None:
+        target_name = self.config.get("name", "git")
+        repo = (self.config.get("path", "") or "").strip()
+        refs = self.config.get("refs") or None
+        if isinstance(refs, str):
+            refs = [refs]
+        if not repo or not Path(repo).is_dir():
+            self.db_manager.save_failure(target_name, "unreachable", f"Repository path does not exist: {repo}")
+            return
+        try:
+            from utils.logger import log_connection
+            log_connection(target_name, "git", repo)
+        except Exception:
+            pass
+        try:
+            reader = _BlobReader(repo, self.git_binary)
+        except OSError as e:
+            self.db_manager.save_failure(target_name, "error", f"git not available: {e}")
+            return
+        skipped: list[str] = []
+        oversized: list[str] = []
+        try:
+            for sha, file_path, commit in iter_history_blobs(repo, refs, self.git_binary):
+                ext = archive_extension(file_path)
+                if ext not in self.extensions and Path(file_path).suffix.lower() not in self.extensions:
+                    continue
+                display = f"{file_path}@{commit[:_COMMIT_CHARS]}"
+                if sha in self.scanned_blobs:
+                    self._save_alias(target_name, repo, sha, display)
+                    continue
+                self.scanned_blobs.add(sha)
+                size = reader.size(sha)
+                if size is None:
+                    continue
+                if size > self.max_blob_bytes:
+                    oversized.append(f"{display} ({size} bytes)")
+                    continue
+                data = reader.read(sha)
+                if data is None:
+                    continue
+                findings = _scan_file_bytes(
+                    data, ext, display, self.scanner, self.sample_limit,
+                    scan_tabular_as_table=self.scan_tabular_as_table, parent=repo, content_name=file_path,
+                    archive_limits=self.archive_limits, mail_limits=self.mail_limits, skipped=skipped,
+                )
+                if findings:
+                    self._blob_findings[sha] = (display, findings)
+                self._save_findings(target_name, repo, findings)
+        except (OSError, RuntimeError) as e:
+            self.db_manager.save_failure(target_name, "error", f"git history scan failed: {e}")
+        finally:
+            reader.close()
+        if oversized:
+            self.db_manager.save_failure(
+                target_name, "blob_limit",
+                f"{repo}: {len(oversized)} blob(s) larger than max_blob_bytes ({self.max_blob_bytes}): "
+                + "; ".join(oversized[:50]),
+            )
+        if skipped:
+            self.db_manager.save_failure(target_name, "archive_limit", f"{repo}: {'; '.join(skipped[:50])}")
+
+    def _save_alias(self, target_name: str, repo: str, sha: str, display: str) -> None:
+        """Save the findings of a blob already scanned under another path@commit (display)."""
+        first_display, findings = self._blob_findings.get(sha, ("", []))
+        self._save_findings(target_name, repo, [
+            {**finding, "file_name": display + finding["file_name"][len(first_display):]} for finding in findings
+        ])
+
+    def _save_findings(self, target_name: str, repo: str, findings: list[dict[str, Any]]) -> None:
+        for finding in findings:
+            self.db_manager.save_finding(
+                "filesystem",
+                target_name=target_name,
+                path=repo,
+                file_name=finding["file_name"],
+                data_type=finding["data_type"],
+                sensitivity_level=finding["sensitivity_level"],
+                pattern_detected=finding["pattern_detected"],
+                norm_tag=finding["norm_tag"],
+                ml_confidence=finding["ml_confidence"],
+            )
+            try:
+                from utils.logger import log_finding
+                log_finding("filesystem", target_name, finding["file_name"], finding["sensitivity_level"], finding["pattern_detected"])
+            except Exception:
+                pass
+
+
+register("git", GitConnector, ["name", "path"])
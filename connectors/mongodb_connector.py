@@ -2,22 +2,118 @@
 Optional MongoDB connector: connect, list collections, sample documents, run detector, save_finding.
 Register as type 'mongodb'. Install: pip install pymongo
 Config target: type: database, driver: mongodb, host, port, database (and optional user/pass).
+
+Each collection is read with two aggregations: a $sample whose $project keeps only field names and
+BSON types (nested documents and arrays of documents down to max_depth), then a $sample of
+sample_limit documents projecting just the sampled field paths, one flat output field per path.
+Collections run concurrently (concurrency, default 4); the samples of a collection go through the
+detector in one batch. Findings are per field path (address.city, contacts.email).
 """
+from datetime import datetime
 from typing import Any
 from urllib.parse import quote
 
 try:
     from pymongo import MongoClient
+    from pymongo.errors import AutoReconnect
     _MONGO_AVAILABLE = True
 except ImportError:
     _MONGO_AVAILABLE = False
     MongoClient = None
+    AutoReconnect = None
 
 from core.connector_registry import register
+from core.fetch_pool import pool_from_config
+
+# Documents read by the schema pass (names and types only); more than sample_limit so sparse fields are seen
+DEFAULT_SCHEMA_SAMPLE_SIZE = 100
+DEFAULT_MAX_DEPTH = 4
+
+# BSON types ($type names) whose values are sampled; other leaves (objectId, bool, binData, ...) by name only
+_SAMPLED_TYPES = frozenset({"string", "int", "long", "double", "decimal", "date", "array"})
+
+
+def _fields_expr(value: Any, depth: int) -> dict[str, Any]:
+    """
+    Aggregation expression listing the fields of the document value as {k, t, c}: name, $type and
+    (depth permitting) the fields of a nested document or of the first element of an array of documents.
+    """
+    var = f"f{depth}"
+    field_value = f"$${var}.v"
+    entry: dict[str, Any] = {"k": f"$${var}.k", "t": {"$type": field_value}}
+    if depth > 1:
+        first = {"$cond": [{"$isArray": field_value}, {"$arrayElemAt": [field_value, 0]}, field_value]}
+        entry["c"] = {"$cond": [{"$eq": [{"$type": first}, "object"]}, _fields_expr(first, depth - 1), []]}
+    return {"$map": {"input": {"$objectToArray": value}, "as": var, "in": entry}}
+
+
+def _bson_type(value: Any) -> str:
+    """$type name of a decoded value, for the schema fallback on full documents."""
+    if isinstance(value, bool):
+        return "bool"
+    if isinstance(value, int):
+        return "long" if abs(value) >= 2**31 else "int"
+    if isinstance(value, float):
+        return "double"
+    if isinstance(value, str):
+        return "string"
+    if isinstance(value, dict):
+        return "object"
+    if isinstance(value, (list, tuple)):
+        return "array"
+    if isinstance(value, datetime):
+        return "date"
+    if value is None:
+        return "null"
+    return type(value).__name__
+
+
+def _fields_from_document(doc: dict[str, Any], depth: int) -> list[dict[str, Any]]:
+    """The {k, t, c} listing of _fields_expr, computed client-side from a full document."""
+    out = []
+    for key, value in doc.items():
+        entry: dict[str, Any] = {"k": key, "t": _bson_type(value)}
+        first = value[0] if isinstance(value, (list, tuple)) and value else value
+        entry["c"] = _fields_from_document(first, depth - 1) if depth > 1 and isinstance(first, dict) else []
+        out.append(entry)
+    return out
+
+
+def _collect_paths(fields: list[dict[str, Any]], paths: dict[str, str], prefix: str = "") -> None:
+    """
+    Add the dotted leaf paths of a {k, t, c} listing to paths (path -> BSON type; a sampled type wins over null, bool, ...).
+    Arrays of documents continue into their fields: contacts.email reads every element's email.
+    """
+    for field in fields or []:
+        key = str(field.get("k") or "")
+        # _id and internal fields are skipped as before; "$"/"." cannot appear in a field path expression
+        if not key or (not prefix and key.startswith("_")) or key.startswith("$") or "." in key:
+            continue
+        path = f"{prefix}{key}"
+        children = field.get("c") or []
+        if children:
+            _collect_paths(children, paths, prefix=f"{path}.")
+        else:
+            kind = str(field.get("t") or "")
+            if path not in paths or (paths[path] not in _SAMPLED_TYPES and kind in _SAMPLED_TYPES):
+                paths[path] = kind
+
+
+def _flatten_values(value: Any, out: list[str], limit: int) -> None:
+    """Append scalar values (arrays flattened, None skipped) as strings until out holds limit entries."""
+    if len(out) >= limit or value is None:
+        return
+    if isinstance(value, (list, tuple)):
+        for item in value:
+            _flatten_values(item, out, limit)
+        return
+    if isinstance(value, dict):
+        return
+    out.append(str(value)[:200])
 
 
 class MongoDBConnector:
-    """Scan MongoDB: list collections, sample docs, detect sensitive field names and sample values."""
+    """Scan MongoDB: list collections, sample docs, detect sensitive field paths and sample values."""
 
     def __init__(self, target_config: dict[str, Any], scanner: Any, db_manager: Any, sample_limit: int = 5):
         self.config = target_config
@@ -25,6 +121,8 @@ class MongoDBConnector:
         self.db_manager = db_manager
         self.sample_limit = sample_limit
         self._client = None
+        self.schema_sample_size = max(int(target_config.get("schema_sample_size") or DEFAULT_SCHEMA_SAMPLE_SIZE), 1)
+        self.max_depth = max(int(target_config.get("max_depth") or DEFAULT_MAX_DEPTH), 1)
 
     def connect(self) -> None:
         if not _MONGO_AVAILABLE:
@@ -52,6 +150,52 @@ class MongoDBConnector:
                 pass
             self._client = None
 
+    def _field_paths(self, coll: Any) -> dict[str, str]:
+        """
+        Leaf field paths of a collection and their BSON types, from a $sample of schema_sample_size
+        documents projected down to names and types. Servers that reject the projection expression
+        (or test doubles) get the same listing computed from full sampled documents.
+        """
+        paths: dict[str, str] = {}
+        try:
+            rows = coll.aggregate([
+                {"$sample": {"size": self.schema_sample_size}},
+                {"$project": {"_id": 0, "f": _fields_expr("$$ROOT", self.max_depth)}},
+            ])
+            for row in rows:
+                _collect_paths(row.get("f"), paths)
+        except Exception:
+            paths.clear()
+            for doc in coll.aggregate([{"$sample": {"size": self.schema_sample_size}}]):
+                _collect_paths(_fields_from_document(doc, self.max_depth), paths)
+        return paths
+
+    def _sample_collection(self, coll_name: str) -> list[tuple[str, str, str]]:
+        """
+        (path, type, sample) for each field path of the collection. Values come from one $sample of
+        sample_limit documents that projects only the sampled paths (flattened to p0, p1, ...), so
+        other fields and whole document payloads are never transferred.
+        """
+        coll = self._db[coll_name]
+        paths = self._field_paths(coll)
+        sampled = [path for path, kind in paths.items() if kind in _SAMPLED_TYPES]
+        values: dict[str, list[str]] = {path: [] for path in sampled}
+        if sampled:
+            projection: dict[str, Any] = {"_id": 0}
+            projection.update({f"p{i}": f"${path}" for i, path in enumerate(sampled)})
+            for doc in coll.aggregate([{"$sample": {"size": self.sample_limit}}, {"$project": projection}]):
+                for i, path in enumerate(sampled):
+                    _flatten_values(doc.get(f"p{i}"), values[path], self.sample_limit)
+        return [(path, kind, " ".join(values.get(path, []))) for path, kind in paths.items()]
+
+    def _scan(self, columns: list[tuple[str, str, str]]) -> list[dict[str, Any]]:
+        """Detector results for (path, type, sample) columns, in one batch when the scanner supports it."""
+        pairs = [(path, sample) for path, _kind, sample in columns]
+        scan_columns = getattr(self.scanner, "scan_columns", None)
+        if scan_columns is not None:
+            return scan_columns(pairs)
+        return [self.scanner.scan_column(path, sample) for path, sample in pairs]
+
     def run(self) -> None:
         target_name = self.config.get("name", "mongodb")
         try:
@@ -62,24 +206,14 @@ class MongoDBConnector:
         try:
             from utils.logger import log_connection
             log_connection(target_name, "mongodb", self.config.get("host", "localhost"))
-            for coll_name in self._db.list_collection_names():
-                coll = self._db[coll_name]
-                sample_docs = list(coll.find().limit(self.sample_limit))
-                if not sample_docs:
+            pool = pool_from_config(self.config)
+            pool.is_retryable = lambda e: AutoReconnect is not None and isinstance(e, AutoReconnect)
+            collections = self._db.list_collection_names()
+            for coll_name, columns, error in pool.map(collections, lambda _client, name: self._sample_collection(name)):
+                if error is not None:
+                    self.db_manager.save_failure(target_name, "error", f"{coll_name}: {error}")
                     continue
-                # Flatten keys from sample docs
-                all_keys = set()
-                sample_texts = []
-                for doc in sample_docs:
-                    for k, v in doc.items():
-                        if k.startswith("_"):
-                            continue
-                        all_keys.add(k)
-                        if v is not None:
-                            sample_texts.append(f"{k} {str(v)[:100]}")
-                combined = " ".join(sample_texts)
-                for key in all_keys:
-                    res = self.scanner.scan_column(key, combined)
+                for (path, kind, _sample), res in zip(columns, self._scan(columns)):
                     if res["sensitivity_level"] == "LOW":
                         continue
                     self.db_manager.save_finding(
@@ -89,8 +223,8 @@ class MongoDBConnector:
                         engine_details="mongodb",
                         schema_name="",
                         table_name=coll_name,
-                        column_name=key,
-                        data_type="document",
+                        column_name=path,
+                        data_type=kind or "document",
                         sensitivity_level=res["sensitivity_level"],
                         pattern_detected=res["pattern_detected"],
                         norm_tag=res.get("norm_tag", ""),
@@ -98,7 +232,7 @@ class MongoDBConnector:
                     )
                     try:
                         from utils.logger import log_finding
-                        log_finding("database", target_name, f"{coll_name}.{key}", res["sensitivity_level"], res["pattern_detected"])
+                        log_finding("database", target_name, f"{coll_name}.{path}", res["sensitivity_level"], res["pattern_detected"])
                     except Exception:
                         pass
         except Exception as e:
@@ -2,12 +2,14 @@
 NFS connector: scan an NFS share that is already mounted on the audit server.
 Config: host (FQDN or IP), export_path (for reporting), path (local mount point).
 No NFS client library required; the path must be a local directory (mount point).
-Uses the same file scan logic as the filesystem connector.
+Uses the same file scan logic as the filesystem connector (including page_cache_hints: O_NOATIME and
+posix_fadvise, so a nightly scan does not evict the file server's hot pages or touch atime).
 """
 from pathlib import Path
 from typing import Any
 
 from core.connector_registry import register
+from core.throttle import IOThrottle
 
 from connectors.filesystem_connector import FilesystemConnector
 
@@ -27,6 +29,13 @@ class NFSConnector:
         extensions: set[str] | list[str] | None = None,
         scan_sqlite_as_db: bool = True,
         sample_limit: int = 5,
+        scan_tabular_as_table: bool = True,
+        scan_archives: bool = True,
+        archive_limits: dict[str, int] | None = None,
+        scan_mailboxes: bool = True,
+        mail_limits: dict[str, int] | None = None,
+        page_cache_hints: bool = False,
+        throttle: IOThrottle | None = None,
     ):
         self.config = dict(target_config)
         self.scanner = scanner
@@ -38,6 +47,13 @@ class NFSConnector:
             extensions=extensions,
             scan_sqlite_as_db=scan_sqlite_as_db,
             sample_limit=sample_limit,
+            scan_tabular_as_table=scan_tabular_as_table,
+            scan_archives=scan_archives,
+            archive_limits=archive_limits,
+            scan_mailboxes=scan_mailboxes,
+            mail_limits=mail_limits,
+            page_cache_hints=page_cache_hints,
+            throttle=throttle,
         )
 
     def run(self) -> None:
@@ -1,13 +1,22 @@
 """
 Power BI connector: discover datasets and tables via Power BI REST API, sample with DAX,
 run sensitivity detection on column names and sample values. Uses Azure AD OAuth2
-(client credentials). Optional: register only when httpx is available.
+(client credentials); the token is cached across targets until it expires (core.token_cache).
+Several tables are sampled per executeQueries call (one EVALUATE each, dax_batch_size); datasets of a
+workspace are scanned concurrently (concurrency) under a request rate limit (requests_per_minute) with a
+shared backoff that honours Retry-After. Time per workspace is stored in the session metadata.
+Optional: register only when httpx is available.
 Target type: powerbi. Required: name, tenant_id, client_id, client_secret (or auth block).
 """
 import os
+import threading
+import time
 from typing import Any
 
 from core.connector_registry import register
+from core.fetch_pool import FetchPool, parse_retry_after, pool_from_config
+from core.throttle import TokenBucket
+from core.token_cache import client_credentials_token, invalidate_token
 
 try:
     import httpx
@@ -19,10 +28,13 @@ except ImportError:
 _PBI_BASE = "https://api.powerbi.com/v1.0"
 _AZURE_TOKEN_URL_TMPL = "https://login.microsoftonline.com/{tenant_id}/oauth2/v2.0/token"
 _PBI_SCOPE = "https://analysis.windows.net/powerbi/api/.default"
+# executeQueries allows 120 query requests per minute per user
+DEFAULT_REQUESTS_PER_MINUTE = 120
+DEFAULT_DAX_BATCH_SIZE = 10
 
 
-def _get_access_token(target: dict[str, Any]) -> str | None:
-    """Obtain Power BI access token via Azure AD client credentials."""
+def _token_grant(target: dict[str, Any]) -> tuple[str, str, str, str] | None:
+    """(token_url, client_id, client_secret, scope) from the target or its auth block; None when incomplete."""
     auth = target.get("auth") or {}
     tenant_id = auth.get("tenant_id") or target.get("tenant_id", "")
     client_id = auth.get("client_id") or target.get("client_id", "")
@@ -32,20 +44,29 @@ def _get_access_token(target: dict[str, Any]) -> str | None:
     if not tenant_id or not client_id or not client_secret:
         return None
     token_url = auth.get("token_url") or _AZURE_TOKEN_URL_TMPL.format(tenant_id=tenant_id)
-    resp = httpx.post(
-        token_url,
-        data={
-            "grant_type": "client_credentials",
-            "client_id": client_id,
-            "client_secret": client_secret,
-            "scope": _PBI_SCOPE,
-        },
-        headers={"Accept": "application/json"},
-        timeout=30.0,
-    )
-    resp.raise_for_status()
-    data = resp.json()
-    return data.get("access_token")
+    return token_url, client_id, client_secret, _PBI_SCOPE
+
+
+def _get_access_token(target: dict[str, Any], refresh: bool = False) -> str | None:
+    """Obtain Power BI access token via Azure AD client credentials (cached until expiry; refresh drops it first)."""
+    grant = _token_grant(target)
+    if grant is None:
+        return None
+    if refresh:
+        invalidate_token(*grant)
+    return client_credentials_token(httpx.post, *grant)
+
+
+def _dax_table(name: str) -> str:
+    """Table reference for DAX: 'Name' with embedded quotes doubled (names may contain spaces)."""
+    return "'" + name.replace("'", "''") + "'"
+
+
+def _positive_int(value: Any, default: int) -> int:
+    try:
+        return max(1, int(value))
+    except (TypeError, ValueError):
+        return default
 
 
 class PowerBIConnector:
@@ -68,6 +89,17 @@ class PowerBIConnector:
         self.sample_limit = min(max(int(sample_limit), 1), 100)
         self._client: "httpx.Client | None" = None
         self._token: str | None = None
+        settings = pool_from_config(self.config)
+        self._workers = settings.workers
+        self._retries = settings.retries
+        self._backoff = settings.backoff
+        rpm = self.config.get("requests_per_minute", DEFAULT_REQUESTS_PER_MINUTE)
+        self._limiter = TokenBucket(_positive_int(rpm, DEFAULT_REQUESTS_PER_MINUTE) / 60.0, burst_seconds=10)
+        self._batch_size = _positive_int(self.config.get("dax_batch_size"), DEFAULT_DAX_BATCH_SIZE)
+        self._batching = self._batch_size > 1
+        self._counts = {"requests": 0, "retried": 0, "queries": 0}
+        self._counts_lock = threading.Lock()
+        self._token_lock = threading.Lock()
 
     def connect(self) -> None:
         if not _HTTPX_AVAILABLE:
@@ -93,13 +125,50 @@ class PowerBIConnector:
             self._client = None
         self._token = None
 
+    def _count(self, key: str) -> None:
+        with self._counts_lock:
+            self._counts[key] += 1
+
+    def _refresh_token(self, rejected: str | None) -> None:
+        """New token after a 401 (once per rejected token, whichever worker sees it first)."""
+        with self._token_lock:
+            if self._token != rejected:
+                return
+            self._token = _get_access_token(self.config, refresh=True)
+            self._client.headers["Authorization"] = f"Bearer {self._token}"
+
+    def _request(self, method: str, url: str, **kwargs: Any) -> "httpx.Response":
+        """
+        One API call under the rate limit; 429/5xx retried (retries) after the shared backoff or the
+        server's Retry-After, and a rejected token (401) renewed once.
+        """
+        attempt, renewed = 0, False
+        while True:
+            self._backoff.wait()
+            self._limiter.take(1)
+            token = self._token
+            r = self._client.request(method, url, **kwargs)
+            self._count("requests")
+            if r.status_code == 401 and not renewed:
+                renewed = True
+                self._refresh_token(token)
+                continue
+            if (r.status_code == 429 or r.status_code >= 500) and attempt < self._retries:
+                attempt += 1
+                self._count("retried")
+                self._backoff.failure(parse_retry_after(r.headers.get("Retry-After")))
+                continue
+            if r.status_code < 400:
+                self._backoff.success()
+            return r
+
     def _get_workspace_ids(self) -> list[str]:
         """Return list of group (workspace) IDs; empty means use 'myorg' only."""
         workspace_ids = self.config.get("workspace_ids") or self.config.get("group_ids") or []
         if workspace_ids:
             return list(workspace_ids)
         try:
-            r = self._client.get("/myorg/groups")
+            r = self._request("GET", "/myorg/groups")
             if r.status_code != 200:
                 return []
             data = r.json()
@@ -109,9 +178,9 @@ class PowerBIConnector:
 
     def _get_datasets(self, group_id: str | None) -> list[dict]:
         if group_id:
-            r = self._client.get(f"/myorg/groups/{group_id}/datasets")
+            r = self._request("GET", f"/myorg/groups/{group_id}/datasets")
         else:
-            r = self._client.get("/myorg/datasets")
+            r = self._request("GET", "/myorg/datasets")
         if r.status_code != 200:
             return []
         data = r.json()
@@ -120,35 +189,96 @@ class PowerBIConnector:
     def _get_tables(self, dataset_id: str, group_id: str | None) -> list[dict]:
         """Get tables for a dataset. Works for push datasets; others may return empty."""
         if group_id:
-            r = self._client.get(f"/myorg/groups/{group_id}/datasets/{dataset_id}/tables")
+            r = self._request("GET", f"/myorg/groups/{group_id}/datasets/{dataset_id}/tables")
         else:
-            r = self._client.get(f"/myorg/datasets/{dataset_id}/tables")
+            r = self._request("GET", f"/myorg/datasets/{dataset_id}/tables")
         if r.status_code != 200:
             return []
         data = r.json()
         return data.get("value", [])
 
-    def _execute_dax(self, dataset_id: str, group_id: str | None, dax_query: str) -> list[dict]:
-        """Execute a DAX query; returns list of rows (dicts). One table per query."""
+    def _execute_queries(self, dataset_id: str, group_id: str | None, dax_query: str) -> list[list[dict]] | None:
+        """Execute a DAX query; returns the rows of each result table (one per EVALUATE), or None on error."""
         if group_id:
             url = f"/myorg/groups/{group_id}/datasets/{dataset_id}/executeQueries"
         else:
             url = f"/myorg/datasets/{dataset_id}/executeQueries"
         payload = {"queries": [{"query": dax_query}], "serializerSettings": {"includeNulls": True}}
-        r = self._client.post(url, json=payload)
+        self._count("queries")
+        r = self._request("POST", url, json=payload)
         if r.status_code != 200:
-            return []
+            return None
         try:
             data = r.json()
             results = data.get("results", [])
             if not results or results[0].get("error"):
-                return []
-            tables = results[0].get("tables", [])
-            if not tables:
-                return []
-            return tables[0].get("rows", [])
+                return None
+            return [table.get("rows", []) for table in results[0].get("tables", [])]
         except Exception:
+            return None
+
+    def _topn(self, table: str) -> str:
+        return f"EVALUATE TOPN({self.sample_limit}, {_dax_table(table)})"
+
+    def _sample_tables(self, dataset_id: str, group_id: str | None, names: list[str]) -> dict[str, list[dict]]:
+        """
+        TOPN sample rows per table, several EVALUATE statements per executeQueries call. A batch the service
+        rejects is retried table by table; if each table then succeeds, batching is off for the rest of the run.
+        """
+        samples: dict[str, list[dict]] = {}
+        i = 0
+        while i < len(names):
+            chunk = names[i:i + (self._batch_size if self._batching else 1)]
+            i += len(chunk)
+            if len(chunk) > 1:
+                tables = self._execute_queries(dataset_id, group_id, "\n".join(self._topn(n) for n in chunk))
+                if tables is not None and len(tables) == len(chunk):
+                    samples.update(zip(chunk, tables))
+                    continue
+            single = {n: self._execute_queries(dataset_id, group_id, self._topn(n)) for n in chunk}
+            if len(chunk) > 1 and all(t is not None for t in single.values()):
+                self._batching = False
+            samples.update((n, (t or [[]])[0]) for n, t in single.items())
+        return samples
+
+    def _scan_dataset(self, dataset: dict, group_id: str | None) -> list[dict[str, Any]]:
+        """Findings (save_finding keyword arguments) for one dataset; runs on a pool worker, no DB writes."""
+        ds_id = dataset.get("id")
+        ds_name = dataset.get("name", "Dataset")
+        if not ds_id:
+            return []
+        tables = [t for t in self._get_tables(ds_id, group_id) if t.get("name")]
+        if not tables:
             return []
+        samples = self._sample_tables(ds_id, group_id, [t["name"] for t in tables])
+        findings = []
+        for tbl in tables:
+            tname = tbl["name"]
+            rows = samples.get(tname) or []
+            columns = tbl.get("columns", [])
+            if not columns:
+                # No declared schema: columns are the keys of the sampled rows ("Table[Column]")
+                columns = [{"name": key.split("[")[-1].rstrip("]"), "key": key} for key in (rows[0] if rows else {})]
+            for col in columns:
+                cname = col.get("name", "")
+                if not cname:
+                    continue
+                full_key = col.get("key") or f"{tname}[{cname}]"
+                sample = " ".join(str(row.get(full_key, row.get(cname, "")))[:200] for row in rows[: self.sample_limit])
+                res = self.scanner.scan_column(cname, sample)
+                if res.get("sensitivity_level") == "LOW":
+                    continue
+                findings.append({
+                    "schema_name": ds_name,
+                    "table_name": tname,
+                    "column_name": cname,
+                    "data_type": str(col.get("dataType", "")),
+                    "sensitivity_level": res.get("sensitivity_level", "MEDIUM"),
+                    "pattern_detected": res.get("pattern_detected", ""),
+                    "norm_tag": res.get("norm_tag", ""),
+                    "ml_confidence": res.get("ml_confidence", 0),
+                })
+        return findings
 
     def run(self) -> None:
         target_name = self.config.get("name", "Power BI")
@@ -160,88 +290,57 @@ class PowerBIConnector:
         except Exception as e:
             self.db_manager.save_failure(target_name, "unreachable", str(e))
             return
+        timing: dict[str, dict[str, Any]] = {}
+        started = time.monotonic()
         try:
             workspace_ids = self._get_workspace_ids()
             if not workspace_ids:
                 workspace_ids = [None]
+            # Datasets run concurrently on one shared httpx.Client; findings are saved on this thread
+            pool = FetchPool(self._workers, retries=0, backoff=self._backoff)
             for group_id in workspace_ids:
+                ws_started = time.monotonic()
+                queries = self._counts["queries"]
                 datasets = self._get_datasets(group_id)
-                for ds in datasets:
-                    ds_id = ds.get("id")
-                    ds_name = ds.get("name", "Dataset")
-                    if not ds_id:
+                for ds, findings, error in pool.map(datasets, lambda _c, ds, g=group_id: self._scan_dataset(ds, g)):
+                    if error is not None:
+                        self.db_manager.save_failure(target_name, "error", f"{ds.get('name', ds.get('id'))}: {error}")
                         continue
-                    tables = self._get_tables(ds_id, group_id)
-                    if not tables:
-                        continue
-                    for tbl in tables:
-                        tname = tbl.get("name")
-                        if not tname:
-                            continue
-                        columns = tbl.get("columns", [])
-                        if not columns:
-                            try:
-                                rows = self._execute_dax(
-                                    ds_id, group_id,
-                                    f"EVALUATE TOPN({self.sample_limit}, {tname})",
-                                )
-                                if rows:
-                                    for key in rows[0].keys():
-                                        sample = " ".join(str(r.get(key, ""))[:200] for r in rows[: self.sample_limit])
-                                        res = self.scanner.scan_column(key.split("[")[-1].rstrip("]"), sample)
-                                        if res.get("sensitivity_level") == "LOW":
-                                            continue
-                                        self.db_manager.save_finding(
-                                            source_type="database",
-                                            target_name=target_name,
-                                            server_ip="api.powerbi.com",
-                                            engine_details="Power BI",
-                                            schema_name=ds_name,
-                                            table_name=tname,
-                                            column_name=key.split("[")[-1].rstrip("]"),
-                                            data_type="",
-                                            sensitivity_level=res.get("sensitivity_level", "MEDIUM"),
-                                            pattern_detected=res.get("pattern_detected", ""),
-                                            norm_tag=res.get("norm_tag", ""),
-                                            ml_confidence=res.get("ml_confidence", 0),
-                                        )
-                            except Exception:
-                                pass
-                            continue
-                        sample_rows = self._execute_dax(
-                            ds_id, group_id,
-                            f"EVALUATE TOPN({self.sample_limit}, {tname})",
+                    for finding in findings:
+                        self.db_manager.save_finding(
+                            source_type="database",
+                            target_name=target_name,
+                            server_ip="api.powerbi.com",
+                            engine_details="Power BI",
+                            **finding,
                         )
-                        for col in columns:
-                            cname = col.get("name", "")
-                            if not cname:
-                                continue
-                            sample = ""
-                            if sample_rows:
-                                full_key = f"{tname}[{cname}]"
-                                for row in sample_rows[: self.sample_limit]:
-                                    sample += str(row.get(full_key, row.get(cname, "")))[:200] + " "
-                            res = self.scanner.scan_column(cname, sample)
-                            if res.get("sensitivity_level") == "LOW":
-                                continue
-                            self.db_manager.save_finding(
-                                source_type="database",
-                                target_name=target_name,
-                                server_ip="api.powerbi.com",
-                                engine_details="Power BI",
-                                schema_name=ds_name,
-                                table_name=tname,
-                                column_name=cname,
-                                data_type=str(col.get("dataType", "")),
-                                sensitivity_level=res.get("sensitivity_level", "MEDIUM"),
-                                pattern_detected=res.get("pattern_detected", ""),
-                                norm_tag=res.get("norm_tag", ""),
-                                ml_confidence=res.get("ml_confidence", 0),
-                            )
+                timing[group_id or "My workspace"] = {
+                    "seconds": round(time.monotonic() - ws_started, 3),
+                    "datasets": len(datasets),
+                    "queries": self._counts["queries"] - queries,
+                }
         except Exception as e:
             self.db_manager.save_failure(target_name, "error", str(e))
         finally:
             self.close()
+            self._save_timing(target_name, timing, time.monotonic() - started)
+
+    def _save_timing(self, target_name: str, timing: dict[str, dict[str, Any]], seconds: float) -> None:
+        """Per-workspace timing and request counts under scan_metadata["powerbi"][target_name]."""
+        session_id = self.db_manager.current_session_id
+        if not session_id:
+            return
+        stats = {
+            "seconds": round(seconds, 3),
+            "requests": self._counts["requests"],
+            "retried": self._counts["retried"],
+            "dax_batching": self._batching,
+            "workspaces": timing,
+        }
+        try:
+            self.db_manager.update_session_metadata(session_id, {"powerbi": {target_name: stats}})
+        except Exception:
+            pass
 
 
 if _HTTPX_AVAILABLE:
@@ -2,7 +2,14 @@
 Optional Redis connector: connect, scan keys (or sample), run detector on key names and types.
 Register as type 'redis'. Install: pip install redis
 Config target: type: database, driver: redis, host, port, (optional password).
+
+The whole keyspace is streamed with SCAN (match, scan_count) into a KeyPatternTrie that collapses
+key names into namespace patterns (user:{id}:profile); only keys_per_pattern keys of each pattern
+are kept. Their TYPE and a bounded slice of their value (GETRANGE, HSCAN/SSCAN/ZSCAN with COUNT,
+LRANGE, XRANGE) are fetched in pipelined batches of pipeline_batch keys, and findings are saved
+per pattern, not per key.
 """
+import re
 from typing import Any
 
 try:
@@ -14,16 +21,149 @@ except ImportError:
 
 from core.connector_registry import register
 
+DEFAULT_KEYS_PER_PATTERN = 3
+DEFAULT_MAX_CHILDREN = 100
+DEFAULT_SCAN_COUNT = 1000
+DEFAULT_PIPELINE_BATCH = 100
+DEFAULT_VALUE_BYTES = 256
+
+WILDCARD = "{*}"
+
+# Key segments replaced by a placeholder before they reach the trie (checked in order)
+_SEGMENT_PLACEHOLDERS = (
+    (re.compile(r"^\d+$"), "{id}"),
+    (re.compile(r"^[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}$"), "{uuid}"),
+    (re.compile(r"^[0-9a-fA-F]{16,}$"), "{hex}"),
+    (re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$"), "{email}"),
+)
+# Tokens the trie never folds into {*}; other segments are literals, Cluster hash tags ("{abc}") included
+_PLACEHOLDERS = frozenset(placeholder for _regex, placeholder in _SEGMENT_PLACEHOLDERS) | {WILDCARD}
+
+
+def _segment_token(segment: str) -> str:
+    """Placeholder for an id-like key segment (digits, UUID, long hex, e-mail), else the segment itself."""
+    for regex, placeholder in _SEGMENT_PLACEHOLDERS:
+        if regex.match(segment):
+            return placeholder
+    return segment
+
+
+class _Node:
+    __slots__ = ("children", "count", "samples")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _Node] = {}
+        self.count = 0
+        self.samples: list[str] = []
+
+
+class KeyPatternTrie:
+    """
+    Key names split on separator, one trie level per segment. Id-like segments become placeholders;
+    when a level has more than max_children distinct literal segments they are merged into one {*}
+    child (and later literals go there), so memory follows the number of patterns, not of keys.
+    Each pattern keeps its key count and its first keys_per_pattern keys.
+    """
+
+    def __init__(
+        self,
+        separator: str = ":",
+        keys_per_pattern: int = DEFAULT_KEYS_PER_PATTERN,
+        max_children: int = DEFAULT_MAX_CHILDREN,
+    ):
+        self.separator = separator
+        self.keys_per_pattern = max(int(keys_per_pattern), 1)
+        self.max_children = max(int(max_children), 1)
+        self._root = _Node()
+
+    def add(self, key: str) -> None:
+        node = self._root
+        for segment in key.split(self.separator):
+            token = _segment_token(segment)
+            child = node.children.get(token)
+            if child is None:
+                child = node.children.get(WILDCARD) if token not in _PLACEHOLDERS else None
+                if child is None:
+                    child = node.children[token] = _Node()
+                    child = self._collapse(node) or child
+            node = child
+        node.count += 1
+        if len(node.samples) < self.keys_per_pattern:
+            node.samples.append(key)
+
+    def _collapse(self, node: _Node) -> "_Node | None":
+        """Merge node's literal children into {*} once there are more than max_children; return {*} if so."""
+        literals = [token for token in node.children if token not in _PLACEHOLDERS]
+        if len(literals) <= self.max_children:
+            return None
+        wildcard = node.children.setdefault(WILDCARD, _Node())
+        for token in literals:
+            self._merge(wildcard, node.children.pop(token))
+        self._collapse(wildcard)
+        return wildcard
+
+    def _merge(self, into: _Node, node: _Node) -> None:
+        into.count += node.count
+        into.samples.extend(node.samples[: self.keys_per_pattern - len(into.samples)])
+        for token, child in node.children.items():
+            target = into.children.get(token)
+            if target is None:
+                into.children[token] = child
+            else:
+                self._merge(target, child)
+
+    def patterns(self) -> list[tuple[str, int, list[str]]]:
+        """(pattern, key count, sample keys) for every pattern with keys, depth-first."""
+        out: list[tuple[str, int, list[str]]] = []
+        stack: list[tuple[_Node, list[str]]] = [(self._root, [])]
+        while stack:
+            node, tokens = stack.pop()
+            if node.count and tokens:
+                out.append((self.separator.join(tokens), node.count, node.samples))
+            for token, child in sorted(node.children.items(), reverse=True):
+                stack.append((child, tokens + [token]))
+        return out
+
+
+def _text(value: Any) -> str:
+    if isinstance(value, bytes):
+        return value.decode("utf-8", errors="replace")
+    return str(value)
+
+
+def _value_text(kind: str, reply: Any, limit: int) -> str:
+    """Sample text of one value reply: hash fields as "field value", at most limit items of 200 chars."""
+    if isinstance(reply, Exception) or reply is None:
+        return ""
+    if kind == "string":
+        return _text(reply)
+    if kind in ("hash", "set", "zset") and isinstance(reply, (list, tuple)) and len(reply) == 2:
+        # HSCAN / SSCAN / ZSCAN reply: (cursor, items)
+        reply = reply[1]
+    if isinstance(reply, dict):
+        items = [f"{_text(k)} {_text(v)}" for k, v in reply.items()]
+    elif kind == "stream":
+        items = [" ".join(f"{_text(k)} {_text(v)}" for k, v in fields.items()) for _id, fields in reply]
+    else:
+        items = [_text(item[0] if isinstance(item, tuple) else item) for item in reply]
+    return " ".join(item[:200] for item in items[:limit])
+
 
 class RedisConnector:
-    """Scan Redis: sample keys (e.g. SCAN), detect sensitive key names; no value storage."""
+    """Scan Redis: SCAN all keys into patterns, sample values of a few keys per pattern; no value storage."""
 
-    def __init__(self, target_config: dict[str, Any], scanner: Any, db_manager: Any, sample_limit: int = 100):
+    def __init__(self, target_config: dict[str, Any], scanner: Any, db_manager: Any, sample_limit: int = 5):
         self.config = target_config
         self.scanner = scanner
         self.db_manager = db_manager
-        self.sample_limit = sample_limit
+        self.sample_limit = max(int(sample_limit or 5), 1)
         self._client = None
+        cfg = target_config
+        self.keys_per_pattern = int(cfg.get("keys_per_pattern") or DEFAULT_KEYS_PER_PATTERN)
+        self.max_children = int(cfg.get("max_children") or DEFAULT_MAX_CHILDREN)
+        self.scan_count = int(cfg.get("scan_count") or DEFAULT_SCAN_COUNT)
+        self.pipeline_batch = max(int(cfg.get("pipeline_batch") or DEFAULT_PIPELINE_BATCH), 1)
+        self.value_bytes = max(int(cfg.get("value_bytes") or DEFAULT_VALUE_BYTES), 1)
 
     def connect(self) -> None:
         if not _REDIS_AVAILABLE:
@@ -31,7 +171,8 @@ class RedisConnector:
         host = self.config.get("host", "localhost")
         port = int(self.config.get("port", 6379))
         password = self.config.get("pass") or self.config.get("password")
-        self._client = redis.Redis(host=host, port=port, password=password or None, decode_responses=True)
+        # Raw bytes: values are decoded leniently, a binary value must not fail the whole pipeline
+        self._client = redis.Redis(host=host, port=port, password=password or None, decode_responses=False)
 
     def close(self) -> None:
         if self._client:
@@ -41,6 +182,64 @@ class RedisConnector:
                 pass
             self._client = None
 
+    def _scan_patterns(self) -> KeyPatternTrie:
+        """Stream every key (SCAN, optional match) into a KeyPatternTrie."""
+        trie = KeyPatternTrie(
+            separator=self.config.get("separator") or ":",
+            keys_per_pattern=self.keys_per_pattern,
+            max_children=self.max_children,
+        )
+        for key in self._client.scan_iter(match=self.config.get("match") or None, count=self.scan_count):
+            trie.add(_text(key))
+        return trie
+
+    def _queue_value(self, pipe: Any, key: str, kind: str) -> bool:
+        """Queue the bounded read for a key of this type; False for types sampled by name only."""
+        n = self.sample_limit
+        if kind == "string":
+            pipe.getrange(key, 0, self.value_bytes - 1)
+        elif kind == "hash":
+            pipe.hscan(key, 0, count=n)
+        elif kind == "set":
+            pipe.sscan(key, 0, count=n)
+        elif kind == "zset":
+            pipe.zscan(key, 0, count=n)
+        elif kind == "list":
+            pipe.lrange(key, 0, n - 1)
+        elif kind == "stream":
+            pipe.xrange(key, count=n)
+        else:
+            return False
+        return True
+
+    def _sample_keys(self, keys: list[str]) -> dict[str, tuple[str, str]]:
+        """
+        {key: (type, sample text)} with two pipelined round trips per pipeline_batch keys: TYPE for
+        the batch, then one bounded value read per key. Errors (key gone, wrong type) leave the sample empty.
+        """
+        out: dict[str, tuple[str, str]] = {}
+        for start in range(0, len(keys), self.pipeline_batch):
+            batch = keys[start:start + self.pipeline_batch]
+            pipe = self._client.pipeline(transaction=False)
+            for key in batch:
+                pipe.type(key)
+            kinds = [_text(k) if not isinstance(k, Exception) else "none" for k in pipe.execute(raise_on_error=False)]
+            pipe = self._client.pipeline(transaction=False)
+            queued = [(key, kind) for key, kind in zip(batch, kinds) if self._queue_value(pipe, key, kind)]
+            replies = pipe.execute(raise_on_error=False) if queued else []
+            for key, kind in zip(batch, kinds):
+                out[key] = (kind, "")
+            for (key, kind), reply in zip(queued, replies):
+                out[key] = (kind, _value_text(kind, reply, self.sample_limit))
+        return out
+
+    def _scan(self, columns: list[tuple[str, str]]) -> list[dict[str, Any]]:
+        """Detector results for (pattern, sample) columns, in one batch when the scanner supports it."""
+        scan_columns = getattr(self.scanner, "scan_columns", None)
+        if scan_columns is not None:
+            return scan_columns(columns)
+        return [self.scanner.scan_column(name, sample) for name, sample in columns]
+
     def run(self) -> None:
         target_name = self.config.get("name", "redis")
         try:
@@ -51,14 +250,15 @@ class RedisConnector:
         try:
             from utils.logger import log_connection
             log_connection(target_name, "redis", self.config.get("host", "localhost"))
-            keys = []
-            for k in self._client.scan_iter(count=self.sample_limit):
-                keys.append(k)
-                if len(keys) >= self.sample_limit:
-                    break
-            combined = " ".join(keys)
-            for key in keys[:50]:  # per-key classification
-                res = self.scanner.scan_column(key, combined)
+            patterns = self._scan_patterns().patterns()
+            values = self._sample_keys([key for _pattern, _count, keys in patterns for key in keys])
+            columns = []
+            kinds = []
+            for pattern, _count, keys in patterns:
+                sampled = [values.get(key, ("none", "")) for key in keys]
+                kinds.append(", ".join(sorted({kind for kind, _ in sampled if kind != "none"})) or "key")
+                columns.append((pattern, " ".join(text for _, text in sampled if text)))
+            for (pattern, _sample), kind, res in zip(columns, kinds, self._scan(columns)):
                 if res["sensitivity_level"] == "LOW":
                     continue
                 self.db_manager.save_finding(
@@ -68,8 +268,8 @@ class RedisConnector:
                     engine_details="redis",
                     schema_name="",
                     table_name="keys",
-                    column_name=key,
-                    data_type="key",
+                    column_name=pattern,
+                    data_type=kind,
                     sensitivity_level=res["sensitivity_level"],
                     pattern_detected=res["pattern_detected"],
                     norm_tag=res.get("norm_tag", ""),
@@ -77,7 +277,7 @@ class RedisConnector:
                 )
                 try:
                     from utils.logger import log_finding
-                    log_finding("database", target_name, f"keys.{key}", res["sensitivity_level"], res["pattern_detected"])
+                    log_finding("database", target_name, f"keys.{pattern}", res["sensitivity_level"], res["pattern_detected"])
                 except Exception:
                     pass
         except Exception as e:
@@ -4,10 +4,16 @@ REST/API connector: call remote HTTP(S) endpoints with configurable authenticati
 and scan response payloads for personal or sensitive data.
 Optional: register only when httpx is available. Used for type "api" or "rest" targets.
 """
+import asyncio
+import json
 import os
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
 from core.connector_registry import register
+from core.fetch_pool import pool_from_config
+from file_scan.json_stream import DEFAULT_JSON_MAX_BYTES, sample_json_paths
 
 try:
     import httpx
@@ -17,7 +23,7 @@ except ImportError:
     httpx = None
 
 
-def _build_auth(client: "httpx.Client", target: dict[str, Any]) -> None:
+def _build_auth(client: "httpx.Client | httpx.AsyncClient", target: dict[str, Any]) -> None:
     """
     Configure auth on the client from target["auth"].
     Supports: basic (username/password), bearer (token), oauth2_client (token_url, client_id, client_secret),
@@ -79,38 +85,94 @@ def _build_auth(client: "httpx.Client", target: dict[str, Any]) -> None:
         client.auth = httpx.BasicAuth(user, password)
 
 
-def _flatten_sample(obj: Any, prefix: str = "", max_len: int = 500) -> list[tuple[str, str]]:
+DEFAULT_MAX_PAGES = 5
+DEFAULT_MAX_RESPONSE_BYTES = DEFAULT_JSON_MAX_BYTES
+# Leading bytes of a body kept for the text fallback when it is not JSON
+_RAW_SAMPLE_BYTES = 2000
+
+# Body fields holding the next page's URL (dotted paths; a {"href": ...} object also works)
+_NEXT_FIELDS = (
+    "next", "next_url", "nextLink", "@odata.nextLink", "links.next", "_links.next", "paging.next", "meta.next",
+)
+# Body fields holding an opaque cursor, sent back as the cursor_param query parameter
+_CURSOR_FIELDS = ("next_cursor", "nextCursor", "meta.next_cursor", "response_metadata.next_cursor")
+
+
+def _field(samples: dict[str, list[str]], path: str) -> str | None:
+    """First sampled value of a top-level body field (or of its href for {"href": ...} objects)."""
+    values = samples.get(path) or samples.get(f"{path}.href")
+    return values[0] if values else None
+
+
+def _next_page_url(
+    response: "httpx.Response", samples: dict[str, list[str]], is_object: bool, pagination: dict[str, Any],
+) -> str | None:
     """
-    Recursively flatten JSON-like structure into (key_path, string_value) for scanning.
-    Stops at first level of nesting for arrays (sample first element) to avoid huge payloads.
+    Absolute URL of the next page: RFC 5988 Link rel="next", else a next-URL field of an object body,
+    else a cursor field of the body set as a query parameter on the current URL. None on the last page.
+    Body fields come from the streamed path samples, so they count only if read within the byte budget.
+    """
+    current = response.request.url
+    link = (response.links.get("next") or {}).get("url")
+    if link:
+        return str(current.join(link))
+    if not is_object:
+        return None
+    next_fields = [pagination["next_field"]] if pagination.get("next_field") else _NEXT_FIELDS
+    for field in next_fields:
+        value = _field(samples, field)
+        if value:
+            return str(current.join(value))
+    cursor_fields = [pagination["cursor_field"]] if pagination.get("cursor_field") else _CURSOR_FIELDS
+    for field in cursor_fields:
+        value = _field(samples, field)
+        if value and value not in ("true", "false"):
+            return str(current.copy_set_param(pagination.get("cursor_param") or "cursor", value))
+    return None
+
+
+class _BodyChunks:
+    """
+    Sync iterable over a streamed httpx response body, for the JSON sampler running on a worker thread:
+    each chunk is awaited on the event loop, so nothing past what the sampler reads is downloaded.
+    Keeps the first bytes for the non-JSON fallback and the transport error that cut the body short
+    (the sampler stops quietly on any error, so the caller re-raises it).
     """
-    out: list[tuple[str, str]] = []
-    if obj is None:
-        out.append((prefix or "value", ""))
-        return out
-    if isinstance(obj, bool):
-        out.append((prefix or "value", "true" if obj else "false"))
-        return out
-    if isinstance(obj, (int, float)):
-        out.append((prefix or "value", str(obj)[:max_len]))
-        return out
-    if isinstance(obj, str):
-        out.append((prefix or "value", obj[:max_len]))
-        return out
-    if isinstance(obj, list):
-        for i, item in enumerate(obj[:3]):  # sample first 3
-            out.extend(_flatten_sample(item, f"{prefix}[{i}]" if prefix else f"[{i}]", max_len))
-        return out
-    if isinstance(obj, dict):
-        for k, v in obj.items():
-            key = f"{prefix}.{k}" if prefix else k
-            if isinstance(v, (dict, list)) and v:
-                out.extend(_flatten_sample(v, key, max_len))
-            else:
-                out.append((key, str(v)[:max_len] if v is not None else ""))
-        return out
-    out.append((prefix or "value", str(obj)[:max_len]))
-    return out
+
+    def __init__(self, response: "httpx.Response", loop: asyncio.AbstractEventLoop):
+        self._chunks = response.aiter_bytes()
+        self._loop = loop
+        self.head = b""
+        self.error: Exception | None = None
+
+    async def _next(self) -> bytes | None:
+        try:
+            return await self._chunks.__anext__()
+        except StopAsyncIteration:
+            return None
+
+    def __iter__(self) -> Iterator[bytes]:
+        while True:
+            try:
+                chunk = asyncio.run_coroutine_threadsafe(self._next(), self._loop).result()
+            except Exception as e:
+                self.error = e
+                raise
+            if chunk is None:
+                return
+            if len(self.head) < _RAW_SAMPLE_BYTES:
+                self.head += chunk[: _RAW_SAMPLE_BYTES - len(self.head)]
+            yield chunk
+
+
+def _run_coroutine(coro: Any) -> Any:
+    """asyncio.run, or on a helper thread when the caller already runs an event loop."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
 
 
 class RESTConnector:
@@ -118,6 +180,11 @@ class RESTConnector:
     Connect to REST/API endpoints with configurable auth (basic, bearer, OAuth2 client, custom headers),
     GET configured paths, parse JSON responses, and run sensitivity detection on field names and sample values.
     Findings are saved as filesystem_findings with file_name encoding path and field (e.g. "GET /users | email").
+
+    Paths are fetched with an httpx.AsyncClient, at most concurrency requests at a time, and each path
+    follows its next pages (Link header, next/cursor fields) up to max_pages. Pages that sent an ETag
+    or Last-Modified are revalidated on the next scan (If-None-Match / If-Modified-Since); a 304 reuses
+    the findings and next link stored in connector_state instead of downloading and scanning again.
     """
 
     def __init__(
@@ -131,24 +198,36 @@ class RESTConnector:
         self.scanner = scanner
         self.db_manager = db_manager
         self.sample_limit = sample_limit
-        self._client: "httpx.Client | None" = None
+        self._client: "httpx.AsyncClient | None" = None
+        settings = pool_from_config(target_config)
+        self.concurrency = settings.workers
+        try:
+            self.max_pages = max(int(target_config.get("max_pages", DEFAULT_MAX_PAGES)), 1)
+        except (TypeError, ValueError):
+            self.max_pages = DEFAULT_MAX_PAGES
+        self.pagination = target_config.get("pagination") or {}
+        try:
+            self.max_response_bytes = max(int(target_config.get("max_response_bytes", DEFAULT_MAX_RESPONSE_BYTES)), 1)
+        except (TypeError, ValueError):
+            self.max_response_bytes = DEFAULT_MAX_RESPONSE_BYTES
+        self._base_url = (target_config.get("base_url") or target_config.get("url", "")).rstrip("/")
 
     def connect(self) -> None:
         if not _HTTPX_AVAILABLE:
             raise RuntimeError("httpx is required for REST connector. Install with: pip install httpx")
-        base_url = (self.config.get("base_url") or self.config.get("url", "")).rstrip("/")
         timeout = float(self.config.get("timeout", 30))
-        self._client = httpx.Client(base_url=base_url, timeout=timeout)
+        limits = httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency)
+        self._client = httpx.AsyncClient(base_url=self._base_url, timeout=timeout, limits=limits)
         _build_auth(self._client, self.config)
         # Optional extra headers (e.g. API key, negotiated token)
         for key, value in (self.config.get("headers") or {}).items():
             if value is not None and key not in self._client.headers:
                 self._client.headers[key] = str(value)
 
-    def close(self) -> None:
+    async def _close(self) -> None:
         if self._client:
             try:
-                self._client.close()
+                await self._client.aclose()
             except Exception:
                 pass
             self._client = None
@@ -162,12 +241,15 @@ class RESTConnector:
             )
             return
         self.connect()
+        _run_coroutine(self._crawl())
+
+    async def _crawl(self) -> None:
         try:
             paths = self.config.get("paths") or self.config.get("endpoints") or []
             discover_url = self.config.get("discover_url")
             if discover_url and not paths:
                 try:
-                    r = self._client.get(discover_url)
+                    r = await self._client.get(discover_url)
                     r.raise_for_status()
                     data = r.json()
                     if isinstance(data, list):
@@ -186,54 +268,132 @@ class RESTConnector:
                     "No paths or discover_url configured",
                 )
                 return
-            target_name = self.config.get("name", "API")
+            semaphore = asyncio.Semaphore(self.concurrency)
             seen_path_key: set[tuple[str, str]] = set()  # (path_str, key) to avoid duplicate findings per field
+            crawls = []
             for path in paths:
                 path_str = path if isinstance(path, str) else path.get("path", path.get("url", ""))
                 if not path_str:
                     continue
                 path_str = path_str if path_str.startswith("/") else "/" + path_str
+                crawls.append(self._crawl_path(path_str, semaphore, seen_path_key))
+            await asyncio.gather(*crawls)
+        finally:
+            await self._close()
+
+    def _load_page_state(self, target_name: str, url: str) -> dict[str, Any] | None:
+        try:
+            raw = self.db_manager.get_connector_state(target_name, f"page:{url}")
+            cached = json.loads(raw) if isinstance(raw, str) else None
+        except Exception:
+            return None
+        return cached if isinstance(cached, dict) else None
+
+    def _store_page_state(self, target_name: str, response: "httpx.Response", results: list, next_url: str | None) -> None:
+        """Validators, sensitive results and next link of a page, for a 304 on the next scan."""
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        url = str(response.request.url)
+        try:
+            if not etag and not last_modified:
+                self.db_manager.set_connector_state(target_name, f"page:{url}", None)
+                return
+            state = {"etag": etag, "last_modified": last_modified, "next": next_url, "findings": results}
+            self.db_manager.set_connector_state(target_name, f"page:{url}", json.dumps(state, separators=(",", ":")))
+        except Exception:
+            pass
+
+    async def _crawl_path(self, path_str: str, semaphore: asyncio.Semaphore, seen_path_key: set[tuple[str, str]]) -> None:
+        """GET a configured path and its next pages (same origin only, at most max_pages)."""
+        target_name = self.config.get("name", "API")
+        base = httpx.URL(self._base_url + path_str)
+        url: str | None = str(base)
+        visited: set[str] = set()
+        while url and url not in visited and len(visited) < self.max_pages:
+            visited.add(url)
+            cached = self._load_page_state(target_name, url)
+            headers = {}
+            if cached and cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached and cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+            async with semaphore:
                 try:
-                    r = self._client.get(path_str)
-                    r.raise_for_status()
+                    async with self._client.stream("GET", url, headers=headers) as r:
+                        if r.status_code != 304 or not cached:
+                            r.raise_for_status()
+                        if r.status_code != 304:
+                            samples, head = await self._sample_body(r)
                 except Exception as e:
-                    self.db_manager.save_failure(target_name, "error", f"GET {path_str}: {e}")
-                    continue
-                try:
-                    payload = r.json()
-                except Exception:
-                    payload = {"_raw": r.text[:2000]}
-                def _save_if_sensitive(key: str, sample: str) -> None:
-                    if (path_str, key) in seen_path_key:
-                        return
-                    result = self.scanner.scan_column(key, sample)
-                    if result.get("sensitivity_level") in ("HIGH", "MEDIUM"):
-                        seen_path_key.add((path_str, key))
-                        self.db_manager.save_finding(
-                            "filesystem",
-                            target_name=target_name,
-                            path=self.config.get("base_url", "") + path_str,
-                            file_name=f"GET {path_str} | {key}",
-                            data_type="application/json",
-                            sensitivity_level=result.get("sensitivity_level", "MEDIUM"),
-                            pattern_detected=result.get("pattern_detected", ""),
-                            norm_tag=result.get("norm_tag", ""),
-                            ml_confidence=result.get("ml_confidence") or 0,
-                        )
-
-                if isinstance(payload, list):
-                    for item in payload[: self.sample_limit]:
-                        if isinstance(item, dict):
-                            for key, sample in _flatten_sample(item, prefix="", max_len=500):
-                                _save_if_sensitive(key, sample)
-                    if not payload:
-                        for key, sample in _flatten_sample({}, prefix="(empty)", max_len=500):
-                            _save_if_sensitive(key, sample)
-                else:
-                    for key, sample in _flatten_sample(payload, max_len=500):
-                        _save_if_sensitive(key, sample)
-        finally:
-            self.close()
+                    self.db_manager.save_failure(target_name, "error", f"GET {url}: {e}")
+                    return
+            if r.status_code == 304:
+                results = [tuple(item) for item in cached.get("findings") or []]
+                next_url = cached.get("next")
+            else:
+                results = self._scan_samples(samples)
+                next_url = _next_page_url(r, samples, head.lstrip().startswith(b"{"), self.pagination)
+                self._store_page_state(target_name, r, results, next_url)
+            for key, result in results:
+                self._save_finding(target_name, path_str, key, result, seen_path_key)
+            if next_url:
+                following = httpx.URL(next_url)
+                # Never send the target's credentials to another host
+                if (following.scheme, following.host, following.port) != (base.scheme, base.host, base.port):
+                    break
+            url = next_url
+
+    async def _sample_body(self, response: "httpx.Response") -> tuple[dict[str, list[str]], bytes]:
+        """
+        Stream the body through the incremental JSON sampler on a worker thread: sample_limit items per
+        array and values per key path, at most max_response_bytes read; the rest is never downloaded
+        (leaving the stream closes the connection). Returns (path samples, leading bytes); a transport
+        error while reading the body is raised.
+        """
+        body = _BodyChunks(response, asyncio.get_running_loop())
+        content_type = response.headers.get("Content-Type", "").lower()
+        ext = ".jsonl" if "ndjson" in content_type or "jsonl" in content_type else ".json"
+        samples = await asyncio.to_thread(
+            sample_json_paths, body, ext, self.sample_limit, self.max_response_bytes,
+        )
+        if body.error is not None:
+            # Partial page: fail it rather than store its validators with incomplete findings
+            raise body.error
+        if not samples and body.head.strip() and not body.head.lstrip().startswith((b"[", b"{")):
+            samples = {"_raw": [body.head.decode("utf-8", errors="replace")]}
+        return samples, body.head
+
+    def _scan_samples(self, samples: dict[str, list[str]]) -> list[tuple[str, dict[str, Any]]]:
+        """(field path, scanner result) for the sensitive paths of one response page."""
+        results = []
+        for key, values in samples.items():
+            result = self.scanner.scan_column(key, " ".join(values))
+            if result.get("sensitivity_level") in ("HIGH", "MEDIUM"):
+                results.append((key, {
+                    "sensitivity_level": result.get("sensitivity_level", "MEDIUM"),
+                    "pattern_detected": result.get("pattern_detected", ""),
+                    "norm_tag": result.get("norm_tag", ""),
+                    "ml_confidence": result.get("ml_confidence") or 0,
+                }))
+        return results
+
+    def _save_finding(
+        self, target_name: str, path_str: str, key: str, result: dict[str, Any], seen_path_key: set[tuple[str, str]],
+    ) -> None:
+        if (path_str, key) in seen_path_key:
+            return
+        seen_path_key.add((path_str, key))
+        self.db_manager.save_finding(
+            "filesystem",
+            target_name=target_name,
+            path=self.config.get("base_url", "") + path_str,
+            file_name=f"GET {path_str} | {key}",
+            data_type="application/json",
+            sensitivity_level=result.get("sensitivity_level", "MEDIUM"),
+            pattern_detected=result.get("pattern_detected", ""),
+            norm_tag=result.get("norm_tag", ""),
+            ml_confidence=result.get("ml_confidence") or 0,
+        )
 
 
 if _HTTPX_AVAILABLE:
@@ -1,19 +1,26 @@
 """
-SharePoint connector: connect to SharePoint (on-prem or URL) by site_url (FQDN), list files in a folder,
-download to temp, run same text extraction and sensitivity detection as filesystem.
+SharePoint connector: connect to SharePoint (on-prem or URL) by site_url (FQDN), list the files of a folder and
+its subfolders, download into memory (text formats: only the sampled prefix, with an HTTP Range request), run the
+same extraction and sensitivity detection as filesystem (no temp files, except SQLite files opened as databases).
+Listing: REST with $select of the needed fields, odata=nometadata JSON and next links followed; folders are crawled
+breadth-first on the fetch pool. With incremental: true, the site's change token is kept in connector_state and
+repeat scans fetch only the files added or modified since (GetChanges).
 Uses REST API with NTLM or basic auth. Requires optional: requests_ntlm (or uv pip install -e ".[shares]").
 """
-import os
-import tempfile
+from collections.abc import Iterator
 from pathlib import Path
-from typing import Any
+from typing import Any, NamedTuple
+from urllib.parse import quote
 
 from core.connector_registry import register
+from core.fetch_pool import FetchPool, failure_reason, pool_from_config
+from core.throttle import IOThrottle
 
 from connectors.filesystem_connector import (
     SUPPORTED_EXTENSIONS,
-    _read_text_sample,
-    _scan_sqlite_file_as_db,
+    _read_http_body,
+    _remote_read_limit,
+    _scan_file_bytes,
 )
 
 try:
@@ -25,8 +32,6 @@ except ImportError:
     requests = None
     HttpNtlmAuth = None
 
-SQLITE_EXTENSIONS = {".sqlite", ".sqlite3", ".db"}
-
 
 def _normalize_extensions(extensions: Any) -> set[str]:
     if not extensions:
@@ -38,10 +43,58 @@ def _normalize_extensions(extensions: Any) -> set[str]:
     return {e if e.startswith(".") else f".{e.lstrip('*')}" for e in exts}
 
 
+_ACCEPT = "application/json;odata=nometadata"
+_FILE_FIELDS = "Name,ServerRelativeUrl,Length,TimeLastModified"
+_FOLDER_FIELDS = "Name,ServerRelativeUrl"
+_ITEM_FIELDS = "FileRef,FileLeafRef,FSObjType,File_x0020_Size,Modified"
+_PAGE_SIZE = 1000
+# SP.ChangeType values that leave a file to scan: Add, Update, Rename, MoveInto, Restore
+_SCANNED_CHANGES = {1, 2, 4, 6, 7}
+
+
+class SPFile(NamedTuple):
+    """A file to scan: server-relative URL, name, size and last-modified as sent by SharePoint."""
+
+    server_relative_url: str
+    name: str
+    size: int | None
+    modified: str | None
+
+
+def _odata_path(path: str) -> str:
+    """Path as an OData string literal inside ('...'): quotes doubled, URL-encoded."""
+    return quote(path.replace("'", "''"), safe="/'")
+
+
+def _size(value: Any) -> int | None:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _json_results(data: dict[str, Any]) -> tuple[list[dict[str, Any]], str | None]:
+    """Rows and next link of a collection response (nometadata: value / odata.nextLink; verbose: d.results / __next)."""
+    if isinstance(data.get("d"), dict):
+        data = data["d"]
+        return data.get("results", []), data.get("__next")
+    return data.get("value", data.get("results", [])), data.get("odata.nextLink")
+
+
+def _get_pages(session: Any, url: str) -> Iterator[dict[str, Any]]:
+    """GET a collection and every following page (next links) one at a time."""
+    while url:
+        r = session.get(url)
+        r.raise_for_status()
+        rows, url = _json_results(r.json())
+        yield from rows
+
+
 class SharePointConnector:
     """
     Connect to SharePoint site (site_url = FQDN or host with path). Credentials: user, password; auth NTLM or basic.
-    List files in folder (path_in_site), download via REST GetFileByServerRelativeUrl/.../$value, scan, save findings.
+    List files in folder (path_in_site) and subfolders, download via REST GetFileByServerRelativeUrl/.../$value,
+    scan, save findings.
     """
 
     def __init__(
@@ -52,11 +105,15 @@ class SharePointConnector:
         extensions: set[str] | list[str] | None = None,
         scan_sqlite_as_db: bool = True,
         sample_limit: int = 5,
+        scan_tabular_as_table: bool = True,
+        throttle: IOThrottle | None = None,
     ):
         self.config = target_config
+        self.throttle = throttle
         self.scanner = scanner
         self.db_manager = db_manager
         self.scan_sqlite_as_db = scan_sqlite_as_db
+        self.scan_tabular_as_table = scan_tabular_as_table
         self.sample_limit = sample_limit
         self.extensions = _normalize_extensions(extensions)
 
@@ -73,84 +130,222 @@ class SharePointConnector:
         if not site_url:
             self.db_manager.save_failure(target_name, "error", "Missing site_url (e.g. https://host/sites/sitename)")
             return
+        path_in_site = (self.config.get("path", "") or self.config.get("path_in_site", "Shared Documents")).strip("/")
+        session = self._new_session()
+        # One requests.Session (keep-alive, NTLM handshake done once) per worker; extraction overlaps here
+        pool = pool_from_config(self.config, make_client=self._new_session, close_client=lambda s: s.close())
+        incremental = bool(self.config.get("incremental", False))
+        state_key = f"change_token:{site_url}/{path_in_site}"
+        # Token taken before listing: changes made during this scan are picked up by the next one
+        new_token = self._current_change_token(session, site_url) if incremental else None
+        old_token = self.db_manager.get_connector_state(target_name, state_key) if new_token else None
+        unlisted: list[tuple[str, Exception]] = []
+        try:
+            files = None
+            if old_token:
+                files = self._changed_files(session, pool, site_url, path_in_site, old_token)
+            if files is None:
+                files = self._list_files(pool, site_url, path_in_site, unlisted)
+        except Exception as e:
+            self.db_manager.save_failure(target_name, "unreachable", str(e))
+            return
+        finally:
+            session.close()
+        for folder, error in unlisted:
+            self.db_manager.save_failure(target_name, failure_reason(error), f"{folder}: {error}")
+
+        def _files():
+            for item in files:
+                ext = Path(item.name).suffix.lower()
+                if ext in self.extensions:
+                    yield item, ext
+
+        complete = not unlisted
+        for (item, ext), content, error in pool.map(
+            _files(), lambda worker_session, f: self._download_file(worker_session, site_url, f),
+        ):
+            name = item.name
+            server_relative_url = item.server_relative_url
+            if error is not None:
+                complete = False
+                self.db_manager.save_failure(target_name, failure_reason(error), f"{name}: {error}")
+                continue
+            # Classified in memory; only SQLite-as-DB goes through a temp file
+            findings = _scan_file_bytes(
+                content, ext, name, self.scanner, self.sample_limit,
+                scan_tabular_as_table=self.scan_tabular_as_table, parent=server_relative_url, content_name=name,
+                scan_sqlite_as_db=self.scan_sqlite_as_db,
+            )
+            for finding in findings:
+                self.db_manager.save_finding(
+                    "filesystem",
+                    target_name=target_name,
+                    path=server_relative_url,
+                    file_name=finding["file_name"],
+                    data_type=finding["data_type"],
+                    sensitivity_level=finding["sensitivity_level"],
+                    pattern_detected=finding["pattern_detected"],
+                    norm_tag=finding["norm_tag"],
+                    ml_confidence=finding["ml_confidence"],
+                )
+        if new_token and complete:
+            # Files that failed are fetched again next time: the token only moves after a complete pass
+            self.db_manager.set_connector_state(target_name, state_key, new_token)
+
+    def _list_folder(self, session: Any, site_url: str, folder: str) -> tuple[list[SPFile], list[str]]:
+        """Files and subfolders (server-relative URLs) of one folder, all pages, only the selected fields."""
+        base = f"{site_url}/_api/web/GetFolderByServerRelativeUrl('{_odata_path(folder)}')"
+        files = [
+            SPFile(
+                row.get("ServerRelativeUrl") or f"/{folder}/{row.get('Name', '')}".replace("//", "/"),
+                row.get("Name", ""), _size(row.get("Length")), row.get("TimeLastModified"),
+            )
+            for row in _get_pages(session, f"{base}/Files?$select={_FILE_FIELDS}&$top={_PAGE_SIZE}")
+            if row.get("Name")
+        ]
+        folders = [
+            row["ServerRelativeUrl"]
+            for row in _get_pages(session, f"{base}/Folders?$select={_FOLDER_FIELDS}&$top={_PAGE_SIZE}")
+            if row.get("ServerRelativeUrl")
+        ]
+        return files, folders
+
+    def _list_files(
+        self, pool: FetchPool, site_url: str, root: str, unlisted: list[tuple[str, Exception]],
+    ) -> list[SPFile]:
+        """
+        Files of root and all its subfolders: breadth-first, one level at a time on the pool's workers (explicit
+        queue). A folder that cannot be listed is appended to unlisted; a failure on root raises.
+        """
+        files: list[SPFile] = []
+        queue, seen = [root], {root}
+        while queue:
+            level, queue = queue, []
+            for folder, listing, error in pool.map(level, lambda s, f: self._list_folder(s, site_url, f)):
+                if error is not None:
+                    if folder == root:
+                        raise error
+                    unlisted.append((folder, error))
+                    continue
+                folder_files, subfolders = listing
+                files.extend(folder_files)
+                for sub in subfolders:
+                    if sub not in seen:
+                        seen.add(sub)
+                        queue.append(sub)
+            queue.sort()
+        return sorted(files, key=lambda f: f.server_relative_url)
+
+    def _current_change_token(self, session: Any, site_url: str) -> str | None:
+        """The site's current change token (None when the server does not expose one: full listing every time)."""
+        try:
+            r = session.get(f"{site_url}/_api/web/CurrentChangeToken")
+            r.raise_for_status()
+            data = r.json()
+        except Exception:
+            return None
+        data = data.get("d", data)
+        return data.get("StringValue") or None
+
+    def _changed_files(
+        self, session: Any, pool: FetchPool, site_url: str, root: str, token: str,
+    ) -> list[SPFile] | None:
+        """
+        Files under root added or modified since token (web GetChanges, paged by FetchLimit, then each changed
+        item's file fields). None when the token is rejected (expired change log, moved site) or a changed item
+        cannot be read (timeout, 5xx, 401): full listing, so no change is lost when the token moves on.
+        """
+        try:
+            folder_url = f"{site_url}/_api/web/GetFolderByServerRelativeUrl('{_odata_path(root)}')"
+            r = session.get(f"{folder_url}?$select=ServerRelativeUrl")
+            r.raise_for_status()
+            data = r.json()
+            prefix = data.get("d", data)["ServerRelativeUrl"].rstrip("/") + "/"
+            r = session.post(f"{site_url}/_api/contextinfo")
+            r.raise_for_status()
+            data = r.json()
+            digest = data.get("d", {}).get("GetContextWebInformation", data)["FormDigestValue"]
+            changed: dict[tuple[str, int], None] = {}
+            while True:
+                query = {
+                    "Item": True, "Add": True, "Update": True, "Rename": True, "Move": True, "Restore": True,
+                    "FetchLimit": _PAGE_SIZE, "ChangeTokenStart": {"StringValue": token},
+                }
+                r = session.post(
+                    f"{site_url}/_api/web/GetChanges", json={"query": query},
+                    headers={"X-RequestDigest": digest, "Content-Type": _ACCEPT},
+                )
+                r.raise_for_status()
+                rows, _ = _json_results(r.json())
+                for row in rows:
+                    if row.get("ChangeType") in _SCANNED_CHANGES and row.get("ListId") and row.get("ItemId"):
+                        changed[(row["ListId"], int(row["ItemId"]))] = None
+                if len(rows) < _PAGE_SIZE:
+                    break
+                token = (rows[-1].get("ChangeToken") or {}).get("StringValue")
+                if not token:
+                    break
+        except Exception:
+            return None
+        files = []
+        for _key, row, error in pool.map(list(changed), lambda s, key: self._changed_item(s, site_url, key)):
+            if error is not None:
+                return None
+            # Items deleted since the change (None: 404) are skipped; folders have FSObjType 1
+            if not row or str(row.get("FSObjType", "0")) != "0":
+                continue
+            url = row.get("FileRef", "")
+            if url.startswith(prefix):
+                files.append(SPFile(
+                    url, row.get("FileLeafRef") or url.rsplit("/", 1)[-1], _size(row.get("File_x0020_Size")),
+                    row.get("Modified"),
+                ))
+        return sorted(files, key=lambda f: f.server_relative_url)
+
+    def _changed_item(self, session: Any, site_url: str, key: tuple[str, int]) -> dict[str, Any] | None:
+        """File fields of a changed list item; None when it was deleted since (404)."""
+        list_id, item_id = key
+        r = session.get(f"{site_url}/_api/web/Lists(guid'{list_id}')/Items({item_id})?$select={_ITEM_FIELDS}")
+        if r.status_code == 404:
+            return None
+        r.raise_for_status()
+        data = r.json()
+        return data.get("d", data)
+
+    def _new_session(self) -> Any:
+        """requests.Session with the target's auth (NTLM or basic), TLS verification and OData accept header."""
         user = self.config.get("user", self.config.get("username", ""))
         password = self.config.get("pass", self.config.get("password", ""))
-        path_in_site = (self.config.get("path", "") or self.config.get("path_in_site", "Shared Documents")).strip("/")
         use_ntlm = self.config.get("auth", {}).get("type", "ntlm").lower() in ("ntlm", "")
-        verify_ssl = self.config.get("verify_ssl", True)
         session = requests.Session()
-        session.verify = verify_ssl
+        session.verify = self.config.get("verify_ssl", True)
         if use_ntlm and user and password:
             session.auth = HttpNtlmAuth(user, password)
         elif user and password:
             session.auth = (user, password)
-        session.headers["Accept"] = "application/json;odata=verbose"
-        list_files_url = f"{site_url}/_api/web/GetFolderByServerRelativeUrl('{path_in_site}')/Files"
-        try:
-            r = session.get(list_files_url)
-            r.raise_for_status()
-            data = r.json()
-        except Exception as e:
-            self.db_manager.save_failure(target_name, "unreachable", str(e))
-            return
-        results = data.get("d", {}).get("results", data.get("results", []))
-        if not results:
-            return
-        for item in results:
-            name = item.get("Name", item.get("name", ""))
-            if not name:
-                continue
-            ext = Path(name).suffix.lower()
-            if ext not in self.extensions:
-                continue
-            server_relative_url = item.get("ServerRelativeUrl", item.get("serverRelativeUrl", ""))
-            if not server_relative_url:
-                server_relative_url = f"/{path_in_site}/{name}".replace("//", "/")
-            file_value_url = f"{site_url}/_api/web/GetFileByServerRelativeUrl('{server_relative_url}')/$value"
-            try:
-                r2 = session.get(file_value_url)
-                r2.raise_for_status()
-                content = r2.content
-            except Exception as e:
-                self.db_manager.save_failure(target_name, "permission_denied", f"{name}: {e}")
-                continue
-            with tempfile.NamedTemporaryFile(suffix=ext, delete=False) as tmp:
-                tmp.write(content)
-                temp_path = tmp.name
-            try:
-                if self.scan_sqlite_as_db and ext in SQLITE_EXTENSIONS:
-                    for finding in _scan_sqlite_file_as_db(Path(temp_path), self.scanner, self.sample_limit):
-                        self.db_manager.save_finding(
-                            "filesystem",
-                            target_name=target_name,
-                            path=server_relative_url,
-                            file_name=finding["file_name"],
-                            data_type=finding["data_type"],
-                            sensitivity_level=finding["sensitivity_level"],
-                            pattern_detected=finding["pattern_detected"],
-                            norm_tag=finding["norm_tag"],
-                            ml_confidence=finding["ml_confidence"],
-                        )
-                else:
-                    text = _read_text_sample(Path(temp_path), ext)
-                    res = self.scanner.scan_file_content(text, Path(name))
-                    if res is not None:
-                        self.db_manager.save_finding(
-                            "filesystem",
-                            target_name=target_name,
-                            path=server_relative_url,
-                            file_name=name,
-                            data_type=ext.replace(".", "").upper(),
-                            sensitivity_level=res["sensitivity_level"],
-                            pattern_detected=res["pattern_detected"],
-                            norm_tag=res.get("norm_tag", ""),
-                            ml_confidence=res.get("ml_confidence", 0),
-                        )
-            finally:
-                try:
-                    os.unlink(temp_path)
-                except Exception:
-                    pass
+        session.headers["Accept"] = _ACCEPT
+        return session
+
+    def _download_file(self, session: Any, site_url: str, item: tuple[SPFile, str]) -> bytes:
+        """Download one file with a worker's session (text formats: only the sampled prefix, Range request)."""
+        file, ext = item
+        if self.throttle is not None:
+            self.throttle.file()
+        if file.size == 0:
+            # Empty per the listing: nothing to fetch
+            return b""
+        file_value_url = (
+            f"{site_url}/_api/web/GetFileByServerRelativeUrl('{_odata_path(file.server_relative_url)}')/$value"
+        )
+        limit = _remote_read_limit(ext, self.scan_tabular_as_table)
+        headers = {"Range": f"bytes=0-{limit - 1}"} if limit else None
+        response = session.get(file_value_url, headers=headers, stream=True)
+        if headers and response.status_code == 416:
+            # Empty file: nothing to sample
+            response.close()
+            return b""
+        response.raise_for_status()
+        return _read_http_body(response, limit, self.throttle)
 
 
 if _REQUESTS_NTLM_AVAILABLE:
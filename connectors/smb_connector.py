@@ -1,19 +1,22 @@
 """
 SMB/CIFS connector: connect to Windows or Samba shares by host (FQDN or IP), list files,
-download to temp, run same text extraction and sensitivity detection as filesystem.
+read each into memory (text formats: only the sampled prefix) and run the same extraction and sensitivity
+detection as filesystem (no temp files, except SQLite files opened as databases).
+Files are read by a bounded pool of workers (core.fetch_pool: concurrency, retries), each with its own
+SMB connection, while extraction and detection run on the calling thread.
 Requires optional dependency: pip install smbprotocol (or uv pip install -e ".[shares]").
 """
-import os
-import tempfile
 from pathlib import Path
 from typing import Any
 
 from core.connector_registry import register
+from core.fetch_pool import failure_reason, pool_from_config
+from core.throttle import IOThrottle
 
 from connectors.filesystem_connector import (
     SUPPORTED_EXTENSIONS,
-    _read_text_sample,
-    _scan_sqlite_file_as_db,
+    _remote_read_limit,
+    _scan_file_bytes,
 )
 
 try:
@@ -23,8 +26,6 @@ except ImportError:
     _SMB_AVAILABLE = False
     smbclient = None
 
-SQLITE_EXTENSIONS = {".sqlite", ".sqlite3", ".db"}
-
 
 def _normalize_extensions(extensions: Any) -> set[str]:
     if not extensions:
@@ -39,7 +40,8 @@ def _normalize_extensions(extensions: Any) -> set[str]:
 class SMBConnector:
     """
     Connect to SMB/CIFS share (host FQDN or IP, share name, path). Credentials: user, password, optional domain.
-    List files recursively, download to temp, run filesystem-style text extraction and scanner, save findings.
+    List files recursively, read each into memory, run filesystem-style extraction and scanner, save findings.
+    Reads run on a bounded pool (concurrency, retries), one SMB connection per worker.
     """
 
     def __init__(
@@ -50,11 +52,15 @@ class SMBConnector:
         extensions: set[str] | list[str] | None = None,
         scan_sqlite_as_db: bool = True,
         sample_limit: int = 5,
+        scan_tabular_as_table: bool = True,
+        throttle: IOThrottle | None = None,
     ):
         self.config = target_config
+        self.throttle = throttle
         self.scanner = scanner
         self.db_manager = db_manager
         self.scan_sqlite_as_db = scan_sqlite_as_db
+        self.scan_tabular_as_table = scan_tabular_as_table
         self.sample_limit = sample_limit
         self.extensions = _normalize_extensions(extensions)
         self._session_registered = False
@@ -110,65 +116,58 @@ class SMBConnector:
         except Exception as e:
             self.db_manager.save_failure(target_name, "unreachable", str(e))
             return
-        for dirpath, _dirnames, filenames in walker:
-            for filename in filenames:
-                ext = Path(filename).suffix.lower()
-                if ext not in self.extensions:
-                    continue
-                unc_file = dirpath + "\\" + filename
-                try:
-                    with smbclient.open_file(unc_file, mode="rb") as f:
-                        content = f.read()
-                except Exception as e:
-                    self.db_manager.save_failure(target_name, "permission_denied", f"{unc_file}: {e}")
-                    continue
-                if self.scan_sqlite_as_db and ext in SQLITE_EXTENSIONS:
-                    fd, temp_path = tempfile.mkstemp(suffix=ext)
-                    try:
-                        os.write(fd, content)
-                        os.close(fd)
-                        for finding in _scan_sqlite_file_as_db(Path(temp_path), self.scanner, self.sample_limit):
-                            self.db_manager.save_finding(
-                                "filesystem",
-                                target_name=target_name,
-                                path=dirpath,
-                                file_name=finding["file_name"],
-                                data_type=finding["data_type"],
-                                sensitivity_level=finding["sensitivity_level"],
-                                pattern_detected=finding["pattern_detected"],
-                                norm_tag=finding["norm_tag"],
-                                ml_confidence=finding["ml_confidence"],
-                            )
-                    finally:
-                        try:
-                            os.unlink(temp_path)
-                        except Exception:
-                            pass
-                    continue
-                fd, temp_path = tempfile.mkstemp(suffix=ext)
-                try:
-                    os.write(fd, content)
-                    os.close(fd)
-                    text = _read_text_sample(Path(temp_path), ext)
-                    res = self.scanner.scan_file_content(text, Path(unc_file))
-                    if res is None:
-                        continue
-                    self.db_manager.save_finding(
-                        "filesystem",
-                        target_name=target_name,
-                        path=dirpath,
-                        file_name=filename,
-                        data_type=ext.replace(".", "").upper(),
-                        sensitivity_level=res["sensitivity_level"],
-                        pattern_detected=res["pattern_detected"],
-                        norm_tag=res.get("norm_tag", ""),
-                        ml_confidence=res.get("ml_confidence", 0),
-                    )
-                finally:
-                    try:
-                        os.unlink(temp_path)
-                    except Exception:
-                        pass
+
+        def _files():
+            for dirpath, _dirnames, filenames in walker:
+                for filename in filenames:
+                    ext = Path(filename).suffix.lower()
+                    if ext in self.extensions:
+                        yield dirpath, filename, ext
+
+        def _connect() -> dict:
+            # One connection cache (TCP connection + SMB session) per worker thread
+            cache: dict = {}
+            smbclient.register_session(host, username=user, password=password, port=port, connection_cache=cache)
+            return cache
+
+        pool = pool_from_config(
+            self.config, make_client=_connect,
+            close_client=lambda cache: smbclient.reset_connection_cache(connection_cache=cache),
+        )
+        # Downloads run on the pool's workers; extraction and detection overlap with them here
+        for (dirpath, filename, ext), content, error in pool.map(_files(), self._read_file):
+            if error is not None:
+                self.db_manager.save_failure(target_name, failure_reason(error), f"{dirpath}\\{filename}: {error}")
+                continue
+            # Classified in memory; only SQLite-as-DB goes through a temp file
+            findings = _scan_file_bytes(
+                content, ext, filename, self.scanner, self.sample_limit,
+                scan_tabular_as_table=self.scan_tabular_as_table, parent=dirpath, content_name=filename,
+                scan_sqlite_as_db=self.scan_sqlite_as_db,
+            )
+            for finding in findings:
+                self.db_manager.save_finding(
+                    "filesystem",
+                    target_name=target_name,
+                    path=dirpath,
+                    file_name=finding["file_name"],
+                    data_type=finding["data_type"],
+                    sensitivity_level=finding["sensitivity_level"],
+                    pattern_detected=finding["pattern_detected"],
+                    norm_tag=finding["norm_tag"],
+                    ml_confidence=finding["ml_confidence"],
+                )
+
+    def _read_file(self, cache: dict, item: tuple[str, str, str]) -> bytes:
+        """Read one file through a worker's connection cache (text formats: only the sampled prefix)."""
+        dirpath, filename, ext = item
+        limit = _remote_read_limit(ext, self.scan_tabular_as_table)
+        with smbclient.open_file(dirpath + "\\" + filename, mode="rb", connection_cache=cache) as f:
+            if self.throttle is None:
+                return f.read(-1 if limit is None else limit)
+            # Chunked so the bytes/sec budget paces the transfer instead of one burst per file
+            self.throttle.file()
+            return self.throttle.wrap(f).read(-1 if limit is None else limit)
 
 
 if _SMB_AVAILABLE:
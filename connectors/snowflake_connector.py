@@ -3,6 +3,11 @@ Snowflake connector: optional, requires snowflake-connector-python (.[bigdata] e
 Uses Snowflake's Python connector directly (no SQLAlchemy) to discover tables/columns,
 sample rows, run sensitivity detection, and save findings as database metadata.
 
+Every query resumes the warehouse and costs credits, so a run issues one information_schema.columns
+query for the whole database and one SELECT <sampled columns> FROM t SAMPLE (n ROWS) per table, read
+as Arrow batches. Query counts, execution time and estimated credits go to the session metadata
+(scan_metadata["snowflake"]) and the report's Report info sheet.
+
 Target config (type: database, driver: snowflake):
 
   - name: "Warehouse_LGPD"
@@ -16,6 +21,9 @@ Target config (type: database, driver: snowflake):
     warehouse: "AUDIT_WH"
     role: "ANALYST"           # optional
 """
+import itertools
+import time
+from collections.abc import Iterator
 from typing import Any
 
 from core.connector_registry import register
@@ -28,6 +36,16 @@ except ImportError:
     _SNOWFLAKE_AVAILABLE = False
     snowflake = None  # type: ignore[assignment]
 
+# information_schema data types whose values are sampled; other columns (BINARY, BOOLEAN, FLOAT,
+# timestamps, GEOGRAPHY, ...) are classified by name only and stay out of the SAMPLE query
+_SAMPLED_TYPES = frozenset({"TEXT", "NUMBER", "VARIANT", "OBJECT", "ARRAY", "DATE"})
+
+# Standard warehouse credits per hour by size (WAREHOUSE_SIZE in query history, dashes removed)
+_CREDITS_PER_HOUR = {
+    "XSMALL": 1, "SMALL": 2, "MEDIUM": 4, "LARGE": 8, "XLARGE": 16, "XXLARGE": 32, "2XLARGE": 32,
+    "XXXLARGE": 64, "3XLARGE": 64, "4XLARGE": 128, "5XLARGE": 256, "6XLARGE": 512,
+}
+
 
 class SnowflakeConnector:
     """
@@ -47,6 +65,8 @@ class SnowflakeConnector:
         self.db_manager = db_manager
         self.sample_limit = max(int(sample_limit or 5), 1)
         self._conn = None
+        self._counts = {"queries": 0}
+        self._query_ids: list[str] = []
 
     def connect(self) -> None:
         if not _SNOWFLAKE_AVAILABLE:
@@ -90,7 +110,7 @@ class SnowflakeConnector:
             return []
         cur = self._conn.cursor()
         try:
-            cur.execute(sql, params or ())
+            self._executed(cur, sql, params)
             return cur.fetchall()
         finally:
             try:
@@ -98,70 +118,99 @@ class SnowflakeConnector:
             except Exception:
                 pass
 
-    def _list_tables(self) -> list[dict[str, str]]:
-        """
-        Return list of {schema, table} for base tables in the current database.
-        """
-        rows = self._execute(
-            """
-            SELECT table_schema, table_name
-            FROM information_schema.tables
-            WHERE table_type = 'BASE TABLE'
-            ORDER BY table_schema, table_name
-            """
-        )
-        out: list[dict[str, str]] = []
-        for schema, table in rows:
-            out.append({"schema": str(schema or ""), "table": str(table or "")})
-        return out
+    def _executed(self, cur: Any, sql: str, params: tuple[Any, ...] | None = None) -> None:
+        """Run sql on cur and remember its query id, so the run's warehouse usage can be looked up afterwards."""
+        cur.execute(sql, params or ())
+        self._counts["queries"] += 1
+        query_id = getattr(cur, "sfqid", None)
+        if query_id:
+            self._query_ids.append(str(query_id))
 
-    def _get_columns(self, schema: str, table: str) -> list[dict[str, str]]:
+    def _discover_columns(self) -> list[dict[str, Any]]:
         """
-        Return list of {name, type} for columns in the given table.
+        Return list of {schema, table, columns: [{name, type}]} for base tables in the current database,
+        from a single information_schema.columns query (instead of one query per table).
         """
         rows = self._execute(
             """
-            SELECT column_name, data_type
-            FROM information_schema.columns
-            WHERE table_schema = %s AND table_name = %s
-            ORDER BY ordinal_position
-            """,
-            (schema, table),
+            SELECT c.table_schema, c.table_name, c.column_name, c.data_type
+            FROM information_schema.columns c
+            JOIN information_schema.tables t
+              ON t.table_schema = c.table_schema AND t.table_name = c.table_name
+            WHERE t.table_type = 'BASE TABLE'
+            ORDER BY c.table_schema, c.table_name, c.ordinal_position
+            """
         )
-        out: list[dict[str, str]] = []
-        for name, dtype in rows:
-            out.append({"name": str(name or ""), "type": str(dtype or "")})
+        out: list[dict[str, Any]] = []
+        for schema, table, name, dtype in rows:
+            schema, table = str(schema or ""), str(table or "")
+            if not out or (out[-1]["schema"], out[-1]["table"]) != (schema, table):
+                out.append({"schema": schema, "table": table, "columns": []})
+            out[-1]["columns"].append({"name": str(name or ""), "type": str(dtype or "")})
         return out
 
-    def _sample_column(self, schema: str, table: str, column: str) -> str:
+    def _sample_table(self, schema: str, table: str, columns: list[str]) -> dict[str, str]:
         """
-        Fetch up to sample_limit values from column; return concatenated string for detection.
-        Does not persist any raw content.
+        Fetch up to sample_limit rows of the given columns with one SAMPLE (n ROWS) query; return
+        {column: concatenated values} for detection. Does not persist any raw content.
         """
-        if self._conn is None:
-            return ""
-        # Simple identifier quoting; names come from information_schema, not user input.
-        def _q(identifier: str) -> str:
-            return '"' + identifier.replace('"', '""') + '"'
-
+        if self._conn is None or not columns:
+            return {}
         full_table = f"{_q(schema)}.{_q(table)}" if schema else _q(table)
-        col = _q(column)
-        sql = f"SELECT {col} FROM {full_table} LIMIT {self.sample_limit}"
+        sql = f"SELECT {', '.join(_q(c) for c in columns)} FROM {full_table} SAMPLE ({self.sample_limit} ROWS)"
         cur = self._conn.cursor()
-        parts: list[str] = []
+        values: list[list[str]] = [[] for _ in columns]
         try:
-            cur.execute(sql)
-            for row in cur.fetchmany(self.sample_limit):
-                if row and row[0] is not None:
-                    parts.append(str(row[0])[:200])
+            self._executed(cur, sql)
+            for batch in _fetch_columns(cur, len(columns), self.sample_limit):
+                for i, column_values in enumerate(batch):
+                    values[i].extend(str(v)[:200] for v in column_values if v is not None)
         except Exception:
-            return ""
+            return {}
         finally:
             try:
                 cur.close()
             except Exception:
                 pass
-        return " ".join(parts)
+        return {name: " ".join(parts) for name, parts in zip(columns, values)}
+
+    def _query_cost(self) -> dict[str, Any]:
+        """
+        Execution time, bytes scanned and credits of this run's queries, from the session's query history
+        (no warehouse needed). Warehouse credits are estimated from execution time and warehouse size, as
+        Snowflake bills warehouses per second of uptime rather than per query.
+        """
+        if not self._query_ids:
+            return {}
+        ids = list(self._query_ids)
+        placeholders = ", ".join(["%s"] * len(ids))
+        try:
+            rows = self._execute(
+                f"""
+                SELECT query_id, execution_time, bytes_scanned, warehouse_size, credits_used_cloud_services
+                FROM TABLE(information_schema.query_history_by_session(RESULT_LIMIT => 10000))
+                WHERE query_id IN ({placeholders})
+                """,
+                tuple(ids),
+            )
+        except Exception:
+            return {}
+        execution_ms = 0
+        scanned = 0
+        warehouse_credits = 0.0
+        cloud_credits = 0.0
+        for _query_id, execution_time, bytes_scanned, warehouse_size, cloud_services in rows:
+            execution_ms += int(execution_time or 0)
+            scanned += int(bytes_scanned or 0)
+            per_hour = _CREDITS_PER_HOUR.get(str(warehouse_size or "").upper().replace("-", ""), 0)
+            warehouse_credits += (execution_time or 0) / 3_600_000 * per_hour
+            cloud_credits += float(cloud_services or 0)
+        return {
+            "execution_seconds": round(execution_ms / 1000, 3),
+            "bytes_scanned": scanned,
+            "warehouse_credits_estimate": round(warehouse_credits, 6),
+            "cloud_services_credits": round(cloud_credits, 6),
+        }
 
     def run(self) -> None:
         target_name = self.config.get("name", "Snowflake")
@@ -171,6 +220,8 @@ class SnowflakeConnector:
         except Exception as e:
             self.db_manager.save_failure(target_name, "unreachable", str(e))
             return
+        started = time.monotonic()
+        tables: list[dict[str, Any]] = []
         try:
             try:
                 from utils.logger import log_connection
@@ -178,16 +229,18 @@ class SnowflakeConnector:
                 log_connection(target_name, "database", account or "snowflake")
             except Exception:
                 pass
-            tables = self._list_tables()
+            tables = self._discover_columns()
             for t in tables:
                 schema = t["schema"]
                 table = t["table"]
-                columns = self._get_columns(schema, table)
+                columns = t["columns"]
+                samples = self._sample_table(
+                    schema, table, [c["name"] for c in columns if c["type"].upper() in _SAMPLED_TYPES]
+                )
                 for col in columns:
                     cname = col["name"]
                     ctype = col["type"]
-                    sample = self._sample_column(schema, table, cname)
-                    res = self.scanner.scan_column(cname, sample)
+                    res = self.scanner.scan_column(cname, samples.get(cname, ""))
                     if res.get("sensitivity_level") == "LOW":
                         continue
                     self.db_manager.save_finding(
@@ -214,7 +267,58 @@ class SnowflakeConnector:
         except Exception as e:
             self.db_manager.save_failure(target_name, "error", str(e))
         finally:
-            self.close()
+            try:
+                self._save_usage(target_name, tables, time.monotonic() - started)
+            finally:
+                self.close()
+
+    def _save_usage(self, target_name: str, tables: list[dict[str, Any]], seconds: float) -> None:
+        """Query counts and warehouse usage under scan_metadata["snowflake"][target_name]."""
+        session_id = self.db_manager.current_session_id
+        if not session_id:
+            return
+        stats: dict[str, Any] = {
+            "seconds": round(seconds, 3),
+            "queries": self._counts["queries"],
+            "tables": len(tables),
+            "columns": sum(len(t["columns"]) for t in tables),
+        }
+        # What one columns query per table plus one LIMIT query per column would have run
+        stats["per_column_queries"] = 1 + stats["tables"] + stats["columns"]
+        stats.update(self._query_cost())
+        try:
+            self.db_manager.update_session_metadata(session_id, {"snowflake": {target_name: stats}})
+        except Exception:
+            pass
+
+
+def _q(identifier: str) -> str:
+    """Simple identifier quoting; names come from information_schema, not user input."""
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def _fetch_columns(cur: Any, width: int, limit: int) -> Iterator[list[Any]]:
+    """
+    Rows of an executed query as batches of column value lists, up to limit rows: Arrow result batches when the
+    connector has pyarrow (fetch_arrow_batches), plain fetchmany otherwise.
+    """
+    try:
+        # Pull the first batch here: the unsupported case may only raise once iteration starts
+        batches = iter(cur.fetch_arrow_batches())
+        first = next(batches, None)
+    except Exception:
+        batches = None
+    if batches is not None:
+        seen = 0
+        for batch in itertools.chain([first] if first is not None else [], batches):
+            if seen >= limit:
+                break
+            batch = batch.slice(0, limit - seen)
+            seen += batch.num_rows
+            yield [batch.column(i).to_pylist() for i in range(width)]
+        return
+    rows = cur.fetchmany(limit)
+    yield [[row[i] for row in rows] for i in range(width)]
 
 
 if _SNOWFLAKE_AVAILABLE:
@@ -1,29 +1,43 @@
 """
-WebDAV connector: connect to WebDAV server by URL (FQDN or IP), list files, download to temp,
-run same text extraction and sensitivity detection as filesystem.
+WebDAV connector: connect to WebDAV server by URL (FQDN or IP), list files, download each into memory
+(text formats: only the sampled prefix, with an HTTP Range request), run same extraction and sensitivity
+detection as filesystem (no temp files, except SQLite files opened as databases).
+Listing: one PROPFIND Depth: infinity (multistatus parsed incrementally), or a breadth-first Depth: 1 crawl when
+the server refuses it; each file's size and last-modified are kept (DavEntry) for incremental scanning.
+Listing and downloads run on a bounded pool of workers (core.fetch_pool: concurrency, retries), each with its own client.
 Requires optional dependency: pip install webdavclient3 (or uv pip install -e ".[shares]").
 """
-import os
-import tempfile
+from collections.abc import Iterator
+from datetime import datetime
+from email.utils import parsedate_to_datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, NamedTuple
+from urllib.parse import unquote, urlsplit
+
+try:
+    from defusedxml.ElementTree import iterparse
+except ImportError:
+    from xml.etree.ElementTree import iterparse
 
 from core.connector_registry import register
+from core.fetch_pool import FetchPool, failure_reason, pool_from_config
+from core.throttle import IOThrottle
 
 from connectors.filesystem_connector import (
     SUPPORTED_EXTENSIONS,
-    _read_text_sample,
-    _scan_sqlite_file_as_db,
+    _read_http_body,
+    _remote_read_limit,
+    _scan_file_bytes,
 )
 
 try:
     from webdav3.client import Client as WebDAVClient
+    from webdav3.urn import Urn
     _WEBDAV_AVAILABLE = True
 except ImportError:
     _WEBDAV_AVAILABLE = False
     WebDAVClient = None
-
-SQLITE_EXTENSIONS = {".sqlite", ".sqlite3", ".db"}
+    Urn = None
 
 
 def _normalize_extensions(extensions: Any) -> set[str]:
@@ -36,44 +50,171 @@ def _normalize_extensions(extensions: Any) -> set[str]:
     return {e if e.startswith(".") else f".{e.lstrip('*')}" for e in exts}
 
 
-def _list_webdav_recursive(client: Any, path: str) -> list[str]:
-    """Return list of remote file paths (relative)."""
-    out = []
+_DAV = "{DAV:}"
+_PROPFIND_BODY = (
+    '<?xml version="1.0" encoding="utf-8"?>'
+    '<d:propfind xmlns:d="DAV:"><d:prop>'
+    "<d:resourcetype/><d:getcontentlength/><d:getlastmodified/>"
+    "</d:prop></d:propfind>"
+)
+
+
+class DavEntry(NamedTuple):
+    """One PROPFIND result: path relative to the server root (as used for downloads), size and mtime when sent."""
+
+    path: str
+    is_dir: bool
+    size: int | None
+    modified: datetime | None
+
+
+def _relative_path(href: str, base_path: str) -> str:
+    """href (absolute URL or path, percent-encoded) to a path relative to the base_url's path."""
+    path = unquote(urlsplit(href).path)
+    if base_path and (path == base_path or path.startswith(base_path + "/")):
+        path = path[len(base_path):]
+    return path.strip("/")
+
+
+def _iter_multistatus(stream: Any, base_path: str) -> Iterator[DavEntry]:
+    """
+    Parse a 207 multistatus body incrementally: one DavEntry per <response>, each element cleared and detached
+    from the root once read, so a Depth: infinity listing of a large tree is never held in memory as a whole.
+    """
+    root = None
+    for event, elem in iterparse(stream, events=("start", "end")):
+        if event == "start":
+            if root is None:
+                root = elem
+            continue
+        if elem.tag != _DAV + "response":
+            continue
+        is_dir, size, modified = False, None, None
+        for propstat in elem.iter(_DAV + "propstat"):
+            status = (propstat.findtext(_DAV + "status") or "").split()
+            if len(status) > 1 and status[1] != "200":
+                continue
+            prop = propstat.find(_DAV + "prop")
+            if prop is None:
+                continue
+            resourcetype = prop.find(_DAV + "resourcetype")
+            if resourcetype is not None and resourcetype.find(_DAV + "collection") is not None:
+                is_dir = True
+            length = (prop.findtext(_DAV + "getcontentlength") or "").strip()
+            if length.isdigit():
+                size = int(length)
+            last_modified = (prop.findtext(_DAV + "getlastmodified") or "").strip()
+            if last_modified:
+                try:
+                    modified = parsedate_to_datetime(last_modified)
+                except (TypeError, ValueError):
+                    pass
+        href = elem.findtext(_DAV + "href") or ""
+        elem.clear()
+        if root is not None and elem is not root:
+            try:
+                root.remove(elem)
+            except ValueError:
+                # Not a direct child of <multistatus>: cleared only
+                pass
+        yield DavEntry(_relative_path(href, base_path), is_dir, size, modified)
+
+
+def _propfind(client: Any, path: str, depth: str, base_path: str) -> Iterator[DavEntry]:
+    """PROPFIND path with the given Depth header; the body is streamed into the multistatus parser."""
+    response = client.execute_request(
+        "list", Urn(path, directory=True).quote(), data=_PROPFIND_BODY,
+        headers_ext=[f"Depth: {depth}", "Content-Type: application/xml; charset=utf-8"],
+    )
     try:
-        items = client.list(path, get_info=True)
+        raw = response.raw
+        if hasattr(raw, "decode_content"):
+            raw.decode_content = True
+        yield from _iter_multistatus(raw, base_path)
+    finally:
+        response.close()
+
+
+def _parent(path: str) -> str:
+    return path.rsplit("/", 1)[0] if "/" in path else ""
+
+
+def list_webdav_files(
+    client: Any,
+    root: str,
+    base_path: str,
+    recursive: bool = True,
+    pool: FetchPool | None = None,
+    errors: list[tuple[str, Exception]] | None = None,
+) -> list[DavEntry]:
+    """
+    Files under root (sorted by path). Recursive: one PROPFIND Depth: infinity round trip; when the server
+    refuses it (403 propfind-finite-depth, 400, 501...) or answers only one level, the remaining collections are
+    crawled breadth-first with Depth: 1 PROPFINDs, one level at a time on the pool's workers (explicit queue,
+    no recursion). Collections that cannot be listed are appended to errors; a failure on root raises.
+    """
+    root = root.strip("/")
+    if not recursive:
+        return sorted((e for e in _propfind(client, root, "1", base_path) if not e.is_dir), key=lambda e: e.path)
+    files: dict[str, DavEntry] = {}
+    # Entries are consumed as they are parsed; only file entries and directory paths are kept
+    dirs: set[str] = set()
+    expanded: set[str] = set()
+    try:
+        for entry in _propfind(client, root, "infinity", base_path):
+            if entry.path != root:
+                expanded.add(_parent(entry.path))
+            if not entry.is_dir:
+                files[entry.path] = entry
+            elif entry.path != root:
+                dirs.add(entry.path)
     except Exception:
-        return out
-    if not items:
-        return out
-    for item in items:
-        if isinstance(item, dict):
-            name = (item.get("name") or item.get("href", "")).strip("/")
-            if not name:
-                continue
-            rel = (path + "/" + name).strip("/") if path else name
-            content_length = item.get("content_length")
-            is_file = content_length is not None and str(content_length).isdigit()
-            if is_file:
-                out.append(rel)
-            else:
-                out.extend(_list_webdav_recursive(client, rel))
-        else:
-            name = str(item).strip("/")
-            if not name:
+        queue = [root]
+    else:
+        # Servers that cap the depth silently return only the first level: crawl what was not expanded
+        queue = sorted(dirs - expanded)
+    pool = pool or FetchPool(workers=1)
+    seen = set(queue)
+    while queue:
+        level, queue = queue, []
+        listings = pool.map(level, lambda c, path: list(_propfind(c or client, path, "1", base_path)))
+        for path, entries, error in listings:
+            if error is not None:
+                if path == root:
+                    raise error
+                if errors is not None:
+                    errors.append((path, error))
                 continue
-            rel = (path + "/" + name).strip("/") if path else name
-            if rel.endswith("/"):
-                rel = rel.rstrip("/")
-                out.extend(_list_webdav_recursive(client, rel))
-            else:
-                out.append(rel)
-    return out
+            for entry in entries:
+                if not entry.is_dir:
+                    files[entry.path] = entry
+                elif entry.path != path and entry.path not in seen:
+                    seen.add(entry.path)
+                    queue.append(entry.path)
+        queue.sort()
+    return sorted(files.values(), key=lambda e: e.path)
+
+
+def _download(client: Any, remote: str, limit: int | None, throttle: IOThrottle | None = None) -> bytes:
+    """
+    GET remote into memory; with limit, only the first limit bytes (Range request, and the body is not read
+    further when the server ignores it). An empty file answers a Range with 416: empty content.
+    """
+    headers = [f"Range: bytes=0-{limit - 1}"] if limit else None
+    try:
+        response = client.execute_request("download", Urn(remote).quote(), headers_ext=headers)
+    except Exception as e:
+        if headers and getattr(e, "code", None) == 416:
+            return b""
+        raise
+    return _read_http_body(response, limit, throttle)
 
 
 class WebDAVConnector:
     """
     Connect to WebDAV server (base_url = FQDN or IP with optional path). Credentials: user, password.
-    List files recursively, download to temp, run filesystem-style text extraction and scanner, save findings.
+    List files (PROPFIND, see list_webdav_files), download each into memory, run filesystem-style extraction
+    and scanner, save findings.
     """
 
     def __init__(
@@ -84,11 +225,15 @@ class WebDAVConnector:
         extensions: set[str] | list[str] | None = None,
         scan_sqlite_as_db: bool = True,
         sample_limit: int = 5,
+        scan_tabular_as_table: bool = True,
+        throttle: IOThrottle | None = None,
     ):
         self.config = target_config
+        self.throttle = throttle
         self.scanner = scanner
         self.db_manager = db_manager
         self.scan_sqlite_as_db = scan_sqlite_as_db
+        self.scan_tabular_as_table = scan_tabular_as_table
         self.sample_limit = sample_limit
         self.extensions = _normalize_extensions(extensions)
 
@@ -121,79 +266,59 @@ class WebDAVConnector:
         except Exception as e:
             self.db_manager.save_failure(target_name, "error", str(e))
             return
-        if path_in_share:
-            list_path = path_in_share
-        else:
-            list_path = ""
+        # hrefs in PROPFIND answers carry the base_url's path; downloads are relative to it
+        base_path = unquote(urlsplit(base_url).path).rstrip("/")
+        # One WebDAV client (requests.Session, keep-alive) per worker, for the listing crawl and the downloads
+        pool = pool_from_config(self.config, make_client=lambda: WebDAVClient(options))
+        unlisted: list[tuple[str, Exception]] = []
         try:
-            if recursive:
-                files = _list_webdav_recursive(client, list_path)
-            else:
-                items = client.list(list_path, get_info=True)
-                files = []
-                for item in items:
-                    if isinstance(item, dict):
-                        cl = item.get("content_length")
-                        if cl is not None and str(cl).isdigit():
-                            name = (item.get("name") or item.get("href", "")).strip("/")
-                            if name:
-                                files.append(name)
-                    elif isinstance(item, str) and item.strip("/"):
-                        files.append(item.strip("/"))
+            files = list_webdav_files(client, path_in_share, base_path, recursive, pool, unlisted)
         except Exception as e:
             self.db_manager.save_failure(target_name, "unreachable", str(e))
             return
-        for rel_path in files:
-            name = rel_path.split("/")[-1] if "/" in rel_path else rel_path
-            ext = Path(name).suffix.lower()
-            if ext not in self.extensions:
-                continue
-            remote = rel_path if not list_path else f"{list_path}/{rel_path}"
-            with tempfile.NamedTemporaryFile(suffix=ext, delete=False) as tmp:
-                temp_path = tmp.name
-            try:
-                client.download(remote, temp_path)
-            except Exception as e:
-                self.db_manager.save_failure(target_name, "permission_denied", f"{remote}: {e}")
-                try:
-                    os.unlink(temp_path)
-                except Exception:
-                    pass
+        for folder, error in unlisted:
+            self.db_manager.save_failure(target_name, failure_reason(error), f"{folder}: {error}")
+
+        def _files():
+            for entry in files:
+                name = entry.path.rsplit("/", 1)[-1]
+                ext = Path(name).suffix.lower()
+                if ext in self.extensions:
+                    yield entry, name, ext
+
+        for (entry, name, ext), content, error in pool.map(_files(), self._download_file):
+            remote = entry.path
+            if error is not None:
+                self.db_manager.save_failure(target_name, failure_reason(error), f"{remote}: {error}")
                 continue
-            try:
-                if self.scan_sqlite_as_db and ext in SQLITE_EXTENSIONS:
-                    for finding in _scan_sqlite_file_as_db(Path(temp_path), self.scanner, self.sample_limit):
-                        self.db_manager.save_finding(
-                            "filesystem",
-                            target_name=target_name,
-                            path=remote,
-                            file_name=finding["file_name"],
-                            data_type=finding["data_type"],
-                            sensitivity_level=finding["sensitivity_level"],
-                            pattern_detected=finding["pattern_detected"],
-                            norm_tag=finding["norm_tag"],
-                            ml_confidence=finding["ml_confidence"],
-                        )
-                else:
-                    text = _read_text_sample(Path(temp_path), ext)
-                    res = self.scanner.scan_file_content(text, Path(remote))
-                    if res is not None:
-                        self.db_manager.save_finding(
-                            "filesystem",
-                            target_name=target_name,
-                            path=remote,
-                            file_name=name,
-                            data_type=ext.replace(".", "").upper(),
-                            sensitivity_level=res["sensitivity_level"],
-                            pattern_detected=res["pattern_detected"],
-                            norm_tag=res.get("norm_tag", ""),
-                            ml_confidence=res.get("ml_confidence", 0),
-                        )
-            finally:
-                try:
-                    os.unlink(temp_path)
-                except Exception:
-                    pass
+            # Classified in memory; only SQLite-as-DB goes through a temp file
+            findings = _scan_file_bytes(
+                content, ext, name, self.scanner, self.sample_limit,
+                scan_tabular_as_table=self.scan_tabular_as_table, parent=remote, content_name=name,
+                scan_sqlite_as_db=self.scan_sqlite_as_db,
+            )
+            for finding in findings:
+                self.db_manager.save_finding(
+                    "filesystem",
+                    target_name=target_name,
+                    path=remote,
+                    file_name=finding["file_name"],
+                    data_type=finding["data_type"],
+                    sensitivity_level=finding["sensitivity_level"],
+                    pattern_detected=finding["pattern_detected"],
+                    norm_tag=finding["norm_tag"],
+                    ml_confidence=finding["ml_confidence"],
+                )
+
+    def _download_file(self, client: Any, item: tuple[DavEntry, str, str]) -> bytes:
+        """Download one file with a worker's client (text formats: only the sampled prefix)."""
+        entry, _name, ext = item
+        if self.throttle is not None:
+            self.throttle.file()
+        if entry.size == 0:
+            # Empty per the listing: nothing to fetch
+            return b""
+        return _download(client, entry.path, _remote_read_limit(ext, self.scan_tabular_as_table), self.throttle)
 
 
 if _WEBDAV_AVAILABLE:
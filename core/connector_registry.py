@@ -57,7 +57,7 @@ def connector_for_target(target: dict[str, Any]) -> tuple[Type[Any], list[str]]
         return get_connector("filesystem")
     if t in ("api", "rest"):
         return _try_get_connector("api")
-    if t in ("sharepoint", "webdav", "smb", "cifs", "nfs"):
+    if t in ("sharepoint", "webdav", "smb", "cifs", "nfs", "git"):
         return _try_get_connector(t)
     if t in ("powerbi", "dataverse", "powerapps"):
         return _try_get_connector(t)
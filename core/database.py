@@ -1,12 +1,15 @@
 """
 Single SQLite schema for audit results: sessions, database_findings, filesystem_findings, scan_failures.
-LocalDBManager: save_finding(source_type, **kwargs), save_failure, get_findings, list_sessions.
+LocalDBManager: save_finding(source_type, **kwargs), save_failure, get_findings, list_sessions;
+get/set_connector_state for state kept between sessions (connector_state).
 Session id comes from core.session (UUID + timestamp); set via set_current_session_id.
 """
+import json
+import threading
 from datetime import datetime, timezone
 from typing import Any
 
-from sqlalchemy import Column, DateTime, Integer, String, Text, create_engine, text
+from sqlalchemy import Column, DateTime, Integer, String, Text, UniqueConstraint, create_engine, text
 from sqlalchemy.orm import declarative_base, sessionmaker
 from sqlalchemy.pool import NullPool
 
@@ -18,6 +21,17 @@ def _utc_now() -> datetime:
     return datetime.now(timezone.utc)
 
 
+def _load_metadata(raw: str | None) -> dict[str, Any]:
+    """Parse a scan_metadata JSON object; empty dict for NULL or invalid values."""
+    if not raw:
+        return {}
+    try:
+        value = json.loads(raw)
+    except (TypeError, ValueError):
+        return {}
+    return value if isinstance(value, dict) else {}
+
+
 class ScanSession(Base):
     """
     One scan run: UUID + timestamp, status.
@@ -32,6 +46,7 @@ class ScanSession(Base):
     tenant_name = Column(String(255), nullable=True)  # optional customer/tenant for this scan
     technician_name = Column(String(255), nullable=True)  # optional technician/operator for this scan
     config_scope_hash = Column(String(64), nullable=True)  # optional SHA-256 of scan scope (targets, types, extensions) for audit evidence
+    scan_metadata = Column(Text, nullable=True)  # optional JSON object (e.g. io_throttle achieved rates per target)
 
 
 class DatabaseFinding(Base):
@@ -75,7 +90,7 @@ class ScanFailure(Base):
     id = Column(Integer, primary_key=True, autoincrement=True)
     session_id = Column(String(64), nullable=False, index=True)
     target_name = Column(String(100))
-    reason = Column(String(50))  # unreachable, auth_failed, permission_denied, timeout, error
+    reason = Column(String(50))  # unreachable, auth_failed, permission_denied, timeout, archive_limit, mail_limit, blob_limit, error
     details = Column(Text, nullable=True)
     created_at = Column(DateTime, default=_utc_now)
 
@@ -106,6 +121,21 @@ def failure_hint(reason: str) -> str:
             "Operation timed out. Check for high latency, overloaded target, or too strict timeouts. "
             "Consider increasing timeout values and re-running during off-peak hours."
         )
+    if r == "archive_limit":
+        return (
+            "Archive only partially scanned (nesting depth, member count or size limit, or unreadable member). "
+            "Raise file_scan.archive_max_* limits if the archive is trusted, or extract and scan it separately."
+        )
+    if r == "blob_limit":
+        return (
+            "Git blobs larger than max_blob_bytes were not read. Raise max_blob_bytes on the git target "
+            "if those files must be scanned (large binaries are usually safe to skip)."
+        )
+    if r == "mail_limit":
+        return (
+            "Mailbox only partially scanned (message count or message size limit, or unreadable message). "
+            "Raise file_scan.mail_max_messages / mail_max_message_bytes, or split the mailbox and scan it again."
+        )
     return (
         "Unexpected error. Review the detailed message and audit log, verify the target configuration "
         "(host, port, path, credentials) and test connectivity manually before re-running."
@@ -143,6 +173,20 @@ class AggregatedIdentificationRisk(Base):
     created_at = Column(DateTime, default=_utc_now)
 
 
+class ConnectorState(Base):
+    """
+    Per-target state kept between sessions by incremental connectors (e.g. SharePoint change tokens).
+    Not tied to a session: a repeat scan reads what the previous one stored.
+    """
+    __tablename__ = "connector_state"
+    __table_args__ = (UniqueConstraint("target_name", "state_key"),)
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    target_name = Column(String(100), nullable=False, index=True)
+    state_key = Column(String(512), nullable=False)
+    value = Column(Text, nullable=True)
+    updated_at = Column(DateTime, default=_utc_now, onupdate=_utc_now)
+
+
 class LocalDBManager:
     """Single SQLite DB for all audit results; session id set externally (core.session)."""
 
@@ -154,8 +198,11 @@ class LocalDBManager:
         self._ensure_tenant_column()
         self._ensure_technician_column()
         self._ensure_config_scope_hash_column()
+        self._ensure_scan_metadata_column()
         self._session_factory = sessionmaker(bind=self.engine, expire_on_commit=False)
         self._current_session_id: str | None = None
+        # Serializes the read-merge-write of scan_metadata (targets run on parallel threads)
+        self._metadata_lock = threading.Lock()
 
     def _ensure_tenant_column(self) -> None:
         """Add tenant_name column to scan_sessions if missing (migration for existing DBs)."""
@@ -181,6 +228,14 @@ class LocalDBManager:
                 conn.execute(text("ALTER TABLE scan_sessions ADD COLUMN config_scope_hash VARCHAR(64)"))
                 conn.commit()
 
+    def _ensure_scan_metadata_column(self) -> None:
+        """Add scan_metadata column to scan_sessions if missing (migration for existing DBs)."""
+        with self.engine.connect() as conn:
+            r = conn.execute(text("SELECT 1 FROM pragma_table_info('scan_sessions') WHERE name='scan_metadata'"))
+            if r.fetchone() is None:
+                conn.execute(text("ALTER TABLE scan_sessions ADD COLUMN scan_metadata TEXT"))
+                conn.commit()
+
     def _ensure_aggregated_table(self) -> None:
         """Create aggregated_identification_risk table if it does not exist."""
         AggregatedIdentificationRisk.__table__.create(self.engine, checkfirst=True)
@@ -352,6 +407,7 @@ class LocalDBManager:
                     "tenant_name": getattr(s, "tenant_name", None),
                     "technician_name": getattr(s, "technician_name", None),
                     "config_scope_hash": getattr(s, "config_scope_hash", None),
+                    "scan_metadata": _load_metadata(getattr(s, "scan_metadata", None)),
                     "database_findings": db_count,
                     "filesystem_findings": fs_count,
                     "scan_failures": fail_count,
@@ -411,6 +467,68 @@ class LocalDBManager:
         finally:
             session.close()
 
+    def update_session_metadata(self, session_id: str, metadata: dict[str, Any]) -> None:
+        """
+        Merge metadata keys into the session's scan_metadata JSON object (a None value removes the key; a dict
+        is merged one level deep into an existing dict, so targets can add their own entry under a shared key).
+        Safe to call from parallel target threads.
+        """
+        with self._metadata_lock:
+            self._merge_session_metadata(session_id, metadata)
+
+    def _merge_session_metadata(self, session_id: str, metadata: dict[str, Any]) -> None:
+        session = self._session_factory()
+        try:
+            rec = session.query(ScanSession).filter(ScanSession.session_id == session_id).first()
+            if rec:
+                merged = _load_metadata(rec.scan_metadata)
+                for key, value in metadata.items():
+                    if value is None:
+                        merged.pop(key, None)
+                    elif isinstance(value, dict) and isinstance(merged.get(key), dict):
+                        merged[key] = {**merged[key], **value}
+                    else:
+                        merged[key] = value
+                rec.scan_metadata = json.dumps(merged, default=str) if merged else None
+                session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def get_connector_state(self, target_name: str, key: str) -> str | None:
+        """Value stored by set_connector_state for (target_name, key), or None."""
+        session = self._session_factory()
+        try:
+            rec = session.query(ConnectorState).filter(
+                ConnectorState.target_name == target_name, ConnectorState.state_key == key
+            ).first()
+            return rec.value if rec else None
+        finally:
+            session.close()
+
+    def set_connector_state(self, target_name: str, key: str, value: str | None) -> None:
+        """Store (or, with None, remove) a connector state value for (target_name, key)."""
+        session = self._session_factory()
+        try:
+            rec = session.query(ConnectorState).filter(
+                ConnectorState.target_name == target_name, ConnectorState.state_key == key
+            ).first()
+            if value is None:
+                if rec:
+                    session.delete(rec)
+            elif rec:
+                rec.value = value
+            else:
+                session.add(ConnectorState(target_name=target_name, state_key=key, value=value))
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
     def update_session_tenant(self, session_id: str, tenant_name: str | None) -> None:
         """Set or clear tenant_name for an existing session."""
         session = self._session_factory()
@@ -478,6 +596,8 @@ class LocalDBManager:
             session.query(FilesystemFinding).delete(synchronize_session=False)
             session.query(AggregatedIdentificationRisk).delete(synchronize_session=False)
             session.query(ScanFailure).delete(synchronize_session=False)
+            # Incremental state refers to the wiped sessions: next scans start from a full listing
+            session.query(ConnectorState).delete(synchronize_session=False)
             # Delete all scan session rows
             session.query(ScanSession).delete(synchronize_session=False)
             # Record the wipe event itself
@@ -384,7 +384,42 @@ class SensitivityDetector:
         Does not store sample_text. Downgrades classification when content looks like
         song lyrics or music tabs to reduce false positives.
         """
-        combined = f"{column_name} {sample_text}"
+        return self.analyze_many([(column_name, sample_text)])[0]
+
+    def analyze_many(self, columns: list[tuple[str, str]]) -> list[tuple[str, str, str, int]]:
+        """
+        analyze() for many (column_name, sample_text) pairs, in order. The ML and DL models score all
+        pairs in one vectorized call each, instead of one call per column; the hybrid confidence is
+        max(ML, DL) to avoid missing semantic matches.
+        """
+        combined = [f"{column_name} {sample_text}" for column_name, sample_text in columns]
+        ml = self._ml_confidences(combined)
+        dl = self._dl_confidences(combined)
+        return [
+            self._classify(column_name, sample_text, text, max(ml_conf, dl_conf))
+            for (column_name, sample_text), text, ml_conf, dl_conf in zip(columns, combined, ml, dl)
+        ]
+
+    def _ml_confidences(self, texts: list[str]) -> list[int]:
+        """ML confidence 0-100 per text (0 when the model is unavailable or fails)."""
+        if not texts or not (self._ml_available and self._model and self._vectorizer):
+            return [0] * len(texts)
+        try:
+            X = self._vectorizer.transform([t.lower() for t in texts])
+            return [int(round(p[1] * 100)) for p in self._model.predict_proba(X)]
+        except Exception:
+            return [0] * len(texts)
+
+    def _dl_confidences(self, texts: list[str]) -> list[int]:
+        """DL confidence 0-100 per text (0 when the classifier is not ready or gives no answer)."""
+        if not texts or not (self._dl_classifier and self._dl_classifier.is_ready):
+            return [0] * len(texts)
+        return [0 if p is None else int(round(p * 100)) for p in self._dl_classifier.predict_proba_many(texts)]
+
+    def _classify(
+        self, column_name: str, sample_text: str, combined: str, combined_confidence: int,
+    ) -> tuple[str, str, str, int]:
+        """Regex, minor and entertainment rules for one column, given its combined ML/DL confidence."""
         sample_only = sample_text or ""
         entertainment_context = _looks_like_lyrics(sample_only) or _looks_like_music_tab(sample_only)
 
@@ -397,23 +432,6 @@ class SensitivityDetector:
             if rex and rex.search(combined):
                 found_patterns.append((name, norm_tag))
 
-        ml_confidence = 0
-        if self._ml_available and self._model and self._vectorizer:
-            try:
-                X = self._vectorizer.transform([combined.lower()])
-                prob = self._model.predict_proba(X)[0][1]
-                ml_confidence = int(round(prob * 100))
-            except Exception:
-                pass
-
-        # Hybrid DL step: when available, combine with ML (take max to avoid missing semantic matches)
-        dl_confidence = 0
-        if self._dl_classifier and self._dl_classifier.is_ready:
-            prob = self._dl_classifier.predict_proba(combined)
-            if prob is not None:
-                dl_confidence = int(round(prob * 100))
-        combined_confidence = max(ml_confidence, dl_confidence)
-
         if entertainment_context:
             combined_confidence = max(0, combined_confidence - 25)
             if found_patterns:
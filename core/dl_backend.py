@@ -95,16 +95,25 @@ class DLClassifier:
         """
         Return P(sensitive) in [0, 1], or None if backend not ready.
         """
+        return self.predict_proba_many([text])[0]
+
+    def predict_proba_many(self, texts: list[str]) -> list[float | None]:
+        """
+        predict_proba for many texts with one encode call; None for blank texts or if the backend is not ready.
+        """
+        out: list[float | None] = [None] * len(texts)
         if not self._ready or not self._embedder or not self._model:
-            return None
-        if not (text or "").strip():
-            return None
+            return out
+        indexes = [i for i, text in enumerate(texts) if (text or "").strip()]
+        if not indexes:
+            return out
         try:
-            vec = self._embedder.encode([text], convert_to_numpy=True)
-            prob = self._model.predict_proba(vec)[0][1]
-            return float(prob)
+            vecs = self._embedder.encode([texts[i] for i in indexes], convert_to_numpy=True)
+            for i, prob in zip(indexes, self._model.predict_proba(vecs)):
+                out[i] = float(prob[1])
         except Exception:
-            return None
+            pass
+        return out
 
     @property
     def is_ready(self) -> bool:
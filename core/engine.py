@@ -1,6 +1,7 @@
 """
 AuditEngine: orchestrates targets from config via connector registry; uses LocalDBManager and DataScanner.
 Supports sequential or parallel (max_workers) scan; start_audit(), generate_final_reports(session_id).
+File-based targets share an optional I/O throttle (core.throttle); achieved rates go to the session metadata.
 Exposes db_manager, is_running, get_current_findings_count() for API.
 """
 import hashlib
@@ -68,11 +69,21 @@ try:
     import connectors.snowflake_connector  # noqa: F401
 except ImportError:
     pass
+try:
+    import connectors.git_connector  # noqa: F401
+except ImportError:
+    pass
 
 from core.connector_registry import connector_for_target
 from core.database import LocalDBManager
+from core.throttle import IOThrottle, throttle_from_config
 from core.scanner import DataScanner
 from core.session import new_session_id
+from file_scan.archive import archive_limits
+from file_scan.mail import mail_limits
+
+# File-based target types read through an I/O throttle (io_throttle: bytes/sec, files/sec)
+_THROTTLED_TYPES = ("filesystem", "nfs", "smb", "cifs", "webdav", "sharepoint")
 
 
 class AuditEngine:
@@ -94,6 +105,9 @@ class AuditEngine:
         self._last_report_path: str | None = None
         self._max_workers = int(config.get("scan", {}).get("max_workers", 1))
         self._extensions = config.get("file_scan", {}).get("extensions", [])
+        # I/O throttle shared by all workers of a run (io_throttle) and per target throttles charging it
+        self._io_throttle: IOThrottle | None = None
+        self._target_throttles: dict[str, IOThrottle] = {}
 
     @property
     def is_running(self) -> bool:
@@ -127,6 +141,8 @@ class AuditEngine:
         self._is_running = True
         session_id = self.db_manager.current_session_id
         targets = self.config.get("targets", [])
+        self._io_throttle = throttle_from_config(self.config.get("io_throttle"))
+        self._target_throttles = {}
         try:
             if self._max_workers <= 1:
                 for target in targets:
@@ -141,8 +157,30 @@ class AuditEngine:
                             pass
         finally:
             self._is_running = False
+            self._save_throttle_metadata(session_id)
             self.db_manager.finish_session(session_id, "completed")
 
+    def _save_throttle_metadata(self, session_id: str) -> None:
+        """Store achieved I/O rates (global and per target) in the session metadata when a throttle was used."""
+        if self._io_throttle is None and not self._target_throttles:
+            return
+        metadata = {
+            "global": self._io_throttle.stats() if self._io_throttle is not None else None,
+            "targets": {name: throttle.stats() for name, throttle in self._target_throttles.items()},
+        }
+        try:
+            self.db_manager.update_session_metadata(session_id, {"io_throttle": metadata})
+        except Exception as e:
+            from utils.logger import get_logger
+            get_logger().warning("Could not save I/O throttle metadata: %s", e)
+
+    def _target_throttle(self, target: dict[str, Any]) -> IOThrottle | None:
+        """Throttle for a file-based target: its io_throttle block (if any) charged to the global one."""
+        throttle = throttle_from_config(target.get("io_throttle"), parent=self._io_throttle)
+        if throttle is not None:
+            self._target_throttles[target.get("name", "unknown")] = throttle
+        return throttle
+
     def _run_target(self, target: dict[str, Any]) -> None:
         """Run one target: resolve connector, instantiate, run()."""
         resolved = connector_for_target(target)
@@ -158,22 +196,52 @@ class AuditEngine:
         fs_config = self.config.get("file_scan", {})
         scan_sqlite_as_db = fs_config.get("scan_sqlite_as_db", True)
         sample_limit = fs_config.get("sample_limit", 5)
+        scan_tabular_as_table = fs_config.get("scan_tabular_as_table", True)
         ext = fs_config.get("extensions")
+        # Archive (zip/tar in memory) and mailbox (mbox/Maildir) scanning apply to local paths (filesystem, mounted
+        # NFS) and git history blobs
+        archive_kwargs = {
+            "scan_archives": fs_config.get("scan_archives", True),
+            "archive_limits": archive_limits(fs_config),
+            "scan_mailboxes": fs_config.get("scan_mailboxes", True),
+            "mail_limits": mail_limits(fs_config),
+        }
+        # O_NOATIME + posix_fadvise read hints for local disks and NFS mounts (Linux; off by default)
+        page_cache_hints = bool(fs_config.get("page_cache_hints", False))
+        throttle = self._target_throttle(target) if t in _THROTTLED_TYPES else None
         if t == "filesystem":
             if ext is not None:
                 connector = connector_class(
                     target, self.scanner, self.db_manager,
                     extensions=ext, scan_sqlite_as_db=scan_sqlite_as_db, sample_limit=sample_limit,
+                    scan_tabular_as_table=scan_tabular_as_table, page_cache_hints=page_cache_hints,
+                    throttle=throttle, **archive_kwargs,
                 )
             else:
                 connector = connector_class(
                     target, self.scanner, self.db_manager,
                     scan_sqlite_as_db=scan_sqlite_as_db, sample_limit=sample_limit,
+                    scan_tabular_as_table=scan_tabular_as_table, page_cache_hints=page_cache_hints,
+                    throttle=throttle, **archive_kwargs,
                 )
-        elif t in ("sharepoint", "webdav", "smb", "cifs", "nfs"):
+        elif t == "nfs":
+            connector = connector_class(
+                target, self.scanner, self.db_manager,
+                extensions=ext, scan_sqlite_as_db=scan_sqlite_as_db, sample_limit=sample_limit,
+                scan_tabular_as_table=scan_tabular_as_table, page_cache_hints=page_cache_hints,
+                throttle=throttle, **archive_kwargs,
+            )
+        elif t == "git":
+            connector = connector_class(
+                target, self.scanner, self.db_manager,
+                extensions=ext, sample_limit=sample_limit, scan_tabular_as_table=scan_tabular_as_table,
+                **archive_kwargs,
+            )
+        elif t in ("sharepoint", "webdav", "smb", "cifs"):
             connector = connector_class(
                 target, self.scanner, self.db_manager,
                 extensions=ext, scan_sqlite_as_db=scan_sqlite_as_db, sample_limit=sample_limit,
+                scan_tabular_as_table=scan_tabular_as_table, throttle=throttle,
             )
         elif t in ("powerbi", "dataverse", "powerapps"):
             connector = connector_class(target, self.scanner, self.db_manager, sample_limit=sample_limit)
@@ -0,0 +1,210 @@
+"""
+Bounded concurrent fetches for remote-share connectors (SMB, WebDAV, SharePoint): N reads in flight per
+target, one client (requests.Session, WebDAV client, SMB connection cache) per worker thread so keep-alive
+connections are reused, and a backoff shared by the workers when the server reports errors.
+
+Results are yielded to the caller's thread as downloads complete, so extraction, detection and database
+writes run there (one thread, as before) while the workers keep fetching the next files.
+
+Target config: concurrency (reads in flight, default 4), retries (per file on server errors, default 3).
+"""
+import errno
+import itertools
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, TypeVar
+
+try:
+    import requests
+    _TRANSIENT_ERRORS: tuple[type[BaseException], ...] = (
+        ConnectionError, TimeoutError,
+        requests.exceptions.ConnectionError, requests.exceptions.Timeout, requests.exceptions.ChunkedEncodingError,
+    )
+    _TIMEOUT_ERRORS: tuple[type[BaseException], ...] = (TimeoutError, requests.exceptions.Timeout)
+except ImportError:
+    _TRANSIENT_ERRORS = (ConnectionError, TimeoutError)
+    _TIMEOUT_ERRORS = (TimeoutError,)
+# webdav3 wraps requests connection errors in these (matched by name: webdav3 is optional)
+_CONNECTION_ERROR_NAMES = {"NoConnection", "ConnectionException"}
+
+DEFAULT_CONCURRENCY = 4
+DEFAULT_RETRIES = 3
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def _status_code(exc: BaseException) -> int | None:
+    """HTTP status of a requests HTTPError (exc.response) or a webdav3 ResponseErrorCode (exc.code)."""
+    response = getattr(exc, "response", None)
+    code = getattr(response, "status_code", None) if response is not None else getattr(exc, "code", None)
+    return code if isinstance(code, int) else None
+
+
+def is_server_error(exc: BaseException) -> bool:
+    """True for errors worth retrying: connection drops, timeouts, HTTP 429 and 5xx."""
+    if isinstance(exc, _TRANSIENT_ERRORS):
+        return True
+    code = _status_code(exc)
+    return code is not None and (code == 429 or code >= 500)
+
+
+def failure_reason(exc: BaseException) -> str:
+    """
+    save_failure reason for a fetch or listing error left after retries: permission_denied for HTTP 401/403
+    and EACCES/EPERM, timeout, unreachable for connection errors, else error (5xx, protocol errors).
+    """
+    code = _status_code(exc)
+    os_errno = getattr(exc, "errno", None)
+    if code in (401, 403) or isinstance(exc, PermissionError) or os_errno in (errno.EACCES, errno.EPERM):
+        return "permission_denied"
+    if isinstance(exc, _TIMEOUT_ERRORS) or os_errno == errno.ETIMEDOUT:
+        return "timeout"
+    if isinstance(exc, _TRANSIENT_ERRORS) or type(exc).__name__ in _CONNECTION_ERROR_NAMES:
+        return "unreachable"
+    return "error"
+
+
+def parse_retry_after(value: Any) -> float | None:
+    """Seconds from a Retry-After header value (delta-seconds form); None when absent or not a number."""
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def retry_after(exc: BaseException) -> float | None:
+    """Seconds from a Retry-After header (delta-seconds form) on the error's response, if any."""
+    headers = getattr(getattr(exc, "response", None), "headers", None) or {}
+    return parse_retry_after(headers.get("Retry-After"))
+
+
+class AdaptiveBackoff:
+    """
+    Pause shared by all workers of a target: each server error doubles the delay (up to maximum, or uses
+    the server's Retry-After) and holds every worker until it passes; each success halves it again.
+    """
+
+    def __init__(
+        self,
+        initial: float = 0.5,
+        maximum: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.initial = initial
+        self.maximum = maximum
+        self.delay = 0.0
+        self._until = 0.0
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        with self._lock:
+            remaining = self._until - self._clock()
+        if remaining > 0:
+            self._sleep(remaining)
+
+    def failure(self, delay: float | None = None) -> None:
+        with self._lock:
+            self.delay = min(max(self.delay * 2, self.initial), self.maximum)
+            self._until = max(self._until, self._clock() + (self.delay if delay is None else delay))
+
+    def success(self) -> None:
+        with self._lock:
+            self.delay = self.delay / 2 if self.delay > self.initial else 0.0
+
+
+class FetchPool:
+    """Run fetch(client, item) on worker threads, at most 2 * workers submitted, with retries and backoff."""
+
+    def __init__(
+        self,
+        workers: int = DEFAULT_CONCURRENCY,
+        make_client: Callable[[], Any] | None = None,
+        close_client: Callable[[Any], None] | None = None,
+        retries: int = DEFAULT_RETRIES,
+        backoff: AdaptiveBackoff | None = None,
+        is_retryable: Callable[[BaseException], bool] = is_server_error,
+    ):
+        self.workers = max(1, int(workers))
+        self.make_client = make_client
+        self.close_client = close_client
+        self.retries = max(0, int(retries))
+        self.backoff = backoff or AdaptiveBackoff()
+        self.is_retryable = is_retryable
+
+    def _fetch(self, fetch: Callable[[Any, T], R], client: Any, item: T) -> R:
+        attempt = 0
+        while True:
+            self.backoff.wait()
+            try:
+                result = fetch(client, item)
+            except Exception as e:
+                if attempt >= self.retries or not self.is_retryable(e):
+                    raise
+                attempt += 1
+                self.backoff.failure(retry_after(e))
+                continue
+            self.backoff.success()
+            return result
+
+    def map(self, items: Iterable[T], fetch: Callable[[Any, T], R]) -> Iterator[tuple[T, R | None, Exception | None]]:
+        """
+        Yield (item, result, None) or (item, None, error) in completion order; items are consumed lazily.
+        Each worker thread creates its client once (make_client) and reuses it for all its fetches.
+        """
+        local = threading.local()
+        clients: list[Any] = []
+        clients_lock = threading.Lock()
+
+        def _run(item: T) -> R:
+            client = getattr(local, "client", None)
+            if client is None and self.make_client is not None:
+                client = local.client = self.make_client()
+                with clients_lock:
+                    clients.append(client)
+            return self._fetch(fetch, client, item)
+
+        source = iter(items)
+        executor = ThreadPoolExecutor(max_workers=self.workers)
+        pending: dict[Future, T] = {}
+        try:
+            for item in itertools.islice(source, self.workers * 2):
+                pending[executor.submit(_run, item)] = item
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    item = pending.pop(future)
+                    for following in itertools.islice(source, 1):
+                        pending[executor.submit(_run, following)] = following
+                    error = future.exception()
+                    yield item, (None if error is not None else future.result()), error
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            if self.close_client is not None:
+                for client in clients:
+                    try:
+                        self.close_client(client)
+                    except Exception:
+                        pass
+
+
+def pool_from_config(
+    config: dict[str, Any],
+    make_client: Callable[[], Any] | None = None,
+    close_client: Callable[[Any], None] | None = None,
+) -> FetchPool:
+    """FetchPool for a target's concurrency / retries keys (invalid values fall back to the defaults)."""
+    try:
+        workers = int(config.get("concurrency", DEFAULT_CONCURRENCY))
+    except (TypeError, ValueError):
+        workers = DEFAULT_CONCURRENCY
+    try:
+        retries = int(config.get("retries", DEFAULT_RETRIES))
+    except (TypeError, ValueError):
+        retries = DEFAULT_RETRIES
+    return FetchPool(workers, make_client=make_client, close_client=close_client, retries=retries)
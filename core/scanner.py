@@ -43,6 +43,16 @@ class DataScanner:
             "ml_confidence": conf,
         }
 
+    def scan_columns(self, columns: list[tuple[str, str]]) -> list[dict[str, Any]]:
+        """
+        scan_column for many (column_name, sample_content) pairs, in order; the ML/DL models run once per batch.
+        """
+        results = self.detector.analyze_many([(name, sample or "") for name, sample in columns])
+        return [
+            {"sensitivity_level": level, "pattern_detected": pattern, "norm_tag": norm, "ml_confidence": conf}
+            for level, pattern, norm, conf in results
+        ]
+
     def scan_file_content(self, content: str, file_path: str | Path) -> dict[str, Any] | None:
         """
         Analyze file content (and path for context). Returns same shape as scan_column if sensitivity != LOW; else None.
@@ -0,0 +1,249 @@
+"""
+I/O throttle for file-based connectors (filesystem, NFS, SMB, WebDAV, SharePoint): token buckets for
+bytes/sec and files/sec, shared by all workers of a scan (global io_throttle) and optionally per target
+(target io_throttle, checked in addition to the global one).
+
+Config (top-level io_throttle, or io_throttle inside a target):
+
+    io_throttle:
+      bytes_per_second: 52428800     # 0 or missing = unlimited
+      files_per_second: 500
+      burst_seconds: 1               # bucket size in seconds of the rate (default 1)
+      schedule:                      # optional; first matching window (local time) wins
+        - days: [mon, tue, wed, thu, fri]
+          start: "08:00"
+          end: "18:00"               # windows may cross midnight (start > end)
+          bytes_per_second: 5242880  # keys missing in a window keep the base value
+          files_per_second: 50
+
+Reads are paced after the fact: a read takes the bytes it returned from the bucket and sleeps while the
+bucket is in debt, so concurrent readers share the budget. Each throttle keeps counters (files, bytes,
+seconds spent waiting) so achieved rates can be stored in the session metadata.
+"""
+import io
+import threading
+import time
+from datetime import datetime
+from typing import Any, BinaryIO, Callable
+
+_DAYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+_LIMIT_KEYS = ("bytes_per_second", "files_per_second")
+
+
+def _rate(value: Any) -> float | None:
+    """Positive rate or None (unlimited) for missing, zero, negative or invalid values."""
+    try:
+        rate = float(value)
+    except (TypeError, ValueError):
+        return None
+    return rate if rate > 0 else None
+
+
+def _minutes(value: Any) -> int:
+    hours, _, minutes = str(value).strip().partition(":")
+    return (int(hours) * 60 + int(minutes or 0)) % (24 * 60)
+
+
+class TokenBucket:
+    """Thread-safe token bucket; rate None means unlimited. take(n) may leave the bucket in debt and waits it out."""
+
+    def __init__(
+        self,
+        rate: float | None,
+        burst_seconds: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self._lock = threading.Lock()
+        self._clock = clock
+        self._sleep = sleep
+        self.burst_seconds = max(float(burst_seconds), 0.001)
+        self._rate: float | None = None
+        self._tokens = 0.0
+        self._updated = clock()
+        self.set_rate(rate)
+
+    @property
+    def rate(self) -> float | None:
+        return self._rate
+
+    def set_rate(self, rate: float | None) -> None:
+        """Change the rate (e.g. on a schedule boundary); a new limited rate starts with a full bucket."""
+        with self._lock:
+            if rate == self._rate:
+                return
+            was_unlimited = self._rate is None
+            self._refill()
+            self._rate = rate
+            if rate is not None:
+                capacity = rate * self.burst_seconds
+                self._tokens = capacity if was_unlimited else min(self._tokens, capacity)
+
+    def _refill(self) -> None:
+        now = self._clock()
+        if self._rate is not None:
+            self._tokens = min(self._tokens + (now - self._updated) * self._rate, self._rate * self.burst_seconds)
+        self._updated = now
+
+    def take(self, amount: float) -> float:
+        """Take amount tokens, sleeping while the bucket is in debt. Returns the seconds waited."""
+        with self._lock:
+            if self._rate is None or amount <= 0:
+                return 0.0
+            self._refill()
+            self._tokens -= amount
+            wait = -self._tokens / self._rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+
+class IOThrottle:
+    """
+    Bytes/sec and files/sec budget with an optional time-of-day schedule. parent (the global throttle)
+    is charged too, so a target never exceeds either budget.
+    """
+
+    def __init__(
+        self,
+        config: dict[str, Any] | None = None,
+        parent: "IOThrottle | None" = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+        now: Callable[[], datetime] = datetime.now,
+    ):
+        cfg = config or {}
+        self.parent = parent
+        self._now = now
+        self._clock = clock
+        self._base = {key: _rate(cfg.get(key)) for key in _LIMIT_KEYS}
+        self._windows = [w for w in (cfg.get("schedule") or []) if isinstance(w, dict)]
+        try:
+            burst = float(cfg.get("burst_seconds", 1.0))
+        except (TypeError, ValueError):
+            burst = 1.0
+        self._bytes = TokenBucket(self._base["bytes_per_second"], burst, clock, sleep)
+        self._files = TokenBucket(self._base["files_per_second"], burst, clock, sleep)
+        self._lock = threading.Lock()
+        self._next_schedule_check = 0.0
+        self.files = 0
+        self.bytes = 0
+        self.waited_seconds = 0.0
+        self._started: float | None = None
+        self._last: float | None = None
+
+    def limits(self) -> dict[str, float | None]:
+        """Limits in force now (schedule applied)."""
+        at = self._now()
+        minute = at.hour * 60 + at.minute
+        for window in self._windows:
+            days = [str(d).strip().lower()[:3] for d in (window.get("days") or _DAYS)]
+            try:
+                start, end = _minutes(window.get("start", "00:00")), _minutes(window.get("end", "24:00"))
+            except ValueError:
+                continue
+            inside = start <= minute < end if start < end else (minute >= start or minute < end)
+            # A window crossing midnight belongs to the day it started on
+            day = _DAYS[at.weekday() if start < end or minute >= start else (at.weekday() - 1) % 7]
+            if inside and day in days:
+                return {key: _rate(window[key]) if key in window else self._base[key] for key in _LIMIT_KEYS}
+        return dict(self._base)
+
+    def _apply_schedule(self) -> None:
+        if not self._windows:
+            return
+        now = self._clock()
+        if now < self._next_schedule_check:
+            return
+        self._next_schedule_check = now + 1.0
+        limits = self.limits()
+        self._bytes.set_rate(limits["bytes_per_second"])
+        self._files.set_rate(limits["files_per_second"])
+
+    def _count(self, files: int, nbytes: int, waited: float) -> None:
+        now = self._clock()
+        with self._lock:
+            if self._started is None:
+                self._started = now
+            self._last = now
+            self.files += files
+            self.bytes += nbytes
+            self.waited_seconds += waited
+
+    def file(self) -> None:
+        """Account for opening one file (waits for a files/sec token)."""
+        if self.parent is not None:
+            self.parent.file()
+        self._apply_schedule()
+        self._count(1, 0, self._files.take(1))
+
+    def consume(self, nbytes: int) -> None:
+        """Account for nbytes read (waits while the bytes/sec bucket is in debt)."""
+        if nbytes <= 0:
+            return
+        if self.parent is not None:
+            self.parent.consume(nbytes)
+        self._apply_schedule()
+        self._count(0, nbytes, self._bytes.take(nbytes))
+
+    def wrap(self, stream: BinaryIO) -> BinaryIO:
+        """Buffered reader over stream whose reads are charged to this throttle (stream is not closed)."""
+        return io.BufferedReader(_ThrottledRaw(stream, self))
+
+    def stats(self) -> dict[str, Any]:
+        """Counters and achieved rates (per second of wall time between first and last use)."""
+        with self._lock:
+            elapsed = (self._last - self._started) if self._started is not None else 0.0
+            files, nbytes, waited = self.files, self.bytes, self.waited_seconds
+        return {
+            "files": files,
+            "bytes": nbytes,
+            "elapsed_seconds": round(elapsed, 3),
+            "throttled_seconds": round(waited, 3),
+            "files_per_second": round(files / elapsed, 2) if elapsed > 0 else None,
+            "bytes_per_second": round(nbytes / elapsed, 1) if elapsed > 0 else None,
+            "limits": {key: self._base[key] for key in _LIMIT_KEYS},
+            "schedule_windows": len(self._windows),
+        }
+
+
+class _ThrottledRaw(io.RawIOBase):
+    """Raw reader that charges every read to an IOThrottle; seeks pass through (random-access extractors)."""
+
+    def __init__(self, stream: BinaryIO, throttle: IOThrottle):
+        super().__init__()
+        self._stream = stream
+        self._throttle = throttle
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return self._stream.seekable()
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        return self._stream.seek(offset, whence)
+
+    def tell(self) -> int:
+        return self._stream.tell()
+
+    def readinto(self, buffer: Any) -> int:
+        n = self._stream.readinto(buffer) if hasattr(self._stream, "readinto") else self._read_copy(buffer)
+        self._throttle.consume(n or 0)
+        return n
+
+    def _read_copy(self, buffer: Any) -> int:
+        data = self._stream.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+
+def throttle_from_config(config: dict[str, Any] | None, parent: IOThrottle | None = None) -> IOThrottle | None:
+    """
+    IOThrottle for an io_throttle block, charging parent as well. None when there is no parent and the
+    block sets no limit and no schedule; with a parent, an unlimited block still counts the target's I/O.
+    """
+    cfg = config if isinstance(config, dict) else {}
+    if parent is None and not any(_rate(cfg.get(key)) for key in _LIMIT_KEYS) and not cfg.get("schedule"):
+        return None
+    return IOThrottle(cfg, parent=parent)
@@ -0,0 +1,98 @@
+"""
+OAuth2 client-credentials tokens shared across targets (Power BI, Dataverse): one token request per
+(token URL, client id, scope, secret) until shortly before the token expires, instead of one per target.
+Concurrent targets using the same app registration wait for a single request.
+"""
+import hashlib
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+# Renew this many seconds before expires_in so a token never expires mid-request
+EXPIRY_MARGIN = 60.0
+DEFAULT_EXPIRES_IN = 3600.0
+
+CacheKey = tuple[str, str, str, str]
+
+
+class TokenCache:
+    """Access tokens by key with their expiry (monotonic clock); thread-safe, one fetch per key at a time."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._tokens: dict[CacheKey, tuple[str, float]] = {}
+        self._key_locks: dict[CacheKey, threading.Lock] = {}
+
+    def get(self, key: CacheKey, fetch: Callable[[], tuple[str | None, float | None]]) -> str | None:
+        """Cached token for key, or fetch() -> (token, expires_in seconds) stored until expiry minus the margin."""
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            cached = self._tokens.get(key)
+            if cached and cached[1] > self._clock():
+                return cached[0]
+            token, expires_in = fetch()
+            if token:
+                lifetime = DEFAULT_EXPIRES_IN if expires_in is None else expires_in
+                self._tokens[key] = (token, self._clock() + max(0.0, lifetime - EXPIRY_MARGIN))
+            return token
+
+    def invalidate(self, key: CacheKey) -> None:
+        """Drop the token for key (e.g. after HTTP 401), so the next get() requests a new one."""
+        with self._lock:
+            self._tokens.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tokens.clear()
+
+
+_CACHE = TokenCache()
+
+
+def token_key(token_url: str, client_id: str, client_secret: str, scope: str) -> CacheKey:
+    """Cache key for a client-credentials grant; the secret only as a digest (a rotated secret gets a new token)."""
+    return token_url, client_id, scope, hashlib.sha256(client_secret.encode("utf-8")).hexdigest()
+
+
+def client_credentials_token(
+    post: Callable[..., Any],
+    token_url: str,
+    client_id: str,
+    client_secret: str,
+    scope: str,
+    cache: TokenCache | None = None,
+) -> str | None:
+    """
+    Access token for the client-credentials grant, from the cache while valid; otherwise POST token_url
+    with post (e.g. httpx.post) and cache the answer for its expires_in.
+    """
+
+    def _fetch() -> tuple[str | None, float | None]:
+        resp = post(
+            token_url,
+            data={
+                "grant_type": "client_credentials",
+                "client_id": client_id,
+                "client_secret": client_secret,
+                "scope": scope,
+            },
+            headers={"Accept": "application/json"},
+            timeout=30.0,
+        )
+        resp.raise_for_status()
+        data = resp.json()
+        try:
+            expires_in = float(data.get("expires_in"))
+        except (TypeError, ValueError):
+            expires_in = None
+        return data.get("access_token"), expires_in
+
+    return (cache or _CACHE).get(token_key(token_url, client_id, client_secret, scope), _fetch)
+
+
+def invalidate_token(token_url: str, client_id: str, client_secret: str, scope: str, cache: TokenCache | None = None) -> None:
+    """Forget the cached token for this grant (the server rejected it)."""
+    (cache or _CACHE).invalidate(token_key(token_url, client_id, client_secret, scope))
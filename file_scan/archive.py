@@ -0,0 +1,191 @@
+"""
+Streaming archive reader for file scan: zip and tar (plain, .tar.gz/.tgz, .tar.bz2, .tar.xz) members are
+read in memory, one at a time, and nested archives are opened recursively, so members can go through the
+regular extractors without being written to temp files.
+
+Zip-bomb protection: every read is bounded. Limits apply per top-level archive (nested members count
+towards the same budget):
+
+- max_depth: archive nesting levels opened (the scanned file is level 1).
+- max_members: regular file members read.
+- max_member_bytes: uncompressed bytes of one member (larger members are skipped).
+- max_total_bytes: uncompressed bytes read in total; scanning stops when reached.
+
+Sizes declared in archive headers are not trusted: reads stop at the limit whatever the header says.
+Sources may be a filesystem path or a binary file-like object (tar is read as a forward-only stream).
+"""
+import io
+import tarfile
+import zipfile
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any, BinaryIO
+
+ZIP_EXTENSIONS = {".zip"}
+TAR_EXTENSIONS = {".tar", ".tgz", ".tbz2", ".txz", ".tar.gz", ".tar.bz2", ".tar.xz"}
+ARCHIVE_EXTENSIONS = ZIP_EXTENSIONS | TAR_EXTENSIONS
+
+# Separator between an archive and a member path in reported file names: archive.zip!/inner/path.csv
+MEMBER_SEPARATOR = "!/"
+
+DEFAULT_ARCHIVE_LIMITS = {
+    "max_depth": 3,
+    "max_members": 1000,
+    "max_member_bytes": 32 * 1024 * 1024,
+    "max_total_bytes": 256 * 1024 * 1024,
+}
+
+_COMPOUND_TAR_SUFFIXES = (".tar.gz", ".tar.bz2", ".tar.xz")
+
+Source = str | Path | BinaryIO
+
+
+def archive_extension(name: str) -> str:
+    """Lower-case extension of name, keeping compound tar suffixes (.tar.gz, .tar.bz2, .tar.xz)."""
+    lower = name.lower()
+    for suffix in _COMPOUND_TAR_SUFFIXES:
+        if lower.endswith(suffix):
+            return suffix
+    return Path(lower).suffix
+
+
+def archive_limits(file_scan_config: dict[str, Any] | None = None) -> dict[str, int]:
+    """Limits from file_scan config keys archive_max_depth, archive_max_members, archive_max_member_bytes,
+    archive_max_total_bytes; defaults for missing or invalid values."""
+    cfg = file_scan_config or {}
+    limits = dict(DEFAULT_ARCHIVE_LIMITS)
+    for key in limits:
+        try:
+            value = int(cfg.get(f"archive_{key}", limits[key]))
+        except (TypeError, ValueError):
+            continue
+        if value > 0:
+            limits[key] = value
+    return limits
+
+
+def _read_bounded(stream: BinaryIO, limit: int) -> bytes | None:
+    """Read up to limit bytes; None when the stream holds more (oversized member or lying header)."""
+    data = stream.read(limit + 1)
+    if len(data) > limit:
+        return None
+    return data
+
+
+class _Budget:
+    """Shared member/byte counters for one top-level archive; collects limit messages."""
+
+    def __init__(self, limits: dict[str, int], skipped: list[str] | None):
+        self.limits = limits
+        self.members = 0
+        self.bytes = 0
+        self.stopped = False
+        self.skipped = skipped if skipped is not None else []
+
+    def note(self, message: str) -> None:
+        if message not in self.skipped:
+            self.skipped.append(message)
+
+    def take_member(self, declared_size: int, name: str) -> int | None:
+        """Reserve a member; return the byte limit for reading it, or None when it must be skipped."""
+        if self.members >= self.limits["max_members"]:
+            self.note(f"max_members ({self.limits['max_members']}) reached")
+            self.stopped = True
+            return None
+        remaining = self.limits["max_total_bytes"] - self.bytes
+        if remaining <= 0:
+            self.note(f"max_total_bytes ({self.limits['max_total_bytes']}) reached")
+            self.stopped = True
+            return None
+        if declared_size > self.limits["max_member_bytes"]:
+            self.note(f"{name}: larger than max_member_bytes ({self.limits['max_member_bytes']})")
+            return None
+        self.members += 1
+        return min(self.limits["max_member_bytes"], remaining)
+
+    def account(self, data: bytes | None, limit: int, name: str) -> bytes | None:
+        if data is None:
+            self.bytes += limit
+            if limit < self.limits["max_member_bytes"]:
+                self.note(f"max_total_bytes ({self.limits['max_total_bytes']}) reached")
+                self.stopped = True
+            else:
+                self.note(f"{name}: larger than max_member_bytes ({self.limits['max_member_bytes']})")
+            return None
+        self.bytes += len(data)
+        return data
+
+
+def _iter_zip(source: Any, budget: _Budget) -> Iterator[tuple[str, bytes]]:
+    with zipfile.ZipFile(source, "r") as z:
+        for info in z.infolist():
+            if budget.stopped:
+                return
+            if info.is_dir() or info.flag_bits & 0x1:
+                # Directories and encrypted members are skipped
+                continue
+            limit = budget.take_member(info.file_size, info.filename)
+            if limit is None:
+                continue
+            try:
+                with z.open(info) as member:
+                    data = budget.account(_read_bounded(member, limit), limit, info.filename)
+            except Exception:
+                continue
+            if data is not None:
+                yield info.filename, data
+
+
+def _iter_tar(source: Any, budget: _Budget) -> Iterator[tuple[str, bytes]]:
+    if isinstance(source, (str, Path)):
+        tar = tarfile.open(str(source), mode="r|*")
+    else:
+        tar = tarfile.open(fileobj=source, mode="r|*")
+    with tar:
+        for info in tar:
+            if budget.stopped:
+                return
+            if not info.isfile():
+                continue
+            limit = budget.take_member(info.size, info.name)
+            if limit is None:
+                continue
+            member = tar.extractfile(info)
+            if member is None:
+                continue
+            data = budget.account(_read_bounded(member, limit), limit, info.name)
+            if data is not None:
+                yield info.name, data
+
+
+def _iter_members(source: Any, ext: str, depth: int, budget: _Budget) -> Iterator[tuple[str, bytes]]:
+    reader = _iter_zip if ext in ZIP_EXTENSIONS else _iter_tar
+    for name, data in reader(source, budget):
+        inner_ext = archive_extension(name)
+        if inner_ext not in ARCHIVE_EXTENSIONS:
+            yield name, data
+            continue
+        if depth >= budget.limits["max_depth"]:
+            budget.note(f"{name}: nested deeper than max_depth ({budget.limits['max_depth']})")
+            continue
+        try:
+            for inner_name, inner_data in _iter_members(io.BytesIO(data), inner_ext, depth + 1, budget):
+                yield f"{name}{MEMBER_SEPARATOR}{inner_name}", inner_data
+        except (zipfile.BadZipFile, tarfile.TarError, EOFError, OSError):
+            budget.note(f"{name}: unreadable nested archive")
+
+
+def iter_archive_members(
+    source: Source,
+    ext: str,
+    limits: dict[str, int] | None = None,
+    skipped: list[str] | None = None,
+) -> Iterator[tuple[str, bytes]]:
+    """
+    Yield (member_path, data) for regular file members of a zip/tar archive, in archive order, reading each
+    member in memory within the limits. Members of nested archives are yielded as "inner.zip!/member".
+    Limit hits and unreadable nested archives are appended to skipped (human-readable messages).
+    Raises zipfile.BadZipFile / tarfile.TarError when the top-level archive cannot be read.
+    """
+    budget = _Budget(limits or DEFAULT_ARCHIVE_LIMITS, skipped)
+    yield from _iter_members(source, ext.lower(), 1, budget)
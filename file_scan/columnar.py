@@ -0,0 +1,135 @@
+"""
+Column sampling for columnar files (Parquet, Arrow IPC/Feather, ORC) with projection pushdown.
+
+Only the footer/schema is read, then a small slice of the first row group (Parquet), record batch
+(Arrow IPC) or stripe (ORC) is decoded per column; whole files are never read, so I/O stays roughly
+constant as files grow. Requires optional pyarrow (uv pip install -e ".[columnar]"); without it the
+functions return empty results and files get path/name-only analysis.
+
+Sources may be a filesystem path or a binary file-like object.
+"""
+from pathlib import Path
+from typing import Any, BinaryIO
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+    import pyarrow.parquet as pq
+    _PYARROW_AVAILABLE = True
+except ImportError:
+    _PYARROW_AVAILABLE = False
+    pa = None
+    pa_ipc = None
+    pq = None
+
+PARQUET_EXTENSIONS = {".parquet", ".pq"}
+ARROW_EXTENSIONS = {".arrow", ".feather", ".ipc", ".arrows"}
+ORC_EXTENSIONS = {".orc"}
+COLUMNAR_EXTENSIONS = PARQUET_EXTENSIONS | ARROW_EXTENSIONS | ORC_EXTENSIONS
+
+# Parquet read buffer: pages are streamed through this buffer instead of pre-buffering column chunks
+_PARQUET_BUFFER_SIZE = 64 * 1024
+# Sample values are truncated like DB samples (see _scan_sqlite_file_as_db)
+_MAX_VALUE_CHARS = 200
+
+Source = str | Path | BinaryIO
+
+
+def _column_samples(batch: Any, sample_limit: int) -> list[list[str]]:
+    """First non-null values (as strings) of each column of a RecordBatch/Table slice."""
+    samples = []
+    for column in batch.slice(0, sample_limit).columns:
+        samples.append([str(v)[:_MAX_VALUE_CHARS] for v in column.to_pylist() if v is not None])
+    return samples
+
+
+def _sample_parquet(source: Source, sample_limit: int) -> tuple[list[str], list[list[str]]]:
+    src = str(source) if isinstance(source, Path) else source
+    pf = pq.ParquetFile(src, pre_buffer=False, buffer_size=_PARQUET_BUFFER_SIZE)
+    try:
+        names = pf.schema_arrow.names
+        if pf.metadata.num_row_groups == 0:
+            return names, [[] for _ in names]
+        batch = next(pf.iter_batches(batch_size=sample_limit, row_groups=[0], columns=names), None)
+        if batch is None:
+            return names, [[] for _ in names]
+        return names, _column_samples(batch, sample_limit)
+    finally:
+        pf.close()
+
+
+def _open_arrow_reader(source: Source) -> tuple[Any, Any]:
+    """Open an Arrow IPC file (random access) or stream; paths are memory-mapped so only touched pages are read."""
+    handle = pa.memory_map(str(source), "r") if isinstance(source, (str, Path)) else source
+    try:
+        return handle, pa_ipc.open_file(handle)
+    except pa.ArrowInvalid:
+        handle.seek(0)
+        return handle, pa_ipc.open_stream(handle)
+
+
+def _sample_arrow(source: Source, sample_limit: int) -> tuple[list[str], list[list[str]]]:
+    handle, reader = _open_arrow_reader(source)
+    try:
+        names = reader.schema.names
+        if isinstance(reader, pa_ipc.RecordBatchFileReader):
+            batch = reader.get_batch(0) if reader.num_record_batches else None
+        else:
+            batch = next(iter(reader), None)
+        if batch is None:
+            return names, [[] for _ in names]
+        return names, _column_samples(batch, sample_limit)
+    finally:
+        if handle is not source:
+            handle.close()
+
+
+def _sample_orc(source: Source, sample_limit: int) -> tuple[list[str], list[list[str]]]:
+    from pyarrow import orc
+
+    src = str(source) if isinstance(source, Path) else source
+    of = orc.ORCFile(src)
+    names = of.schema.names
+    if of.nstripes == 0:
+        return names, [[] for _ in names]
+    return names, _column_samples(of.read_stripe(0, columns=names), sample_limit)
+
+
+def sample_columnar_columns(
+    source: Source,
+    ext: str,
+    sample_limit: int = 5,
+) -> list[tuple[str, list[str], list[list[str]]]]:
+    """
+    Return [("", column_names, samples_per_column)] for a Parquet/Arrow/ORC file (same shape as
+    file_scan.tabular.sample_table_columns). Column names come from the footer/schema; up to sample_limit
+    values per column are decoded from the first row group/batch/stripe only.
+    Returns an empty list when pyarrow is missing, the format is unknown, or the file cannot be read.
+    """
+    if not _PYARROW_AVAILABLE:
+        return []
+    ext = ext.lower()
+    try:
+        if ext in PARQUET_EXTENSIONS:
+            names, samples = _sample_parquet(source, sample_limit)
+        elif ext in ARROW_EXTENSIONS:
+            names, samples = _sample_arrow(source, sample_limit)
+        elif ext in ORC_EXTENSIONS:
+            names, samples = _sample_orc(source, sample_limit)
+        else:
+            return []
+    except Exception:
+        return []
+    if not names:
+        return []
+    return [("", list(names), samples)]
+
+
+def read_columnar_sample(source: Source, ext: str, max_chars: int = 10000) -> str:
+    """Column names followed by their sampled values, as one text sample (for the non-tabular scan path)."""
+    parts: list[str] = []
+    for _table, names, samples in sample_columnar_columns(source, ext):
+        for name, values in zip(names, samples):
+            parts.append(name)
+            parts.extend(values)
+    return " ".join(parts)[:max_chars]
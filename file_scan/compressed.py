@@ -0,0 +1,93 @@
+"""
+Streaming decompression of single-file compressed formats (.gz, .bz2, .xz/.lzma, .zst) for file scan.
+
+The inner extractor is chosen from the inner file name (export.csv.xz -> .csv; numeric and date rotation
+suffixes are skipped: app.log.3.gz -> .log, app.log-20240101.gz -> .log). Decompression is lazy: callers
+read only what the inner extractor needs (e.g. the text sampling budget), so a huge .gz costs a few MB of
+decompression instead of the whole file. .zst needs optional zstandard (uv pip install -e ".[zstd]").
+
+Sources may be a filesystem path or a binary file-like object.
+"""
+import bz2
+import gzip
+import lzma
+import re
+from pathlib import Path
+from typing import BinaryIO
+
+try:
+    import zstandard
+    _ZSTD_AVAILABLE = True
+except ImportError:
+    _ZSTD_AVAILABLE = False
+    zstandard = None
+
+COMPRESSED_EXTENSIONS = {".gz", ".bz2", ".xz", ".lzma", ".zst"}
+
+# Inner names without an extension (syslog.2.gz) are sampled as plain text
+DEFAULT_INNER_EXTENSION = ".txt"
+
+# Date rotation suffix glued to the extension: .log-20240101, .log_2024-01-01
+_DATED_SUFFIX = re.compile(r"\.([a-z0-9]+)[-_][0-9][0-9-]{5,}")
+
+Source = str | Path | BinaryIO
+
+# Errors raised by the decompressors on corrupt or truncated input
+DECOMPRESSION_ERRORS: tuple[type[BaseException], ...] = (OSError, EOFError, lzma.LZMAError)
+if _ZSTD_AVAILABLE:
+    DECOMPRESSION_ERRORS = DECOMPRESSION_ERRORS + (zstandard.ZstdError,)
+
+
+def inner_extension(name: str) -> str:
+    """
+    Extension of the decompressed file, from the compressed file name: compression suffix removed,
+    numeric (.3) and date (-20240101) rotation suffixes skipped. DEFAULT_INNER_EXTENSION when none is left.
+    """
+    inner = Path(name)
+    if inner.suffix.lower() in COMPRESSED_EXTENSIONS:
+        inner = inner.with_suffix("")
+    while inner.suffix[1:].isdigit():
+        inner = inner.with_suffix("")
+    suffix = inner.suffix.lower()
+    dated = _DATED_SUFFIX.fullmatch(suffix)
+    if dated:
+        suffix = f".{dated.group(1)}"
+    return suffix or DEFAULT_INNER_EXTENSION
+
+
+def open_decompressed(source: Source, ext: str) -> BinaryIO:
+    """
+    Open a lazily decompressing binary stream over source (read-only, forward). The caller closes it;
+    closing does not close a caller-provided file object. Raises ValueError for an unsupported ext
+    (or .zst without zstandard).
+    """
+    ext = ext.lower()
+    src = str(source) if isinstance(source, Path) else source
+    if ext == ".gz":
+        return gzip.open(src, "rb")
+    if ext == ".bz2":
+        return bz2.open(src, "rb")
+    if ext in (".xz", ".lzma"):
+        return lzma.open(src, "rb")
+    if ext == ".zst" and _ZSTD_AVAILABLE:
+        if isinstance(src, str):
+            return zstandard.ZstdDecompressor().stream_reader(open(src, "rb"), closefd=True)
+        return zstandard.ZstdDecompressor().stream_reader(src, closefd=False)
+    raise ValueError(f"Unsupported compressed format: {ext}")
+
+
+def read_decompressed(source: Source, ext: str, max_bytes: int) -> bytes | None:
+    """Decompress up to max_bytes; None when the content is larger (caller falls back to name-only)."""
+    chunks: list[bytes] = []
+    total = 0
+    with open_decompressed(source, ext) as stream:
+        # Some decompressors return short reads; loop until EOF or one byte past the limit
+        while total <= max_bytes:
+            chunk = stream.read(max_bytes + 1 - total)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            total += len(chunk)
+    if total > max_bytes:
+        return None
+    return b"".join(chunks)
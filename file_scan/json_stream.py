@@ -0,0 +1,354 @@
+"""
+Structure-aware sampling for JSON documents (.json) and JSON Lines (.jsonl/.ndjson) without loading them
+whole: values are collected per key path ("email", "data[].cpf", "addresses[].street"), up to sample_limit
+items per array and sample_limit values per path, so each path can be scanned like a DB column.
+
+- .json: incremental event parser (optional ijson, uv pip install -e ".[json]"; pure-Python tokenizer
+  over fixed-size chunks otherwise). Items of a top-level array are records (paths relative to the item,
+  like RESTConnector); reading stops once sample_limit records were seen.
+- .jsonl/.ndjson: line by line (json.loads per line, oversized/invalid lines skipped), first sample_limit
+  records.
+
+Reads stop at max_bytes (default DEFAULT_JSON_MAX_BYTES) whatever the document shape; a truncated or
+invalid document keeps the paths collected so far. Sources may be a filesystem path, a binary file-like
+object, or an iterable of byte chunks (e.g. an HTTP response body).
+"""
+import codecs
+import json
+import re
+from collections.abc import Callable, Iterable, Iterator
+from pathlib import Path
+from typing import Any, BinaryIO
+
+try:
+    import ijson
+    _IJSON_AVAILABLE = True
+except ImportError:
+    _IJSON_AVAILABLE = False
+    ijson = None
+
+JSON_EXTENSIONS = {".json"}
+JSON_LINES_EXTENSIONS = {".jsonl", ".ndjson"}
+JSON_STREAM_EXTENSIONS = JSON_EXTENSIONS | JSON_LINES_EXTENSIONS
+
+DEFAULT_JSON_MAX_BYTES = 32 * 1024 * 1024
+
+_CHUNK_BYTES = 64 * 1024
+# JSONL lines and single JSON tokens (strings) longer than this are skipped
+_MAX_TOKEN_BYTES = 1024 * 1024
+# Distinct key paths kept (objects keyed by ids would otherwise grow without bound)
+_MAX_PATHS = 1000
+_MAX_VALUE_CHARS = 500
+
+_TOKEN_RX = re.compile(
+    r'[ \t\r\n]*(?:([\[\]{}:,])|"((?:[^"\\]|\\.)*)"|(-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)|(true|false|null))',
+    re.DOTALL,
+)
+
+# Rest of the buffer after a number that may still continue it in the next chunk ("1." + "25", "1e" + "5")
+_NUMBER_TAIL_RX = re.compile(r"[0-9.eE+-]*\Z")
+
+# Strings (possibly cut at the end of the buffer) and brackets, for skipping containers past the sample
+_SKIP_RX = re.compile(r'"(?:[^"\\]|\\.)*(?:"|\\?\Z)|[\[\]{}]', re.DOTALL)
+
+Source = str | Path | BinaryIO | Iterable[bytes]
+
+
+class _BoundedReader:
+    """File-like read(n) over a path stream, file object or chunk iterable; EOF after max_bytes."""
+
+    def __init__(self, source: Any, max_bytes: int):
+        self._remaining = max_bytes
+        self._file = source if hasattr(source, "read") else None
+        self._chunks = None if self._file is not None else iter(source)
+        self._pending = b""
+
+    def read(self, size: int = -1) -> bytes:
+        if self._remaining <= 0:
+            return b""
+        if size is None or size < 0 or size > self._remaining:
+            size = self._remaining
+        if self._file is not None:
+            data = self._file.read(size)
+        else:
+            while not self._pending:
+                chunk = next(self._chunks, None)
+                if chunk is None:
+                    return b""
+                self._pending = bytes(chunk)
+            data, self._pending = self._pending[:size], self._pending[size:]
+        self._remaining -= len(data)
+        return data
+
+
+def _tokenize_events(
+    reader: _BoundedReader,
+    skip_depth: Callable[[], int] = lambda: 0,
+) -> Iterator[tuple[str, Any]]:
+    """
+    Pure-Python (event, value) stream in ijson.basic_parse format, one chunk in memory at a time.
+    When skip_depth() is non-zero after a value event, that many open containers are fast-forwarded with
+    a bracket-matching regex (no events for their content) and only their end events are yielded.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    buf, pos, eof = "", 0, False
+
+    def _refill(keep_from: int) -> None:
+        nonlocal buf, pos, eof
+        chunk = reader.read(_CHUNK_BYTES)
+        eof = not chunk
+        buf = buf[keep_from:] + decoder.decode(chunk, final=eof)
+        pos = 0
+        if len(buf) > _MAX_TOKEN_BYTES:
+            raise ValueError("JSON token too large")
+
+    def _skip_containers(depth: int) -> None:
+        nonlocal pos
+        while True:
+            for m in _SKIP_RX.finditer(buf, pos):
+                token = m.group()
+                if token[0] == '"':
+                    if m.end() == len(buf) and not eof:
+                        # String cut at the chunk boundary: read more from its start
+                        _refill(m.start())
+                        break
+                    continue
+                depth += 1 if token in "[{" else -1
+                if depth == 0:
+                    pos = m.end()
+                    return
+            else:
+                if eof:
+                    raise ValueError("invalid JSON")
+                _refill(len(buf))
+
+    # Per open container: True for objects (the next string is a key when expect_key is set)
+    stack: list[bool] = []
+    expect_key = False
+    while True:
+        m = _TOKEN_RX.match(buf, pos)
+        if m is None or (not eof and (
+            (m.end() == len(buf) and m.group(1) is None)
+            or (m.group(3) is not None and _NUMBER_TAIL_RX.match(buf, m.end()))
+        )):
+            # Incomplete token at the chunk boundary: read more
+            if eof:
+                if buf[pos:].strip():
+                    raise ValueError("invalid JSON")
+                return
+            _refill(pos)
+            continue
+        pos = m.end()
+        punct, string, number, literal = m.groups()
+        if punct is not None:
+            if punct in "{[":
+                stack.append(punct == "{")
+                expect_key = punct == "{"
+                yield ("start_map" if punct == "{" else "start_array"), None
+            elif punct in "}]":
+                stack.pop()
+                expect_key = False
+                yield ("end_map" if punct == "}" else "end_array"), None
+                continue
+            elif punct == ",":
+                expect_key = bool(stack) and stack[-1]
+                continue
+            else:
+                continue
+        elif string is not None:
+            value = json.loads(f'"{string}"') if "\\" in string else string
+            if expect_key:
+                expect_key = False
+                yield "map_key", value
+                continue
+            yield "string", value
+        elif number is not None:
+            yield "number", float(number) if any(c in number for c in ".eE") else int(number)
+        else:
+            yield ("null", None) if literal == "null" else ("boolean", literal == "true")
+        depth = skip_depth()
+        if depth:
+            _skip_containers(depth)
+            expect_key = False
+            for _ in range(depth):
+                yield ("end_map" if stack.pop() else "end_array"), None
+
+
+def _value_events(obj: Any) -> Iterator[tuple[str, Any]]:
+    """(event, value) stream for an already decoded value (JSON Lines records)."""
+    if isinstance(obj, dict):
+        yield "start_map", None
+        for key, value in obj.items():
+            yield "map_key", str(key)
+            yield from _value_events(value)
+        yield "end_map", None
+    elif isinstance(obj, list):
+        yield "start_array", None
+        for item in obj:
+            yield from _value_events(item)
+        yield "end_array", None
+    elif obj is None:
+        yield "null", None
+    elif isinstance(obj, bool):
+        yield "boolean", obj
+    elif isinstance(obj, (int, float)):
+        yield "number", obj
+    else:
+        yield "string", str(obj)
+
+
+class _PathSampler:
+    """Consume (event, value) pairs; collect up to sample_limit values per key path and items per array."""
+
+    def __init__(self, sample_limit: int, records: bool):
+        self.sample_limit = sample_limit
+        self.samples: dict[str, list[str]] = {}
+        self.done = False
+        # Frames: [is_map, path, current_key, children_seen, is_root]
+        self._stack: list[list[Any]] = []
+        self._skip = 0
+        if records:
+            # JSON Lines: a virtual top-level array whose items are the records
+            self._stack.append([False, "", None, 0, True])
+
+    @property
+    def skip_depth(self) -> int:
+        """Open containers to close before events matter again (0 when not skipping)."""
+        return self._skip
+
+    def _add_path(self, path: str) -> list[str] | None:
+        path = path or "value"
+        if path not in self.samples:
+            if len(self.samples) >= _MAX_PATHS:
+                return None
+            self.samples[path] = []
+        return self.samples[path]
+
+    def _child_path(self) -> str | None:
+        """Path of the value about to start, or None when it is past the array sample (skipped)."""
+        if not self._stack:
+            return ""
+        frame = self._stack[-1]
+        is_map, path, key, _children, is_root = frame
+        if is_map:
+            return f"{path}.{key}" if path else str(key)
+        frame[3] += 1
+        if frame[3] > self.sample_limit:
+            if is_root and len(self._stack) == 1:
+                # sample_limit records seen: nothing more to learn from the rest of the document
+                self.done = True
+            return None
+        return path if is_root else f"{path}[]"
+
+    def feed(self, event: str, value: Any) -> None:
+        if self._skip:
+            # Past the array sample: ignore events up to the end of that array, then close it below
+            if event in ("start_map", "start_array"):
+                self._skip += 1
+                return
+            if event not in ("end_map", "end_array"):
+                return
+            self._skip -= 1
+            if self._skip:
+                return
+        if event == "map_key":
+            self._stack[-1][2] = value
+            self._stack[-1][3] += 1
+            return
+        if event in ("end_map", "end_array"):
+            _is_map, path, _key, children, _is_root = self._stack.pop()
+            if not children and path:
+                # Empty container: keep its key path so the name alone can be classified
+                self._add_path(path)
+            return
+        path = self._child_path()
+        if path is None:
+            # The rest of the array is skipped (skip depth counts the array and this item)
+            self._skip = 2 if event in ("start_map", "start_array") else 1
+            return
+        if event in ("start_map", "start_array"):
+            is_root = event == "start_array" and not self._stack
+            self._stack.append([event == "start_map", path, None, 0, is_root])
+            return
+        values = self._add_path(path)
+        if values is None or len(values) >= self.sample_limit or value is None:
+            return
+        text = ("true" if value else "false") if isinstance(value, bool) else str(value)
+        if text.strip():
+            values.append(text.strip()[:_MAX_VALUE_CHARS])
+
+
+def _json_events(reader: _BoundedReader, sampler: _PathSampler) -> Iterator[tuple[str, Any]]:
+    if _IJSON_AVAILABLE:
+        return ijson.basic_parse(reader, use_float=True)
+    return _tokenize_events(reader, skip_depth=lambda: sampler.skip_depth)
+
+
+def _json_lines_events(reader: _BoundedReader, sampler: _PathSampler) -> Iterator[tuple[str, Any]]:
+    pending = b""
+    skipping = False
+    while True:
+        chunk = reader.read(_CHUNK_BYTES)
+        lines = (pending + chunk).split(b"\n")
+        pending = lines.pop() if chunk else b""
+        for line in lines:
+            if skipping:
+                # Tail of an oversized line
+                skipping = False
+                continue
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            yield from _value_events(record)
+        if len(pending) > _MAX_TOKEN_BYTES:
+            pending, skipping = b"", True
+        if not chunk:
+            return
+
+
+def sample_json_paths(
+    source: Source,
+    ext: str = ".json",
+    sample_limit: int = 5,
+    max_bytes: int = DEFAULT_JSON_MAX_BYTES,
+) -> dict[str, list[str]]:
+    """
+    Return {key_path: sample_values} for a JSON/JSON Lines source, in first-seen order. Arrays contribute
+    their first sample_limit items (nested arrays as "key[]"); at most sample_limit values per path and
+    max_bytes of input are read. Paths seen before a truncation or syntax error are kept; empty dict when
+    nothing could be parsed.
+    """
+    sampler = _PathSampler(sample_limit, records=ext.lower() in JSON_LINES_EXTENSIONS)
+    events = _json_lines_events if ext.lower() in JSON_LINES_EXTENSIONS else _json_events
+
+    def _consume(stream: Any) -> None:
+        for event, value in events(_BoundedReader(stream, max_bytes), sampler):
+            sampler.feed(event, value)
+            if sampler.done:
+                return
+
+    try:
+        if isinstance(source, (str, Path)):
+            with open(source, "rb") as f:
+                _consume(f)
+        else:
+            _consume(source)
+    except Exception:
+        pass
+    return sampler.samples
+
+
+def sample_json_columns(
+    source: Source,
+    ext: str = ".json",
+    sample_limit: int = 5,
+    max_bytes: int = DEFAULT_JSON_MAX_BYTES,
+) -> list[tuple[str, list[str], list[list[str]]]]:
+    """sample_json_paths as one unnamed table (same shape as file_scan.tabular.sample_table_columns)."""
+    paths = sample_json_paths(source, ext, sample_limit, max_bytes)
+    if not paths:
+        return []
+    return [("", list(paths), list(paths.values()))]
@@ -0,0 +1,224 @@
+"""
+Streaming mail parsing for file scan: single messages (.eml, .mht/.mhtml), mbox files (.mbox/.mbx) and
+Maildir directories (cur/ and new/ holding one message per file).
+
+Messages are yielded lazily, one at a time, as (message_id, text, attachments):
+
+- text: Subject/From/To/Cc/Date headers plus decoded text/plain and text/html bodies (tags stripped),
+  capped at max_chars; forwarded message/rfc822 parts are included.
+- attachments: [(file_name, decoded bytes)] so callers can run them through the regular extractors in
+  memory (no temp files).
+
+Limits per mailbox (file_scan config mail_max_messages, mail_max_message_bytes): messages past
+max_messages are not read; a message larger than max_message_bytes is parsed from its first
+max_message_bytes only (attachments cut by the limit are dropped). mbox files are read line by line
+with email.parser.BytesFeedParser, so memory is bounded by one message. Limit hits are appended to
+skipped (human-readable messages).
+"""
+import email.policy
+import os
+import re
+from collections.abc import Callable, Iterator
+from contextlib import AbstractContextManager
+from email.message import Message
+from email.parser import BytesFeedParser, BytesParser
+from pathlib import Path
+from typing import Any, BinaryIO
+
+MESSAGE_EXTENSIONS = {".eml", ".mht", ".mhtml"}
+MBOX_EXTENSIONS = {".mbox", ".mbx"}
+MAIL_EXTENSIONS = MESSAGE_EXTENSIONS | MBOX_EXTENSIONS
+
+DEFAULT_MAIL_LIMITS = {
+    "max_messages": 1000,
+    "max_message_bytes": 25 * 1024 * 1024,
+}
+
+# Longest mbox line read at once (base64 bodies use 76-character lines)
+_MAX_LINE_BYTES = 64 * 1024
+_HEADERS = ("Subject", "From", "To", "Cc", "Reply-To", "Date")
+_TAG_RX = re.compile(r"<[^>]*>")
+_MBOXRD_FROM = re.compile(rb"^>+From ")
+
+Source = str | Path | BinaryIO
+MailMessage = tuple[str, str, list[tuple[str, bytes]]]
+
+
+def mail_limits(file_scan_config: dict[str, Any] | None = None) -> dict[str, int]:
+    """Limits from file_scan config keys mail_max_messages, mail_max_message_bytes; defaults for missing or
+    invalid values."""
+    cfg = file_scan_config or {}
+    limits = dict(DEFAULT_MAIL_LIMITS)
+    for key in limits:
+        try:
+            value = int(cfg.get(f"mail_{key}", limits[key]))
+        except (TypeError, ValueError):
+            continue
+        if value > 0:
+            limits[key] = value
+    return limits
+
+
+def maildir_root(file_path: Path) -> Path | None:
+    """Maildir directory holding file_path (a message in its cur/ or new/), or None."""
+    parent = file_path.parent
+    if parent.name not in ("cur", "new"):
+        return None
+    root = parent.parent
+    if (root / "cur").is_dir() and (root / "new").is_dir():
+        return root
+    return None
+
+
+def _part_text(part: Message) -> str:
+    try:
+        text = part.get_content()
+    except Exception:
+        payload = part.get_payload(decode=True) or b""
+        text = payload.decode(part.get_content_charset() or "utf-8", errors="replace")
+    if not isinstance(text, str):
+        return ""
+    if part.get_content_subtype() == "html":
+        text = _TAG_RX.sub(" ", text)
+    return text
+
+
+def message_content(msg: Message, max_chars: int = 10000) -> tuple[str, list[tuple[str, bytes]]]:
+    """(headers and body text up to max_chars, [(attachment_name, bytes)]) of a parsed message."""
+    texts: list[str] = []
+    size = 0
+    attachments: list[tuple[str, bytes]] = []
+    for part in msg.walk():
+        if part.get("From") or part.get("Subject"):
+            # The message itself or a forwarded message/rfc822 part (MIME parts carry no such headers)
+            texts.extend(f"{h}: {part.get(h)}" for h in _HEADERS if part.get(h))
+        if part.is_multipart() or part.get_content_maintype() == "message":
+            continue
+        name = part.get_filename()
+        if name or part.get_content_disposition() == "attachment":
+            payload = part.get_payload(decode=True)
+            if payload:
+                attachments.append((name or "attachment", payload))
+            continue
+        if part.get_content_maintype() == "text" and size < max_chars:
+            text = _part_text(part)
+            texts.append(text)
+            size += len(text)
+    return "\n".join(texts)[:max_chars], attachments
+
+
+def _parse(data: bytes) -> Message:
+    return BytesParser(policy=email.policy.default).parsebytes(data)
+
+
+def _message(msg: Message, fallback_id: str, max_chars: int) -> MailMessage:
+    message_id = str(msg.get("Message-ID") or "").strip() or fallback_id
+    text, attachments = message_content(msg, max_chars)
+    return message_id, text, attachments
+
+
+def _read_bounded(stream: BinaryIO, limit: int, label: str, skipped: list[str]) -> bytes:
+    data = stream.read(limit + 1)
+    if len(data) > limit:
+        skipped.append(f"{label}: larger than max_message_bytes ({limit}), truncated")
+        return data[:limit]
+    return data
+
+
+def _iter_mbox(stream: BinaryIO, limits: dict[str, int], skipped: list[str], max_chars: int) -> Iterator[MailMessage]:
+    parser: BytesFeedParser | None = None
+    size = 0
+    count = 0
+    truncated = False
+    at_line_start = True
+    prev_blank = True
+    while True:
+        line = stream.readline(_MAX_LINE_BYTES)
+        separator = at_line_start and prev_blank and line.startswith(b"From ")
+        if not line or separator:
+            if parser is not None:
+                count += 1
+                yield _message(parser.close(), f"#{count}", max_chars)
+                parser = None
+            if not line:
+                return
+            if count >= limits["max_messages"]:
+                skipped.append(f"max_messages ({limits['max_messages']}) reached")
+                return
+            parser = BytesFeedParser(policy=email.policy.default)
+            size, truncated = 0, False
+            at_line_start, prev_blank = True, False
+            continue
+        complete = line.endswith(b"\n")
+        if at_line_start:
+            prev_blank = line in (b"\n", b"\r\n")
+        at_line_start = complete
+        if parser is None or truncated:
+            continue
+        if size + len(line) > limits["max_message_bytes"]:
+            skipped.append(f"#{count + 1}: larger than max_message_bytes ({limits['max_message_bytes']}), truncated")
+            truncated = True
+            continue
+        size += len(line)
+        parser.feed(_MBOXRD_FROM.sub(lambda m: m.group()[1:], line) if line.startswith(b">") else line)
+
+
+def iter_mail_messages(
+    source: Source,
+    ext: str,
+    limits: dict[str, int] | None = None,
+    skipped: list[str] | None = None,
+    max_chars: int = 10000,
+) -> Iterator[MailMessage]:
+    """
+    Yield (message_id, text, attachments) for a .eml/.mht/.mhtml message or each message of an mbox file
+    (ext .mbox/.mbx), lazily and within the limits. message_id is the Message-ID header, or "#n" (position
+    in the mailbox) when missing.
+    """
+    limits = limits or DEFAULT_MAIL_LIMITS
+    skipped = skipped if skipped is not None else []
+    if isinstance(source, (str, Path)):
+        with open(source, "rb") as f:
+            yield from iter_mail_messages(f, ext, limits, skipped, max_chars)
+        return
+    if ext.lower() in MBOX_EXTENSIONS:
+        yield from _iter_mbox(source, limits, skipped, max_chars)
+        return
+    data = _read_bounded(source, limits["max_message_bytes"], "message", skipped)
+    yield _message(_parse(data), "#1", max_chars)
+
+
+def iter_maildir_messages(
+    root: Path,
+    limits: dict[str, int] | None = None,
+    skipped: list[str] | None = None,
+    max_chars: int = 10000,
+    open_message: Callable[[Path], AbstractContextManager[BinaryIO] | None] | None = None,
+) -> Iterator[MailMessage]:
+    """
+    Yield (message_id, text, attachments) for the messages in a Maildir's new/ and cur/ (name order).
+    open_message(path) opens a message file (default open(path, "rb")); None skips the message.
+    """
+    limits = limits or DEFAULT_MAIL_LIMITS
+    skipped = skipped if skipped is not None else []
+    count = 0
+    for sub in ("new", "cur"):
+        try:
+            names = sorted(e.name for e in os.scandir(root / sub) if e.is_file() and not e.name.startswith("."))
+        except OSError:
+            continue
+        for name in names:
+            if count >= limits["max_messages"]:
+                skipped.append(f"max_messages ({limits['max_messages']}) reached")
+                return
+            try:
+                opened = open(root / sub / name, "rb") if open_message is None else open_message(root / sub / name)
+                if opened is None:
+                    continue
+                count += 1
+                with opened as f:
+                    data = _read_bounded(f, limits["max_message_bytes"], f"{sub}/{name}", skipped)
+            except OSError:
+                skipped.append(f"{sub}/{name}: unreadable")
+                continue
+            yield _message(_parse(data), f"{sub}/{name}", max_chars)
@@ -0,0 +1,175 @@
+"""
+Unified streaming text extractor for zip-based office formats (OOXML and ODF).
+
+One code path for .docx/.pptx/.xlsx (and macro/show variants) and .odt/.ods/.odp: open the zip once,
+walk the relevant XML parts in reading order, parse each with iterparse and stop as soon as the
+character budget is reached. Finished elements are cleared and detached from their parent, so memory
+stays bounded by the largest single paragraph/cell instead of the whole document (no python-docx or
+odfpy DOM, no reading whole slide XML into memory).
+
+Sources may be a filesystem path or a binary file-like object (anything zipfile accepts).
+"""
+import re
+import zipfile
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any, BinaryIO
+
+try:
+    from defusedxml.ElementTree import iterparse
+except ImportError:
+    from xml.etree.ElementTree import iterparse
+
+Source = str | Path | BinaryIO
+
+# Namespaces
+_W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+_A_NS = "http://schemas.openxmlformats.org/drawingml/2006/main"
+_S_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+ODF_TEXT_NS = "urn:oasis:names:tc:opendocument:xmlns:text:1.0"
+ODF_TABLE_NS = "urn:oasis:names:tc:opendocument:xmlns:table:1.0"
+
+_ODF_TEXT_TAGS = frozenset({f"{{{ODF_TEXT_NS}}}p", f"{{{ODF_TEXT_NS}}}h"})
+# ODF whitespace markers (<text:s/>, <text:tab/>, <text:line-break/>) carry no text node
+_ODF_SPACE_TAGS = frozenset({f"{{{ODF_TEXT_NS}}}s", f"{{{ODF_TEXT_NS}}}tab", f"{{{ODF_TEXT_NS}}}line-break"})
+_ODF_FLUSH_TAGS = frozenset({f"{{{ODF_TABLE_NS}}}table-cell", f"{{{ODF_TABLE_NS}}}table-row"})
+
+_XLSX_CELL = f"{{{_S_NS}}}c"
+_XLSX_VALUE = f"{{{_S_NS}}}v"
+_XLSX_INLINE = f"{{{_S_NS}}}is"
+
+# Per format family: (ordered part-name patterns, text tags, leaf text tag, flush tags).
+# Text tags (paragraphs, cells) emit the joined text of their leaf tags (or all text when leaf is None),
+# so a value split across runs ("123.456" + ".789-09") stays contiguous. Text and flush tags are
+# cleared and detached once finished (bounded memory).
+_DOCX = (
+    [r"word/document\.xml", r"word/header(\d*)\.xml", r"word/footer(\d*)\.xml",
+     r"word/footnotes\.xml", r"word/endnotes\.xml", r"word/comments\.xml"],
+    frozenset({f"{{{_W_NS}}}p"}),
+    f"{{{_W_NS}}}t",
+    frozenset({f"{{{_W_NS}}}tbl"}),
+)
+_PPTX = (
+    [r"ppt/slides/slide(\d+)\.xml", r"ppt/notesSlides/notesSlide(\d+)\.xml"],
+    frozenset({f"{{{_A_NS}}}p"}),
+    f"{{{_A_NS}}}t",
+    frozenset(),
+)
+_XLSX = (
+    [r"xl/sharedStrings\.xml", r"xl/worksheets/sheet(\d+)\.xml"],
+    frozenset({f"{{{_S_NS}}}si", _XLSX_CELL}),
+    f"{{{_S_NS}}}t",
+    frozenset({f"{{{_S_NS}}}row"}),
+)
+_ODF = ([r"content\.xml"], _ODF_TEXT_TAGS, None, _ODF_FLUSH_TAGS)
+
+_FORMATS = {
+    ".docx": _DOCX, ".docm": _DOCX, ".dotx": _DOCX,
+    ".pptx": _PPTX, ".pptm": _PPTX, ".ppsx": _PPTX, ".potx": _PPTX,
+    ".xlsx": _XLSX, ".xlsm": _XLSX, ".xltx": _XLSX,
+    ".odt": _ODF, ".ods": _ODF, ".odp": _ODF,
+}
+
+OFFICE_ZIP_EXTENSIONS = frozenset(_FORMATS)
+
+
+def _ordered_parts(names: list[str], patterns: list[str]) -> list[str]:
+    """Return member names matching patterns, pattern order first, then numeric suffix (slide2 < slide10)."""
+    out: list[str] = []
+    for pattern in patterns:
+        rx = re.compile(pattern)
+        matched = []
+        for name in names:
+            m = rx.fullmatch(name)
+            if m:
+                num = m.group(1) if m.groups() and m.group(1) else "0"
+                matched.append((int(num), name))
+        out.extend(name for _, name in sorted(matched))
+    return out
+
+
+def odf_element_text(elem: Any) -> str:
+    """Text of an ODF element (e.g. text:p) with space/tab/line-break markers rendered as spaces."""
+    parts = [elem.text or ""]
+    for child in elem:
+        parts.append(" " if child.tag in _ODF_SPACE_TAGS else odf_element_text(child))
+        parts.append(child.tail or "")
+    return "".join(parts)
+
+
+def _element_text(elem: Any, leaf_tag: str | None) -> str:
+    if elem.tag == _XLSX_CELL:
+        # Shared-string cells hold an index into sharedStrings.xml (already emitted); skip them
+        t = elem.get("t")
+        if t == "s":
+            return ""
+        if t == "inlineStr":
+            inline = elem.find(_XLSX_INLINE)
+            return "".join(inline.itertext()) if inline is not None else ""
+        v = elem.find(_XLSX_VALUE)
+        return (v.text or "") if v is not None else ""
+    if leaf_tag is None:
+        return odf_element_text(elem)
+    return "".join(t.text or "" for t in elem.iter(leaf_tag))
+
+
+def iter_xml_texts(
+    stream: BinaryIO,
+    text_tags: frozenset[str],
+    flush_tags: frozenset[str] = frozenset(),
+    leaf_tag: str | None = None,
+) -> Iterator[str]:
+    """
+    Incrementally parse one XML stream and yield the text of each finished text-tag element.
+    Finished text/flush elements are cleared and removed from their parent so the tree never grows.
+    """
+    stack: list[Any] = []
+    for event, elem in iterparse(stream, events=("start", "end")):
+        if event == "start":
+            stack.append(elem)
+            continue
+        stack.pop()
+        tag = elem.tag
+        is_text = tag in text_tags
+        if is_text:
+            text = _element_text(elem, leaf_tag).strip()
+            if text:
+                yield text
+        if is_text or tag in flush_tags:
+            elem.clear()
+            if stack:
+                stack[-1].remove(elem)
+
+
+def iter_office_text(source: Source, ext: str) -> Iterator[str]:
+    """
+    Yield text fragments (paragraph runs, slide text, cells) of a zip-based office document in reading
+    order. The zip is opened once; each relevant XML member is streamed with iterparse.
+    Unknown ext yields nothing.
+    """
+    fmt = _FORMATS.get(ext.lower())
+    if fmt is None:
+        return
+    patterns, text_tags, leaf_tag, flush_tags = fmt
+    with zipfile.ZipFile(source, "r") as z:
+        for name in _ordered_parts(z.namelist(), patterns):
+            with z.open(name) as stream:
+                yield from iter_xml_texts(stream, text_tags, flush_tags, leaf_tag)
+
+
+def read_office_sample(source: Source, ext: str, max_chars: int = 10000) -> str:
+    """
+    Return up to max_chars of text from a docx/pptx/xlsx/odt/ods/odp (and variants), stopping parsing as
+    soon as the budget is reached. Returns empty string on error (corrupt zip, malformed XML).
+    """
+    parts: list[str] = []
+    total = 0
+    try:
+        for text in iter_office_text(source, ext):
+            parts.append(text)
+            total += len(text) + 1
+            if total >= max_chars:
+                break
+    except Exception:
+        pass
+    return " ".join(parts)[:max_chars]
@@ -0,0 +1,183 @@
+"""
+Page-cache-friendly reads for scans of file servers and NFS mounts (Linux; file_scan.page_cache_hints).
+
+- Files are opened with O_NOATIME, so sampling does not update access times (falls back to a plain open
+  when not permitted: O_NOATIME needs the file owner or CAP_FOWNER).
+- posix_fadvise(POSIX_FADV_SEQUENTIAL) while extractors read (larger readahead, pages reclaimed sooner).
+- posix_fadvise(POSIX_FADV_DONTNEED) once the file is sampled, so the scan does not push the server's hot
+  pages out of the cache. Files that already had pages cached before the scan (in use by production
+  workloads) are left alone: only what the scan itself brought in is dropped.
+
+Extractors usually stop after a sample, and the async readahead started by their last read can still be in
+flight when the file is closed; those pages land after the first DONTNEED. PageCacheHints therefore keeps
+the descriptor of each cold file for a short settle time and advises DONTNEED again afterwards (and for all
+pending files when the scan of a target ends).
+
+Residency is measured with mincore(2) on a read-only mapping (no page is faulted in). Before sampling only
+the head of the file is checked (_RESIDENCY_CHECK_BYTES, where extractors read first), stopping at the first
+cached page, so multi-GB files cost no more than small ones. Elsewhere (no
+O_NOATIME, posix_fadvise or mincore) files are opened normally and the hints are no-ops.
+"""
+import contextlib
+import ctypes
+import os
+import time
+from collections import deque
+from collections.abc import Iterator
+from pathlib import Path
+from typing import BinaryIO
+
+_O_NOATIME = getattr(os, "O_NOATIME", 0)
+_FADVISE_AVAILABLE = hasattr(os, "posix_fadvise")
+
+# Seconds before the second DONTNEED (readahead in flight at close has completed by then)
+_SETTLE_SECONDS = 0.1
+# Descriptors kept open for the second DONTNEED; older ones are advised early when exceeded
+_MAX_PENDING = 64
+# Head of the file checked for cached pages before sampling (covers the text and tabular read budgets)
+_RESIDENCY_CHECK_BYTES = 1024 * 1024
+
+_PROT_READ = 1
+_MAP_SHARED = 1
+_MAP_FAILED = ctypes.c_void_p(-1).value
+
+
+def _load_libc():
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        libc.mmap.restype = ctypes.c_void_p
+        libc.mmap.argtypes = (ctypes.c_void_p, ctypes.c_size_t, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_long)
+        libc.munmap.argtypes = (ctypes.c_void_p, ctypes.c_size_t)
+        libc.mincore.argtypes = (ctypes.c_void_p, ctypes.c_size_t, ctypes.POINTER(ctypes.c_ubyte))
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+_LIBC = _load_libc()
+
+
+def _open_fd(path: str | Path) -> int:
+    flags = os.O_RDONLY | getattr(os, "O_CLOEXEC", 0)
+    if _O_NOATIME:
+        try:
+            return os.open(path, flags | _O_NOATIME)
+        except PermissionError:
+            # EPERM (not the owner) or EACCES: retry without O_NOATIME; EACCES is raised again below
+            pass
+    return os.open(path, flags)
+
+
+def _advise(fd: int, advice: int) -> None:
+    if not _FADVISE_AVAILABLE:
+        return
+    try:
+        os.posix_fadvise(fd, 0, 0, advice)
+    except OSError:
+        pass
+
+
+def _residency(fd: int, size: int) -> "ctypes.Array[ctypes.c_ubyte] | None":
+    """mincore vector (one byte per page, bit 0 = cached) for the first size bytes of fd, or None when unsupported."""
+    if _LIBC is None or size <= 0:
+        return None
+    page = os.sysconf("SC_PAGE_SIZE")
+    addr = _LIBC.mmap(None, size, _PROT_READ, _MAP_SHARED, fd, 0)
+    if addr in (None, _MAP_FAILED):
+        return None
+    try:
+        vec = (ctypes.c_ubyte * ((size + page - 1) // page))()
+        if _LIBC.mincore(addr, size, vec) != 0:
+            return None
+        return vec
+    finally:
+        _LIBC.munmap(addr, size)
+
+
+def _cached_pages(fd: int, size: int) -> tuple[int, int] | None:
+    """(pages in the page cache, total pages) for the first size bytes of fd, or None when unsupported."""
+    vec = _residency(fd, size)
+    if vec is None:
+        return None
+    return sum(b & 1 for b in vec), len(vec)
+
+
+def _any_cached(fd: int, size: int) -> bool | None:
+    """Whether any page of the file head (first _RESIDENCY_CHECK_BYTES) is cached, or None when unsupported."""
+    vec = _residency(fd, min(size, _RESIDENCY_CHECK_BYTES))
+    if vec is None:
+        return None
+    return any(b & 1 for b in vec)
+
+
+def cached_fraction(path: str | Path) -> float | None:
+    """Fraction (0.0-1.0) of the file's pages currently in the page cache, or None when it cannot be measured."""
+    try:
+        fd = _open_fd(path)
+    except OSError:
+        return None
+    try:
+        size = os.fstat(fd).st_size
+        if size == 0:
+            return 0.0
+        counts = _cached_pages(fd, size)
+    finally:
+        os.close(fd)
+    if counts is None:
+        return None
+    return counts[0] / counts[1]
+
+
+class PageCacheHints:
+    """
+    Open files for one scan with read hints (use as a context manager around the scan of a target):
+    O_NOATIME, sequential readahead while reading, DONTNEED after sampling and again after the settle time.
+    """
+
+    def __init__(self, settle_seconds: float = _SETTLE_SECONDS, max_pending: int = _MAX_PENDING):
+        self.settle_seconds = settle_seconds
+        self.max_pending = max_pending
+        # (monotonic deadline, duplicated descriptor) of cold files waiting for the second DONTNEED
+        self._pending: deque[tuple[float, int]] = deque()
+
+    def __enter__(self) -> "PageCacheHints":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    @contextlib.contextmanager
+    def open(self, path: str | Path) -> Iterator[BinaryIO]:
+        """Open path for sampling; on exit, drop its pages from the page cache unless its head had cached pages."""
+        self._drain(time.monotonic())
+        fd = _open_fd(path)
+        try:
+            was_cold = not _any_cached(fd, os.fstat(fd).st_size)
+            if _FADVISE_AVAILABLE:
+                _advise(fd, os.POSIX_FADV_SEQUENTIAL)
+        except BaseException:
+            os.close(fd)
+            raise
+        f = os.fdopen(fd, "rb")
+        try:
+            yield f
+        finally:
+            if was_cold and _FADVISE_AVAILABLE:
+                _advise(fd, os.POSIX_FADV_DONTNEED)
+                try:
+                    self._pending.append((time.monotonic() + self.settle_seconds, os.dup(fd)))
+                except OSError:
+                    pass
+            f.close()
+
+    def _drain(self, now: float) -> None:
+        while self._pending and (self._pending[0][0] <= now or len(self._pending) > self.max_pending):
+            _, fd = self._pending.popleft()
+            _advise(fd, os.POSIX_FADV_DONTNEED)
+            os.close(fd)
+
+    def close(self) -> None:
+        """Advise DONTNEED for every pending file, after waiting out the settle time of the last one."""
+        if self._pending:
+            time.sleep(max(0.0, self._pending[-1][0] - time.monotonic()))
+        self._drain(float("inf"))
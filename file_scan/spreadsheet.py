@@ -0,0 +1,178 @@
+"""
+Streaming spreadsheet readers for file scan: rows are produced lazily, sheet by sheet, so memory
+and time-to-first-row stay bounded regardless of workbook size (no pandas, no full DOM load).
+
+- .xlsx/.xlsm: openpyxl in read_only mode (rows parsed on demand from the worksheet XML).
+- .xls: xlrd with on_demand sheets (optional dependency; empty result when not installed).
+- .xlsb: pyxlsb row iterator (optional dependency; empty result when not installed).
+- .ods: incremental parse (iterparse) of content.xml inside the zip; no odfpy DOM (shares the
+  XML/ODF helpers of file_scan.office).
+
+Sources may be a filesystem path or a binary file-like object (anything zipfile/openpyxl accept).
+Cell values are returned as strings; nothing is stored after the caller consumes them.
+"""
+import zipfile
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any, BinaryIO
+
+from file_scan.office import ODF_TABLE_NS, ODF_TEXT_NS, iterparse, odf_element_text
+
+SPREADSHEET_EXTENSIONS = {".xlsx", ".xlsm", ".xls", ".xlsb", ".ods"}
+
+# ODS elements in content.xml
+_ODS_TABLE = f"{{{ODF_TABLE_NS}}}table"
+_ODS_ROW = f"{{{ODF_TABLE_NS}}}table-row"
+_ODS_CELL = f"{{{ODF_TABLE_NS}}}table-cell"
+_ODS_COVERED_CELL = f"{{{ODF_TABLE_NS}}}covered-table-cell"
+_ODS_TABLE_NAME = f"{{{ODF_TABLE_NS}}}name"
+_ODS_COLS_REPEATED = f"{{{ODF_TABLE_NS}}}number-columns-repeated"
+_ODS_TEXT_P = f"{{{ODF_TEXT_NS}}}p"
+
+# Repeated non-empty ODS cells are expanded up to this count (empty repeats are dropped)
+_ODS_MAX_CELL_REPEAT = 100
+
+Source = str | Path | BinaryIO
+
+
+def _cell_str(value: Any) -> str:
+    if value is None:
+        return ""
+    return str(value)
+
+
+def _iter_xlsx_rows(source: Source, max_rows_per_sheet: int | None) -> Iterator[tuple[str, list[str]]]:
+    from openpyxl import load_workbook
+
+    wb = load_workbook(source, read_only=True, data_only=True)
+    try:
+        for ws in wb.worksheets:
+            for i, row in enumerate(ws.iter_rows(values_only=True)):
+                if max_rows_per_sheet is not None and i >= max_rows_per_sheet:
+                    break
+                yield ws.title, [_cell_str(v) for v in row]
+    finally:
+        wb.close()
+
+
+def _iter_xls_rows(source: Source, max_rows_per_sheet: int | None) -> Iterator[tuple[str, list[str]]]:
+    try:
+        import xlrd
+    except ImportError:
+        return
+    if isinstance(source, (str, Path)):
+        book = xlrd.open_workbook(str(source), on_demand=True)
+    else:
+        book = xlrd.open_workbook(file_contents=source.read(), on_demand=True)
+    try:
+        for idx in range(book.nsheets):
+            sheet = book.sheet_by_index(idx)
+            limit = sheet.nrows if max_rows_per_sheet is None else min(sheet.nrows, max_rows_per_sheet)
+            for r in range(limit):
+                yield sheet.name, [_cell_str(v) for v in sheet.row_values(r)]
+            book.unload_sheet(idx)
+    finally:
+        book.release_resources()
+
+
+def _iter_xlsb_rows(source: Source, max_rows_per_sheet: int | None) -> Iterator[tuple[str, list[str]]]:
+    try:
+        from pyxlsb import open_workbook
+    except ImportError:
+        return
+    with open_workbook(source) as wb:
+        for name in wb.sheets:
+            with wb.get_sheet(name) as sheet:
+                for i, row in enumerate(sheet.rows()):
+                    if max_rows_per_sheet is not None and i >= max_rows_per_sheet:
+                        break
+                    yield name, [_cell_str(c.v) for c in row]
+
+
+def _ods_cell_text(cell: Any) -> str:
+    """Join text:p paragraphs of an ODS cell (including nested spans)."""
+    parts = [odf_element_text(p) for p in cell.iter(_ODS_TEXT_P)]
+    return " ".join(p for p in parts if p)
+
+
+def _iter_ods_rows(source: Source, max_rows_per_sheet: int | None) -> Iterator[tuple[str, list[str]]]:
+    with zipfile.ZipFile(source, "r") as z:
+        with z.open("content.xml") as content:
+            sheet = ""
+            rows_in_sheet = 0
+            skip_sheet = False
+            cells: list[str] = []
+            # Open elements; finished rows are detached from their parent so the tree never grows
+            stack: list[Any] = []
+            for event, elem in iterparse(content, events=("start", "end")):
+                tag = elem.tag
+                if event == "start":
+                    stack.append(elem)
+                    if tag == _ODS_TABLE:
+                        sheet = elem.get(_ODS_TABLE_NAME, "")
+                        rows_in_sheet = 0
+                        skip_sheet = False
+                    elif tag == _ODS_ROW:
+                        cells = []
+                    continue
+                stack.pop()
+                if tag in (_ODS_CELL, _ODS_COVERED_CELL):
+                    if not skip_sheet:
+                        text = _ods_cell_text(elem)
+                        repeat = int(elem.get(_ODS_COLS_REPEATED, "1") or 1)
+                        # Empty runs expanded too, so later cells keep their column; trailing empties trimmed below
+                        cells.extend([text] * min(repeat, _ODS_MAX_CELL_REPEAT))
+                    elem.clear()
+                elif tag in (_ODS_ROW, _ODS_TABLE):
+                    elem.clear()
+                    if stack:
+                        stack[-1].remove(elem)
+                    if tag == _ODS_TABLE or skip_sheet or not any(cells):
+                        continue
+                    while cells and not cells[-1]:
+                        cells.pop()
+                    yield sheet, cells
+                    rows_in_sheet += 1
+                    if max_rows_per_sheet is not None and rows_in_sheet >= max_rows_per_sheet:
+                        skip_sheet = True
+
+
+def iter_sheet_rows(
+    source: Source,
+    ext: str,
+    max_rows_per_sheet: int | None = None,
+) -> Iterator[tuple[str, list[str]]]:
+    """
+    Yield (sheet_name, row_values) lazily across all sheets of a workbook.
+    Rows are read on demand; stopping iteration early stops parsing. Unknown ext yields nothing.
+    """
+    ext = ext.lower()
+    if ext in (".xlsx", ".xlsm"):
+        yield from _iter_xlsx_rows(source, max_rows_per_sheet)
+    elif ext == ".xls":
+        yield from _iter_xls_rows(source, max_rows_per_sheet)
+    elif ext == ".xlsb":
+        yield from _iter_xlsb_rows(source, max_rows_per_sheet)
+    elif ext == ".ods":
+        yield from _iter_ods_rows(source, max_rows_per_sheet)
+
+
+def read_spreadsheet_sample(source: Source, ext: str, max_chars: int = 10000) -> str:
+    """
+    Return up to max_chars of cell text (space-separated) from all sheets, stopping as soon as the
+    budget is reached. Returns empty string on error (e.g. corrupt workbook, missing optional reader).
+    """
+    parts: list[str] = []
+    total = 0
+    try:
+        for _sheet, row in iter_sheet_rows(source, ext):
+            for value in row:
+                if not value:
+                    continue
+                parts.append(value)
+                total += len(value) + 1
+            if total >= max_chars:
+                break
+    except Exception:
+        pass
+    return " ".join(parts)[:max_chars]
@@ -0,0 +1,376 @@
+"""
+Streaming reader for SQL dumps (pg_dump plain format, mysqldump, generic INSERT scripts) for file scan.
+
+CREATE TABLE column lists are mapped to the values of the following INSERT statements and COPY ... FROM
+stdin blocks, and up to sample_limit rows are kept per table, so a dump can be scanned per column like
+a database instead of from its first characters (usually DDL).
+
+Memory stays bounded whatever the dump size: input is read in fixed-size chunks, lines are capped at
+_MAX_LINE_BYTES (rows are parsed from the first part of a longer extended INSERT and the rest is skipped),
+and once a table has its sample the remaining rows are skipped without being parsed.
+Sources may be a filesystem path or a binary file-like object (read forward only).
+"""
+import re
+from pathlib import Path
+from typing import BinaryIO
+
+SQL_DUMP_EXTENSIONS = {".sql"}
+
+_CHUNK_BYTES = 1024 * 1024
+# Longest line handed to the parser; longer lines (extended INSERTs) are truncated for parsing
+_MAX_LINE_BYTES = 1024 * 1024
+# CREATE TABLE statements larger than this are ignored (column names only come from small DDL)
+_MAX_DDL_CHARS = 256 * 1024
+# Sample values are truncated like DB samples (see _scan_sqlite_file_as_db)
+_MAX_VALUE_CHARS = 200
+
+_NAME = r'(?:"[^"]+"|`[^`]+`|\[[^\]]+\]|[\w$]+)'
+_QUALIFIED = rf"{_NAME}(?:\s*\.\s*{_NAME})*"
+_CREATE_RX = re.compile(
+    rf"\s*CREATE\s+(?:(?:GLOBAL|LOCAL)\s+)?(?:(?:TEMP|TEMPORARY|UNLOGGED)\s+)?TABLE\s+"
+    rf"(?:IF\s+NOT\s+EXISTS\s+)?(?:ONLY\s+)?({_QUALIFIED})\s*\(",
+    re.IGNORECASE,
+)
+_INSERT_RX = re.compile(
+    rf"\s*INSERT\s+(?:IGNORE\s+)?INTO\s+({_QUALIFIED})\s*(?:\(([^)]*)\))?\s*VALUES\s*",
+    re.IGNORECASE,
+)
+_COPY_RX = re.compile(rf"\s*COPY\s+({_QUALIFIED})\s*(?:\(([^)]*)\))?\s+FROM\s+stdin", re.IGNORECASE)
+# Table-level clauses inside CREATE TABLE (...) that are not columns
+_CONSTRAINT_RX = re.compile(
+    r"(?:CONSTRAINT|PRIMARY|UNIQUE|KEY|INDEX|FOREIGN|CHECK|FULLTEXT|SPATIAL|EXCLUDE|LIKE|PERIOD)\b",
+    re.IGNORECASE,
+)
+_LEADING_NAME_RX = re.compile(rf"\s*({_NAME})")
+# One SQL literal (optionally prefixed: _utf8mb4'..', E'..', X'..') or bare token inside a VALUES tuple
+_VALUE_RX = re.compile(
+    r"\s*(?:(?:_\w+\s*|[xXbBnNeE](?='))?'((?:[^'\\]|\\.|'')*)'|\"((?:[^\"\\]|\\.)*)\""
+    r"|([^,()'\"\s][^,()'\"]*(?:\([^()]*\)[^,()'\"]*)?))\s*",
+    re.DOTALL,
+)
+_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "0": "", "\\": "\\", "'": "'", '"': '"'}
+_ESCAPE_RX = re.compile(r"\\(.)")
+
+Source = str | Path | BinaryIO
+
+
+def _unquote(name: str) -> str:
+    name = name.strip()
+    if len(name) >= 2 and name[0] in "\"`[" and name[-1] in "\"`]":
+        return name[1:-1]
+    return name
+
+
+def _table_name(qualified: str) -> str:
+    return ".".join(_unquote(p) for p in re.findall(_NAME, qualified))
+
+
+def _column_list(text: str | None) -> list[str] | None:
+    if not text:
+        return None
+    return [_unquote(c) for c in text.split(",") if c.strip()]
+
+
+def _split_top_level(body: str) -> list[str]:
+    """Split a CREATE TABLE body on commas outside parentheses and quotes."""
+    parts, depth, quote, start = [], 0, "", 0
+    for i, ch in enumerate(body):
+        if quote:
+            if ch == quote:
+                quote = ""
+        elif ch in "'\"`":
+            quote = ch
+        elif ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        elif ch == "," and depth == 0:
+            parts.append(body[start:i])
+            start = i + 1
+    parts.append(body[start:])
+    return parts
+
+
+def _create_columns(statement: str) -> tuple[str, list[str]] | None:
+    """(table, column names) from a full CREATE TABLE statement, or None."""
+    m = _CREATE_RX.match(statement)
+    if not m:
+        return None
+    body_start = m.end()
+    depth, end = 1, len(statement)
+    for i in range(body_start, len(statement)):
+        if statement[i] == "(":
+            depth += 1
+        elif statement[i] == ")":
+            depth -= 1
+            if depth == 0:
+                end = i
+                break
+    columns = []
+    for part in _split_top_level(statement[body_start:end]):
+        if not part.strip() or _CONSTRAINT_RX.match(part.strip()):
+            continue
+        name = _LEADING_NAME_RX.match(part)
+        if name:
+            columns.append(_unquote(name.group(1)))
+    return _table_name(m.group(1)), columns
+
+
+def _literal(m: re.Match) -> str | None:
+    single, double, bare = m.group(1), m.group(2), m.group(3)
+    if single is not None or double is not None:
+        raw = single if single is not None else double
+        return _ESCAPE_RX.sub(lambda e: _ESCAPES.get(e.group(1), e.group(1)), raw.replace("''", "'"))
+    bare = (bare or "").strip()
+    if bare.upper() == "NULL":
+        return None
+    return bare
+
+
+def _parse_tuples(text: str, pos: int, limit: int) -> tuple[list[list[str | None]], int]:
+    """
+    Parse up to limit VALUES tuples starting at pos; stops at the first incomplete tuple.
+    Returns (rows, position after the last complete tuple).
+    """
+    rows: list[list[str | None]] = []
+    n = len(text)
+    while len(rows) < limit:
+        while pos < n and text[pos] in " \t\r\n,":
+            pos += 1
+        if pos >= n or text[pos] != "(":
+            break
+        end = pos + 1
+        row: list[str | None] = []
+        while True:
+            m = _VALUE_RX.match(text, end)
+            if not m:
+                return rows, pos
+            row.append(_literal(m))
+            end = m.end()
+            if end >= n:
+                return rows, pos
+            if text[end] == ",":
+                end += 1
+                continue
+            if text[end] == ")":
+                end += 1
+                break
+            return rows, pos
+        rows.append(row)
+        pos = end
+    return rows, pos
+
+
+def _copy_value(value: str) -> str | None:
+    if value == "\\N":
+        return None
+    return _ESCAPE_RX.sub(lambda e: _ESCAPES.get(e.group(1), e.group(1)), value)
+
+
+class _ChunkReader:
+    """Forward-only byte reader with capped readline and fast skip-until-marker (bounded buffer)."""
+
+    def __init__(self, stream: BinaryIO):
+        self._stream = stream
+        self._buf = bytearray()
+        self._eof = False
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        chunk = self._stream.read(_CHUNK_BYTES)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buf += chunk
+        return True
+
+    def readline(self) -> tuple[bytes, bool] | None:
+        """Return (line, complete); a line longer than _MAX_LINE_BYTES is cut (complete=False). None at EOF."""
+        start = 0
+        while True:
+            idx = self._buf.find(b"\n", start)
+            if idx >= 0 and idx < _MAX_LINE_BYTES:
+                line = bytes(self._buf[:idx + 1])
+                del self._buf[:idx + 1]
+                return line, True
+            if len(self._buf) >= _MAX_LINE_BYTES:
+                line = bytes(self._buf[:_MAX_LINE_BYTES])
+                del self._buf[:_MAX_LINE_BYTES]
+                return line, False
+            start = len(self._buf)
+            if not self._fill():
+                if not self._buf:
+                    return None
+                line = bytes(self._buf)
+                self._buf.clear()
+                return line, True
+
+    def skip_copy_block(self) -> None:
+        """Discard COPY rows up to and including the terminator line (a line equal to "\\.", LF or CRLF)."""
+        line_start = True
+        while True:
+            item = self.readline()
+            if item is None:
+                return
+            line, complete = item
+            if line_start and line.rstrip(b"\r\n") == b"\\.":
+                return
+            line_start = complete
+
+    def skip_past(self, marker: bytes) -> None:
+        """Discard input up to and including the next occurrence of marker (or to EOF)."""
+        while True:
+            idx = self._buf.find(marker)
+            if idx >= 0:
+                del self._buf[:idx + len(marker)]
+                return
+            # Keep a marker-sized tail in case the marker straddles chunks
+            keep = len(marker) - 1
+            if len(self._buf) > keep:
+                del self._buf[:len(self._buf) - keep]
+            if not self._fill():
+                self._buf.clear()
+                return
+
+
+class _Tables:
+    """Column names and sampled values per table, in first-seen order."""
+
+    def __init__(self, sample_limit: int):
+        self.sample_limit = sample_limit
+        self.columns: dict[str, list[str]] = {}
+        self.samples: dict[str, list[list[str]]] = {}
+        self.rows: dict[str, int] = {}
+
+    def define(self, table: str, columns: list[str]) -> None:
+        if table not in self.columns or not self.columns[table]:
+            self.columns[table] = list(columns)
+            self.samples[table] = [[] for _ in columns]
+            self.rows.setdefault(table, 0)
+
+    def full(self, table: str) -> bool:
+        return self.rows.get(table, 0) >= self.sample_limit
+
+    def add_row(self, table: str, values: list[str | None], columns: list[str] | None) -> None:
+        if self.full(table):
+            return
+        if table not in self.columns:
+            self.define(table, columns or [])
+        names, samples = self.columns[table], self.samples[table]
+        for i, value in enumerate(values):
+            name = columns[i] if columns and i < len(columns) else None
+            if name is not None and name in names:
+                idx = names.index(name)
+            elif name is None and i < len(names):
+                idx = i
+            else:
+                names.append(name or f"column_{len(names) + 1}")
+                samples.append([])
+                idx = len(names) - 1
+            if value is not None and value.strip():
+                samples[idx].append(value.strip()[:_MAX_VALUE_CHARS])
+        self.rows[table] = self.rows.get(table, 0) + 1
+
+    def result(self) -> list[tuple[str, list[str], list[list[str]]]]:
+        return [(t, self.columns[t], self.samples[t]) for t in self.columns if self.columns[t]]
+
+
+def _read_dump(reader: _ChunkReader, tables: _Tables) -> None:
+    ddl: list[str] | None = None
+    ddl_chars = 0
+    while True:
+        item = reader.readline()
+        if item is None:
+            return
+        raw, complete = item
+        line = raw.decode("utf-8", errors="replace")
+        if ddl is not None:
+            # Inside a multi-line CREATE TABLE: collect until the statement ends
+            ddl.append(line)
+            ddl_chars += len(line)
+            if line.rstrip().endswith(";") or ddl_chars > _MAX_DDL_CHARS:
+                parsed = _create_columns("".join(ddl)) if ddl_chars <= _MAX_DDL_CHARS else None
+                if parsed:
+                    tables.define(*parsed)
+                ddl = None
+            continue
+        if _CREATE_RX.match(line):
+            if line.rstrip().endswith(";"):
+                parsed = _create_columns(line)
+                if parsed:
+                    tables.define(*parsed)
+            else:
+                ddl, ddl_chars = [line], len(line)
+            continue
+        m = _INSERT_RX.match(line)
+        if m:
+            table = _table_name(m.group(1))
+            if not tables.full(table):
+                columns = _column_list(m.group(2)) or tables.columns.get(table)
+                remaining = tables.sample_limit - tables.rows.get(table, 0)
+                rows, pos = _parse_tuples(line, m.end(), remaining)
+                text = line[pos:]
+                # Statement continues on the next lines (phpMyAdmin: "VALUES" then one tuple per line):
+                # parse the tuples as they complete, keeping only the unparsed tail (at most _MAX_LINE_BYTES)
+                while (
+                    len(rows) < remaining and complete and not line.rstrip().endswith(";")
+                    and len(text) < _MAX_LINE_BYTES
+                ):
+                    item = reader.readline()
+                    if item is None:
+                        break
+                    raw, complete = item
+                    line = raw.decode("utf-8", errors="replace")
+                    text += line
+                    more, pos = _parse_tuples(text, 0, remaining - len(rows))
+                    rows += more
+                    text = text[pos:]
+                for row in rows:
+                    tables.add_row(table, row, columns)
+            if not complete:
+                reader.skip_past(b"\n")
+            continue
+        m = _COPY_RX.match(line)
+        if m:
+            table = _table_name(m.group(1))
+            columns = _column_list(m.group(2)) or tables.columns.get(table)
+            while not tables.full(table):
+                item = reader.readline()
+                if item is None:
+                    return
+                row_line = item[0].decode("utf-8", errors="replace").rstrip("\r\n")
+                if row_line == "\\.":
+                    break
+                tables.add_row(table, [_copy_value(v) for v in row_line.split("\t")], columns)
+                if not item[1]:
+                    reader.skip_past(b"\n")
+            else:
+                # Sample complete: skip the rest of the COPY block without parsing rows
+                reader.skip_copy_block()
+            continue
+        if not complete:
+            reader.skip_past(b"\n")
+
+
+def sample_dump_columns(
+    source: Source,
+    sample_limit: int = 5,
+) -> list[tuple[str, list[str], list[list[str]]]]:
+    """
+    Return [(table, column_names, samples_per_column)] from a SQL dump: columns from CREATE TABLE (or the
+    INSERT/COPY column list), up to sample_limit rows per table from INSERT ... VALUES and COPY ... FROM
+    stdin blocks. Same shape as file_scan.tabular.sample_table_columns. Empty list when the file has no
+    CREATE TABLE/INSERT/COPY or on error (caller falls back to a text scan).
+    """
+    tables = _Tables(sample_limit)
+    try:
+        if isinstance(source, (str, Path)):
+            with open(source, "rb") as f:
+                _read_dump(_ChunkReader(f), tables)
+        else:
+            _read_dump(_ChunkReader(source), tables)
+    except Exception:
+        return []
+    return tables.result()
+
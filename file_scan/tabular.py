@@ -0,0 +1,136 @@
+"""
+Column-aware sampling for tabular files (CSV/TSV, workbooks, Parquet/Arrow/ORC, SQL dumps, JSON), so they can be scanned like DB tables:
+header names plus a few sample values per column, instead of one text blob.
+
+- .csv/.tsv/.tab: csv.reader over the text stream (delimiter sniffed from the first chunk for .csv).
+- .xlsx/.xlsm/.xls/.xlsb/.ods: file_scan.spreadsheet.iter_sheet_rows, one table per sheet.
+- .parquet/.arrow/.feather/.orc: file_scan.columnar (schema + first row group/batch/stripe, optional pyarrow).
+- .sql: file_scan.sql_dump (CREATE TABLE columns mapped to INSERT/COPY rows, one table per dumped table).
+- .json/.jsonl/.ndjson: file_scan.json_stream (one unnamed table whose columns are key paths, e.g. data[].email).
+
+Read budget per format: CSV/TSV and workbooks stop after the header and the first sample rows (per sheet);
+columnar files read the footer and a slice of the first row group/batch/stripe; SQL dumps are streamed to
+EOF in fixed-size chunks (later tables need their rows; rows past the sample are skipped unparsed); JSON
+stops once sample_limit records were seen or at DEFAULT_JSON_MAX_BYTES. Sources may be a filesystem path
+or a binary file-like object.
+"""
+import csv
+import io
+from collections.abc import Iterator
+from itertools import chain
+from pathlib import Path
+from typing import BinaryIO
+
+from file_scan.columnar import COLUMNAR_EXTENSIONS, sample_columnar_columns
+from file_scan.json_stream import JSON_STREAM_EXTENSIONS, sample_json_columns
+from file_scan.spreadsheet import SPREADSHEET_EXTENSIONS, iter_sheet_rows
+from file_scan.sql_dump import SQL_DUMP_EXTENSIONS, sample_dump_columns
+
+DELIMITED_EXTENSIONS = {".csv", ".tsv", ".tab"}
+TABULAR_EXTENSIONS = (
+    DELIMITED_EXTENSIONS | SPREADSHEET_EXTENSIONS | COLUMNAR_EXTENSIONS | SQL_DUMP_EXTENSIONS
+    | JSON_STREAM_EXTENSIONS
+)
+
+# Characters read up front to sniff the CSV dialect (completed to the end of the line)
+_SNIFF_CHARS = 16384
+# Leading blank rows tolerated before the header row
+_MAX_HEADER_ROW = 10
+# Sample values are truncated like DB samples (see _scan_sqlite_file_as_db)
+_MAX_VALUE_CHARS = 200
+
+Source = str | Path | BinaryIO
+
+
+def _open_text(source: Source) -> io.TextIOBase:
+    if isinstance(source, (str, Path)):
+        return open(source, "r", encoding="utf-8-sig", errors="replace", newline="")
+    return io.TextIOWrapper(source, encoding="utf-8-sig", errors="replace", newline="")
+
+
+def _iter_delimited_rows(source: Source, ext: str, max_rows: int | None) -> Iterator[tuple[str, list[str]]]:
+    f = _open_text(source)
+    try:
+        head = f.read(_SNIFF_CHARS)
+        if not head:
+            return
+        if not head.endswith(("\n", "\r")):
+            head += f.readline()
+        if ext in (".tsv", ".tab"):
+            dialect: type[csv.Dialect] | csv.Dialect = csv.excel_tab
+        else:
+            try:
+                dialect = csv.Sniffer().sniff(head, delimiters=",;\t|")
+            except csv.Error:
+                dialect = csv.excel
+        reader = csv.reader(chain(io.StringIO(head), f), dialect)
+        for i, row in enumerate(reader):
+            if max_rows is not None and i >= max_rows:
+                break
+            yield "", row
+    finally:
+        if isinstance(source, (str, Path)):
+            f.close()
+        else:
+            # Leave the caller's binary stream open
+            f.detach()
+
+
+def iter_tabular_rows(
+    source: Source,
+    ext: str,
+    max_rows_per_table: int | None = None,
+) -> Iterator[tuple[str, list[str]]]:
+    """
+    Yield (table_name, row_values) for a tabular file. Delimited files are one table named "";
+    workbooks yield one table per sheet. Unknown ext yields nothing.
+    """
+    ext = ext.lower()
+    if ext in DELIMITED_EXTENSIONS:
+        yield from _iter_delimited_rows(source, ext, max_rows_per_table)
+    elif ext in SPREADSHEET_EXTENSIONS:
+        yield from iter_sheet_rows(source, ext, max_rows_per_sheet=max_rows_per_table)
+
+
+def sample_table_columns(
+    source: Source,
+    ext: str,
+    sample_limit: int = 5,
+) -> list[tuple[str, list[str], list[list[str]]]]:
+    """
+    Return [(table_name, column_names, samples_per_column)] from the header row and up to sample_limit
+    data rows per table. The header is the first non-empty row; blank header cells become column_N.
+    Returns an empty list when no header could be parsed or on error (caller falls back to a text scan).
+    """
+    if ext.lower() in COLUMNAR_EXTENSIONS:
+        return sample_columnar_columns(source, ext, sample_limit)
+    if ext.lower() in SQL_DUMP_EXTENSIONS:
+        return sample_dump_columns(source, sample_limit)
+    if ext.lower() in JSON_STREAM_EXTENSIONS:
+        return sample_json_columns(source, ext, sample_limit)
+    tables: dict[str, tuple[list[str], list[list[str]]]] = {}
+    data_rows: dict[str, int] = {}
+    try:
+        for table, row in iter_tabular_rows(source, ext, max_rows_per_table=_MAX_HEADER_ROW + sample_limit):
+            values = [v.strip() for v in row]
+            if table not in tables:
+                if not any(values):
+                    continue
+                names = [v or f"column_{i + 1}" for i, v in enumerate(values)]
+                tables[table] = (names, [[] for _ in names])
+                data_rows[table] = 0
+                continue
+            if data_rows[table] >= sample_limit:
+                continue
+            names, samples = tables[table]
+            for i, value in enumerate(values):
+                if not value:
+                    continue
+                while i >= len(names):
+                    names.append(f"column_{len(names) + 1}")
+                    samples.append([])
+                samples[i].append(value[:_MAX_VALUE_CHARS])
+            data_rows[table] += 1
+    except Exception:
+        return []
+    return [(table, names, samples) for table, (names, samples) in tables.items()]
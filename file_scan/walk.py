@@ -0,0 +1,96 @@
+"""
+Directory walk for file scans with inode deduplication (rsnapshot-style hardlinked backup trees, symlinked
+directories).
+
+- InodeSet: compact set of (st_dev, st_ino) keys, about 8 bytes per inode. New keys go to a small buffer;
+  full buffers are sorted into array('Q') runs that are merged when they reach the size of the previous run
+  (as in a log-structured merge), so lookups are a few binary searches and inserts stay amortised O(log n).
+- iter_files: yield (path, stat) for each regular file under a root, walking each directory once by inode,
+  so symlink loops and directories reached through several symlinks are not walked again. File stats follow
+  symlinks, so a symlinked file reports the inode of its target.
+"""
+import os
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterator
+from pathlib import Path
+
+# New keys buffered in a Python set before they are sorted into a compact run
+_BUFFER_SIZE = 4096
+
+
+class InodeSet:
+    """Set of (st_dev, st_ino) pairs backed by sorted array('Q') runs per device."""
+
+    def __init__(self, buffer_size: int = _BUFFER_SIZE):
+        self.buffer_size = max(1, buffer_size)
+        self._runs: dict[int, list[array]] = {}
+        self._buffer: set[tuple[int, int]] = set()
+        self._len = 0
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __contains__(self, key: tuple[int, int]) -> bool:
+        if key in self._buffer:
+            return True
+        dev, ino = key
+        for run in self._runs.get(dev, ()):
+            i = bisect_left(run, ino)
+            if i < len(run) and run[i] == ino:
+                return True
+        return False
+
+    def add(self, dev: int, ino: int) -> bool:
+        """Add (dev, ino); return False when it was already present."""
+        key = (dev, ino)
+        if key in self:
+            return False
+        self._buffer.add(key)
+        self._len += 1
+        if len(self._buffer) >= self.buffer_size:
+            self._flush()
+        return True
+
+    def _flush(self) -> None:
+        by_dev: dict[int, list[int]] = {}
+        for dev, ino in self._buffer:
+            by_dev.setdefault(dev, []).append(ino)
+        self._buffer.clear()
+        for dev, inos in by_dev.items():
+            runs = self._runs.setdefault(dev, [])
+            run = array("Q", sorted(inos))
+            # Keep run sizes decreasing: merge while the last run is not larger than the new one
+            while runs and len(runs[-1]) <= len(run):
+                run = array("Q", sorted(runs.pop() + run))
+            runs.append(run)
+
+
+def iter_files(root: str | Path, recursive: bool = True, follow_symlinks: bool = True) -> Iterator[tuple[Path, os.stat_result]]:
+    """
+    Yield (path, stat) for each regular file under root (depth first, names sorted). Each directory is
+    walked once by (st_dev, st_ino); unreadable directories and entries that vanish are skipped.
+    """
+    walked = InodeSet()
+    stack = [str(root)]
+    while stack:
+        directory = stack.pop()
+        try:
+            st = os.stat(directory)
+            if not walked.add(st.st_dev, st.st_ino):
+                continue
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            continue
+        subdirs = []
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=follow_symlinks):
+                    if recursive:
+                        subdirs.append(entry.path)
+                elif entry.is_file(follow_symlinks=follow_symlinks):
+                    yield Path(entry.path), entry.stat(follow_symlinks=follow_symlinks)
+            except OSError:
+                continue
+        stack.extend(reversed(subdirs))
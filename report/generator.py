@@ -398,7 +398,7 @@ def _trends_rows(
 
 
 def _get_session_metadata(db_manager: Any, session_id: str) -> dict[str, Any]:
-    """Return started_at, tenant_name, technician_name, config_scope_hash for the given session (or None)."""
+    """Return started_at, tenant_name, technician_name, config_scope_hash, scan_metadata for the given session (or None)."""
     for s in (db_manager.list_sessions() or []):
         if s.get("session_id") == session_id:
             return {
@@ -406,8 +406,48 @@ def _get_session_metadata(db_manager: Any, session_id: str) -> dict[str, Any]:
                 "tenant_name": s.get("tenant_name"),
                 "technician_name": s.get("technician_name"),
                 "config_scope_hash": s.get("config_scope_hash"),
+                "scan_metadata": s.get("scan_metadata") or {},
             }
-    return {"started_at": None, "tenant_name": None, "technician_name": None, "config_scope_hash": None}
+    return {"started_at": None, "tenant_name": None, "technician_name": None, "config_scope_hash": None, "scan_metadata": {}}
+
+
+def _format_throttle_stats(stats: dict) -> str:
+    """One-line summary of achieved I/O rates (core.throttle.IOThrottle.stats)."""
+    bps = stats.get("bytes_per_second")
+    fps = stats.get("files_per_second")
+    text = f"{stats.get('files', 0)} files, {stats.get('bytes', 0)} bytes"
+    if bps is not None:
+        text += f"; {bps / (1024 * 1024):.2f} MiB/s, {fps} files/s"
+    if stats.get("throttled_seconds"):
+        text += f"; waited {stats['throttled_seconds']} s"
+    return text
+
+
+def _format_powerbi_stats(stats: dict) -> str:
+    """One-line summary of a Power BI target's run: totals, then seconds per workspace (slowest first)."""
+    text = f"{stats.get('seconds', 0)} s, {stats.get('requests', 0)} API requests"
+    if stats.get("retried"):
+        text += f" ({stats['retried']} retried)"
+    workspaces = sorted((stats.get("workspaces") or {}).items(), key=lambda kv: -(kv[1].get("seconds") or 0))
+    parts = [
+        f"{name}: {ws.get('seconds', 0)} s, {ws.get('datasets', 0)} datasets, {ws.get('queries', 0)} DAX queries"
+        for name, ws in workspaces
+    ]
+    return "; ".join([text] + parts)
+
+
+def _format_snowflake_stats(stats: dict) -> str:
+    """One-line summary of a Snowflake target's run: queries issued (vs. one per column), warehouse usage."""
+    text = (
+        f"{stats.get('queries', 0)} queries for {stats.get('tables', 0)} tables / {stats.get('columns', 0)} columns"
+        f" (per-column sampling: {stats.get('per_column_queries', 0)}); {stats.get('seconds', 0)} s"
+    )
+    if "execution_seconds" in stats:
+        text += (
+            f"; warehouse {stats['execution_seconds']} s, ~{stats.get('warehouse_credits_estimate', 0)} credits"
+            f", {stats.get('bytes_scanned', 0)} bytes scanned"
+        )
+    return text
 
 
 def _get_report_config_and_filtered_rows(
@@ -572,6 +612,15 @@ def _build_report_info(session_id: str, meta: dict, about: dict) -> list[dict]:
     ]
     if meta.get("config_scope_hash"):
         report_info.append({"Field": "Config scope hash", "Value": meta["config_scope_hash"]})
+    io_throttle = (meta.get("scan_metadata") or {}).get("io_throttle") or {}
+    if io_throttle.get("global"):
+        report_info.append({"Field": "I/O throttle (global)", "Value": _format_throttle_stats(io_throttle["global"])})
+    for name, stats in sorted((io_throttle.get("targets") or {}).items()):
+        report_info.append({"Field": f"I/O throttle: {name}", "Value": _format_throttle_stats(stats)})
+    for name, stats in sorted(((meta.get("scan_metadata") or {}).get("powerbi") or {}).items()):
+        report_info.append({"Field": f"Power BI: {name}", "Value": _format_powerbi_stats(stats)})
+    for name, stats in sorted(((meta.get("scan_metadata") or {}).get("snowflake") or {}).items()):
+        report_info.append({"Field": f"Snowflake: {name}", "Value": _format_snowflake_stats(stats)})
     report_info.extend([
         {"Field": "Application", "Value": about["name"]},
         {"Field": "Version", "Value": about["version"]},
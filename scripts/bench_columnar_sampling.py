@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Benchmark file_scan.columnar sampling: bytes read and wall time as Parquet/Feather/ORC files grow.
+
+Writes synthetic files of increasing size (id, nome, cpf, email, valor columns; many row groups /
+record batches / stripes) to a temporary directory and samples each through a byte-counting file
+object, using the same code path as the file scan (sample_columnar_columns). With projection pushdown
+and first-row-group-only sampling, bytes read should stay roughly constant while file size grows.
+
+Requires pyarrow (uv pip install -e ".[columnar]"). Multi-GB sizes need matching free disk space.
+
+Usage:
+  uv run python scripts/bench_columnar_sampling.py
+  uv run python scripts/bench_columnar_sampling.py --sizes-mb 256,1024,4096 --formats parquet
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+REPO_ROOT = SCRIPT_DIR.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from file_scan.columnar import sample_columnar_columns  # noqa: E402
+
+_CHUNK_ROWS = 500_000
+
+
+class CountingFile(io.FileIO):
+    """Read-only file that counts bytes returned by read/readinto."""
+
+    def __init__(self, path: Path):
+        super().__init__(path, "r")
+        self.bytes_read = 0
+
+    def read(self, size: int = -1) -> bytes:
+        data = super().read(size)
+        self.bytes_read += len(data or b"")
+        return data
+
+    def readinto(self, buffer) -> int:
+        n = super().readinto(buffer) or 0
+        self.bytes_read += n
+        return n
+
+
+def _chunk(start: int, rows: int):
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    ids = pa.array(range(start, start + rows), pa.int64())
+    digits = pc.utf8_lpad(pc.cast(pc.add(ids, 100_000_000_00), pa.string()), 11, "0")
+    return pa.table({
+        "id": ids,
+        "nome": pc.binary_join_element_wise("Cliente ", pc.cast(ids, pa.string()), ""),
+        "cpf": digits,
+        "email": pc.binary_join_element_wise("cliente", pc.cast(ids, pa.string()), "@example.com", ""),
+        "valor": pc.divide(pc.cast(ids, pa.float64()), 7.0),
+    })
+
+
+def write_file(path: Path, fmt: str, target_bytes: int) -> None:
+    """Append chunks until the file reaches target_bytes (checked after each chunk)."""
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+    import pyarrow.orc as orc
+    import pyarrow.parquet as pq
+
+    schema = _chunk(0, 1).schema
+    if fmt == "parquet":
+        writer = pq.ParquetWriter(path, schema)
+    elif fmt == "feather":
+        writer = ipc.new_file(pa.OSFile(str(path), "wb"), schema, options=ipc.IpcWriteOptions(compression="lz4"))
+    else:
+        writer = orc.ORCWriter(str(path))
+    start = 0
+    try:
+        while True:
+            table = _chunk(start, _CHUNK_ROWS)
+            if fmt == "parquet":
+                writer.write_table(table, row_group_size=_CHUNK_ROWS // 4)
+            elif fmt == "feather":
+                writer.write_table(table, max_chunksize=64 * 1024)
+            else:
+                writer.write(table)
+            start += _CHUNK_ROWS
+            if fmt != "orc" and path.stat().st_size >= target_bytes:
+                break
+            if fmt == "orc" and start * 60 >= target_bytes:
+                # ORC writer buffers stripes; estimate from rows written, actual size is reported below
+                break
+    finally:
+        writer.close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes-mb", default="64,256,1024", help="comma-separated target file sizes in MiB")
+    parser.add_argument("--formats", default="parquet,feather,orc", help="comma-separated: parquet, feather, orc")
+    parser.add_argument("--sample-limit", type=int, default=5, help="values sampled per column")
+    args = parser.parse_args()
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        print("pyarrow not installed: uv pip install -e \".[columnar]\"")
+        return 1
+
+    sizes = [int(s) for s in args.sizes_mb.split(",") if s.strip()]
+    formats = [f.strip() for f in args.formats.split(",") if f.strip()]
+    print(f"{'format':<8} {'file size':>11} {'bytes read':>12} {'time':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for fmt in formats:
+            for size_mb in sizes:
+                path = Path(tmp) / f"bench_{size_mb}.{fmt}"
+                write_file(path, fmt, size_mb * 1024 * 1024)
+                with CountingFile(path) as f:
+                    t0 = time.perf_counter()
+                    tables = sample_columnar_columns(f, f".{fmt}", args.sample_limit)
+                    elapsed = time.perf_counter() - t0
+                    read_kib = f.bytes_read / 1024
+                columns = len(tables[0][1]) if tables else 0
+                size = path.stat().st_size / (1024 * 1024)
+                print(f"{fmt:<8} {size:>7.0f} MiB {read_kib:>8.0f} KiB {elapsed * 1000:>7.1f} ms  ({columns} columns)")
+                path.unlink()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Benchmark file_scan streaming extractors against the previous per-format implementations.
+
+Generates synthetic documents in a temporary directory and, for each format, measures wall time and
+peak Python memory (tracemalloc) to obtain the default 10k-character sample:
+
+- streaming: file_scan.office.read_office_sample (zip opened once, iterparse, stops at the budget)
+- legacy:    python-docx paragraphs, odfpy load, regex over full slide XML, pandas.read_excel(nrows=20)
+
+Legacy readers whose packages are missing are reported as "n/a".
+
+Usage:
+  uv run python scripts/bench_file_extractors.py
+  uv run python scripts/bench_file_extractors.py --paragraphs 50000 --repeat 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+import zipfile
+from pathlib import Path
+from typing import Callable
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+REPO_ROOT = SCRIPT_DIR.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from file_scan.office import read_office_sample  # noqa: E402
+
+MAX_CHARS = 10000
+_LINE = "Cliente {i}: Maria da Silva, CPF 123.456.789-{c:02d}, email maria{i}@example.com"
+
+_ODF_HEAD = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<office:document-content xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0" '
+    'xmlns:table="urn:oasis:names:tc:opendocument:xmlns:table:1.0" '
+    'xmlns:text="urn:oasis:names:tc:opendocument:xmlns:text:1.0"><office:body>'
+)
+_ODF_TAIL = "</office:body></office:document-content>"
+_ODF_MANIFEST = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<manifest:manifest xmlns:manifest="urn:oasis:names:tc:opendocument:xmlns:manifest:1.0">'
+    '<manifest:file-entry manifest:full-path="/" manifest:media-type="{mime}"/>'
+    '<manifest:file-entry manifest:full-path="content.xml" manifest:media-type="text/xml"/>'
+    "</manifest:manifest>"
+)
+_PPTX_SLIDE = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<p:sld xmlns:p="http://schemas.openxmlformats.org/presentationml/2006/main" '
+    'xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main"><p:cSld><p:spTree><p:sp><p:txBody>'
+    "{paras}</p:txBody></p:sp></p:spTree></p:cSld></p:sld>"
+)
+
+
+def _lines(n: int) -> list[str]:
+    return [_LINE.format(i=i, c=i % 100) for i in range(n)]
+
+
+def make_docx(path: Path, n: int) -> None:
+    from docx import Document
+
+    doc = Document()
+    for line in _lines(n):
+        doc.add_paragraph(line)
+    doc.save(path)
+
+
+def make_pptx(path: Path, n: int, per_slide: int = 50) -> None:
+    # Minimal package with slide parts only: enough for both extractors under test
+    lines = _lines(n)
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as z:
+        for s, start in enumerate(range(0, n, per_slide), start=1):
+            paras = "".join(f"<a:p><a:r><a:t>{t}</a:t></a:r></a:p>" for t in lines[start:start + per_slide])
+            z.writestr(f"ppt/slides/slide{s}.xml", _PPTX_SLIDE.format(paras=paras))
+
+
+def _write_odf(path: Path, mime: str, body: str) -> None:
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as z:
+        z.writestr("mimetype", mime)
+        z.writestr("META-INF/manifest.xml", _ODF_MANIFEST.format(mime=mime))
+        z.writestr("content.xml", f"{_ODF_HEAD}{body}{_ODF_TAIL}")
+
+
+def make_odt(path: Path, n: int) -> None:
+    body = "".join(f"<text:p>{t}</text:p>" for t in _lines(n))
+    _write_odf(path, "application/vnd.oasis.opendocument.text", f"<office:text>{body}</office:text>")
+
+
+def make_ods(path: Path, n: int) -> None:
+    rows = "".join(
+        f"<table:table-row><table:table-cell><text:p>{t}</text:p></table:table-cell></table:table-row>"
+        for t in _lines(n)
+    )
+    _write_odf(
+        path,
+        "application/vnd.oasis.opendocument.spreadsheet",
+        f'<office:spreadsheet><table:table table:name="S">{rows}</table:table></office:spreadsheet>',
+    )
+
+
+def make_xlsx(path: Path, n: int) -> None:
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("S")
+    for line in _lines(n):
+        ws.append(line.split(", "))
+    wb.save(path)
+
+
+def legacy_docx(path: Path) -> str:
+    from docx import Document
+
+    doc = Document(path)
+    return " ".join(p.text for p in doc.paragraphs[:50])[:MAX_CHARS]
+
+
+def legacy_odf(path: Path) -> str:
+    from odf import teletype
+    from odf import text as odf_text
+    from odf.opendocument import load
+
+    doc = load(path)
+    return " ".join(teletype.extractText(el) for el in doc.getElementsByType(odf_text.P))[:MAX_CHARS]
+
+
+def legacy_pptx(path: Path) -> str:
+    parts = []
+    with zipfile.ZipFile(path, "r") as z:
+        for name in z.namelist():
+            if name.startswith("ppt/slides/slide") and name.endswith(".xml"):
+                parts.append(re.sub(r"<[^>]+>", " ", z.read(name).decode("utf-8", errors="replace")))
+    return " ".join(parts)[:MAX_CHARS]
+
+
+def legacy_xlsx(path: Path) -> str:
+    import pandas as pd
+
+    df = pd.read_excel(path, nrows=20, header=None)
+    return " ".join(df.astype(str).stack().tolist())[:MAX_CHARS]
+
+
+def measure(fn: Callable[[], str], repeat: int) -> tuple[float, float] | None:
+    """Return (best seconds, peak MiB) or None when the reader's package is missing."""
+    best = float("inf")
+    peak = 0
+    for _ in range(repeat):
+        tracemalloc.start()
+        t0 = time.perf_counter()
+        try:
+            fn()
+        except ImportError:
+            tracemalloc.stop()
+            return None
+        best = min(best, time.perf_counter() - t0)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return best, peak / (1024 * 1024)
+
+
+def _fmt(result: tuple[float, float] | None) -> str:
+    if result is None:
+        return f"{'n/a':>22}"
+    return f"{result[0] * 1000:>10.1f} ms {result[1]:>7.1f} MiB"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--paragraphs", type=int, default=20000, help="paragraphs/rows per document")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per reader (best time is reported)")
+    args = parser.parse_args()
+
+    cases = [
+        (".docx", make_docx, legacy_docx),
+        (".pptx", make_pptx, legacy_pptx),
+        (".odt", make_odt, legacy_odf),
+        (".ods", make_ods, legacy_odf),
+        (".xlsx", make_xlsx, legacy_xlsx),
+    ]
+    print(f"{'format':<7} {'size':>9}  {'streaming':>22}  {'legacy':>22}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for ext, make, legacy in cases:
+            path = Path(tmp) / f"bench{ext}"
+            try:
+                make(path, args.paragraphs)
+            except ImportError as e:
+                print(f"{ext:<7} skipped (generator needs {e.name})")
+                continue
+            size_kib = path.stat().st_size / 1024
+            streaming = measure(lambda: read_office_sample(path, ext, MAX_CHARS), args.repeat)
+            old = measure(lambda: legacy(path), args.repeat)
+            print(f"{ext:<7} {size_kib:>7.0f}KiB  {_fmt(streaming)}  {_fmt(old)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+"""Tests for streaming archive scanning (file_scan.archive) and its use by the filesystem connector.
+
+Archives are built in memory or tmp_path; no member is ever extracted to disk.
+"""
+import io
+import tarfile
+import tempfile
+import zipfile
+from unittest.mock import MagicMock
+
+import pytest
+
+from connectors.filesystem_connector import FilesystemConnector, _scan_archive_file
+from core.database import failure_hint
+from file_scan.archive import archive_extension, archive_limits, iter_archive_members
+
+
+class _Scanner:
+    """HIGH when the CPF sample or a cpf column/file name shows up; LOW otherwise."""
+
+    def _hit(self, name, text):
+        return "cpf" in str(name).lower() or "123.456.789-09" in (text or "")
+
+    def scan_column(self, name, sample):
+        level = "HIGH" if self._hit(name, sample) else "LOW"
+        return {"sensitivity_level": level, "pattern_detected": "CPF", "norm_tag": "", "ml_confidence": 0}
+
+    def scan_file_content(self, content, path):
+        if not self._hit("", content):
+            return None
+        return {"sensitivity_level": "HIGH", "pattern_detected": "CPF", "norm_tag": "", "ml_confidence": 0}
+
+
+def _zip_bytes(members: dict[str, bytes]) -> bytes:
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as z:
+        for name, data in members.items():
+            z.writestr(name, data)
+    return buf.getvalue()
+
+
+def _tar_bytes(members: dict[str, bytes], mode: str = "w:gz") -> bytes:
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode=mode) as tar:
+        for name, data in members.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    return buf.getvalue()
+
+
+def test_archive_extension_keeps_compound_tar_suffix():
+    assert archive_extension("backup.TAR.GZ") == ".tar.gz"
+    assert archive_extension("export.tgz") == ".tgz"
+    assert archive_extension("dados.csv") == ".csv"
+
+
+def test_archive_limits_from_config_ignores_invalid_values():
+    limits = archive_limits({"archive_max_depth": "2", "archive_max_members": -1, "archive_max_total_bytes": "x"})
+    assert limits["max_depth"] == 2
+    assert limits["max_members"] == 1000
+    assert limits["max_total_bytes"] == 256 * 1024 * 1024
+
+
+def test_nested_archives_yield_bang_paths():
+    inner = _tar_bytes({"notes.txt": b"CPF 123.456.789-09"})
+    outer = _zip_bytes({"data/readme.txt": b"hello", "nested/inner.tar.gz": inner})
+    members = list(iter_archive_members(io.BytesIO(outer), ".zip"))
+    assert members == [("data/readme.txt", b"hello"), ("nested/inner.tar.gz!/notes.txt", b"CPF 123.456.789-09")]
+
+
+def test_limits_depth_members_and_member_bytes():
+    level3 = _zip_bytes({"deep.txt": b"x"})
+    level2 = _zip_bytes({"l3.zip": level3})
+    bomb = b"\0" * (2 * 1024 * 1024)
+    outer = _zip_bytes({"l2.zip": level2, "bomb.txt": bomb, "a.txt": b"a", "b.txt": b"b"})
+    skipped = []
+    limits = {"max_depth": 2, "max_members": 3, "max_member_bytes": 1024 * 1024, "max_total_bytes": 10**9}
+    names = [n for n, _ in iter_archive_members(io.BytesIO(outer), ".zip", limits, skipped)]
+    assert names == ["a.txt"]
+    assert any("max_depth" in s for s in skipped)
+    assert any(s.startswith("bomb.txt") and "max_member_bytes" in s for s in skipped)
+    assert any("max_members" in s for s in skipped)
+
+
+def test_total_bytes_limit_stops_scan():
+    outer = _tar_bytes({f"f{i}.txt": b"y" * 1000 for i in range(10)}, mode="w")
+    skipped = []
+    limits = {"max_depth": 3, "max_members": 100, "max_member_bytes": 5000, "max_total_bytes": 2500}
+    names = [n for n, _ in iter_archive_members(io.BytesIO(outer), ".tar", limits, skipped)]
+    assert names == ["f0.txt", "f1.txt"]
+    assert skipped == ["max_total_bytes (2500) reached"]
+
+
+def test_scan_archive_file_members_through_extractors(monkeypatch, tmp_path):
+    """Tabular and text members are scanned in memory; no temp file is created."""
+    def _no_temp(*args, **kwargs):
+        raise AssertionError("archive members must not be written to temp files")
+
+    monkeypatch.setattr(tempfile, "mkstemp", _no_temp)
+    monkeypatch.setattr(tempfile, "NamedTemporaryFile", _no_temp)
+    path = tmp_path / "export.zip"
+    path.write_bytes(_zip_bytes({
+        "clientes/pessoas.csv": b"nome,cpf\nAna,123.456.789-09\n",
+        "inner.zip": _zip_bytes({"notes.md": b"CPF 123.456.789-09"}),
+        "ok.txt": b"nothing here",
+        "image.bin": b"\x00CPF 123.456.789-09",
+    }))
+    findings = _scan_archive_file(path, ".zip", _Scanner())
+    assert [f["file_name"] for f in findings] == [
+        "export.zip!/clientes/pessoas.csv | cpf",
+        "export.zip!/inner.zip!/notes.md",
+    ]
+    assert findings[1]["data_type"] == "MD"
+    assert findings[0]["path"] == str(tmp_path)
+
+
+def test_filesystem_connector_scans_tar_gz_and_reports_limits(tmp_path):
+    (tmp_path / "backup.tar.gz").write_bytes(_tar_bytes({"a.txt": b"CPF 123.456.789-09", "b.txt": b"x"}))
+    (tmp_path / "broken.zip").write_bytes(b"PK\x03\x04 not a zip")
+    db = MagicMock()
+    connector = FilesystemConnector(
+        {"name": "fs", "path": str(tmp_path)}, _Scanner(), db, extensions=[".tar.gz", ".zip"],
+        archive_limits={"max_depth": 3, "max_members": 1, "max_member_bytes": 1024, "max_total_bytes": 4096},
+    )
+    connector.run()
+    assert [c.kwargs["file_name"] for c in db.save_finding.call_args_list] == ["backup.tar.gz!/a.txt"]
+    assert {c.args[1] for c in db.save_failure.call_args_list} == {"archive_limit"}
+    failures = [c.args[2] for c in db.save_failure.call_args_list]
+    assert any("backup.tar.gz" in f and "max_members" in f for f in failures)
+    assert any("broken.zip" in f and "unreadable archive" in f for f in failures)
+    assert "archive" in failure_hint("archive_limit").lower()
+
+
+@pytest.mark.parametrize("scan_archives, expected", [(True, 1), (False, 0)])
+def test_scan_archives_option(tmp_path, scan_archives, expected):
+    (tmp_path / "x.zip").write_bytes(_zip_bytes({"a.txt": b"CPF 123.456.789-09"}))
+    db = MagicMock()
+    FilesystemConnector(
+        {"name": "fs", "path": str(tmp_path)}, _Scanner(), db, extensions=[".zip"], scan_archives=scan_archives,
+    ).run()
+    assert db.save_finding.call_count == expected
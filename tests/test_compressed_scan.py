@@ -0,0 +1,127 @@
+"""Tests for single-file compressed formats (file_scan.compressed) and their scan by the filesystem connector.
+
+Files are compressed in tmp_path with the standard library (zstandard tests are skipped when not installed).
+"""
+import bz2
+import gzip
+import io
+import lzma
+import os
+import zipfile
+from unittest.mock import MagicMock
+
+import pytest
+
+from connectors.filesystem_connector import FilesystemConnector, _scan_archive_file, _scan_compressed_file
+from file_scan.compressed import inner_extension, read_decompressed
+
+
+class _Scanner:
+    """HIGH when a cpf column name or the CPF value shows up; records file content samples."""
+
+    def __init__(self):
+        self.contents = []
+
+    def scan_column(self, name, sample):
+        hit = "cpf" in name.lower() or "123.456.789-09" in sample
+        return {"sensitivity_level": "HIGH" if hit else "LOW", "pattern_detected": "CPF", "norm_tag": "", "ml_confidence": 0}
+
+    def scan_file_content(self, content, path):
+        self.contents.append(content)
+        if "123.456.789-09" not in content:
+            return None
+        return {"sensitivity_level": "HIGH", "pattern_detected": "CPF", "norm_tag": "", "ml_confidence": 0}
+
+
+class _CountingBytesIO(io.BytesIO):
+    def __init__(self, data):
+        super().__init__(data)
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        data = super().read(size)
+        self.bytes_read += len(data)
+        return data
+
+    def readinto(self, buffer):
+        n = super().readinto(buffer)
+        self.bytes_read += n
+        return n
+
+
+@pytest.mark.parametrize("name, expected", [
+    ("export.csv.xz", ".csv"),
+    ("app.log.3.gz", ".log"),
+    ("app.log-20240101.bz2", ".log"),
+    ("syslog.2.gz", ".txt"),
+    ("dump.SQL.GZ", ".sql"),
+])
+def test_inner_extension(name, expected):
+    assert inner_extension(name) == expected
+
+
+def test_huge_gz_reads_only_the_sampling_budget():
+    """Incompressible text: sampling decompresses a small prefix, not the whole file."""
+    lines = b"".join(os.urandom(32).hex().encode() + b"\n" for _ in range(120_000))
+    source = _CountingBytesIO(gzip.compress(b"cpf 123.456.789-09\n" + lines, compresslevel=1))
+    scanner = _Scanner()
+    findings = _scan_compressed_file(source, ".gz", scanner, file_name="app.log.1.gz")
+    assert [f["file_name"] for f in findings] == ["app.log.1.gz"]
+    assert findings[0]["data_type"] == "LOG"
+    assert len(scanner.contents[0]) == 10000
+    assert source.bytes_read < len(source.getvalue()) // 10
+
+
+def test_csv_xz_scanned_per_column(tmp_path):
+    path = tmp_path / "export.csv.xz"
+    path.write_bytes(lzma.compress(b"nome;cpf\nAna;123.456.789-09\n"))
+    findings = _scan_compressed_file(path, ".xz", _Scanner())
+    assert [f["file_name"] for f in findings] == ["export.csv.xz | cpf"]
+    assert findings[0]["path"] == str(tmp_path)
+
+
+def test_random_access_inner_format_is_bounded(tmp_path):
+    """Workbooks need random access: decompressed in memory up to max_bytes, else name-only."""
+    from openpyxl import Workbook
+
+    wb = Workbook()
+    wb.active.append(["cpf"])
+    wb.active.append(["123.456.789-09"])
+    buf = io.BytesIO()
+    wb.save(buf)
+    path = tmp_path / "dados.xlsx.bz2"
+    path.write_bytes(bz2.compress(buf.getvalue()))
+    assert [f["file_name"] for f in _scan_compressed_file(path, ".bz2", _Scanner())] == ["dados.xlsx.bz2 | Sheet.cpf"]
+    assert read_decompressed(path, ".bz2", 100) is None
+    assert _scan_compressed_file(path, ".bz2", _Scanner(), scan_tabular_as_table=False, max_bytes=100) == []
+
+
+def test_corrupt_file_gets_name_only_analysis(tmp_path):
+    path = tmp_path / "broken.txt.gz"
+    path.write_bytes(b"\x1f\x8b not gzip")
+    scanner = _Scanner()
+    assert _scan_compressed_file(path, ".gz", scanner) == []
+    assert scanner.contents == [""]
+
+
+def test_zst_when_zstandard_installed(tmp_path):
+    zstandard = pytest.importorskip("zstandard")
+    path = tmp_path / "notes.md.zst"
+    path.write_bytes(zstandard.ZstdCompressor().compress(b"CPF 123.456.789-09"))
+    assert [f["data_type"] for f in _scan_compressed_file(path, ".zst", _Scanner())] == ["MD"]
+
+
+def test_compressed_member_inside_archive():
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as z:
+        z.writestr("logs/app.log.2.gz", gzip.compress(b"CPF 123.456.789-09"))
+    findings = _scan_archive_file(io.BytesIO(buf.getvalue()), ".zip", _Scanner(), file_name="logs.zip")
+    assert [f["file_name"] for f in findings] == ["logs.zip!/logs/app.log.2.gz"]
+
+
+def test_filesystem_connector_scans_rotated_logs(tmp_path):
+    (tmp_path / "app.log.3.gz").write_bytes(gzip.compress(b"CPF 123.456.789-09"))
+    (tmp_path / "clean.log.1.gz").write_bytes(gzip.compress(b"nothing"))
+    db = MagicMock()
+    FilesystemConnector({"name": "fs", "path": str(tmp_path)}, _Scanner(), db, extensions=[".gz"]).run()
+    assert [c.kwargs["file_name"] for c in db.save_finding.call_args_list] == ["app.log.3.gz"]
@@ -1,5 +1,6 @@
 """Tests for config loader and database layer (no live DB required)."""
 import os
+import threading
 import pytest
 from pathlib import Path
 
@@ -187,6 +188,58 @@ def test_wipe_all_data_logs_and_clears(tmp_path):
         mgr.dispose()
 
 
+def test_connector_state_kept_between_sessions_and_wiped(tmp_path):
+    db_path = str(tmp_path / "test_state.db")
+    mgr = LocalDBManager(db_path)
+    try:
+        assert mgr.get_connector_state("sp", "change_token:x") is None
+        mgr.set_connector_state("sp", "change_token:x", "1;3;10")
+        mgr.set_connector_state("sp", "change_token:x", "1;3;12")
+        mgr.set_connector_state("other", "change_token:x", "1;3;99")
+        assert mgr.get_connector_state("sp", "change_token:x") == "1;3;12"
+        mgr.set_connector_state("other", "change_token:x", None)
+        assert mgr.get_connector_state("other", "change_token:x") is None
+        mgr.wipe_all_data("pytest wipe")
+        assert mgr.get_connector_state("sp", "change_token:x") is None
+    finally:
+        mgr.dispose()
+
+
+def test_session_metadata_merges_per_target_entries(tmp_path):
+    mgr = LocalDBManager(str(tmp_path / "test_meta.db"))
+    try:
+        mgr.create_session_record("s1")
+        mgr.update_session_metadata("s1", {"powerbi": {"a": {"seconds": 1}}})
+        mgr.update_session_metadata("s1", {"powerbi": {"b": {"seconds": 2}}, "other": 1})
+        [session] = mgr.list_sessions()
+        assert session["scan_metadata"] == {"powerbi": {"a": {"seconds": 1}, "b": {"seconds": 2}}, "other": 1}
+    finally:
+        mgr.dispose()
+
+
+
+def test_session_metadata_concurrent_targets_keep_their_entries(tmp_path):
+    mgr = LocalDBManager(str(tmp_path / "test_meta.db"))
+    try:
+        mgr.create_session_record("s1")
+        barrier = threading.Barrier(8, timeout=10)
+
+        def _target(i):
+            barrier.wait()
+            for j in range(5):
+                mgr.update_session_metadata("s1", {"snowflake": {f"t{i}-{j}": {"seconds": i}}})
+
+        threads = [threading.Thread(target=_target, args=(i,)) for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        [session] = mgr.list_sessions()
+        assert len(session["scan_metadata"]["snowflake"]) == 40
+    finally:
+        mgr.dispose()
+
+
 def test_load_config_file(config_path=None):
     path = Path("config.yaml")
     if not path.exists():
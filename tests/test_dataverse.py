@@ -0,0 +1,183 @@
+"""Tests for DataverseConnector with a mocked Web API (httpx.MockTransport): expanded metadata in one call cached
+by metadata version, $batch sampling with $select, concurrent batches, retries and token renewal on 401."""
+import json
+import threading
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import httpx
+import pytest
+
+from connectors import dataverse_connector
+from connectors.dataverse_connector import DataverseConnector, _parse_batch_response
+from core import token_cache
+from core.database import LocalDBManager
+from core.token_cache import TokenCache
+
+_TARGET = {
+    "name": "dv", "org_url": "https://contoso.crm.dynamics.com", "tenant_id": "t", "client_id": "c",
+    "client_secret": "s", "batch_size": 2,
+}
+
+
+class _Scanner:
+    def scan_column(self, name, sample):
+        hit = "cpf" in name.lower() or "123.456.789-09" in sample
+        return {"sensitivity_level": "HIGH" if hit else "LOW", "pattern_detected": "CPF", "norm_tag": "", "ml_confidence": 0}
+
+
+def _attr(name, kind, attribute_of=None):
+    return {"LogicalName": name, "SchemaName": name.title(), "AttributeType": kind, "AttributeOf": attribute_of}
+
+
+class _Dataverse:
+    """Fake Dataverse Web API: metadata version, expanded EntityDefinitions and $batch GETs."""
+
+    def __init__(self):
+        self.version = "100!2026-10-01"
+        self.entities = {
+            "contacts": ("contact", [
+                _attr("fullname", "String"), _attr("documento", "String"), _attr("description", "Memo"),
+                _attr("parentcustomerid", "Lookup"), _attr("parentcustomeridname", "String", "parentcustomerid"),
+                _attr("statecode", "State"),
+            ]),
+            "accounts": ("account", [_attr("name", "String"), _attr("cpf_responsavel", "String")]),
+            "leads": ("lead", [_attr("subject", "String")]),
+            "notes": ("annotation", [_attr("notetext", "Memo")]),
+            "tasks": ("task", []),
+        }
+        self.metadata_calls = 0
+        self.batches = []
+        self.fail_batches = []
+        self.lock = threading.Lock()
+        self.on_batch = None
+        self.tokens = 0
+        self.expired = set()
+
+    def token(self, *args, **kwargs):
+        with self.lock:
+            self.tokens += 1
+            token = f"tok-{self.tokens}"
+        return SimpleNamespace(raise_for_status=lambda: None, json=lambda: {"access_token": token, "expires_in": 3599})
+
+    def __call__(self, request):
+        if request.headers["Authorization"].split(" ", 1)[1] in self.expired:
+            return httpx.Response(401)
+        path = unquote(request.url.path).split("/api/data/v9.2/", 1)[1]
+        if path.startswith("RetrieveMetadataChanges"):
+            return httpx.Response(200, json={"EntityMetadata": [], "ServerVersionStamp": self.version})
+        if path == "EntityDefinitions":
+            params = parse_qs(urlsplit(str(request.url)).query)
+            assert params["$expand"] == ["Attributes($select=LogicalName,SchemaName,AttributeType,AttributeOf)"]
+            self.metadata_calls += 1
+            return httpx.Response(200, json={"value": [
+                {"LogicalName": logical, "EntitySetName": entity_set, "Attributes": attrs}
+                for entity_set, (logical, attrs) in self.entities.items()
+            ]})
+        assert path == "$batch" and request.method == "POST"
+        if self.on_batch:
+            self.on_batch()
+        with self.lock:
+            if self.fail_batches:
+                return self.fail_batches.pop(0)
+        boundary = request.headers["Content-Type"].split("boundary=", 1)[1]
+        assert request.content.decode().rstrip("\r\n").endswith(f"--{boundary}--")
+        urls = [line.split(" ")[1] for line in request.content.decode().split("\r\n") if line.startswith("GET ")]
+        with self.lock:
+            self.batches.append(urls)
+        parts = []
+        for url in urls:
+            query = parse_qs(urlsplit(url).query)
+            selected = query["$select"][0].split(",") if "$select" in query else ["fullname", "description"]
+            row = {"@odata.etag": "W/1"}
+            row.update({col: ("123.456.789-09" if col == "documento" else "x" * 300) for col in selected})
+            parts.append(
+                f"--resp\r\nContent-Type: application/http\r\nContent-Transfer-Encoding: binary\r\n\r\n"
+                f"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n\r\n{json.dumps({'value': [row]})}\r\n"
+            )
+        body = "".join(parts) + "--resp--\r\n"
+        return httpx.Response(200, content=body.encode(), headers={"Content-Type": "multipart/mixed; boundary=resp"})
+
+
+@pytest.fixture
+def api(monkeypatch):
+    api = _Dataverse()
+    transport = httpx.MockTransport(api)
+    monkeypatch.setattr(dataverse_connector, "httpx", SimpleNamespace(
+        post=api.token, Client=lambda **kwargs: httpx.Client(transport=transport, **kwargs),
+    ))
+    monkeypatch.setattr(token_cache, "_CACHE", TokenCache())
+    return api
+
+
+def _found(db):
+    return sorted((c.kwargs["table_name"], c.kwargs["column_name"]) for c in db.save_finding.call_args_list)
+
+
+def test_batched_sampling_with_select(api):
+    db = MagicMock()
+    DataverseConnector(_TARGET, _Scanner(), db).run()
+    db.save_failure.assert_not_called()
+    assert _found(db) == [("accounts", "cpf_responsavel"), ("contacts", "documento")]
+    # 5 entities, 2 per $batch
+    assert sorted(len(urls) for urls in api.batches) == [1, 2, 2]
+    urls = {u.split("?", 1)[0].rsplit("/", 1)[1]: u for batch in api.batches for u in batch}
+    assert urls["contacts"].endswith("contacts?$select=fullname,documento,description&$top=5")
+    # No sampled attribute: plain $top
+    assert urls["tasks"].endswith("tasks?$top=5")
+    assert all(u.startswith("https://contoso.api.crm.dynamics.com/api/data/v9.2/") for u in urls.values())
+
+
+def test_batches_run_concurrently(api):
+    barrier = threading.Barrier(3, timeout=5)
+    api.on_batch = barrier.wait
+    db = MagicMock()
+    DataverseConnector({**_TARGET, "concurrency": 3}, _Scanner(), db).run()
+    db.save_failure.assert_not_called()
+    assert len(api.batches) == 3
+
+
+def test_throttled_batch_retried_after_retry_after(api):
+    api.fail_batches = [httpx.Response(429, headers={"Retry-After": "0"})]
+    db = MagicMock()
+    DataverseConnector({**_TARGET, "concurrency": 1}, _Scanner(), db).run()
+    db.save_failure.assert_not_called()
+    assert len(_found(db)) == 2
+
+
+def test_token_renewed_once_on_401(api):
+    DataverseConnector(_TARGET, _Scanner(), MagicMock()).run()
+    assert api.tokens == 1
+    api.expired.add("tok-1")
+    db = MagicMock()
+    DataverseConnector({**_TARGET, "concurrency": 3}, _Scanner(), db).run()
+    db.save_failure.assert_not_called()
+    assert api.tokens == 2
+    assert len(_found(db)) == 2
+
+
+def test_metadata_cached_by_version(api, tmp_path):
+    mgr = LocalDBManager(str(tmp_path / "audit.db"))
+    try:
+        for _ in range(2):
+            DataverseConnector(_TARGET, _Scanner(), mgr).run()
+        assert api.metadata_calls == 1
+        api.version = "101!2026-10-18"
+        DataverseConnector(_TARGET, _Scanner(), mgr).run()
+        assert api.metadata_calls == 2
+        _, _, failures = mgr.get_findings()
+        assert failures == []
+    finally:
+        mgr.dispose()
+
+
+def test_parse_batch_response_statuses():
+    body = (
+        b"--b1\r\nContent-Type: application/http\r\n\r\nHTTP/1.1 200 OK\r\nContent-Type: application/json\r\n\r\n"
+        b'{"value": [{"a": 1}]}\r\n'
+        b"--b1\r\nContent-Type: application/http\r\n\r\nHTTP/1.1 403 Forbidden\r\n\r\n"
+        b'{"error": {"code": "0x80040220"}}\r\n--b1--\r\n'
+    )
+    parts = _parse_batch_response('multipart/mixed; boundary="b1"', body)
+    assert parts == [(200, {"value": [{"a": 1}]}), (403, {"error": {"code": "0x80040220"}})]
@@ -0,0 +1,176 @@
+"""Tests for the concurrent fetch pool of remote-share connectors (core.fetch_pool)."""
+import threading
+import time
+
+import pytest
+import requests
+
+from core.fetch_pool import AdaptiveBackoff, FetchPool, failure_reason, is_server_error, pool_from_config, retry_after
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(round(seconds, 3))
+        self.now += seconds
+
+
+def _http_error(status, headers=None):
+    response = requests.Response()
+    response.status_code = status
+    response.headers.update(headers or {})
+    return requests.HTTPError(response=response)
+
+
+def test_reads_overlap_up_to_the_pool_size():
+    """Four fetches must be in flight at once to pass the barrier; never more than the pool size."""
+    barrier = threading.Barrier(4, timeout=5)
+    active, peak, lock = [0], [0], threading.Lock()
+
+    def fetch(client, item):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        if item < 4:
+            barrier.wait()
+        time.sleep(0.01)
+        with lock:
+            active[0] -= 1
+        return item * 2
+
+    results = {item: result for item, result, error in FetchPool(workers=4).map(range(20), fetch)}
+    assert results == {i: i * 2 for i in range(20)}
+    assert peak[0] == 4
+
+
+def test_one_client_per_worker_reused_and_closed():
+    created, closed = [], []
+
+    def make_client():
+        client = object()
+        created.append(client)
+        return client
+
+    used = set()
+    pool = FetchPool(workers=3, make_client=make_client, close_client=closed.append)
+    for _ in pool.map(range(30), lambda client, item: used.add(id(client))):
+        pass
+    assert 1 <= len(created) <= 3
+    assert used == {id(c) for c in created}
+    assert closed == created
+
+
+def test_results_are_consumed_lazily_and_in_caller_thread():
+    """Items are pulled as slots free up, so a huge listing is never materialised."""
+    pulled = []
+
+    def items():
+        for i in range(1000):
+            pulled.append(i)
+            yield i
+
+    main = threading.get_ident()
+    seen = 0
+    for _ in FetchPool(workers=2).map(items(), lambda client, item: item):
+        assert threading.get_ident() == main
+        seen += 1
+        # 2 * workers submitted, one more pulled per completed fetch
+        assert len(pulled) <= 4 + seen
+        if seen == 10:
+            break
+
+
+def test_server_errors_retried_with_shared_backoff():
+    clock = _Clock()
+    backoff = AdaptiveBackoff(initial=0.5, maximum=4, clock=clock, sleep=clock.sleep)
+    attempts = {}
+
+    def fetch(client, item):
+        attempts[item] = attempts.get(item, 0) + 1
+        if item == "busy" and attempts[item] <= 2:
+            raise _http_error(503)
+        if item == "limited" and attempts[item] == 1:
+            raise _http_error(429, {"Retry-After": "7"})
+        if item == "denied":
+            raise _http_error(403)
+        return item
+
+    pool = FetchPool(workers=1, retries=3, backoff=backoff)
+    out = {item: (result, error) for item, result, error in pool.map(["busy", "limited", "denied"], fetch)}
+    assert out["busy"] == ("busy", None) and attempts["busy"] == 3
+    assert out["limited"] == ("limited", None)
+    assert isinstance(out["denied"][1], requests.HTTPError) and attempts["denied"] == 1
+    # 503 twice: 0.5 s then 1 s; the 429 waits its Retry-After
+    assert clock.slept == [0.5, 1.0, 7.0]
+
+
+def test_retries_exhausted_yields_error():
+    clock = _Clock()
+    pool = FetchPool(workers=1, retries=2, backoff=AdaptiveBackoff(clock=clock, sleep=clock.sleep))
+
+    def fetch(client, item):
+        raise ConnectionResetError("reset by peer")
+
+    [(item, result, error)] = list(pool.map(["a"], fetch))
+    assert result is None and isinstance(error, ConnectionResetError)
+    assert len(clock.slept) == 2
+
+
+def test_backoff_grows_and_recovers():
+    clock = _Clock()
+    backoff = AdaptiveBackoff(initial=1, maximum=8, clock=clock, sleep=clock.sleep)
+    for expected in (1, 2, 4, 8, 8):
+        backoff.failure()
+        assert backoff.delay == expected
+    backoff.success()
+    assert backoff.delay == 4
+    for _ in range(3):
+        backoff.success()
+    assert backoff.delay == 0
+
+
+@pytest.mark.parametrize("exc, expected", [
+    (_http_error(500), True),
+    (_http_error(429), True),
+    (_http_error(404), False),
+    (requests.ConnectionError("x"), True),
+    (TimeoutError(), True),
+    (PermissionError(13, "denied"), False),
+    (type("ResponseErrorCode", (Exception,), {"code": 502})(), True),
+])
+def test_is_server_error(exc, expected):
+    assert is_server_error(exc) is expected
+
+
+@pytest.mark.parametrize("exc, expected", [
+    (_http_error(403), "permission_denied"),
+    (_http_error(401), "permission_denied"),
+    (PermissionError(13, "denied"), "permission_denied"),
+    (OSError(13, "STATUS_ACCESS_DENIED"), "permission_denied"),
+    (type("ResponseErrorCode", (Exception,), {"code": 403})(), "permission_denied"),
+    (requests.ReadTimeout("x"), "timeout"),
+    (requests.ConnectTimeout("x"), "timeout"),
+    (TimeoutError(), "timeout"),
+    (requests.ConnectionError("reset"), "unreachable"),
+    (ConnectionResetError(104, "reset"), "unreachable"),
+    (type("NoConnection", (Exception,), {})(), "unreachable"),
+    (_http_error(503), "error"),
+    (ValueError("bad"), "error"),
+])
+def test_failure_reason(exc, expected):
+    assert failure_reason(exc) == expected
+
+
+def test_retry_after_and_config():
+    assert retry_after(_http_error(503, {"Retry-After": "3"})) == 3.0
+    assert retry_after(_http_error(503)) is None
+    pool = pool_from_config({"concurrency": 8, "retries": "1"})
+    assert (pool.workers, pool.retries) == (8, 1)
+    pool = pool_from_config({"concurrency": "many"})
+    assert (pool.workers, pool.retries) == (4, 3)
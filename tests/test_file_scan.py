@@ -0,0 +1,341 @@
+"""Tests for file_scan streaming extractors (spreadsheets, OOXML/ODF text, tabular and columnar columns) and their use by the filesystem connector.
+
+Workbooks and documents are generated in tmp_path; no network or external services are required.
+"""
+import io
+import zipfile
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from connectors.filesystem_connector import FilesystemConnector, _read_text_sample, _scan_tabular_file_as_table
+from file_scan.columnar import read_columnar_sample, sample_columnar_columns
+from file_scan.office import iter_office_text, read_office_sample
+from file_scan.spreadsheet import iter_sheet_rows, read_spreadsheet_sample
+from file_scan.tabular import sample_table_columns
+
+_ODS_CONTENT_TMPL = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<office:document-content xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0" '
+    'xmlns:table="urn:oasis:names:tc:opendocument:xmlns:table:1.0" '
+    'xmlns:text="urn:oasis:names:tc:opendocument:xmlns:text:1.0">'
+    "<office:body><office:spreadsheet>{tables}</office:spreadsheet></office:body>"
+    "</office:document-content>"
+)
+
+
+def _ods_table(name: str, rows: list[list[str]]) -> str:
+    body = []
+    for row in rows:
+        cells = "".join(f"<table:table-cell><text:p>{v}</text:p></table:table-cell>" for v in row)
+        # Trailing repeated empty cells/rows, as LibreOffice writes them
+        cells += '<table:table-cell table:number-columns-repeated="1020"/>'
+        body.append(f"<table:table-row>{cells}</table:table-row>")
+    body.append('<table:table-row table:number-rows-repeated="1048000"><table:table-cell/></table:table-row>')
+    return f'<table:table table:name="{name}">{"".join(body)}</table:table>'
+
+
+def _write_ods(path: Path, sheets: dict[str, list[list[str]]]) -> Path:
+    tables = "".join(_ods_table(name, rows) for name, rows in sheets.items())
+    with zipfile.ZipFile(path, "w") as z:
+        z.writestr("mimetype", "application/vnd.oasis.opendocument.spreadsheet")
+        z.writestr("content.xml", _ODS_CONTENT_TMPL.format(tables=tables))
+    return path
+
+
+def _write_xlsx(path: Path, sheets: dict[str, list[list[str]]]) -> Path:
+    from openpyxl import Workbook
+
+    wb = Workbook()
+    wb.remove(wb.active)
+    for name, rows in sheets.items():
+        ws = wb.create_sheet(name)
+        for row in rows:
+            ws.append(row)
+    wb.save(path)
+    return path
+
+
+def test_xlsx_rows_stream_across_all_sheets(tmp_path):
+    """All sheets are read (pd.read_excel only read the first), rows in order."""
+    path = _write_xlsx(tmp_path / "book.xlsx", {
+        "Clientes": [["nome", "cpf"], ["Ana", "123.456.789-09"]],
+        "Contatos": [["email"], ["ana@example.com"]],
+    })
+    rows = list(iter_sheet_rows(path, ".xlsx"))
+    assert rows[0] == ("Clientes", ["nome", "cpf"])
+    assert ("Contatos", ["ana@example.com"]) in rows
+
+
+def test_xlsx_max_rows_per_sheet(tmp_path):
+    path = _write_xlsx(tmp_path / "big.xlsx", {"S": [[f"r{i}"] for i in range(200)], "T": [["x"]]})
+    rows = list(iter_sheet_rows(path, ".xlsx", max_rows_per_sheet=3))
+    assert [r for _, r in rows] == [["r0"], ["r1"], ["r2"], ["x"]]
+
+
+def test_ods_rows_skip_repeated_empty_cells_and_rows(tmp_path):
+    """ODS is parsed incrementally; trailing repeated empties do not inflate rows."""
+    path = _write_ods(tmp_path / "sheet.ods", {
+        "Folha1": [["nome", "email"], ["Bia", "bia@example.com"]],
+        "Folha2": [["telefone"]],
+    })
+    rows = list(iter_sheet_rows(path, ".ods"))
+    assert rows == [
+        ("Folha1", ["nome", "email"]),
+        ("Folha1", ["Bia", "bia@example.com"]),
+        ("Folha2", ["telefone"]),
+    ]
+
+
+
+def test_ods_repeated_empty_cells_keep_columns_aligned(tmp_path):
+    gap = '<table:table-cell table:number-columns-repeated="2"/>'
+    row = "<table:table-row>{}</table:table-row>"
+    cell = "<table:table-cell><text:p>{}</text:p></table:table-cell>"
+    table = '<table:table table:name="S">{}</table:table>'.format(
+        row.format(cell.format("nome") + cell.format("obs") + cell.format("tel") + cell.format("cpf"))
+        + row.format(cell.format("Ana") + gap + cell.format("123.456.789-09") + '<table:table-cell table:number-columns-repeated="1020"/>')
+    )
+    path = tmp_path / "gaps.ods"
+    with zipfile.ZipFile(path, "w") as z:
+        z.writestr("content.xml", _ODS_CONTENT_TMPL.format(tables=table))
+    rows = list(iter_sheet_rows(path, ".ods"))
+    assert rows[1] == ("S", ["Ana", "", "", "123.456.789-09"])
+
+
+def test_spreadsheet_sample_stops_at_budget(tmp_path):
+    path = _write_xlsx(tmp_path / "budget.xlsx", {"S": [["x" * 50, "y" * 50] for _ in range(500)]})
+    sample = read_spreadsheet_sample(path, ".xlsx", max_chars=120)
+    assert len(sample) == 120
+    assert sample.startswith("x" * 50)
+
+
+def test_spreadsheet_sample_accepts_file_like(tmp_path):
+    path = _write_ods(tmp_path / "mem.ods", {"S": [["ana@example.com"]]})
+    buf = io.BytesIO(path.read_bytes())
+    assert "ana@example.com" in read_spreadsheet_sample(buf, ".ods")
+
+
+def test_spreadsheet_sample_corrupt_returns_empty(tmp_path):
+    bad = tmp_path / "bad.xlsx"
+    bad.write_bytes(b"not a zip")
+    assert read_spreadsheet_sample(bad, ".xlsx") == ""
+
+
+@pytest.mark.parametrize("ext", [".xlsx", ".ods"])
+def test_read_text_sample_uses_streaming_spreadsheet_reader(tmp_path, ext):
+    sheets = {"Dados": [["cpf"], ["123.456.789-09"]]}
+    path = tmp_path / f"dados{ext}"
+    if ext == ".ods":
+        _write_ods(path, sheets)
+    else:
+        _write_xlsx(path, sheets)
+    text = _read_text_sample(path, ext)
+    assert "cpf" in text
+    assert "123.456.789-09" in text
+
+
+_PPTX_SLIDE_TMPL = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<p:sld xmlns:p="http://schemas.openxmlformats.org/presentationml/2006/main" '
+    'xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main"><p:cSld><p:spTree><p:sp><p:txBody>'
+    "<a:p><a:r><a:t>{text}</a:t></a:r></a:p></p:txBody></p:sp></p:spTree></p:cSld></p:sld>"
+)
+
+
+def _write_odt(path: Path, body: str) -> Path:
+    content = _ODS_CONTENT_TMPL.replace("office:spreadsheet", "office:text").format(tables=body)
+    with zipfile.ZipFile(path, "w") as z:
+        z.writestr("mimetype", "application/vnd.oasis.opendocument.text")
+        z.writestr("content.xml", content)
+    return path
+
+
+def test_docx_paragraph_split_across_runs_stays_contiguous(tmp_path):
+    """A CPF split across runs is emitted as one string (python-docx is only used to write the file)."""
+    from docx import Document
+
+    doc = Document()
+    p = doc.add_paragraph("CPF ")
+    p.add_run("123.456")
+    p.add_run(".789-09")
+    doc.add_paragraph("Contato: ana@example.com")
+    path = tmp_path / "cliente.docx"
+    doc.save(path)
+    texts = list(iter_office_text(path, ".docx"))
+    assert texts == ["CPF 123.456.789-09", "Contato: ana@example.com"]
+
+
+def test_pptx_slides_in_numeric_order(tmp_path):
+    path = tmp_path / "deck.pptx"
+    with zipfile.ZipFile(path, "w") as z:
+        for n in (10, 2, 1):
+            z.writestr(f"ppt/slides/slide{n}.xml", _PPTX_SLIDE_TMPL.format(text=f"slide {n}"))
+    assert list(iter_office_text(path, ".pptx")) == ["slide 1", "slide 2", "slide 10"]
+
+
+def test_odt_space_markers_render_as_spaces(tmp_path):
+    path = _write_odt(tmp_path / "doc.odt", "<text:h>Titulo</text:h><text:p>CPF<text:s/>123.456.789-09</text:p>")
+    assert read_office_sample(path, ".odt") == "Titulo CPF 123.456.789-09"
+
+
+def test_xlsx_shared_strings_and_numbers_emitted_once(tmp_path):
+    path = _write_xlsx(tmp_path / "book.xlsx", {"S": [["email", "ana@example.com"], [42, 3.5]]})
+    texts = list(iter_office_text(path, ".xlsx"))
+    assert texts.count("ana@example.com") == 1
+    assert "42" in texts
+    assert "3.5" in texts
+
+
+def test_office_sample_stops_at_budget(tmp_path):
+    body = "".join(f"<text:p>{'z' * 40} {i}</text:p>" for i in range(5000))
+    path = _write_odt(tmp_path / "long.odt", body)
+    sample = read_office_sample(path, ".odt", max_chars=100)
+    assert len(sample) == 100
+    assert sample.startswith("z" * 40 + " 0")
+
+
+def test_office_sample_accepts_file_like_and_corrupt_returns_empty(tmp_path):
+    path = _write_odt(tmp_path / "mem.odt", "<text:p>bia@example.com</text:p>")
+    assert read_office_sample(io.BytesIO(path.read_bytes()), ".odt") == "bia@example.com"
+    assert read_office_sample(io.BytesIO(b"not a zip"), ".docx") == ""
+
+
+@pytest.mark.parametrize("ext", [".odt", ".pptx"])
+def test_read_text_sample_uses_streaming_office_reader(tmp_path, ext):
+    path = tmp_path / f"doc{ext}"
+    if ext == ".odt":
+        _write_odt(path, "<text:p>CPF 123.456.789-09</text:p>")
+    else:
+        with zipfile.ZipFile(path, "w") as z:
+            z.writestr("ppt/slides/slide1.xml", _PPTX_SLIDE_TMPL.format(text="CPF 123.456.789-09"))
+    assert "123.456.789-09" in _read_text_sample(path, ext)
+
+
+class _ColumnScanner:
+    """Flags a column as HIGH when its name or sample mentions cpf; records every scan_column call."""
+
+    def __init__(self):
+        self.calls = []
+
+    def scan_column(self, name, sample):
+        self.calls.append((name, sample))
+        hit = "cpf" in name.lower() or "123.456.789-09" in sample
+        return {"sensitivity_level": "HIGH" if hit else "LOW", "pattern_detected": "CPF" if hit else "",
+                "norm_tag": "", "ml_confidence": 0}
+
+    def scan_file_content(self, content, path):
+        return {"sensitivity_level": "MEDIUM", "pattern_detected": "BLOB", "norm_tag": "", "ml_confidence": 0}
+
+
+def test_csv_columns_sampled_with_sniffed_delimiter(tmp_path):
+    path = tmp_path / "clientes.csv"
+    rows = ["nome;documento;;obs"] + [f"Cliente {i};123.456.789-09;;x;extra" for i in range(50)]
+    path.write_text("\n".join(rows), encoding="utf-8")
+    [(table, names, samples)] = sample_table_columns(path, ".csv", sample_limit=3)
+    assert table == ""
+    assert names == ["nome", "documento", "column_3", "obs", "column_5"]
+    assert samples[1] == ["123.456.789-09"] * 3
+    assert samples[2] == []
+
+
+def test_tsv_from_file_like_leaves_stream_open():
+    buf = io.BytesIO("\ufeffemail\tcpf\nana@example.com\t123.456.789-09\n".encode("utf-8"))
+    [(_, names, samples)] = sample_table_columns(buf, ".tsv")
+    assert names == ["email", "cpf"]
+    assert samples == [["ana@example.com"], ["123.456.789-09"]]
+    assert not buf.closed
+
+
+def test_workbook_columns_per_sheet(tmp_path):
+    path = _write_ods(tmp_path / "book.ods", {"A": [["cpf"], ["123.456.789-09"]], "B": [["cidade"], ["Rio"]]})
+    tables = sample_table_columns(path, ".ods")
+    assert [(t, n) for t, n, _ in tables] == [("A", ["cpf"]), ("B", ["cidade"])]
+
+
+def test_scan_tabular_file_emits_per_column_findings(tmp_path):
+    path = _write_xlsx(tmp_path / "book.xlsx", {"Dados": [["id", "doc"], ["1", "123.456.789-09"]]})
+    scanner = _ColumnScanner()
+    findings = _scan_tabular_file_as_table(path, ".xlsx", scanner, sample_limit=5)
+    assert [f["file_name"] for f in findings] == ["book.xlsx | Dados.doc"]
+    assert findings[0]["data_type"] == "XLSX"
+    assert ("id", "1") in scanner.calls
+
+
+def test_scan_tabular_file_unparsable_returns_none(tmp_path):
+    empty = tmp_path / "empty.csv"
+    empty.write_text("\n\n", encoding="utf-8")
+    assert _scan_tabular_file_as_table(empty, ".csv", _ColumnScanner()) is None
+
+
+@pytest.mark.parametrize("as_table, expected", [(True, ["pessoas.csv | cpf"]), (False, ["pessoas.csv"])])
+def test_filesystem_connector_tabular_option(tmp_path, as_table, expected):
+    (tmp_path / "pessoas.csv").write_text("cpf,nome\n123.456.789-09,Ana\n", encoding="utf-8")
+    db = MagicMock()
+    connector = FilesystemConnector(
+        {"name": "fs", "path": str(tmp_path)}, _ColumnScanner(), db, extensions=[".csv"],
+        scan_tabular_as_table=as_table,
+    )
+    connector.run()
+    assert [c.kwargs["file_name"] for c in db.save_finding.call_args_list] == expected
+
+
+def _columnar_table(rows: int):
+    pa = pytest.importorskip("pyarrow")
+    return pa.table({"cpf": ["123.456.789-09"] * rows, "id": list(range(rows))})
+
+
+@pytest.mark.parametrize("ext", [".parquet", ".feather", ".orc"])
+def test_columnar_schema_and_first_values(tmp_path, ext):
+    table = _columnar_table(50)
+    path = tmp_path / f"data{ext}"
+    if ext == ".parquet":
+        import pyarrow.parquet as pq
+        pq.write_table(table, path, row_group_size=10)
+    elif ext == ".feather":
+        import pyarrow.feather as feather
+        feather.write_feather(table, path)
+    else:
+        import pyarrow.orc as orc
+        orc.write_table(table, path)
+    assert sample_columnar_columns(path, ext, sample_limit=2) == [
+        ("", ["cpf", "id"], [["123.456.789-09", "123.456.789-09"], ["0", "1"]]),
+    ]
+    assert read_columnar_sample(path, ext).startswith("cpf 123.456.789-09")
+
+
+def test_parquet_sampling_reads_only_a_slice(tmp_path):
+    """Projection + first row group only: bytes read stay far below the file size."""
+    pq = pytest.importorskip("pyarrow.parquet")
+
+    path = tmp_path / "big.parquet"
+    pq.write_table(_columnar_table(400_000), path, row_group_size=20_000, compression="none")
+    reads = []
+
+    class Counting(io.FileIO):
+        def read(self, size=-1):
+            data = super().read(size)
+            reads.append(len(data))
+            return data
+
+        def readinto(self, buffer):
+            n = super().readinto(buffer)
+            reads.append(n or 0)
+            return n
+
+    with Counting(path, "r") as f:
+        [(_, names, _samples)] = sample_columnar_columns(f, ".parquet")
+    assert names == ["cpf", "id"]
+    assert sum(reads) < path.stat().st_size // 5
+
+
+def test_columnar_corrupt_returns_empty_and_connector_uses_columns(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+
+    (tmp_path / "bad.parquet").write_bytes(b"PAR1 not really")
+    assert sample_columnar_columns(tmp_path / "bad.parquet", ".parquet") == []
+    pq.write_table(_columnar_table(3), tmp_path / "export.parquet")
+    findings = _scan_tabular_file_as_table(tmp_path / "export.parquet", ".parquet", _ColumnScanner())
+    assert [f["file_name"] for f in findings] == ["export.parquet | cpf"]
+    assert findings[0]["data_type"] == "PARQUET"
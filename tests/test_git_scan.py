@@ -0,0 +1,151 @@
+"""Tests for the git connector: history blobs scanned once per SHA across all refs, read from the object database,
+findings saved for every path@commit of a blob.
+
+Repositories are built in tmp_path with the git command line; tests are skipped when git is not installed.
+"""
+import shutil
+import subprocess
+from unittest.mock import MagicMock
+
+import pytest
+
+from connectors.git_connector import GitConnector, iter_history_blobs
+from core.connector_registry import connector_for_target
+from core.database import failure_hint
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+
+
+class _Scanner:
+    """HIGH when the CPF sample or a cpf column name shows up; counts text scans per content."""
+
+    def __init__(self):
+        self.scanned: list[str] = []
+
+    def scan_column(self, name, sample):
+        hit = "cpf" in name.lower() or "123.456.789-09" in sample
+        return {"sensitivity_level": "HIGH" if hit else "LOW", "pattern_detected": "CPF", "norm_tag": "", "ml_confidence": 0}
+
+    def scan_file_content(self, content, path):
+        self.scanned.append(content)
+        if "123.456.789-09" not in content:
+            return None
+        return {"sensitivity_level": "HIGH", "pattern_detected": "CPF", "norm_tag": "", "ml_confidence": 0}
+
+
+def _git(repo, *args) -> str:
+    return subprocess.run(
+        ["git", "-C", str(repo), "-c", "user.email=audit@example.com", "-c", "user.name=Audit", *args],
+        check=True, capture_output=True, text=True,
+    ).stdout.strip()
+
+
+def _commit(repo, files: dict[str, str | None], message: str = "c") -> str:
+    for name, content in files.items():
+        path = repo / name
+        if content is None:
+            _git(repo, "rm", "-q", name)
+            continue
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+        _git(repo, "add", name)
+    _git(repo, "commit", "-q", "-m", message)
+    return _git(repo, "rev-parse", "HEAD")
+
+
+@pytest.fixture
+def repo(tmp_path):
+    path = tmp_path / "repo"
+    path.mkdir()
+    _git(path, "init", "-q", "-b", "main")
+    return path
+
+
+def _run(repo, scanner=None, **target):
+    db = MagicMock()
+    scanner = scanner or _Scanner()
+    GitConnector({"name": "git", "path": str(repo), **target}, scanner, db, extensions=[".txt", ".csv", ".env"]).run()
+    return db, scanner
+
+
+def test_secret_deleted_from_working_tree_found_in_history(repo):
+    added = _commit(repo, {"config/app.env": "CPF=123.456.789-09\n", "README.txt": "ok"})
+    _commit(repo, {"config/app.env": None})
+    db, _ = _run(repo)
+    [call] = db.save_finding.call_args_list
+    assert call.args == ("filesystem",)
+    assert call.kwargs["file_name"] == f"config/app.env@{added[:12]}"
+    assert call.kwargs["path"] == str(repo)
+    db.save_failure.assert_not_called()
+
+
+def test_same_blob_on_paths_and_branches_scanned_once(repo):
+    first = _commit(repo, {"a.txt": "CPF 123.456.789-09", "other.txt": "nada"})
+    _git(repo, "checkout", "-q", "-b", "feature")
+    copy = _commit(repo, {"copy/a.txt": "CPF 123.456.789-09", "other.txt": "outro"})
+    _git(repo, "checkout", "-q", "main")
+    last = _commit(repo, {"b.txt": "CPF 123.456.789-09"})
+    blobs = list(iter_history_blobs(repo))
+    assert len(blobs) == 5 and len({sha for sha, _, _ in blobs}) == 3
+    db, scanner = _run(repo)
+    assert sorted(scanner.scanned) == ["CPF 123.456.789-09", "nada", "outro"]
+    # Scanned once, reported for every path@commit holding the content
+    assert sorted(c.kwargs["file_name"] for c in db.save_finding.call_args_list) == sorted([
+        f"a.txt@{first[:12]}", f"copy/a.txt@{copy[:12]}", f"b.txt@{last[:12]}",
+    ])
+
+
+def test_same_tabular_blob_reported_per_path(repo):
+    first = _commit(repo, {"clientes.csv": "nome,cpf\nAna,123.456.789-09\n"})
+    renamed = _commit(repo, {"clientes.csv": None, "export/clientes.csv": "nome,cpf\nAna,123.456.789-09\n"})
+    db, _ = _run(repo)
+    assert sorted(c.kwargs["file_name"] for c in db.save_finding.call_args_list) == [
+        f"clientes.csv@{first[:12]} | cpf", f"export/clientes.csv@{renamed[:12]} | cpf",
+    ]
+
+
+def test_git_log_stderr_does_not_block(repo, tmp_path):
+    commit = _commit(repo, {"a.txt": "CPF 123.456.789-09"})
+    # More warnings than a pipe buffer holds, written before any history output
+    wrapper = tmp_path / "git-noisy"
+    wrapper.write_text(
+        f'#!/bin/sh\nif [ "$3" = log ]; then head -c 300000 /dev/zero | tr "\\0" w >&2; fi\nexec {shutil.which("git")} "$@"\n'
+    )
+    wrapper.chmod(0o755)
+    db, _ = _run(repo, git_binary=str(wrapper))
+    assert [c.kwargs["file_name"] for c in db.save_finding.call_args_list] == [f"a.txt@{commit[:12]}"]
+
+
+def test_refs_option_limits_history(repo):
+    _commit(repo, {"a.txt": "nada"})
+    _git(repo, "checkout", "-q", "-b", "feature")
+    _commit(repo, {"leak.txt": "CPF 123.456.789-09"})
+    _git(repo, "checkout", "-q", "main")
+    db, _ = _run(repo, refs=["main"])
+    db.save_finding.assert_not_called()
+    db, _ = _run(repo)
+    assert [c.kwargs["file_name"].split("@")[0] for c in db.save_finding.call_args_list] == ["leak.txt"]
+
+
+def test_tabular_blob_reported_per_column(repo):
+    commit = _commit(repo, {"exports/clientes.csv": "nome,cpf\nAna,123.456.789-09\n"})
+    db, _ = _run(repo)
+    assert [c.kwargs["file_name"] for c in db.save_finding.call_args_list] == [f"exports/clientes.csv@{commit[:12]} | cpf"]
+
+
+def test_blob_over_max_bytes_not_read(repo):
+    _commit(repo, {"big.txt": "CPF 123.456.789-09 " + "x" * 5000, "small.txt": "nada"})
+    db, scanner = _run(repo, max_blob_bytes=1024)
+    db.save_finding.assert_not_called()
+    assert scanner.scanned == ["nada"]
+    [failure] = db.save_failure.call_args_list
+    assert failure.args[1] == "blob_limit" and "big.txt@" in failure.args[2]
+    assert "max_blob_bytes" in failure_hint("blob_limit")
+
+
+def test_not_a_repository_and_registry(tmp_path):
+    db, _ = _run(tmp_path / "missing")
+    assert db.save_failure.call_args.args[1] == "unreachable"
+    db, _ = _run(tmp_path)
+    assert db.save_failure.call_args.args[1] == "error"
+    assert connector_for_target({"type": "git"})[0] is GitConnector
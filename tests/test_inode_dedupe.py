@@ -0,0 +1,127 @@
+"""Tests for inode deduplication during filesystem walks (file_scan.walk, FilesystemConnector aliases)."""
+import os
+import random
+from unittest.mock import MagicMock
+
+import pytest
+
+from connectors.filesystem_connector import FilesystemConnector
+from file_scan.walk import InodeSet, iter_files
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "link") or os.name == "nt", reason="POSIX links required")
+
+
+class _CountingScanner:
+    def __init__(self):
+        self.calls = 0
+
+    def scan_column(self, name, sample):
+        self.calls += 1
+        hit = "cpf" in name.lower()
+        return {"sensitivity_level": "HIGH" if hit else "LOW", "pattern_detected": "CPF", "norm_tag": "", "ml_confidence": 0}
+
+    def scan_file_content(self, content, path):
+        self.calls += 1
+        if "123.456.789-09" not in content:
+            return None
+        return {"sensitivity_level": "HIGH", "pattern_detected": "CPF", "norm_tag": "", "ml_confidence": 0}
+
+
+def _scan(root, **config):
+    db = MagicMock()
+    scanner = _CountingScanner()
+    FilesystemConnector({"name": "fs", "path": str(root), **config}, scanner, db).run()
+    found = sorted((c.kwargs["path"], c.kwargs["file_name"]) for c in db.save_finding.call_args_list)
+    return found, scanner.calls
+
+
+def test_inode_set_matches_python_set_across_runs():
+    rng = random.Random(7)
+    inodes = InodeSet(buffer_size=64)
+    reference = set()
+    for _ in range(5000):
+        key = (rng.choice((1, 2)), rng.randrange(20000))
+        assert inodes.add(*key) is (key not in reference)
+        reference.add(key)
+    assert len(inodes) == len(reference)
+    assert all(key in inodes for key in reference)
+    assert (3, 1) not in inodes and (1, 20001) not in inodes
+
+
+def test_inode_set_stays_compact():
+    inodes = InodeSet()
+    for ino in range(200_000):
+        inodes.add(64769, ino * 7)
+    runs = inodes._runs[64769]
+    stored = sum(len(run) for run in runs)
+    assert stored + len(inodes._buffer) == 200_000
+    # 8 bytes per inode in a handful of runs (a set of tuples needs well over 100)
+    assert sum(run.itemsize * len(run) for run in runs) == stored * 8
+    assert len(runs) <= 8
+
+
+def test_iter_files_walks_each_directory_once(tmp_path):
+    data = tmp_path / "data"
+    (data / "sub").mkdir(parents=True)
+    (data / "sub" / "a.txt").write_text("x")
+    (data / "loop").symlink_to(data)
+    (tmp_path / "other").symlink_to(data / "sub")
+    (data / "other").symlink_to(data / "sub")
+    names = [p.relative_to(data).as_posix() for p, _ in iter_files(data)]
+    assert names == ["other/a.txt"]
+    assert [p.name for p, _ in iter_files(data, recursive=False)] == []
+    assert [p.relative_to(data).as_posix() for p, _ in iter_files(data, follow_symlinks=False)] == ["sub/a.txt"]
+
+
+def test_hardlinked_backup_tree_scanned_once(tmp_path):
+    """rsnapshot-style snapshots: the same inodes under every snapshot are read and classified once."""
+    first = tmp_path / "daily.0"
+    first.mkdir()
+    (first / "clientes.csv").write_text("nome,cpf\nAna,123.456.789-09\n")
+    (first / "notas.txt").write_text("CPF 123.456.789-09")
+    (first / "vazio.txt").write_text("nada")
+    for i in range(1, 4):
+        snap = tmp_path / f"daily.{i}"
+        snap.mkdir()
+        for f in first.iterdir():
+            os.link(f, snap / f.name)
+    found, calls = _scan(tmp_path)
+    # clientes.csv: 2 columns; notas.txt and vazio.txt: one content scan each
+    assert calls == 4
+    assert found == sorted(
+        (str(tmp_path / f"daily.{i}"), name) for i in range(4) for name in ("clientes.csv | cpf", "notas.txt")
+    )
+
+
+def test_aliases_with_other_names_and_symlinks(tmp_path):
+    (tmp_path / "a.txt").write_text("CPF 123.456.789-09")
+    os.link(tmp_path / "a.txt", tmp_path / "copia.txt")
+    (tmp_path / "link.txt").symlink_to(tmp_path / "a.txt")
+    (tmp_path / "dir").mkdir()
+    (tmp_path / "dir" / "b.txt").write_text("CPF 123.456.789-09")
+    (tmp_path / "dir_link").symlink_to(tmp_path / "dir")
+    found, calls = _scan(tmp_path)
+    assert calls == 2
+    names = [name for _, name in found]
+    assert sorted(names) == ["a.txt", "b.txt", "copia.txt", "link.txt"]
+    found, calls = _scan(tmp_path, follow_symlinks=False)
+    assert calls == 2 and sorted(name for _, name in found) == ["a.txt", "b.txt", "copia.txt"]
+
+
+def test_findings_kept_per_inode_with_findings(tmp_path, monkeypatch):
+    (tmp_path / "a.txt").write_text("CPF 123.456.789-09")
+    (tmp_path / "clean.txt").write_text("nada")
+    # Symlinks met after their single-link targets: recorded as aliases, not read again
+    (tmp_path / "z_link.txt").symlink_to(tmp_path / "a.txt")
+    (tmp_path / "z_clean.txt").symlink_to(tmp_path / "clean.txt")
+    logged = []
+    monkeypatch.setattr("utils.logger.log_finding", lambda source, target, path, *args: logged.append(path))
+    db = MagicMock()
+    scanner = _CountingScanner()
+    connector = FilesystemConnector({"name": "fs", "path": str(tmp_path)}, scanner, db)
+    connector._walk("fs", tmp_path, recursive=True)
+    assert scanner.calls == 2
+    # Only inodes with findings keep them (memory follows findings, not files)
+    assert [first for first, _ in connector._inode_findings.values()] == ["a.txt"]
+    assert sorted(c.kwargs["file_name"] for c in db.save_finding.call_args_list) == ["a.txt", "z_link.txt"]
+    assert str(tmp_path / "a.txt") in logged
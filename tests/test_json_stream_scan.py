@@ -0,0 +1,158 @@
+"""Tests for structure-aware JSON/JSON Lines sampling (file_scan.json_stream) and per-key-path file findings.
+
+Every parser test runs with the pure-Python tokenizer and, when installed, with ijson.
+"""
+import gzip
+import io
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from connectors.filesystem_connector import FilesystemConnector, _scan_compressed_file
+from file_scan import json_stream
+from file_scan.json_stream import sample_json_paths
+
+DOC = {
+    "meta": {"total": 3, "tags": []},
+    "data": [
+        {"id": 1, "email": "ana@example.com", "addresses": [{"street": "Rua A"}, {"street": "Rua B"}]},
+        {"id": 2, "email": None, "active": True},
+        {"id": 3, "email": "c@example.com", "note": "quote \" and \\u00e9 é"},
+    ],
+}
+
+
+class _Scanner:
+    """HIGH for email/cpf key paths or a CPF value."""
+
+    def scan_column(self, name, sample):
+        hit = any(k in name.lower() for k in ("email", "cpf")) or "123.456.789-09" in sample
+        return {"sensitivity_level": "HIGH" if hit else "LOW", "pattern_detected": "EMAIL", "norm_tag": "", "ml_confidence": 0}
+
+    def scan_file_content(self, content, path):
+        return None
+
+
+class _BatchScanner(_Scanner):
+    """_Scanner with scan_columns, recording each batch."""
+
+    def __init__(self):
+        self.batches = []
+
+    def scan_columns(self, columns):
+        self.batches.append(columns)
+        return [self.scan_column(name, sample) for name, sample in columns]
+
+
+@pytest.fixture(params=["tokenizer", "ijson"])
+def parser(request, monkeypatch):
+    if request.param == "ijson":
+        pytest.importorskip("ijson")
+    monkeypatch.setattr(json_stream, "_IJSON_AVAILABLE", request.param == "ijson")
+    return request.param
+
+
+def test_nested_key_paths_and_array_sampling(parser):
+    paths = sample_json_paths(io.BytesIO(json.dumps(DOC).encode()), ".json", sample_limit=2)
+    assert paths == {
+        "meta.total": ["3"],
+        "meta.tags": [],
+        "data[].id": ["1", "2"],
+        "data[].email": ["ana@example.com"],
+        "data[].addresses[].street": ["Rua A", "Rua B"],
+        "data[].active": ["true"],
+    }
+
+
+def test_top_level_array_items_are_records_and_stop_early(parser, monkeypatch):
+    """Only sample_limit records are parsed: the rest of a huge array is never read."""
+    monkeypatch.setattr(json_stream, "_CHUNK_BYTES", 1024)
+    body = ("[" + ",".join(json.dumps({"cpf": f"{i:011d}", "n": i}) for i in range(200_000)) + "]").encode()
+
+    class _Counting(io.BytesIO):
+        bytes_read = 0
+
+        def read(self, size=-1):
+            data = super().read(size)
+            self.bytes_read += len(data)
+            return data
+
+    source = _Counting(body)
+    paths = sample_json_paths(source, ".json", sample_limit=3)
+    assert paths == {"cpf": ["00000000000", "00000000001", "00000000002"], "n": ["0", "1", "2"]}
+    assert source.bytes_read < 256 * 1024
+
+
+def test_escapes_split_across_chunks(parser, monkeypatch):
+    monkeypatch.setattr(json_stream, "_CHUNK_BYTES", 7)
+    paths = sample_json_paths(io.BytesIO(json.dumps(DOC).encode()), ".json", sample_limit=5)
+    assert paths["data[].note"] == ['quote " and \\u00e9 é']
+    assert paths["data[].email"] == ["ana@example.com", "c@example.com"]
+
+
+def test_every_split_position_parses_the_same(parser):
+    """Numbers, literals, escapes and keys cut at any byte of a chunk iterable give the unsplit result."""
+    body = json.dumps({
+        "data": [{"v": 1.25, "e": -3e-05, "big": 12345678901, "ok": True, "x": None, "s": "a\"é"}],
+        "total": -0.5, "cpf": "123.456.789-09",
+    }).encode()
+    expected = sample_json_paths([body], ".json")
+    assert expected["cpf"] == ["123.456.789-09"] and expected["data[].v"] == ["1.25"]
+    for i in range(1, len(body)):
+        assert sample_json_paths([body[:i], body[i:]], ".json") == expected, body[:i]
+
+
+def test_byte_budget_and_invalid_tail_keep_collected_paths(parser):
+    body = b'{"nome": "Ana", "cpf": "123.456.789-09", "blob": "' + b"x" * 10_000 + b'", "late": 1}'
+    assert sample_json_paths(io.BytesIO(body), ".json", max_bytes=60) == {"nome": ["Ana"], "cpf": ["123.456.789-09"]}
+    assert sample_json_paths(io.BytesIO(b'{"email": "a@b.c", "x": nope}'), ".json") == {"email": ["a@b.c"]}
+    assert sample_json_paths(io.BytesIO(b"not json"), ".json") == {}
+
+
+def test_json_lines_skip_bad_and_oversized_lines(monkeypatch):
+    monkeypatch.setattr(json_stream, "_MAX_TOKEN_BYTES", 64)
+    monkeypatch.setattr(json_stream, "_CHUNK_BYTES", 16)
+    lines = [
+        json.dumps({"user": {"email": "a@example.com"}}),
+        "{broken",
+        json.dumps({"user": {"email": "x" * 200}}),
+        "",
+        json.dumps({"user": {"email": "b@example.com", "cpf": "123.456.789-09"}}),
+        json.dumps({"user": {"email": "never@example.com"}}),
+    ]
+    paths = sample_json_paths(io.BytesIO("\n".join(lines).encode()), ".jsonl", sample_limit=2)
+    assert paths == {"user.email": ["a@example.com", "b@example.com"], "user.cpf": ["123.456.789-09"]}
+
+
+def test_chunk_iterable_source():
+    chunks = [b'{"items": [{"em', b'ail": "a@example.com"}]', b"}"]
+    assert sample_json_paths(iter(chunks), ".json") == {"items[].email": ["a@example.com"]}
+
+
+def test_filesystem_connector_reports_key_paths(tmp_path):
+    (tmp_path / "export.json").write_text(json.dumps(DOC))
+    (tmp_path / "events.ndjson.gz").write_bytes(gzip.compress(b'{"cpf": "123.456.789-09"}\n{"cpf": null}\n'))
+    db = MagicMock()
+    FilesystemConnector({"name": "fs", "path": str(tmp_path)}, _Scanner(), db, extensions=[".json", ".gz"]).run()
+    names = sorted(c.kwargs["file_name"] for c in db.save_finding.call_args_list)
+    assert names == ["events.ndjson.gz | cpf", "export.json | data[].email"]
+
+
+def test_key_paths_scanned_in_one_batch_per_file(tmp_path):
+    (tmp_path / "export.json").write_text(json.dumps(DOC))
+    db = MagicMock()
+    scanner = _BatchScanner()
+    FilesystemConnector({"name": "fs", "path": str(tmp_path)}, scanner, db, extensions=[".json"]).run()
+    [batch] = scanner.batches
+    assert [name for name, _ in batch] == [
+        "meta.total", "meta.tags", "data[].id", "data[].email", "data[].addresses[].street", "data[].active", "data[].note",
+    ]
+    assert [c.kwargs["file_name"] for c in db.save_finding.call_args_list] == ["export.json | data[].email"]
+
+
+def test_invalid_json_falls_back_to_text_scan():
+    scanner = MagicMock()
+    scanner.scan_file_content.return_value = None
+    assert _scan_compressed_file(io.BytesIO(gzip.compress(b"<html>")), ".gz", scanner, file_name="x.json.gz") == []
+    scanner.scan_file_content.assert_called_once()
@@ -77,6 +77,18 @@ class TestAuditLogic(unittest.TestCase):
         self.assertIn(result["sensitivity_level"], ("LOW", "MEDIUM"))
         self.assertNotEqual(result["sensitivity_level"], "HIGH")
 
+    def test_scan_columns_matches_scan_column(self):
+        """Batched scan_columns gives the same results, in order, as one scan_column per column."""
+        scanner = DataScanner()
+        columns = [
+            ("documento", "O CPF do usuario é 123.456.789-00"),
+            ("email", "ana@example.com"),
+            ("quantidade", "3 7 12"),
+            ("lyrics", "Verse 1\nWe met on 01/01/2020\nChorus\nLa la la"),
+        ]
+        self.assertEqual(scanner.scan_columns(columns), [scanner.scan_column(n, s) for n, s in columns])
+        self.assertEqual(scanner.scan_columns([]), [])
+
 
 if __name__ == "__main__":
     unittest.main()
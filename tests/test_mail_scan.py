@@ -0,0 +1,174 @@
+"""Tests for streaming mail parsing (file_scan.mail) and per-message scanning of .eml, mbox and Maildir.
+
+Messages are built with email.message.EmailMessage in tmp_path or in memory.
+"""
+import io
+import os
+import zipfile
+from email.message import EmailMessage
+from unittest.mock import MagicMock
+
+import pytest
+
+from connectors.filesystem_connector import FilesystemConnector, _scan_archive_file, _scan_mail_file
+from core.database import failure_hint
+from core.throttle import IOThrottle
+from file_scan.archive import DEFAULT_ARCHIVE_LIMITS
+from file_scan.mail import DEFAULT_MAIL_LIMITS, iter_mail_messages, mail_limits
+
+
+class _Scanner:
+    """HIGH when the CPF sample or a cpf column name shows up; LOW otherwise."""
+
+    def scan_column(self, name, sample):
+        hit = "cpf" in name.lower() or "123.456.789-09" in sample
+        return {"sensitivity_level": "HIGH" if hit else "LOW", "pattern_detected": "CPF", "norm_tag": "", "ml_confidence": 0}
+
+    def scan_file_content(self, content, path):
+        if "123.456.789-09" not in content:
+            return None
+        return {"sensitivity_level": "HIGH", "pattern_detected": "CPF", "norm_tag": "", "ml_confidence": 0}
+
+
+def _message(msg_id: str | None, body: str, attachments: dict[str, bytes] | None = None, html: str = "") -> bytes:
+    msg = EmailMessage()
+    msg["Subject"] = "Cadastro"
+    msg["From"] = "rh@example.com"
+    msg["To"] = "ana@example.com"
+    if msg_id:
+        msg["Message-ID"] = msg_id
+    msg.set_content(body)
+    if html:
+        msg.add_alternative(html, subtype="html")
+    for name, data in (attachments or {}).items():
+        msg.add_attachment(data, maintype="application", subtype="octet-stream", filename=name)
+    return msg.as_bytes()
+
+
+def _mbox(*messages: bytes) -> bytes:
+    return b"".join(b"From sender@example.com Mon Jan  1 00:00:00 2024\n" + m + b"\n" for m in messages)
+
+
+def test_eml_decodes_base64_body_html_and_headers():
+    msg = EmailMessage()
+    msg["Subject"] = "Teste"
+    msg["Message-ID"] = "<a@example.com>"
+    msg.set_content("CPF 123.456.789-09 é", cte="base64")
+    msg.add_alternative("<p>tel <b>11 99999-0000</b></p>", subtype="html")
+    [(message_id, text, attachments)] = iter_mail_messages(io.BytesIO(msg.as_bytes()), ".eml")
+    assert message_id == "<a@example.com>"
+    assert "Subject: Teste" in text and "CPF 123.456.789-09 é" in text
+    assert "11 99999-0000" in text and "<b>" not in text
+    assert attachments == []
+
+
+def test_mbox_is_split_lazily_with_mboxrd_unescape():
+    mbox = _mbox(_message("<1@x>", "primeira\n>From quoted"), _message(None, "segunda"))
+    messages = list(iter_mail_messages(io.BytesIO(mbox), ".mbox"))
+    assert [m[0] for m in messages] == ["<1@x>", "#2"]
+    assert "From quoted" in messages[0][1] and ">From" not in messages[0][1]
+    assert "segunda" in messages[1][1]
+
+
+def test_mail_limits_messages_and_bytes():
+    assert mail_limits({"mail_max_messages": "2", "mail_max_message_bytes": "x"}) == {
+        "max_messages": 2, "max_message_bytes": 25 * 1024 * 1024,
+    }
+    big = _message("<big@x>", "CPF 123.456.789-09", {"big.bin": b"\0" * 50_000})
+    mbox = _mbox(big, _message("<2@x>", "dois"), _message("<3@x>", "tres"))
+    skipped = []
+    messages = list(iter_mail_messages(io.BytesIO(mbox), ".mbox", {"max_messages": 2, "max_message_bytes": 4096}, skipped))
+    assert [m[0] for m in messages] == ["<big@x>", "<2@x>"]
+    assert "123.456.789-09" in messages[0][1]
+    assert skipped == ["#1: larger than max_message_bytes (4096), truncated", "max_messages (2) reached"]
+
+
+def test_attachments_scanned_in_memory_per_message_id(tmp_path):
+    inner_zip = io.BytesIO()
+    with zipfile.ZipFile(inner_zip, "w") as z:
+        z.writestr("notas.txt", "CPF 123.456.789-09")
+    raw = _message("<m1@x>", "sem dados", {
+        "clientes.csv": b"nome,cpf\nAna,123.456.789-09\n",
+        "pacote.zip": inner_zip.getvalue(),
+        "foto.png": b"\x89PNG 123.456.789-09",
+    })
+    path = tmp_path / "msg.eml"
+    path.write_bytes(raw)
+    findings = _scan_mail_file(path, ".eml", _Scanner(), archive_limits=DEFAULT_ARCHIVE_LIMITS)
+    assert [f["file_name"] for f in findings] == [
+        "msg.eml | <m1@x>!/clientes.csv | cpf",
+        "msg.eml | <m1@x>!/pacote.zip!/notas.txt",
+    ]
+    assert {f["path"] for f in findings} == {str(tmp_path)}
+    # Without archive_limits (scan_archives: false) a zip attachment is not opened
+    assert [f["file_name"] for f in _scan_mail_file(path, ".eml", _Scanner())] == ["msg.eml | <m1@x>!/clientes.csv | cpf"]
+    db = MagicMock()
+    FilesystemConnector({"name": "fs", "path": str(tmp_path)}, _Scanner(), db, scan_archives=False).run()
+    assert "msg.eml | <m1@x>!/pacote.zip!/notas.txt" not in [c.kwargs["file_name"] for c in db.save_finding.call_args_list]
+
+
+def test_filesystem_connector_mbox_maildir_and_limits(tmp_path):
+    (tmp_path / "export.mbox").write_bytes(_mbox(_message("<1@x>", "ok"), _message("<2@x>", "CPF 123.456.789-09")))
+    maildir = tmp_path / "Maildir" / "INBOX"
+    for sub in ("cur", "new", "tmp"):
+        (maildir / sub).mkdir(parents=True)
+    (maildir / "cur" / "1700000000.M1P1.host:2,S").write_bytes(_message("<md1@x>", "CPF 123.456.789-09"))
+    (maildir / "new" / "1700000001.M2P2.host").write_bytes(_message("<md2@x>", "CPF 123.456.789-09"))
+    (maildir / "new" / "1700000002.M3P3.host").write_bytes(_message("<md3@x>", "CPF 123.456.789-09"))
+    db = MagicMock()
+    FilesystemConnector(
+        {"name": "fs", "path": str(tmp_path)}, _Scanner(), db, extensions=[".mbox", ".eml"],
+        mail_limits={"max_messages": 2, "max_message_bytes": 10**6},
+    ).run()
+    names = sorted(c.kwargs["file_name"] for c in db.save_finding.call_args_list)
+    assert names == ["INBOX | <md2@x>", "INBOX | <md3@x>", "export.mbox | <2@x>"]
+    assert {c.kwargs["data_type"] for c in db.save_finding.call_args_list} == {"MAILDIR", "MBOX"}
+    [failure] = db.save_failure.call_args_list
+    assert failure.args[1] == "mail_limit" and "INBOX" in failure.args[2]
+    assert "mailbox" in failure_hint("mail_limit").lower()
+
+
+def test_eml_member_of_archive_parsed_per_message():
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as z:
+        z.writestr("caixa/msg.eml", _message("<z@x>", "CPF 123.456.789-09"))
+    findings = _scan_archive_file(
+        io.BytesIO(buf.getvalue()), ".zip", _Scanner(), file_name="backup.zip", mail_limits=DEFAULT_MAIL_LIMITS,
+    )
+    assert [f["file_name"] for f in findings] == ["backup.zip!/caixa/msg.eml | <z@x>"]
+
+
+@pytest.mark.parametrize("scan_mailboxes, expected", [(True, ["m.eml | <e@x>"]), (False, ["m.eml"])])
+def test_scan_mailboxes_option(tmp_path, scan_mailboxes, expected):
+    (tmp_path / "m.eml").write_bytes(_message("<e@x>", "CPF 123.456.789-09"))
+    db = MagicMock()
+    FilesystemConnector(
+        {"name": "fs", "path": str(tmp_path)}, _Scanner(), db, extensions=[".eml"], scan_mailboxes=scan_mailboxes,
+    ).run()
+    assert [c.kwargs["file_name"] for c in db.save_finding.call_args_list] == expected
+
+
+def test_maildir_follows_extensions_throttle_and_inode_dedupe(tmp_path):
+    maildir = tmp_path / "Maildir"
+    for sub in ("cur", "new", "tmp"):
+        (maildir / sub).mkdir(parents=True)
+    for i in range(3):
+        (maildir / "cur" / f"17000000{i}.M{i}.host:2,S").write_bytes(_message(f"<m{i}@x>", "CPF 123.456.789-09"))
+    # Hardlinked snapshot of the same Maildir (rsnapshot-style): its messages are not read again
+    snapshot = tmp_path / "snap" / "Maildir"
+    for sub in ("cur", "new", "tmp"):
+        (snapshot / sub).mkdir(parents=True)
+    for f in (maildir / "cur").iterdir():
+        os.link(f, snapshot / "cur" / f.name)
+
+    db = MagicMock()
+    FilesystemConnector({"name": "fs", "path": str(tmp_path)}, _Scanner(), db, extensions=[".mbox"]).run()
+    db.save_finding.assert_not_called()
+
+    throttle = IOThrottle({})
+    db = MagicMock()
+    FilesystemConnector({"name": "fs", "path": str(tmp_path)}, _Scanner(), db, throttle=throttle).run()
+    assert sorted(c.kwargs["file_name"] for c in db.save_finding.call_args_list) == [
+        "Maildir | <m0@x>", "Maildir | <m1@x>", "Maildir | <m2@x>",
+    ]
+    assert throttle.files == 3 and throttle.bytes > 0
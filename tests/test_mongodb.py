@@ -0,0 +1,142 @@
+"""Tests for MongoDBConnector on mongomock: $sample with projected field paths, nested documents and arrays,
+concurrent collections and batched detection."""
+import copy
+import threading
+from datetime import datetime
+from unittest.mock import MagicMock
+
+import pytest
+
+mongomock = pytest.importorskip("mongomock")
+
+from connectors import mongodb_connector  # noqa: E402
+from connectors.mongodb_connector import MongoDBConnector, _collect_paths, _fields_expr  # noqa: E402
+
+
+class _Scanner:
+    def __init__(self):
+        self.batches = []
+
+    def scan_columns(self, columns):
+        self.batches.append(columns)
+        return [self.scan_column(name, sample) for name, sample in columns]
+
+    def scan_column(self, name, sample):
+        hit = "cpf" in name.lower() or "123.456.789-09" in sample or "@" in sample
+        return {"sensitivity_level": "HIGH" if hit else "LOW", "pattern_detected": "CPF", "norm_tag": "", "ml_confidence": 0}
+
+
+def _client():
+    client = mongomock.MongoClient()
+    db = client["crm"]
+    db.clientes.insert_many([
+        {
+            "nome": f"Cliente {i}", "ativo": True, "foto": b"\x00" * 64,
+            "documentos": {"fiscal": "123.456.789-09", "rg": None},
+            "contatos": [{"tipo": "email", "valor": f"c{i}@example.com"}, {"tipo": "tel", "valor": "5555"}],
+            "tags": ["vip", "2024"], "criado": datetime(2024, 1, 1),
+        }
+        for i in range(30)
+    ])
+    db.produtos.insert_many([{"sku": f"P{i}", "preco": 10.5} for i in range(10)])
+    db.logs.insert_many([{"msg": "ok", "meta": {"ip": "10.0.0.1"}}])
+    return client
+
+
+@pytest.fixture
+def client(monkeypatch):
+    client = _client()
+    monkeypatch.setattr(mongodb_connector, "_MONGO_AVAILABLE", True)
+    monkeypatch.setattr(mongodb_connector, "MongoClient", lambda uri: client)
+    return client
+
+
+def _found(db):
+    return sorted((c.kwargs["table_name"], c.kwargs["column_name"], c.kwargs["data_type"]) for c in db.save_finding.call_args_list)
+
+
+def test_nested_paths_sampled_with_projection(client):
+    db = MagicMock()
+    scanner = _Scanner()
+    MongoDBConnector({"name": "mongo", "database": "crm"}, scanner, db, sample_limit=3).run()
+    db.save_failure.assert_not_called()
+    assert _found(db) == [("clientes", "contatos.valor", "string"), ("clientes", "documentos.fiscal", "string")]
+    columns = {name: sample for batch in scanner.batches for name, sample in batch}
+    # Arrays of documents: every element's value, up to sample_limit values per path
+    assert len(columns["contatos.valor"].split()) == 3
+    assert columns["tags"].split()[:2] == ["vip", "2024"]
+    # Binary, boolean and null-only fields are classified by name only
+    assert columns["foto"] == "" and columns["ativo"] == "" and columns["documentos.rg"] == ""
+    assert "_id" not in columns and "meta.ip" in columns
+    # One detector batch per collection
+    assert sorted(len(batch) for batch in scanner.batches) == [2, 2, 9]
+
+
+def test_value_pass_projects_only_sampled_paths(client, monkeypatch):
+    pipelines = []
+    aggregate = mongomock.collection.Collection.aggregate
+
+    def _aggregate(self, pipeline, *args, **kwargs):
+        pipelines.append((self.name, copy.deepcopy(pipeline)))
+        return aggregate(self, pipeline, *args, **kwargs)
+
+    monkeypatch.setattr(mongomock.collection.Collection, "aggregate", _aggregate)
+    MongoDBConnector({"name": "mongo", "database": "crm", "concurrency": 1}, _Scanner(), MagicMock(), sample_limit=3).run()
+    [value_pass] = [p for name, p in pipelines if name == "clientes" and p[0]["$sample"]["size"] == 3]
+    projection = value_pass[1]["$project"]
+    assert projection["_id"] == 0
+    assert sorted(v for k, v in projection.items() if k != "_id") == [
+        "$contatos.tipo", "$contatos.valor", "$criado", "$documentos.fiscal", "$nome", "$tags",
+    ]
+    # Schema pass first tries the names-and-types projection
+    assert any("$project" in p[-1] and "f" in p[-1]["$project"] for name, p in pipelines if name == "clientes")
+
+
+def test_collections_scanned_concurrently(client, monkeypatch):
+    barrier = threading.Barrier(3, timeout=5)
+    sample = MongoDBConnector._sample_collection
+
+    def _sample(self, name):
+        barrier.wait()
+        return sample(self, name)
+
+    monkeypatch.setattr(MongoDBConnector, "_sample_collection", _sample)
+    db = MagicMock()
+    MongoDBConnector({"name": "mongo", "database": "crm", "concurrency": 3}, _Scanner(), db).run()
+    db.save_failure.assert_not_called()
+    assert len(_found(db)) == 2
+
+
+def test_failed_collection_reported_and_others_scanned(client, monkeypatch):
+    sample = MongoDBConnector._sample_collection
+
+    def _sample(self, name):
+        if name == "logs":
+            raise RuntimeError("not authorized on crm to execute command { aggregate: \"logs\" }")
+        return sample(self, name)
+
+    monkeypatch.setattr(MongoDBConnector, "_sample_collection", _sample)
+    db = MagicMock()
+    MongoDBConnector({"name": "mongo", "database": "crm"}, _Scanner(), db).run()
+    [failure] = db.save_failure.call_args_list
+    assert failure.args[0] == "mongo" and failure.args[2].startswith("logs: not authorized")
+    assert len(_found(db)) == 2
+
+
+def test_schema_projection_rows_to_paths():
+    rows = [
+        {"f": [
+            {"k": "_id", "t": "objectId", "c": []},
+            {"k": "email", "t": "null", "c": []},
+            {"k": "endereco", "t": "object", "c": [{"k": "cep", "t": "string", "c": []}]},
+            {"k": "itens", "t": "array", "c": [{"k": "sku", "t": "string", "c": []}]},
+        ]},
+        {"f": [{"k": "email", "t": "string", "c": []}, {"k": "a.b", "t": "string", "c": []}]},
+    ]
+    paths = {}
+    for row in rows:
+        _collect_paths(row["f"], paths)
+    assert paths == {"email": "string", "endereco.cep": "string", "itens.sku": "string"}
+    expr = _fields_expr("$$ROOT", 2)
+    assert expr["$map"]["input"] == {"$objectToArray": "$$ROOT"}
+    assert "c" not in expr["$map"]["in"]["c"]["$cond"][1]["$map"]["in"]
@@ -0,0 +1,195 @@
+"""Tests for page-cache-friendly reads (file_scan.page_cache, file_scan.page_cache_hints).
+
+Impact tests measure page-cache residency with mincore and access times on files in tmp_path; they are
+skipped where the platform or mount cannot show the effect (no mincore/O_NOATIME, tmpfs, noatime).
+"""
+import os
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from connectors.filesystem_connector import FilesystemConnector
+from connectors.nfs_connector import NFSConnector
+from file_scan import page_cache
+from file_scan.page_cache import PageCacheHints, cached_fraction
+
+_SIZE = 4 * 1024 * 1024
+
+
+class _Scanner:
+    def scan_column(self, name, sample):
+        hit = "cpf" in name.lower()
+        return {"sensitivity_level": "HIGH" if hit else "LOW", "pattern_detected": "CPF", "norm_tag": "", "ml_confidence": 0}
+
+    def scan_file_content(self, content, path):
+        if "123.456.789-09" not in content:
+            return None
+        return {"sensitivity_level": "HIGH", "pattern_detected": "CPF", "norm_tag": "", "ml_confidence": 0}
+
+
+def _drop(path) -> None:
+    """Evict path from the page cache, retrying while readahead from an earlier read is still landing."""
+    for _ in range(50):
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
+        if cached_fraction(path) in (0.0, None):
+            return
+        time.sleep(0.02)
+
+
+def _cold_file(path, content: bytes) -> None:
+    path.write_bytes(content)
+    _drop(path)
+    if cached_fraction(path) != 0.0:
+        pytest.skip("page cache residency cannot be measured here (no mincore or tmpfs)")
+
+
+def _scan(root, hints: bool, **kwargs) -> MagicMock:
+    db = MagicMock()
+    FilesystemConnector(
+        {"name": "fs", "path": str(root)}, _Scanner(), db, page_cache_hints=hints, **kwargs,
+    ).run()
+    return db
+
+
+@pytest.mark.skipif(not hasattr(os, "posix_fadvise"), reason="posix_fadvise not available")
+def test_scan_leaves_cold_files_out_of_page_cache(tmp_path):
+    """Measured impact: without hints the sampled pages stay cached; with hints none do."""
+    big = tmp_path / "dados.txt"
+    _cold_file(big, b"CPF 123.456.789-09\n" + b"x" * _SIZE)
+    db = _scan(tmp_path, hints=False)
+    assert db.save_finding.call_count == 1
+    plain = cached_fraction(big)
+    assert plain > 0
+    _drop(big)
+    db = _scan(tmp_path, hints=True)
+    assert db.save_finding.call_count == 1
+    assert cached_fraction(big) == 0.0
+
+
+@pytest.mark.skipif(not hasattr(os, "posix_fadvise"), reason="posix_fadvise not available")
+def test_hot_files_keep_their_pages(tmp_path):
+    hot = tmp_path / "hot.txt"
+    hot.write_bytes(b"y" * _SIZE)
+    hot.read_bytes()
+    if cached_fraction(hot) != 1.0:
+        pytest.skip("page cache residency cannot be measured here")
+    _scan(tmp_path, hints=True)
+    assert cached_fraction(hot) == 1.0
+
+
+@pytest.mark.skipif(not getattr(os, "O_NOATIME", 0), reason="O_NOATIME not available")
+def test_access_time_unchanged_with_hints(tmp_path):
+    path = tmp_path / "clientes.csv"
+    path.write_text("nome,cpf\nAna,123.456.789-09\n")
+    st = os.stat(path)
+    old_atime = st.st_mtime - 3600
+    os.utime(path, (old_atime, st.st_mtime))
+    db = _scan(tmp_path, hints=True)
+    assert [c.kwargs["file_name"] for c in db.save_finding.call_args_list] == ["clientes.csv | cpf"]
+    assert db.save_finding.call_args.kwargs["path"] == str(tmp_path)
+    assert os.stat(path).st_atime == old_atime
+    _scan(tmp_path, hints=False)
+    if os.stat(path).st_atime == old_atime:
+        pytest.skip("mount does not update atime (noatime)")
+
+
+def test_noatime_not_permitted_falls_back_to_plain_open(tmp_path, monkeypatch):
+    """O_NOATIME on a file owned by someone else fails with EPERM: the file is still read."""
+    path = tmp_path / "a.txt"
+    path.write_text("CPF 123.456.789-09")
+    real_open = os.open
+    flags_seen = []
+
+    def _open(p, flags, *args, **kwargs):
+        flags_seen.append(flags)
+        if flags & page_cache._O_NOATIME:
+            raise PermissionError(1, "Operation not permitted")
+        return real_open(p, flags, *args, **kwargs)
+
+    monkeypatch.setattr(page_cache, "_O_NOATIME", getattr(os, "O_NOATIME", 0o1000000))
+    monkeypatch.setattr(page_cache.os, "open", _open)
+    with PageCacheHints() as hints, hints.open(path) as f:
+        assert f.read() == b"CPF 123.456.789-09"
+    assert len(flags_seen) == 2 and not flags_seen[1] & page_cache._O_NOATIME
+
+
+def test_hints_are_advisory_and_unreadable_files_reported(tmp_path, monkeypatch):
+    monkeypatch.setattr(page_cache, "_FADVISE_AVAILABLE", False)
+    monkeypatch.setattr(page_cache, "_LIBC", None)
+    (tmp_path / "a.txt").write_text("CPF 123.456.789-09")
+    assert _scan(tmp_path, hints=True).save_finding.call_count == 1
+    assert cached_fraction(tmp_path / "a.txt") is None
+
+    def _denied(self, path):
+        raise PermissionError(13, "Permission denied")
+
+    monkeypatch.setattr(PageCacheHints, "open", _denied)
+    db = _scan(tmp_path, hints=True)
+    db.save_finding.assert_not_called()
+    assert db.save_failure.call_args.args[1] == "permission_denied"
+
+
+def test_second_dontneed_deferred_and_bounded(tmp_path, monkeypatch):
+    """Cold files are advised again after the settle time (or when too many are pending); close() drains all."""
+    advised = []
+    monkeypatch.setattr(page_cache, "_FADVISE_AVAILABLE", True)
+    monkeypatch.setattr(page_cache, "_advise", lambda fd, advice: advised.append(advice))
+    monkeypatch.setattr(page_cache, "_any_cached", lambda fd, size: False)
+    paths = []
+    for i in range(4):
+        paths.append(tmp_path / f"{i}.txt")
+        paths[-1].write_text("x")
+    hints = PageCacheHints(settle_seconds=60, max_pending=2)
+    for path in paths:
+        with hints.open(path) as f:
+            f.read()
+    # 4 opens: SEQUENTIAL + DONTNEED each; the oldest pending file was advised early when a third was queued
+    assert advised.count(os.POSIX_FADV_DONTNEED) == 5 and len(hints._pending) == 3
+    monkeypatch.setattr(page_cache.time, "sleep", lambda s: None)
+    hints.close()
+    assert advised.count(os.POSIX_FADV_DONTNEED) == 8 and not hints._pending
+
+
+class _FakeLibc:
+    """mmap/mincore/munmap stand-in: records mapped lengths and reports the given pages as cached."""
+
+    def __init__(self, cached_pages):
+        self.cached_pages = cached_pages
+        self.mapped = []
+
+    def mmap(self, addr, length, prot, flags, fd, offset):
+        self.mapped.append(length)
+        return 4096
+
+    def mincore(self, addr, length, vec):
+        for i in self.cached_pages:
+            if i < len(vec):
+                vec[i] = 1
+        return 0
+
+    def munmap(self, addr, length):
+        return 0
+
+
+def test_residency_check_limited_to_file_head(monkeypatch):
+    """A multi-GB file maps and checks only the head before sampling; pages cached further in do not count."""
+    page = os.sysconf("SC_PAGE_SIZE")
+    head_pages = page_cache._RESIDENCY_CHECK_BYTES // page
+    libc = _FakeLibc(cached_pages=[head_pages + 10])
+    monkeypatch.setattr(page_cache, "_LIBC", libc)
+    assert page_cache._any_cached(-1, 8 * 1024**3) is False
+    assert libc.mapped == [page_cache._RESIDENCY_CHECK_BYTES]
+    libc.cached_pages = [0]
+    assert page_cache._any_cached(-1, 8 * 1024**3) is True
+    assert page_cache._any_cached(-1, 0) is None
+
+
+def test_nfs_connector_passes_option(tmp_path):
+    connector = NFSConnector({"name": "nfs", "path": str(tmp_path)}, _Scanner(), MagicMock(), page_cache_hints=True)
+    assert connector._fs.page_cache_hints is True
@@ -0,0 +1,202 @@
+"""Tests for PowerBIConnector with a mocked REST API (httpx.MockTransport): batched DAX, concurrent datasets,
+rate limiting with Retry-After, token caching and per-workspace timing."""
+import json
+import threading
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+
+from connectors import powerbi_connector
+from connectors.powerbi_connector import PowerBIConnector
+from core import token_cache
+from core.fetch_pool import AdaptiveBackoff
+from core.token_cache import TokenCache
+from report.generator import _build_report_info
+
+_TARGET = {"name": "pbi", "tenant_id": "t", "client_id": "c", "client_secret": "s", "workspace_ids": ["ws1", "ws2"]}
+
+
+class _Scanner:
+    def scan_column(self, name, sample):
+        hit = "cpf" in name.lower() or "123.456.789-09" in sample
+        return {"sensitivity_level": "HIGH" if hit else "LOW", "pattern_detected": "CPF", "norm_tag": "", "ml_confidence": 0}
+
+
+class _PowerBI:
+    """Fake Power BI API: workspaces -> datasets -> tables; executeQueries answers one table per EVALUATE."""
+
+    def __init__(self, batching=True):
+        self.batching = batching
+        self.datasets = {
+            "ws1": {"d1": ["Clientes", "Vendas 2024"], "d2": ["Funcionários"]},
+            "ws2": {"d3": ["Fornecedores"]},
+        }
+        self.queries = []
+        self.tokens = 0
+        self.token_value = "tok-1"
+        self.expired = set()
+        self.fail = {}
+        self.lock = threading.Lock()
+        self.on_tables = None
+
+    def token(self, url, data=None, headers=None, timeout=None):
+        with self.lock:
+            self.tokens += 1
+            self.token_value = f"tok-{self.tokens}"
+        return SimpleNamespace(
+            raise_for_status=lambda: None,
+            json=lambda: {"access_token": self.token_value, "expires_in": 3599},
+        )
+
+    def __call__(self, request):
+        if request.headers["Authorization"].split()[-1] in self.expired:
+            return httpx.Response(401)
+        path = request.url.path.split("/v1.0/myorg/", 1)[1]
+        with self.lock:
+            failure = self.fail.get(path)
+            if failure:
+                self.fail[path] = failure[1:]
+                if failure[0] is not None:
+                    return failure[0]
+        parts = path.split("/")
+        if parts[-1] == "datasets":
+            return httpx.Response(200, json={"value": [{"id": d, "name": d.upper()} for d in self.datasets[parts[1]]]})
+        if parts[-1] == "tables":
+            if self.on_tables:
+                self.on_tables()
+            ws = parts[1]
+            names = self.datasets[ws][parts[3]]
+            return httpx.Response(200, json={"value": [
+                {"name": n, "columns": [{"name": "cpf", "dataType": "String"}] if n == "Clientes" else []} for n in names
+            ]})
+        query = json.loads(request.content)["queries"][0]["query"]
+        statements = query.split("\n")
+        with self.lock:
+            self.queries.append((parts[3], statements))
+        if len(statements) > 1 and not self.batching:
+            return httpx.Response(200, json={"results": [{"error": {"code": "DatasetExecuteQueriesError"}}]})
+        tables = []
+        for statement in statements:
+            name = statement.split("'", 1)[1].rsplit("'", 1)[0].replace("''", "'")
+            tables.append({"rows": [{f"{name}[nome]": "Ana", f"{name}[documento]": "123.456.789-09"}]})
+        return httpx.Response(200, json={"results": [{"tables": tables}]})
+
+
+@pytest.fixture
+def api(monkeypatch):
+    api = _PowerBI()
+    transport = httpx.MockTransport(api)
+    monkeypatch.setattr(powerbi_connector, "httpx", SimpleNamespace(
+        post=api.token, Client=lambda **kwargs: httpx.Client(transport=transport, **kwargs),
+    ))
+    monkeypatch.setattr(token_cache, "_CACHE", TokenCache())
+    return api
+
+
+def _run(db=None, **config):
+    db = db or MagicMock(current_session_id="s1")
+    connector = PowerBIConnector({**_TARGET, **config}, _Scanner(), db)
+    connector.run()
+    return db, connector
+
+
+def _found(db):
+    return sorted((c.kwargs["schema_name"], c.kwargs["table_name"], c.kwargs["column_name"]) for c in db.save_finding.call_args_list)
+
+
+def test_tables_sampled_in_one_batched_query(api):
+    db, _ = _run()
+    db.save_failure.assert_not_called()
+    assert _found(db) == [
+        ("D1", "Clientes", "cpf"), ("D1", "Vendas 2024", "documento"), ("D2", "Funcionários", "documento"),
+        ("D3", "Fornecedores", "documento"),
+    ]
+    by_dataset = {ds: statements for ds, statements in api.queries}
+    assert len(api.queries) == 3
+    assert by_dataset["d1"] == ["EVALUATE TOPN(5, 'Clientes')", "EVALUATE TOPN(5, 'Vendas 2024')"]
+
+
+def test_rejected_batch_falls_back_to_one_table_per_query(api):
+    api.batching = False
+    api.datasets["ws2"]["d3"] = ["Fornecedores", "Contratos"]
+    db, connector = _run(concurrency=1)
+    assert len(_found(db)) == 5
+    multi = [s for _, s in api.queries if len(s) > 1]
+    # One rejected batch, then single EVALUATEs for the rest of the run
+    assert len(multi) == 1
+    assert connector._batching is False
+
+
+def test_datasets_of_a_workspace_run_concurrently(api):
+    barrier = threading.Barrier(2, timeout=5)
+    # d1 and d2 must list their tables at the same time to pass the barrier
+    api.on_tables = barrier.wait
+    api.datasets["ws2"] = {}
+    db, _ = _run(concurrency=2)
+    db.save_failure.assert_not_called()
+    assert len(_found(db)) == 3
+
+
+def test_429_waits_for_retry_after(api):
+    api.fail["groups/ws1/datasets"] = [httpx.Response(429, headers={"Retry-After": "7"}), None]
+    slept = []
+    now = [0.0]
+
+    def _sleep(seconds):
+        slept.append(round(seconds, 3))
+        now[0] += seconds
+
+    db = MagicMock(current_session_id="s1")
+    connector = PowerBIConnector(_TARGET, _Scanner(), db)
+    connector._backoff = AdaptiveBackoff(clock=lambda: now[0], sleep=_sleep)
+    connector.run()
+    assert len(_found(db)) == 4
+    assert slept == [7.0]
+    assert connector._counts["retried"] == 1
+
+
+def test_token_cached_across_targets_and_renewed_on_401(api):
+    _run()
+    _run(name="pbi-2")
+    assert api.tokens == 1
+    api.expired.add("tok-1")
+    db, _ = _run(name="pbi-3")
+    assert api.tokens == 2
+    assert len(_found(db)) == 4
+
+
+def test_token_cache_expiry():
+    now = [0.0]
+    cache = TokenCache(clock=lambda: now[0])
+    fetched = []
+
+    def fetch():
+        fetched.append(now[0])
+        return f"t{len(fetched)}", 120
+
+    key = ("url", "client", "scope", "digest")
+    assert cache.get(key, fetch) == "t1"
+    now[0] = 59
+    assert cache.get(key, fetch) == "t1"
+    # Renewed within the expiry margin (60 s before expires_in)
+    now[0] = 61
+    assert cache.get(key, fetch) == "t2"
+    cache.invalidate(key)
+    assert cache.get(key, fetch) == "t3"
+
+
+def test_workspace_timing_in_session_metadata(api):
+    db, _ = _run()
+    [call] = db.update_session_metadata.call_args_list
+    session_id, metadata = call.args
+    stats = metadata["powerbi"]["pbi"]
+    assert session_id == "s1"
+    assert set(stats["workspaces"]) == {"ws1", "ws2"}
+    assert stats["workspaces"]["ws1"]["datasets"] == 2 and stats["workspaces"]["ws1"]["queries"] == 2
+    assert stats["requests"] == 2 + 3 + 3
+    meta = {"started_at": None, "tenant_name": None, "technician_name": None, "scan_metadata": metadata}
+    about = {"name": "x", "version": "1", "author": "a", "license": "l", "copyright": "c"}
+    rows = {r["Field"]: r["Value"] for r in _build_report_info("s1", meta, about)}
+    assert "ws1: " in rows["Power BI: pbi"] and "DAX queries" in rows["Power BI: pbi"]
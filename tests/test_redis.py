@@ -0,0 +1,122 @@
+"""Tests for RedisConnector on fakeredis: full SCAN collapsed into key patterns, pipelined TYPE and bounded value
+reads for a few keys per pattern, findings per pattern."""
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+
+from connectors import redis_connector  # noqa: E402
+from connectors.redis_connector import KeyPatternTrie, RedisConnector  # noqa: E402
+
+
+class _Scanner:
+    def __init__(self):
+        self.batches = []
+
+    def scan_columns(self, columns):
+        self.batches.append(columns)
+        return [self.scan_column(name, sample) for name, sample in columns]
+
+    def scan_column(self, name, sample):
+        hit = "123.456.789-09" in sample or "@example.com" in sample
+        return {"sensitivity_level": "HIGH" if hit else "LOW", "pattern_detected": "CPF", "norm_tag": "", "ml_confidence": 0}
+
+
+@pytest.fixture
+def server(monkeypatch):
+    client = fakeredis.FakeStrictRedis()
+    for i in range(250):
+        client.hset(f"user:{i}:profile", mapping={"nome": f"Ana {i}", "cpf": "123.456.789-09", "plano": "ouro"})
+        client.set(f"user:{i}:last_login", "2026-10-18T10:00:00")
+    for i in range(20):
+        client.set(f"session:tok{i:04d}x", "x" * 5000)
+        client.rpush(f"queue:emails:{i}", *[f"p{j}@example.com" for j in range(50)])
+    client.sadd("tags:popular", "lgpd", "audit")
+    client.zadd("ranking", {"a@example.com": 1})
+    client.xadd("events", {"type": "login", "email": "b@example.com"})
+    client.set("blob:1", bytes(range(256)))
+    pipelines = []
+    pipeline = client.pipeline
+
+    def _pipeline(*args, **kwargs):
+        pipe = pipeline(*args, **kwargs)
+        execute = pipe.execute
+
+        def _execute(*a, **k):
+            pipelines.append(len(pipe.command_stack))
+            return execute(*a, **k)
+
+        pipe.execute = _execute
+        return pipe
+
+    client.pipeline = _pipeline
+    monkeypatch.setattr(redis_connector, "_REDIS_AVAILABLE", True)
+    monkeypatch.setattr(redis_connector, "redis", SimpleNamespace(Redis=lambda **kwargs: client))
+    return SimpleNamespace(client=client, pipelines=pipelines)
+
+
+def _run(scanner=None, **config):
+    db = MagicMock()
+    RedisConnector({"name": "cache", **config}, scanner or _Scanner(), db, sample_limit=5).run()
+    return db
+
+
+def _found(db):
+    return sorted((c.kwargs["column_name"], c.kwargs["data_type"]) for c in db.save_finding.call_args_list)
+
+
+def test_findings_per_pattern_from_sampled_values(server):
+    scanner = _Scanner()
+    db = _run(scanner, max_children=10)
+    db.save_failure.assert_not_called()
+    assert _found(db) == [
+        ("events", "stream"), ("queue:emails:{id}", "list"), ("ranking", "zset"), ("user:{id}:profile", "hash"),
+    ]
+    [columns] = scanner.batches
+    samples = dict(columns)
+    # 20 random session tokens collapsed into one pattern; values read with GETRANGE up to value_bytes
+    assert "session:{*}" in samples and len(samples["session:{*}"].split(" ")) == 3
+    assert all(len(part) <= 256 for part in samples["session:{*}"].split(" "))
+    assert "cpf 123.456.789-09" in samples["user:{id}:profile"]
+    # Lists bounded to sample_limit items per key, 3 keys per pattern
+    assert len(samples["queue:emails:{id}"].split()) == 15
+    assert samples["tags:popular"] and "blob:{id}" in samples
+    assert len(columns) == 8
+
+
+def test_values_fetched_in_pipelined_batches(server):
+    _run(pipeline_batch=4, max_children=10)
+    # user:{id}:profile, user:{id}:last_login, session:{*}, queue:emails:{id}: 3 keys; 4 single-key patterns
+    sampled_keys = 4 * 3 + 4
+    # TYPE for every sampled key, then one value read per key, in batches of 4
+    assert sum(server.pipelines) == 2 * sampled_keys
+    assert max(server.pipelines) == 4
+    assert len(server.pipelines) == 2 * -(-sampled_keys // 4)
+
+
+def test_match_limits_the_scan(server):
+    scanner = _Scanner()
+    _run(scanner, match="user:*")
+    assert sorted(name for name, _ in scanner.batches[0]) == ["user:{id}:last_login", "user:{id}:profile"]
+
+
+def test_trie_collapses_wide_levels_and_keeps_counts():
+    trie = KeyPatternTrie(keys_per_pattern=2, max_children=3)
+    for key in ["a:x", "a:y", "a:z", "a:w", "a:v", "a:12", "b:550e8400-e29b-41d4-a716-446655440000:p", "c"]:
+        trie.add(key)
+    trie.add("a:x")
+    assert trie.patterns() == [
+        ("a:{*}", 6, ["a:x", "a:y"]),
+        ("a:{id}", 1, ["a:12"]),
+        ("b:{uuid}:p", 1, ["b:550e8400-e29b-41d4-a716-446655440000:p"]),
+        ("c", 1, ["c"]),
+    ]
+
+
+def test_cluster_hash_tags_are_literals_folded_into_wildcard():
+    trie = KeyPatternTrie(keys_per_pattern=2, max_children=10)
+    for i in range(5000):
+        trie.add(f"session:{{tok{i}}}")
+    assert trie.patterns() == [("session:{*}", 5000, ["session:{tok0}", "session:{tok1}"])]
@@ -0,0 +1,440 @@
+"""Tests for remote-share connectors (SMB, WebDAV, SharePoint) with fake clients: in-memory classification and
+bounded reads (SMB read sizes, HTTP Range)."""
+import contextlib
+import io
+import sqlite3
+import sys
+import tempfile
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from urllib.parse import quote
+from unittest.mock import MagicMock
+
+import pytest
+
+from connectors import sharepoint_connector, smb_connector, webdav_connector
+from connectors.filesystem_connector import _REMOTE_TABLE_BYTES, _REMOTE_TEXT_BYTES
+from connectors.sharepoint_connector import SharePointConnector
+from connectors.smb_connector import SMBConnector
+from connectors.webdav_connector import WebDAVConnector
+
+
+class _Scanner:
+    def scan_column(self, name, sample):
+        hit = "cpf" in name.lower()
+        return {"sensitivity_level": "HIGH" if hit else "LOW", "pattern_detected": "CPF", "norm_tag": "", "ml_confidence": 0}
+
+    def scan_file_content(self, content, path):
+        if "123.456.789-09" not in content:
+            return None
+        return {"sensitivity_level": "HIGH", "pattern_detected": "CPF", "norm_tag": "", "ml_confidence": 0}
+
+
+def _sqlite_bytes(tmp_path) -> bytes:
+    db = tmp_path / "src.db"
+    conn = sqlite3.connect(db)
+    conn.execute("CREATE TABLE clientes (nome TEXT, cpf TEXT)")
+    conn.execute("INSERT INTO clientes VALUES ('Ana', '123.456.789-09')")
+    conn.commit()
+    conn.close()
+    return db.read_bytes()
+
+
+@pytest.fixture
+def files(tmp_path):
+    return {
+        "notas.txt": b"CPF 123.456.789-09",
+        "clientes.csv": b"nome,cpf\nAna,123.456.789-09\n",
+        "vazio.txt": b"nada",
+        "base.sqlite": _sqlite_bytes(tmp_path),
+    }
+
+
+@pytest.fixture
+def temp_files(monkeypatch):
+    """Count temp files created while scanning (only SQLite-as-DB may create one)."""
+    created = []
+    real_mkstemp = tempfile.mkstemp
+
+    def _mkstemp(*args, **kwargs):
+        created.append(kwargs.get("suffix"))
+        return real_mkstemp(*args, **kwargs)
+
+    monkeypatch.setattr(tempfile, "mkstemp", _mkstemp)
+    monkeypatch.setattr(tempfile, "NamedTemporaryFile", MagicMock(side_effect=AssertionError("temp file")))
+    return created
+
+
+class _CountingFile(io.BytesIO):
+    """Remote file that records how many bytes were read from it."""
+
+    transferred: dict[str, int] = {}
+
+    def __init__(self, name, data):
+        super().__init__(data)
+        self.name = name
+        self.transferred[name] = 0
+
+    def read(self, size=-1):
+        data = super().read(size)
+        self.transferred[self.name] += len(data)
+        return data
+
+    def readinto(self, buffer):
+        n = super().readinto(buffer)
+        self.transferred[self.name] += n
+        return n
+
+
+class _HttpResponse:
+    """Streamed response; honours a Range header (206) unless the server ignores ranges."""
+
+    def __init__(self, data, headers=None, honor_range=True):
+        self.status_code = 200
+        self.sent = 0
+        self.closed = False
+        self._data = data
+        spec = (headers or {}).get("Range")
+        if spec and honor_range:
+            start, end = (int(x) for x in spec.split("=", 1)[1].split("-"))
+            if start >= len(data):
+                self.status_code = 416
+            else:
+                self.status_code = 206
+                self._data = data[start:end + 1]
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(self.status_code)
+
+    def iter_content(self, chunk_size=1):
+        for i in range(0, len(self._data), chunk_size):
+            self.sent += len(self._data[i:i + chunk_size])
+            yield self._data[i:i + chunk_size]
+
+    def close(self):
+        self.closed = True
+
+
+def _big_files(files):
+    files = dict(files)
+    files["log.txt"] = b"CPF 123.456.789-09\n" + b"x" * (4 * 1024 * 1024)
+    files["dump.csv"] = b"nome,cpf\n" + b"Ana,123.456.789-09\n" * 200_000
+    files["vazio.md"] = b""
+    return files
+
+
+def _found(db):
+    return sorted(c.kwargs["file_name"] for c in db.save_finding.call_args_list)
+
+
+_EXPECTED = ["base.sqlite | clientes.cpf", "clientes.csv | cpf", "notas.txt"]
+
+
+def _fake_smbclient(files, sessions=None):
+    sessions = sessions if sessions is not None else []
+
+    def register_session(host, connection_cache=None, **kwargs):
+        if connection_cache is not None:
+            connection_cache["conn"] = object()
+            sessions.append(connection_cache)
+
+    @contextlib.contextmanager
+    def open_file(path, mode="rb", connection_cache=None):
+        assert connection_cache and "conn" in connection_cache
+        name = path.rsplit("\\", 1)[-1]
+        yield _CountingFile(name, files[name])
+
+    return SimpleNamespace(
+        register_session=register_session,
+        reset_connection_cache=lambda connection_cache=None: connection_cache.clear(),
+        walk=lambda root: [(root, [], sorted(files))],
+        open_file=open_file,
+    )
+
+
+def test_smb_classifies_in_memory(monkeypatch, files, temp_files):
+    sessions = []
+    monkeypatch.setattr(smb_connector, "_SMB_AVAILABLE", True)
+    monkeypatch.setattr(smb_connector, "smbclient", _fake_smbclient(files, sessions))
+    db = MagicMock()
+    SMBConnector({"name": "smb", "host": "fs01", "share": "dados", "concurrency": 2}, _Scanner(), db).run()
+    assert _found(db) == _EXPECTED
+    assert temp_files == [".sqlite"]
+    assert db.save_finding.call_args.kwargs["path"] == "\\\\fs01\\dados"
+    # One SMB connection per worker, reset when the pool is done
+    assert 1 <= len(sessions) <= 2 and all(not cache for cache in sessions)
+
+
+def test_smb_reads_only_the_sample_of_text_files(monkeypatch, files):
+    files = _big_files(files)
+    monkeypatch.setattr(smb_connector, "_SMB_AVAILABLE", True)
+    monkeypatch.setattr(smb_connector, "smbclient", _fake_smbclient(files))
+    db = MagicMock()
+    SMBConnector({"name": "smb", "host": "fs01", "share": "dados"}, _Scanner(), db).run()
+    assert _found(db) == sorted(_EXPECTED + ["dump.csv | cpf", "log.txt"])
+    read = _CountingFile.transferred
+    assert read["log.txt"] == _REMOTE_TEXT_BYTES
+    assert read["dump.csv"] == _REMOTE_TABLE_BYTES
+    # SQLite needs the whole file
+    assert read["base.sqlite"] == len(files["base.sqlite"])
+
+
+class _DavServer:
+    """
+    Fake webdav3 client: execute_request("list" = PROPFIND, "download", ...) with headers_ext as "Name: value"
+    strings; files are paths under the base_url's path (/dav). infinity=False refuses Depth: infinity (403);
+    infinity="cap" silently answers it with one level.
+    """
+
+    honor_range = True
+    infinity: bool | str = True
+
+    def __init__(self, files, root=""):
+        self.files = {f"{root}/{name}".strip("/"): data for name, data in files.items()}
+        self.dirs = {""} | {p.rsplit("/", 1)[0] for p in self.files if "/" in p}
+        for d in list(self.dirs):
+            while "/" in d:
+                d = d.rsplit("/", 1)[0]
+                self.dirs.add(d)
+        self.requests = []
+        self.propfinds = []
+        self.responses = {}
+
+    def __call__(self, options):
+        assert options["webdav_hostname"].endswith("/dav")
+        return self
+
+    def _entry(self, path, is_dir):
+        href = "/dav/" + quote(path) + ("/" if is_dir and path else "")
+        if is_dir:
+            return (
+                f"<d:response><d:href>{href}</d:href>"
+                "<d:propstat><d:prop><d:resourcetype><d:collection/></d:resourcetype></d:prop>"
+                "<d:status>HTTP/1.1 200 OK</d:status></d:propstat>"
+                "<d:propstat><d:prop><d:getcontentlength/></d:prop>"
+                "<d:status>HTTP/1.1 404 Not Found</d:status></d:propstat></d:response>"
+            )
+        return (
+            f"<d:response><d:href>https://dav.local{href}</d:href><d:propstat><d:prop><d:resourcetype/>"
+            f"<d:getcontentlength>{len(self.files[path])}</d:getcontentlength>"
+            "<d:getlastmodified>Tue, 14 Jul 2026 10:00:00 GMT</d:getlastmodified>"
+            "</d:prop><d:status>HTTP/1.1 200 OK</d:status></d:propstat></d:response>"
+        )
+
+    def _propfind(self, path, depth):
+        if path not in self.dirs:
+            raise type("RemoteResourceNotFound", (Exception,), {"code": 404})()
+        if depth == "infinity" and not self.infinity:
+            raise type("ResponseErrorCode", (Exception,), {"code": 403})()
+        one_level = depth == "1" or self.infinity == "cap"
+        prefix = f"{path}/" if path else ""
+
+        def _below(p):
+            return p.startswith(prefix) and p != path and (not one_level or "/" not in p[len(prefix):])
+
+        body = "".join(
+            [self._entry(path, True)]
+            + [self._entry(d, True) for d in sorted(self.dirs) if _below(d)]
+            + [self._entry(f, False) for f in sorted(self.files) if _below(f)]
+        )
+        response = _HttpResponse(b"")
+        response.raw = io.BytesIO(f'<?xml version="1.0"?><d:multistatus xmlns:d="DAV:">{body}</d:multistatus>'.encode())
+        return response
+
+    def execute_request(self, action, path, data=None, headers_ext=None):
+        headers = dict(h.split(": ", 1) for h in headers_ext or [])
+        if action == "list":
+            self.propfinds.append((path, headers["Depth"]))
+            return self._propfind(path.strip("/"), headers["Depth"])
+        name = path.rsplit("/", 1)[-1]
+        self.requests.append((action, name, headers.get("Range")))
+        response = _HttpResponse(self.files[path.strip("/")], headers, self.honor_range)
+        if response.status_code == 416:
+            raise type("ResponseErrorCode", (Exception,), {"code": 416})()
+        self.responses[name] = response
+        return response
+
+
+def _dav(monkeypatch, server):
+    monkeypatch.setattr(webdav_connector, "_WEBDAV_AVAILABLE", True)
+    monkeypatch.setattr(webdav_connector, "WebDAVClient", server)
+    monkeypatch.setattr(
+        webdav_connector, "Urn",
+        lambda path, directory=False: SimpleNamespace(quote=lambda: "/" + path + ("/" if directory and path else "")),
+    )
+
+
+def test_webdav_downloads_into_memory(monkeypatch, files, temp_files):
+    _dav(monkeypatch, _DavServer(files, root="docs"))
+    db = MagicMock()
+    WebDAVConnector({"name": "dav", "base_url": "https://dav.local/dav", "path": "docs"}, _Scanner(), db).run()
+    assert _found(db) == _EXPECTED
+    assert temp_files == [".sqlite"]
+    assert {c.kwargs["path"] for c in db.save_finding.call_args_list} == {
+        "docs/notas.txt", "docs/clientes.csv", "docs/base.sqlite",
+    }
+
+
+@pytest.mark.parametrize("honor_range", [True, False])
+def test_webdav_range_requests(monkeypatch, files, honor_range):
+    files = _big_files(files)
+    server = _DavServer(files)
+    server.honor_range = honor_range
+    _dav(monkeypatch, server)
+    db = MagicMock()
+    WebDAVConnector({"name": "dav", "base_url": "https://dav.local/dav"}, _Scanner(), db).run()
+    assert _found(db) == sorted(_EXPECTED + ["dump.csv | cpf", "log.txt"])
+    # vazio.md is empty per the listing: not requested at all
+    assert "vazio.md" not in server.responses
+    ranges = {name: spec for _, name, spec in server.requests}
+    assert ranges["log.txt"] == f"bytes=0-{_REMOTE_TEXT_BYTES - 1}"
+    assert ranges["dump.csv"] == f"bytes=0-{_REMOTE_TABLE_BYTES - 1}"
+    assert ranges["base.sqlite"] is None
+    # A server ignoring Range sends the whole file: the body is read only up to the sample (plus one chunk)
+    assert server.responses["log.txt"].sent <= _REMOTE_TEXT_BYTES + 64 * 1024
+    assert all(r.closed for r in server.responses.values())
+    db.save_failure.assert_not_called()
+
+
+def _tree():
+    return {
+        "relatórios 2024/notas.txt": b"CPF 123.456.789-09",
+        "relatórios 2024/rh/clientes.csv": b"nome,cpf\nAna,123.456.789-09\n",
+        "relatórios 2024/rh/antigos/vazio.txt": b"nada",
+        "leia-me.txt": b"nada",
+    }
+
+
+def test_webdav_lists_the_tree_in_one_propfind(monkeypatch):
+    server = _DavServer(_tree())
+    _dav(monkeypatch, server)
+    db = MagicMock()
+    WebDAVConnector({"name": "dav", "base_url": "https://dav.local/dav"}, _Scanner(), db).run()
+    assert server.propfinds == [("/", "infinity")]
+    assert sorted((c.kwargs["path"], c.kwargs["file_name"]) for c in db.save_finding.call_args_list) == [
+        ("relatórios 2024/notas.txt", "notas.txt"),
+        ("relatórios 2024/rh/clientes.csv", "clientes.csv | cpf"),
+    ]
+    db.save_failure.assert_not_called()
+
+
+@pytest.mark.parametrize("infinity", [False, "cap"])
+def test_webdav_breadth_first_fallback(monkeypatch, infinity):
+    """Depth: infinity refused (or silently capped): Depth: 1 crawl, level by level, only folders not yet listed."""
+    server = _DavServer(_tree())
+    server.infinity = infinity
+    _dav(monkeypatch, server)
+    entries = webdav_connector.list_webdav_files(server, "", "/dav", pool=webdav_connector.FetchPool(workers=2))
+    assert [e.path for e in entries] == [
+        "leia-me.txt", "relatórios 2024/notas.txt", "relatórios 2024/rh/antigos/vazio.txt",
+        "relatórios 2024/rh/clientes.csv",
+    ]
+    first = [("/", "infinity")] + ([] if infinity else [("/", "1")])
+    assert server.propfinds == first + [
+        ("/relatórios 2024/", "1"), ("/relatórios 2024/rh/", "1"), ("/relatórios 2024/rh/antigos/", "1"),
+    ]
+    notas = entries[1]
+    assert notas.size == 18 and not notas.is_dir
+    assert notas.modified == datetime(2026, 7, 14, 10, 0, tzinfo=timezone.utc)
+
+
+def test_webdav_deep_tree_without_recursion(monkeypatch):
+    depth = sys.getrecursionlimit() + 100
+    server = _DavServer({"/".join(["d"] * depth) + "/notas.txt": b"CPF 123.456.789-09"})
+    server.infinity = False
+    _dav(monkeypatch, server)
+    entries = webdav_connector.list_webdav_files(server, "", "/dav")
+    assert [e.path.count("/") for e in entries] == [depth]
+    assert len(server.propfinds) == depth + 2
+
+
+def test_webdav_unlisted_folder_reported(monkeypatch):
+    server = _DavServer(_tree())
+    server.infinity = False
+    server.dirs.add("sem acesso")
+    _dav(monkeypatch, server)
+    real = server._propfind
+
+    def _propfind(path, depth):
+        if path == "sem acesso":
+            raise PermissionError("403 Forbidden")
+        return real(path, depth)
+
+    server._propfind = _propfind
+    db = MagicMock()
+    WebDAVConnector({"name": "dav", "base_url": "https://dav.local/dav"}, _Scanner(), db).run()
+    assert _found(db) == ["clientes.csv | cpf", "notas.txt"]
+    db.save_failure.assert_called_once_with("dav", "permission_denied", "sem acesso: 403 Forbidden")
+
+
+def test_sharepoint_scans_response_content(monkeypatch, files, temp_files):
+    files = _big_files(files)
+    requests_seen = []
+
+    class _Listing:
+        def __init__(self, rows):
+            self.rows = rows
+
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            return {"value": self.rows}
+
+    class _Session:
+        def __init__(self):
+            self.headers = {}
+
+        def get(self, url, headers=None, stream=False):
+            if "/Files?" in url:
+                return _Listing([{"Name": name, "Length": str(len(data))} for name, data in sorted(files.items())])
+            if "/Folders?" in url:
+                return _Listing([])
+            name = url.split("('", 1)[1].split("')", 1)[0].rsplit("/", 1)[-1]
+            requests_seen.append((name, (headers or {}).get("Range"), stream))
+            return _HttpResponse(files[name], headers)
+
+        def close(self):
+            pass
+
+    monkeypatch.setattr(sharepoint_connector, "_REQUESTS_NTLM_AVAILABLE", True)
+    monkeypatch.setattr(sharepoint_connector, "requests", SimpleNamespace(Session=_Session))
+    db = MagicMock()
+    SharePointConnector({"name": "sp", "site_url": "https://sp.local/sites/rh"}, _Scanner(), db).run()
+    assert _found(db) == sorted(_EXPECTED + ["dump.csv | cpf", "log.txt"])
+    assert temp_files == [".sqlite"]
+    seen = {name: (spec, stream) for name, spec, stream in requests_seen}
+    assert seen["log.txt"] == (f"bytes=0-{_REMOTE_TEXT_BYTES - 1}", True)
+    assert seen["base.sqlite"] == (None, True)
+    # Empty per the listing: not requested at all
+    assert "vazio.md" not in seen
+    db.save_failure.assert_not_called()
+
+
+def test_webdav_multistatus_parsed_with_defusedxml_and_detached():
+    pytest.importorskip("defusedxml")
+    responses = "".join(
+        f"<d:response><d:href>/dav/f{i}.txt</d:href><d:propstat><d:prop><d:getcontentlength>{i}</d:getcontentlength>"
+        f"</d:prop><d:status>HTTP/1.1 200 OK</d:status></d:propstat></d:response>"
+        for i in range(50)
+    )
+    body = f'<?xml version="1.0"?><d:multistatus xmlns:d="DAV:">{responses}</d:multistatus>'.encode()
+    parser = webdav_connector.iterparse
+    roots = []
+
+    def _spy(source, events):
+        for event, elem in parser(source, events):
+            if not roots:
+                roots.append(elem)
+            yield event, elem
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(webdav_connector, "iterparse", _spy)
+        entries = list(webdav_connector._iter_multistatus(io.BytesIO(body), "/dav"))
+    assert [e.size for e in entries] == list(range(50))
+    # Each <response> is removed from <multistatus> once read
+    assert len(roots[0]) == 0
+    bomb = b'<?xml version="1.0"?><!DOCTYPE m [<!ENTITY a "aaaa">]><d:multistatus xmlns:d="DAV:">&a;</d:multistatus>'
+    with pytest.raises(Exception, match="(?i)entit"):
+        list(webdav_connector._iter_multistatus(io.BytesIO(bomb), "/dav"))
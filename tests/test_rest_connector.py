@@ -0,0 +1,194 @@
+"""Tests for RESTConnector with a mocked API (httpx.MockTransport): concurrent paths on an AsyncClient, Link and
+next/cursor pagination under a page budget, ETag revalidation reusing stored findings, and streamed bodies read
+only up to sample_limit items and the byte budget."""
+import asyncio
+import functools
+import json
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+
+from connectors import rest_connector
+from connectors.rest_connector import RESTConnector
+from core.database import LocalDBManager
+
+_BASE = "https://api.example.com"
+
+
+class _Scanner:
+    def scan_column(self, name, sample):
+        hit = "cpf" in name.lower() or "123.456.789-09" in sample
+        return {"sensitivity_level": "HIGH" if hit else "LOW", "pattern_detected": "CPF", "norm_tag": "", "ml_confidence": 0}
+
+
+class _API:
+    """Fake API: /users paged by Link header, /orders by next field, /events by cursor; ETags per page."""
+
+    def __init__(self):
+        self.requests = []
+        self.active = 0
+        self.max_active = 0
+        self.version = "v1"
+        self.chunks_sent = 0
+
+    async def __call__(self, request):
+        self.requests.append((request.url.path, dict(request.url.params), request.headers.get("If-None-Match")))
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        etag = f'"{request.url.path}-{request.url.query.decode()}-{self.version}"'
+        if request.headers.get("If-None-Match") == etag:
+            return httpx.Response(304, headers={"ETag": etag})
+        page = int(request.url.params.get("page", 1))
+        path = request.url.path
+        if path == "/users":
+            headers = {"ETag": etag}
+            if page < 10:
+                headers["Link"] = f'</users?page={page + 1}>; rel="next", </users?page=10>; rel="last"'
+            rows = [{"nome": "Ana", "documento": "123.456.789-09" if page == 2 else "n/a"}]
+            return httpx.Response(200, json=rows, headers=headers)
+        if path == "/orders":
+            body = {"data": [{"id": page, "obs": "ok"}], "next": "/orders?page=2" if page == 1 else None}
+            if page == 2:
+                body["data"][0]["cpf_cliente"] = "x"
+            return httpx.Response(200, json=body, headers={"ETag": etag})
+        if path == "/events":
+            cursor = request.url.params.get("cursor")
+            body = {"items": [{"tipo": "login"}], "meta": {"next_cursor": None if cursor else "abc"}}
+            if cursor:
+                body["items"][0]["cpf"] = "123.456.789-09"
+            return httpx.Response(200, json=body)
+        if path == "/huge":
+            # Endless-looking list streamed record by record; "padding" makes each record ~1 KB
+            return httpx.Response(200, content=self._records(request.url.params.get("padding")))
+        if path == "/broken":
+            return httpx.Response(200, content=self._broken(request), headers={"ETag": etag})
+        if path == "/feed":
+            return httpx.Response(200, content=b"nome,cpf\nAna,123.456.789-09\n", headers={"Content-Type": "text/csv"})
+        if path == "/elsewhere":
+            return httpx.Response(200, json={"nome": "x"}, headers={"Link": '<https://evil.example.net/p>; rel="next"'})
+        return httpx.Response(404)
+
+    async def _broken(self, request):
+        yield b'[{"nome": "Ana"},'
+        raise httpx.ReadTimeout("read timed out", request=request)
+
+    async def _records(self, padding):
+        yield b"["
+        for i in range(100_000):
+            record = {"id": i, "obs": "x" * 1000 if padding else "ok", "cpf": "123.456.789-09"}
+            self.chunks_sent += 1
+            yield (b"," if i else b"") + json.dumps(record).encode()
+        yield b"]"
+
+
+@pytest.fixture
+def api(monkeypatch):
+    api = _API()
+    monkeypatch.setattr(rest_connector.httpx, "AsyncClient", functools.partial(httpx.AsyncClient, transport=httpx.MockTransport(api)))
+    return api
+
+
+def _run(db, **config):
+    target = {"name": "api", "base_url": _BASE, "paths": ["/users", "/orders", "/events"], **config}
+    RESTConnector(target, _Scanner(), db).run()
+
+
+def _found(db):
+    return sorted(c.kwargs["file_name"] for c in db.save_finding.call_args_list)
+
+
+def test_paths_fetched_concurrently_and_pages_followed(api):
+    db = MagicMock()
+    db.get_connector_state.return_value = None
+    _run(db, max_pages=3)
+    db.save_failure.assert_not_called()
+    assert _found(db) == sorted(["GET /users | documento", "GET /orders | data[].cpf_cliente", "GET /events | items[].cpf"])
+    users = [params.get("page") for path, params, _ in api.requests if path == "/users"]
+    # Link rel="next" followed up to the page budget
+    assert users == [None, "2", "3"]
+    assert [params for path, params, _ in api.requests if path == "/events"] == [{}, {"cursor": "abc"}]
+    assert api.max_active > 1
+
+
+def test_concurrency_bounded(api):
+    db = MagicMock()
+    db.get_connector_state.return_value = None
+    _run(db, concurrency=1, max_pages=2)
+    assert api.max_active == 1
+
+
+def test_next_link_to_another_host_not_followed(api):
+    db = MagicMock()
+    db.get_connector_state.return_value = None
+    _run(db, paths=["/elsewhere"])
+    assert [path for path, _, _ in api.requests] == ["/elsewhere"]
+
+
+def test_unchanged_pages_revalidated_with_etag(api, tmp_path):
+    mgr = LocalDBManager(str(tmp_path / "audit.db"))
+    try:
+        for session_id in ("s1", "s2"):
+            mgr.set_current_session_id(session_id)
+            mgr.create_session_record(session_id)
+            api.requests.clear()
+            _run(mgr, max_pages=3)
+        _, fs_rows, failures = mgr.get_findings("s2")
+        assert failures == []
+        # Second scan: 304 for every page with an ETag, findings reused from connector_state
+        assert sorted(r["file_name"] for r in fs_rows) == sorted(
+            ["GET /users | documento", "GET /orders | data[].cpf_cliente", "GET /events | items[].cpf"]
+        )
+        conditional = [(path, etag is not None) for path, _, etag in api.requests]
+        assert conditional.count(("/users", True)) == 3 and conditional.count(("/orders", True)) == 2
+        # /events sends no ETag: always fetched in full
+        assert ("/events", False) in conditional
+        state = json.loads(mgr.get_connector_state("api", f"page:{_BASE}/users?page=2"))
+        assert state["next"] == f"{_BASE}/users?page=3" and state["findings"][0][0] == "documento"
+
+        api.version = "v2"
+        mgr.set_current_session_id("s3")
+        mgr.create_session_record("s3")
+        _run(mgr, max_pages=3)
+        _, fs_rows, _ = mgr.get_findings("s3")
+        assert len(fs_rows) == 3
+    finally:
+        mgr.dispose()
+
+
+def test_large_list_streamed_up_to_sample_limit(api):
+    db = MagicMock()
+    db.get_connector_state.return_value = None
+    _run(db, paths=["/huge"])
+    db.save_failure.assert_not_called()
+    assert _found(db) == ["GET /huge | cpf"]
+    # Five records sampled (sample_limit), the rest of the body never pulled from the stream
+    assert api.chunks_sent < 10
+
+
+def test_byte_budget_bounds_streamed_body(api):
+    db = MagicMock()
+    db.get_connector_state.return_value = None
+    _run(db, paths=["/huge?padding=1"], max_response_bytes=2500)
+    assert _found(db) == ["GET /huge?padding=1 | cpf"]
+    assert api.chunks_sent <= 4
+
+
+def test_non_json_body_scanned_as_text(api):
+    db = MagicMock()
+    db.get_connector_state.return_value = None
+    _run(db, paths=["/feed"])
+    assert _found(db) == ["GET /feed | _raw"]
+
+
+def test_body_cut_by_transport_error_fails_the_page(api):
+    db = MagicMock()
+    db.get_connector_state.return_value = None
+    _run(db, paths=["/broken"])
+    [call] = db.save_failure.call_args_list
+    assert call.args[:2] == ("api", "error") and "read timed out" in call.args[2]
+    # No validators stored: the next scan fetches the page in full instead of reusing partial findings
+    db.set_connector_state.assert_not_called()
+    db.save_finding.assert_not_called()
@@ -0,0 +1,297 @@
+"""Tests for SharePoint enumeration with a fake REST site: recursive folders, $select, nometadata JSON, next links,
+and incremental scans with change tokens kept in connector_state."""
+from types import SimpleNamespace
+from urllib.parse import unquote
+
+import pytest
+
+from connectors import sharepoint_connector
+from connectors.sharepoint_connector import SharePointConnector
+from core.database import LocalDBManager
+
+_ROOT = "/sites/rh/Shared Documents"
+
+
+class _Scanner:
+    def scan_column(self, name, sample):
+        hit = "cpf" in name.lower()
+        return {"sensitivity_level": "HIGH" if hit else "LOW", "pattern_detected": "CPF", "norm_tag": "", "ml_confidence": 0}
+
+    def scan_file_content(self, content, path):
+        if "123.456.789-09" not in content:
+            return None
+        return {"sensitivity_level": "HIGH", "pattern_detected": "CPF", "norm_tag": "", "ml_confidence": 0}
+
+
+class _HTTPError(Exception):
+    """requests.HTTPError stand-in: the failed response on .response."""
+
+    def __init__(self, response):
+        super().__init__(f"HTTP {response.status_code}")
+        self.response = response
+
+
+class _Response:
+    def __init__(self, body=None, status=200, data=b""):
+        self.status_code = status
+        self._body = body
+        self._data = data
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise _HTTPError(self)
+
+    def json(self):
+        return self._body
+
+    def iter_content(self, chunk_size=1):
+        for i in range(0, len(self._data), chunk_size):
+            yield self._data[i:i + chunk_size]
+
+    def close(self):
+        pass
+
+
+class _Site:
+    """Fake SharePoint REST API: paged folder listings (page rows per response), item ids and a change log."""
+
+    page = 2
+
+    def __init__(self, files):
+        self.files = {f"{_ROOT}/{path}": data for path, data in files.items()}
+        self.ids = {url: i + 1 for i, url in enumerate(sorted(self.files))}
+        self.token = 5
+        self.oldest = 1
+        self.changes = []
+        self.gets = []
+        self.posts = []
+        self.denied = set()
+        self.failing_items = set()
+
+    def Session(self):
+        return _Session(self)
+
+    def write(self, path, data):
+        url = f"{_ROOT}/{path}"
+        self.files[url] = data
+        self.ids.setdefault(url, len(self.ids) + 1)
+        self.token += 1
+        self.changes.append((self.token, self.ids[url]))
+
+    def _folder(self, literal):
+        path = unquote(literal).replace("''", "'")
+        return path if path.startswith("/") else f"/sites/rh/{path}"
+
+    def _children(self, folder):
+        files, folders = [], set()
+        for url in sorted(self.files):
+            if url.startswith(folder + "/"):
+                rest = url[len(folder) + 1:]
+                if "/" in rest:
+                    folders.add(f"{folder}/{rest.split('/', 1)[0]}")
+                else:
+                    files.append(url)
+        return files, sorted(folders)
+
+    def _page(self, url, rows):
+        skip = int(url.split("$skiptoken=", 1)[1]) if "$skiptoken=" in url else 0
+        body = {"value": rows[skip:skip + self.page]}
+        if skip + self.page < len(rows):
+            body["odata.nextLink"] = f"{url.split('&$skiptoken=')[0]}&$skiptoken={skip + self.page}"
+        return _Response(body)
+
+    def get(self, session, url, headers=None, stream=False):
+        assert session.headers["Accept"] == "application/json;odata=nometadata"
+        self.gets.append(url)
+        api = url.split("/_api/web/", 1)[1]
+        if api == "CurrentChangeToken":
+            return _Response({"StringValue": f"1;3;{self.token}"})
+        if api.startswith("GetFolderByServerRelativeUrl('"):
+            literal, rest = api[len("GetFolderByServerRelativeUrl('"):].split("')", 1)
+            folder = self._folder(literal)
+            if folder in self.denied:
+                return _Response(status=403)
+            files, folders = self._children(folder)
+            if rest.startswith("/Files?"):
+                assert "$select=Name,ServerRelativeUrl,Length,TimeLastModified" in rest
+                return self._page(url, [
+                    {"Name": f.rsplit("/", 1)[1], "ServerRelativeUrl": f, "Length": str(len(self.files[f])),
+                     "TimeLastModified": "2026-07-14T10:00:00Z"} for f in files
+                ])
+            if rest.startswith("/Folders?"):
+                return self._page(url, [{"Name": f.rsplit("/", 1)[1], "ServerRelativeUrl": f} for f in folders])
+            return _Response({"ServerRelativeUrl": folder})
+        if api.startswith("Lists(guid'"):
+            item_id = int(api.split("/Items(", 1)[1].split(")", 1)[0])
+            if item_id in self.failing_items:
+                return _Response(status=401)
+            url = next((u for u, i in self.ids.items() if i == item_id), None)
+            if url is None:
+                return _Response(status=404)
+            return _Response({"FileRef": url, "FileLeafRef": url.rsplit("/", 1)[1], "FSObjType": 0,
+                              "File_x0020_Size": str(len(self.files[url]))})
+        if api.startswith("GetFileByServerRelativeUrl('"):
+            path = self._folder(api[len("GetFileByServerRelativeUrl('"):].split("')", 1)[0])
+            return _Response(data=self.files[path])
+        raise AssertionError(url)
+
+    def post(self, session, url, json=None, headers=None):
+        self.posts.append(url)
+        if url.endswith("/_api/contextinfo"):
+            return _Response({"FormDigestValue": "digest"})
+        assert url.endswith("/_api/web/GetChanges") and headers["X-RequestDigest"] == "digest"
+        query = json["query"]
+        since = int(query["ChangeTokenStart"]["StringValue"].rsplit(";", 1)[1])
+        if since < self.oldest:
+            return _Response(status=400)
+        rows = [
+            {"ChangeType": 2, "ListId": "L1", "ItemId": item, "ChangeToken": {"StringValue": f"1;3;{token}"}}
+            for token, item in self.changes if token > since
+        ]
+        return _Response({"value": rows[:query["FetchLimit"]]})
+
+
+class _Session:
+    def __init__(self, site):
+        self.site = site
+        self.headers = {}
+
+    def get(self, url, headers=None, stream=False):
+        return self.site.get(self, url, headers, stream)
+
+    def post(self, url, json=None, headers=None):
+        return self.site.post(self, url, json, headers)
+
+    def close(self):
+        pass
+
+
+_FILES = {
+    "notas.txt": b"CPF 123.456.789-09",
+    "leia-me.txt": b"nada",
+    "RH/clientes.csv": b"nome,cpf\nAna,123.456.789-09\n",
+    "RH/2024/admissões.txt": b"CPF 123.456.789-09",
+    "RH/2024/vazio.txt": b"",
+    "Financeiro/d'Ávila.txt": b"CPF 123.456.789-09",
+}
+
+
+@pytest.fixture
+def site(monkeypatch):
+    site = _Site(_FILES)
+    monkeypatch.setattr(sharepoint_connector, "_REQUESTS_NTLM_AVAILABLE", True)
+    monkeypatch.setattr(sharepoint_connector, "requests", SimpleNamespace(Session=site.Session))
+    return site
+
+
+def _run(db, **config):
+    SharePointConnector({"name": "sp", "site_url": "https://sp.local/sites/rh", **config}, _Scanner(), db).run()
+
+
+def _db(tmp_path, session_id):
+    mgr = LocalDBManager(str(tmp_path / "audit.db"))
+    mgr.set_current_session_id(session_id)
+    mgr.create_session_record(session_id)
+    return mgr
+
+
+def test_recursive_paged_listing(site, tmp_path):
+    mgr = _db(tmp_path, "s1")
+    try:
+        _run(mgr)
+        _, fs_rows, failures = mgr.get_findings("s1")
+    finally:
+        mgr.dispose()
+    assert failures == []
+    assert sorted(r["path"] for r in fs_rows) == [
+        f"{_ROOT}/Financeiro/d'Ávila.txt", f"{_ROOT}/RH/2024/admissões.txt", f"{_ROOT}/RH/clientes.csv",
+        f"{_ROOT}/notas.txt",
+    ]
+    listings = [u for u in site.gets if "/Files?" in u or "/Folders?" in u]
+    # Root, RH, RH/2024 and Financeiro: Files and Folders once each, in pages of $top rows
+    assert len([u for u in listings if "$skiptoken=" not in u]) == 8
+    assert all("$top=" in u for u in listings)
+    # Empty file skipped from its listed size
+    assert not any("vazio.txt" in u for u in site.gets if "GetFileByServerRelativeUrl" in u)
+    # d'Ávila: quote doubled in the OData literal
+    assert any("d''%C3%81vila.txt" in u for u in site.gets)
+
+
+def test_next_links_followed(site, tmp_path):
+    site.page = 1
+    mgr = _db(tmp_path, "s1")
+    try:
+        _run(mgr)
+        _, fs_rows, _ = mgr.get_findings("s1")
+    finally:
+        mgr.dispose()
+    assert len(fs_rows) == 4
+    assert sum("$skiptoken=" in u for u in site.gets) >= 3
+
+
+def test_unlisted_folder_reported(site, tmp_path):
+    site.denied.add(f"{_ROOT}/RH")
+    mgr = _db(tmp_path, "s1")
+    try:
+        _run(mgr, incremental=True)
+        _, fs_rows, failures = mgr.get_findings("s1")
+        assert [f["reason"] for f in failures] == ["permission_denied"]
+        assert len(fs_rows) == 2
+        # Incomplete pass: the change token is not stored, the next scan lists everything again
+        assert mgr.get_connector_state("sp", "change_token:https://sp.local/sites/rh/Shared Documents") is None
+    finally:
+        mgr.dispose()
+
+
+def test_incremental_scan_fetches_only_changes(site, tmp_path):
+    mgr = _db(tmp_path, "s1")
+    try:
+        _run(mgr, incremental=True)
+        assert site.posts == []
+        state = mgr.get_connector_state("sp", "change_token:https://sp.local/sites/rh/Shared Documents")
+        assert state == "1;3;5"
+
+        site.write("RH/2024/novo.txt", b"CPF 123.456.789-09")
+        site.write("leia-me.txt", b"agora com CPF 123.456.789-09")
+        site.gets.clear()
+        mgr.set_current_session_id("s2")
+        mgr.create_session_record("s2")
+        _run(mgr, incremental=True)
+        _, fs_rows, _ = mgr.get_findings("s2")
+        assert sorted(r["path"].rsplit("/", 1)[1] for r in fs_rows) == ["leia-me.txt", "novo.txt"]
+        assert not any("/Files?" in u for u in site.gets)
+        downloads = [u for u in site.gets if "GetFileByServerRelativeUrl" in u]
+        assert len(downloads) == 2
+        assert mgr.get_connector_state("sp", "change_token:https://sp.local/sites/rh/Shared Documents") == "1;3;7"
+
+        # Change log no longer covers the stored token: full listing again
+        site.oldest = 100
+        site.gets.clear()
+        mgr.set_current_session_id("s3")
+        mgr.create_session_record("s3")
+        _run(mgr, incremental=True)
+        _, fs_rows, _ = mgr.get_findings("s3")
+        assert len(fs_rows) == 6
+        assert any("/Files?" in u for u in site.gets)
+    finally:
+        mgr.dispose()
+
+
+def test_unreadable_changed_item_falls_back_to_full_listing(site, tmp_path):
+    mgr = _db(tmp_path, "s1")
+    try:
+        _run(mgr, incremental=True)
+        site.write("RH/2024/novo.txt", b"CPF 123.456.789-09")
+        site.failing_items.add(site.ids[f"{_ROOT}/RH/2024/novo.txt"])
+        site.gets.clear()
+        mgr.set_current_session_id("s2")
+        mgr.create_session_record("s2")
+        _run(mgr, incremental=True)
+        _, fs_rows, failures = mgr.get_findings("s2")
+        # Not skipped like a deleted (404) item: the full listing still finds the changed file
+        assert any("/Files?" in u for u in site.gets)
+        assert "novo.txt" in {r["path"].rsplit("/", 1)[1] for r in fs_rows}
+        assert failures == []
+        assert mgr.get_connector_state("sp", "change_token:https://sp.local/sites/rh/Shared Documents") == "1;3;6"
+    finally:
+        mgr.dispose()
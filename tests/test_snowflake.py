@@ -0,0 +1,159 @@
+"""Tests for SnowflakeConnector with a fake connection: one discovery query, one SAMPLE query per table read as
+Arrow batches (fetchmany without pyarrow), and query counts/credits in the session metadata."""
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pyarrow as pa
+import pytest
+
+from connectors import snowflake_connector
+from connectors.snowflake_connector import SnowflakeConnector
+from report.generator import _build_report_info
+
+_TARGET = {"name": "sf", "type": "database", "driver": "snowflake", "account": "xy1", "user": "u",
+           "database": "DB", "warehouse": "WH"}
+
+
+class _Scanner:
+    def scan_column(self, name, sample):
+        hit = "cpf" in name.lower() or "123.456.789-09" in sample
+        return {"sensitivity_level": "HIGH" if hit else "LOW", "pattern_detected": "CPF", "norm_tag": "", "ml_confidence": 0}
+
+
+class _Account:
+    """Fake Snowflake account: information_schema columns, table rows and the session's query history."""
+
+    def __init__(self, arrow=True):
+        self.arrow = arrow
+        self.columns = [
+            ("PUBLIC", "CLIENTES", "NOME", "TEXT"),
+            ("PUBLIC", "CLIENTES", "DOCUMENTO", "TEXT"),
+            ("PUBLIC", "CLIENTES", "FOTO", "BINARY"),
+            ("PUBLIC", "CLIENTES", "ATIVO", "BOOLEAN"),
+            ("PUBLIC", "PEDIDOS", "CPF_COMPRADOR", "NUMBER"),
+            ("PUBLIC", "PEDIDOS", "OBS", "TEXT"),
+            ("VENDAS", "LOG", "ID", "NUMBER"),
+        ]
+        self.rows = {
+            '"PUBLIC"."CLIENTES"': [("Ana", "123.456.789-09")] * 20,
+            '"PUBLIC"."PEDIDOS"': [(12345678909, None), (1, "entrega 123.456.789-09")],
+            '"VENDAS"."LOG"': [],
+        }
+        self.statements = []
+        self.history = {}
+
+    def connect(self, **params):
+        return SimpleNamespace(cursor=lambda: _Cursor(self), close=lambda: None)
+
+
+class _Cursor:
+    def __init__(self, account):
+        self.account = account
+        self.result = []
+        self.sfqid = None
+
+    def execute(self, sql, params=()):
+        account = self.account
+        sql = " ".join(sql.split())
+        account.statements.append(sql)
+        self.sfqid = f"q{len(account.statements)}"
+        if "information_schema.columns" in sql:
+            self.result = list(account.columns)
+        elif "query_history_by_session" in sql:
+            self.result = [account.history[q] for q in params if q in account.history]
+            return
+        else:
+            table = sql.split(" FROM ", 1)[1].split(" SAMPLE ", 1)[0]
+            limit = int(sql.split("SAMPLE (", 1)[1].split(" ROWS", 1)[0])
+            self.result = account.rows[table][:limit]
+        account.history[self.sfqid] = (self.sfqid, 250, 1024, "X-Small", 0.0001)
+
+    def fetchall(self):
+        return self.result
+
+    def fetchmany(self, size):
+        return self.result[:size]
+
+    def fetch_arrow_batches(self):
+        if not self.account.arrow:
+            raise RuntimeError("pyarrow not installed")
+        width = len(self.result[0]) if self.result else 0
+        # Two batches per result, to cover reading across batch boundaries
+        for chunk in (self.result[:3], self.result[3:]):
+            if chunk:
+                yield pa.table({f"c{i}": [row[i] for row in chunk] for i in range(width)})
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def account(monkeypatch):
+    account = _Account()
+    monkeypatch.setattr(snowflake_connector, "_SNOWFLAKE_AVAILABLE", True)
+    monkeypatch.setattr(snowflake_connector, "snowflake", SimpleNamespace(connector=account))
+    return account
+
+
+def _run(**config):
+    db = MagicMock(current_session_id="s1")
+    SnowflakeConnector({**_TARGET, **config}, _Scanner(), db, sample_limit=5).run()
+    return db
+
+
+def _found(db):
+    return sorted((c.kwargs["schema_name"], c.kwargs["table_name"], c.kwargs["column_name"]) for c in db.save_finding.call_args_list)
+
+
+def test_one_discovery_query_and_one_sample_per_table(account):
+    db = _run()
+    db.save_failure.assert_not_called()
+    assert _found(db) == [("PUBLIC", "CLIENTES", "DOCUMENTO"), ("PUBLIC", "PEDIDOS", "CPF_COMPRADOR"), ("PUBLIC", "PEDIDOS", "OBS")]
+    discovery = [s for s in account.statements if "information_schema.columns" in s]
+    samples = [s for s in account.statements if " SAMPLE " in s]
+    assert len(discovery) == 1
+    # BINARY and BOOLEAN columns are classified by name only
+    assert samples == [
+        'SELECT "NOME", "DOCUMENTO" FROM "PUBLIC"."CLIENTES" SAMPLE (5 ROWS)',
+        'SELECT "CPF_COMPRADOR", "OBS" FROM "PUBLIC"."PEDIDOS" SAMPLE (5 ROWS)',
+        'SELECT "ID" FROM "VENDAS"."LOG" SAMPLE (5 ROWS)',
+    ]
+
+
+def test_fetchmany_without_arrow(account):
+    account.arrow = False
+    db = _run()
+    assert len(_found(db)) == 3
+
+
+def test_sample_reads_arrow_batches_up_to_limit(account):
+    connector = SnowflakeConnector(_TARGET, _Scanner(), MagicMock(), sample_limit=4)
+    connector.connect()
+    samples = connector._sample_table("PUBLIC", "CLIENTES", ["NOME", "DOCUMENTO"])
+    assert samples["NOME"] == " ".join(["Ana"] * 4)
+
+
+def test_failed_sample_falls_back_to_column_names(account):
+    account.rows.pop('"PUBLIC"."PEDIDOS"')
+    db = _run()
+    db.save_failure.assert_not_called()
+    # CPF_COMPRADOR still found by name; OBS needed its values
+    assert _found(db) == [("PUBLIC", "CLIENTES", "DOCUMENTO"), ("PUBLIC", "PEDIDOS", "CPF_COMPRADOR")]
+
+
+def test_query_counts_and_credits_in_session_metadata(account):
+    db = _run()
+    [call] = db.update_session_metadata.call_args_list
+    session_id, metadata = call.args
+    stats = metadata["snowflake"]["sf"]
+    assert session_id == "s1"
+    assert stats["queries"] == 4 and stats["tables"] == 3 and stats["columns"] == 7
+    assert stats["per_column_queries"] == 1 + 3 + 7
+    assert stats["execution_seconds"] == 1.0 and stats["bytes_scanned"] == 4096
+    # X-Small: 1 credit/hour for 1 s of execution
+    assert stats["warehouse_credits_estimate"] == round(1 / 3600, 6)
+    assert stats["cloud_services_credits"] == 0.0004
+    meta = {"started_at": None, "tenant_name": None, "technician_name": None, "scan_metadata": metadata}
+    about = {"name": "x", "version": "1", "author": "a", "license": "l", "copyright": "c"}
+    rows = {r["Field"]: r["Value"] for r in _build_report_info("s1", meta, about)}
+    assert rows["Snowflake: sf"].startswith("4 queries for 3 tables / 7 columns (per-column sampling: 11)")
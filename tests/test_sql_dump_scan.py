@@ -0,0 +1,152 @@
+"""Tests for the streaming SQL dump reader (file_scan.sql_dump) and per-column scan of .sql files.
+
+Dumps are small pg_dump/mysqldump-style texts written to tmp_path or held in memory.
+"""
+import gzip
+import io
+from unittest.mock import MagicMock
+
+from connectors.filesystem_connector import FilesystemConnector, _scan_compressed_file, _scan_tabular_file_as_table
+from file_scan import sql_dump
+from file_scan.sql_dump import sample_dump_columns
+
+PG_DUMP = """--
+-- PostgreSQL database dump
+--
+SET statement_timeout = 0;
+
+CREATE TABLE public.clientes (
+    id integer NOT NULL,
+    nome character varying(100),
+    documento text,
+    CONSTRAINT clientes_pkey PRIMARY KEY (id)
+);
+
+COPY public.clientes (id, nome, documento) FROM stdin;
+1\tAna\t123.456.789-09
+2\t\\N\t987.654.321-00
+3\tCarla\t111.222.333-96
+\\.
+
+CREATE TABLE public.vazia (codigo integer, descricao text);
+"""
+
+MYSQL_DUMP = """/*!40101 SET NAMES utf8mb4 */;
+DROP TABLE IF EXISTS `pedidos`;
+CREATE TABLE `pedidos` (
+  `id` int NOT NULL AUTO_INCREMENT,
+  `email` varchar(255) DEFAULT NULL,
+  `obs` text,
+  PRIMARY KEY (`id`),
+  KEY `idx_email` (`email`)
+) ENGINE=InnoDB;
+INSERT INTO `pedidos` VALUES (1,'ana@example.com','it''s, (ok)'),(2,NULL,'linha\\nnova'),(3,'c@example.com','x');
+"""
+
+
+class _Scanner:
+    """HIGH when a documento/email column or a CPF value shows up; records file content samples."""
+
+    def __init__(self):
+        self.contents = []
+
+    def scan_column(self, name, sample):
+        hit = any(k in name.lower() for k in ("documento", "email")) or "123.456.789-09" in sample
+        return {"sensitivity_level": "HIGH" if hit else "LOW", "pattern_detected": "CPF", "norm_tag": "", "ml_confidence": 0}
+
+    def scan_file_content(self, content, path):
+        self.contents.append(content)
+        if "123.456.789-09" not in content:
+            return None
+        return {"sensitivity_level": "HIGH", "pattern_detected": "CPF", "norm_tag": "", "ml_confidence": 0}
+
+
+def test_pg_dump_copy_block_mapped_to_create_table(tmp_path):
+    path = tmp_path / "dump.sql"
+    path.write_text(PG_DUMP)
+    tables = sample_dump_columns(path, sample_limit=2)
+    assert tables == [
+        ("public.clientes", ["id", "nome", "documento"], [["1", "2"], ["Ana"], ["123.456.789-09", "987.654.321-00"]]),
+        ("public.vazia", ["codigo", "descricao"], [[], []]),
+    ]
+
+
+def test_mysqldump_extended_insert_with_quotes_and_escapes():
+    tables = sample_dump_columns(io.BytesIO(MYSQL_DUMP.encode()), sample_limit=5)
+    assert tables == [
+        ("pedidos", ["id", "email", "obs"], [["1", "2", "3"], ["ana@example.com", "c@example.com"], ["it's, (ok)", "linha\nnova", "x"]]),
+    ]
+
+
+def test_insert_column_list_and_table_without_ddl():
+    dump = b"INSERT INTO pessoas (cpf, nome) VALUES ('123.456.789-09', 'Ana');\nINSERT INTO logs VALUES (1, 'x');\n"
+    assert sample_dump_columns(io.BytesIO(dump)) == [
+        ("pessoas", ["cpf", "nome"], [["123.456.789-09"], ["Ana"]]),
+        ("logs", ["column_1", "column_2"], [["1"], ["x"]]),
+    ]
+
+
+def test_copy_block_with_exactly_sample_limit_rows_keeps_next_table():
+    for newline in ("\n", "\r\n"):
+        dump = newline.join([
+            "COPY a (id) FROM stdin;", "1", "2", "\\.",
+            "COPY b (cpf) FROM stdin;", "123.456.789-09", "\\.", "",
+        ])
+        assert sample_dump_columns(io.BytesIO(dump.encode()), sample_limit=2) == [
+            ("a", ["id"], [["1", "2"]]),
+            ("b", ["cpf"], [["123.456.789-09"]]),
+        ], newline
+
+
+def test_insert_with_one_tuple_per_line():
+    """phpMyAdmin layout: VALUES on its own line, then one tuple per line (a value may span lines)."""
+    dump = (
+        "INSERT INTO `users` (`id`, `cpf`) VALUES\r\n"
+        "(1, '123.456.789-09'),\r\n"
+        "(2, 'multi\nline'),\r\n"
+        "(3, '987.654.321-00');\r\n"
+        "INSERT INTO `logs` (`msg`) VALUES\n('x');\n"
+    )
+    assert sample_dump_columns(io.BytesIO(dump.encode()), sample_limit=2) == [
+        ("users", ["id", "cpf"], [["1", "2"], ["123.456.789-09", "multi\nline"]]),
+        ("logs", ["msg"], [["x"]]),
+    ]
+
+
+def test_memory_bounded_on_long_lines_and_sampled_tables(monkeypatch):
+    """Lines longer than the cap are parsed from their start only; sampled COPY blocks are skipped."""
+    monkeypatch.setattr(sql_dump, "_MAX_LINE_BYTES", 4096)
+    monkeypatch.setattr(sql_dump, "_CHUNK_BYTES", 1024)
+    huge_insert = "INSERT INTO t (cpf) VALUES " + ",".join(f"('{i:011d}')" for i in range(5000)) + ";\n"
+    copy_rows = "".join(f"{i}\tvalue {i}\n" for i in range(5000))
+    dump = (
+        huge_insert
+        + "COPY big (id, val) FROM stdin;\n" + copy_rows + "\\.\n"
+        + "INSERT INTO after_copy (email) VALUES ('a@example.com');\n"
+    )
+    tables = dict((t, (c, s)) for t, c, s in sample_dump_columns(io.BytesIO(dump.encode()), sample_limit=3))
+    assert tables["t"] == (["cpf"], [["00000000000", "00000000001", "00000000002"]])
+    assert tables["big"] == (["id", "val"], [["0", "1", "2"], ["value 0", "value 1", "value 2"]])
+    assert tables["after_copy"] == (["email"], [["a@example.com"]])
+
+
+def test_plain_sql_script_falls_back_to_text_scan(tmp_path):
+    path = tmp_path / "query.sql"
+    path.write_text("SELECT * FROM clientes WHERE cpf = '123.456.789-09';\n")
+    assert sample_dump_columns(path) == []
+    assert _scan_tabular_file_as_table(path, ".sql", _Scanner()) is None
+
+
+def test_filesystem_connector_reports_dump_columns(tmp_path):
+    (tmp_path / "backup.sql").write_text(PG_DUMP)
+    (tmp_path / "mysql.sql.gz").write_bytes(gzip.compress(MYSQL_DUMP.encode()))
+    db = MagicMock()
+    FilesystemConnector({"name": "fs", "path": str(tmp_path)}, _Scanner(), db, extensions=[".sql", ".gz"]).run()
+    names = sorted(c.kwargs["file_name"] for c in db.save_finding.call_args_list)
+    assert names == ["backup.sql | public.clientes.documento", "mysql.sql.gz | pedidos.email"]
+    assert {c.kwargs["data_type"] for c in db.save_finding.call_args_list} == {"SQL"}
+
+
+def test_compressed_dump_is_streamed():
+    findings = _scan_compressed_file(io.BytesIO(gzip.compress(PG_DUMP.encode())), ".gz", _Scanner(), file_name="db.sql.gz")
+    assert [f["file_name"] for f in findings] == ["db.sql.gz | public.clientes.documento"]
@@ -0,0 +1,168 @@
+"""Tests for the I/O throttle (core.throttle, io_throttle): token buckets, schedule, connectors and session metadata."""
+import io
+import sqlite3
+from datetime import datetime
+from unittest.mock import MagicMock
+
+from config.loader import normalize_config
+from connectors.filesystem_connector import FilesystemConnector
+from core.database import LocalDBManager
+from core.engine import AuditEngine
+from core.throttle import IOThrottle, TokenBucket, throttle_from_config
+from report.generator import _build_report_info
+
+
+class _Clock:
+    """Fake monotonic clock; sleep() advances it."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+class _Scanner:
+    def scan_column(self, name, sample):
+        return {"sensitivity_level": "LOW", "pattern_detected": "", "norm_tag": "", "ml_confidence": 0}
+
+    def scan_file_content(self, content, path):
+        if "123.456.789-09" not in content:
+            return None
+        return {"sensitivity_level": "HIGH", "pattern_detected": "CPF", "norm_tag": "", "ml_confidence": 0}
+
+
+def _throttle(config, parent=None, at=datetime(2026, 10, 19, 12, 0)):
+    clock = _Clock()
+    return IOThrottle(config, parent=parent, clock=clock, sleep=clock.sleep, now=lambda: at), clock
+
+
+def test_token_bucket_paces_after_burst():
+    clock = _Clock()
+    bucket = TokenBucket(100, burst_seconds=1, clock=clock, sleep=clock.sleep)
+    assert bucket.take(100) == 0.0
+    # Bucket in debt: a read of 50 waits 0.5 s; after waiting, the next 50 waits another 0.5 s
+    assert bucket.take(50) == 0.5
+    assert bucket.take(50) == 0.5
+    assert clock.now == 1.0
+    unlimited = TokenBucket(None, clock=clock, sleep=clock.sleep)
+    assert unlimited.take(10**9) == 0.0
+
+
+def test_throttle_achieved_rate_close_to_limit():
+    throttle, clock = _throttle({"bytes_per_second": 1000, "files_per_second": 10})
+    for _ in range(50):
+        throttle.file()
+        throttle.consume(200)
+    stats = throttle.stats()
+    assert stats["files"] == 50 and stats["bytes"] == 10000
+    # 10 000 bytes at 1000 B/s with a 1 s burst: about 9 s of wall time
+    assert 9.0 <= clock.now <= 9.5
+    assert 1000 <= stats["bytes_per_second"] <= 1150
+    assert stats["limits"] == {"bytes_per_second": 1000.0, "files_per_second": 10.0}
+
+
+def test_schedule_windows_days_and_midnight():
+    config = {
+        "bytes_per_second": 0,
+        "schedule": [
+            {"days": ["mon", "tue", "wed", "thu", "fri"], "start": "08:00", "end": "18:00", "bytes_per_second": 500},
+            {"days": ["fri"], "start": "22:00", "end": "06:00", "files_per_second": 5},
+        ],
+    }
+    monday_noon = datetime(2026, 10, 19, 12, 0)
+    sunday_noon = datetime(2026, 10, 18, 12, 0)
+    friday_late = datetime(2026, 10, 23, 23, 0)
+    saturday_early = datetime(2026, 10, 24, 3, 0)
+    sunday_early = datetime(2026, 10, 25, 3, 0)
+    assert _throttle(config, at=monday_noon)[0].limits() == {"bytes_per_second": 500.0, "files_per_second": None}
+    assert _throttle(config, at=sunday_noon)[0].limits() == {"bytes_per_second": None, "files_per_second": None}
+    assert _throttle(config, at=friday_late)[0].limits()["files_per_second"] == 5.0
+    # The Friday night window continues after midnight, but not on Sunday morning (it started Saturday)
+    assert _throttle(config, at=saturday_early)[0].limits()["files_per_second"] == 5.0
+    assert _throttle(config, at=sunday_early)[0].limits()["files_per_second"] is None
+
+
+def test_target_throttle_charges_global():
+    parent, clock = _throttle({"bytes_per_second": 100})
+    child = IOThrottle({}, parent=parent, clock=clock, sleep=clock.sleep)
+    child.file()
+    child.consume(300)
+    assert child.stats()["bytes"] == parent.stats()["bytes"] == 300
+    assert parent.stats()["files"] == 1
+    assert clock.now == 2.0
+
+
+def test_throttle_from_config():
+    assert throttle_from_config(None) is None
+    assert throttle_from_config({"bytes_per_second": 0}) is None
+    assert throttle_from_config({"files_per_second": 10}) is not None
+    parent = IOThrottle({"files_per_second": 10})
+    assert throttle_from_config({}, parent=parent).parent is parent
+
+
+def test_wrap_counts_bytes_and_keeps_stream_open():
+    throttle, _ = _throttle({})
+    stream = io.BytesIO(b"abc" * 10000)
+    with throttle.wrap(stream) as f:
+        assert f.read(3) == b"abc"
+        f.seek(0)
+        assert len(f.read()) == 30000
+    assert not stream.closed
+    assert throttle.stats()["bytes"] >= 30000
+
+
+def test_filesystem_connector_reads_through_throttle(tmp_path):
+    (tmp_path / "a.txt").write_text("CPF 123.456.789-09")
+    (tmp_path / "b.txt").write_text("nada aqui")
+    throttle = IOThrottle({"files_per_second": 1000})
+    db = MagicMock()
+    FilesystemConnector({"name": "fs", "path": str(tmp_path)}, _Scanner(), db, throttle=throttle).run()
+    assert db.save_finding.call_count == 1
+    stats = throttle.stats()
+    assert stats["files"] == 2
+    assert stats["bytes"] >= len("CPF 123.456.789-09") + len("nada aqui")
+
+
+def test_engine_stores_achieved_rates_in_session(tmp_path):
+    data = tmp_path / "data"
+    data.mkdir()
+    (data / "a.txt").write_text("CPF 123.456.789-09")
+    config = normalize_config({
+        "targets": [{"name": "share", "type": "filesystem", "path": str(data), "io_throttle": {"files_per_second": 1000}}],
+        "io_throttle": {"bytes_per_second": 100 * 1024 * 1024},
+    })
+    assert config["io_throttle"] == {"bytes_per_second": 100 * 1024 * 1024}
+    engine = AuditEngine(config, db_path=str(tmp_path / "audit.db"))
+    session_id = engine.start_audit()
+    session = next(s for s in engine.db_manager.list_sessions() if s["session_id"] == session_id)
+    io_stats = session["scan_metadata"]["io_throttle"]
+    assert io_stats["global"]["files"] == 1
+    assert io_stats["targets"]["share"]["files"] == 1
+    assert io_stats["targets"]["share"]["limits"]["files_per_second"] == 1000.0
+    meta = {"started_at": None, "tenant_name": None, "technician_name": None, "scan_metadata": session["scan_metadata"]}
+    about = {"name": "x", "version": "1", "author": "a", "license": "l", "copyright": "c"}
+    fields = [row["Field"] for row in _build_report_info(session_id, meta, about)]
+    assert "I/O throttle (global)" in fields and "I/O throttle: share" in fields
+
+
+def test_session_metadata_merge_and_migration(tmp_path):
+    db_path = tmp_path / "old.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "CREATE TABLE scan_sessions (id INTEGER PRIMARY KEY, session_id VARCHAR(64), started_at DATETIME, "
+        "finished_at DATETIME, status VARCHAR(20), tenant_name VARCHAR(255), technician_name VARCHAR(255))"
+    )
+    conn.commit()
+    conn.close()
+    db = LocalDBManager(str(db_path))
+    db.create_session_record("s1")
+    db.update_session_metadata("s1", {"io_throttle": {"global": None}, "other": 1})
+    db.update_session_metadata("s1", {"other": None})
+    session = next(s for s in db.list_sessions() if s["session_id"] == "s1")
+    assert session["scan_metadata"] == {"io_throttle": {"global": None}}